@@ -0,0 +1,91 @@
+"""Benchmark ExplorerService.list_directory on a synthetic directory.
+
+Creates a directory with ``--entries`` entries (files with a mix of
+extensions, sub-directories and symlinks) and compares the listing engine
+with building every entry through ``get_file_entry``, which is how listings
+were made before, and with revisiting the directory through the listing
+cache.
+
+    python benchmarks/explorer_listing.py --entries 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from hiveden.explorer.cache import ListingCache
+from hiveden.explorer.models import SortBy
+from hiveden.explorer.operations import ExplorerService
+
+EXTENSIONS = [".mkv", ".mp4", ".jpg", ".png", ".srt", ".nfo", ".txt", ".tar.gz", ""]
+
+
+def populate(path: str, count: int):
+    for i in range(count):
+        name = os.path.join(path, f"entry-{i:06d}")
+        kind = i % 50
+        if kind == 0:
+            os.mkdir(name)
+        elif kind == 1:
+            os.symlink(f"entry-{i - 1:06d}", name)
+        else:
+            with open(name + EXTENSIONS[i % len(EXTENSIONS)], "wb") as f:
+                f.write(b"x" * (i % 4096))
+
+
+def legacy_listing(service: ExplorerService, path: str):
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name.startswith('.'):
+                continue
+            entries.append(service.get_file_entry(entry.path))
+    entries.sort(key=lambda x: x.name.lower())
+    return entries
+
+
+def best_of(repeat: int, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--directory", help="Existing directory to list instead of a synthetic one.")
+    args = parser.parse_args()
+
+    service = ExplorerService(listing_cache=ListingCache(max_bytes=0))
+    cached_service = ExplorerService(listing_cache=ListingCache(max_bytes=1 << 30))
+    with tempfile.TemporaryDirectory() as scratch:
+        path = args.directory
+        if path is None:
+            path = scratch
+            started = time.perf_counter()
+            populate(path, args.entries)
+            print(f"created {args.entries} entries in {time.perf_counter() - started:.1f}s")
+            # Directories modified a moment ago are not cached.
+            past = time.time() - 60
+            os.utime(path, (past, past))
+
+        legacy, entries = best_of(args.repeat, lambda: legacy_listing(service, path))
+        engine, (listed, _, _) = best_of(args.repeat, lambda: service.list_directory(path, sort_by=SortBy.NAME))
+        assert [e.name for e in entries] == [e.name for e in listed]
+        cached_service.list_directory(path, sort_by=SortBy.NAME)
+        cached, _ = best_of(args.repeat, lambda: cached_service.list_directory(path, sort_by=SortBy.NAME))
+        page, _ = best_of(args.repeat, lambda: cached_service.list_directory_page(path, sort_by=SortBy.SIZE, limit=100))
+
+        print(f"{'get_file_entry per entry':<28} {legacy:8.3f}s  {len(entries) / legacy:10.0f} entries/s")
+        print(f"{'list_directory':<28} {engine:8.3f}s  {len(listed) / engine:10.0f} entries/s")
+        print(f"{'list_directory (cached)':<28} {cached:8.3f}s  {len(listed) / cached:10.0f} entries/s")
+        print(f"{'first page by size (cached)':<28} {page:8.3f}s")
+        print(f"speedup: {legacy / engine:.1f}x, cached {legacy / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
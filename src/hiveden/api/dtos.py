@@ -4,7 +4,15 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 
 from hiveden.docker.models import Container as DockerContainer
-from hiveden.docker.models import ContainerCreate
+from hiveden.docker.models import (
+    ContainerCreate,
+    ContainerStats,
+    ContainerStatsTop,
+    ContainerSummary,
+    DiskUsage,
+    ReclaimItem,
+    ReclaimPlan,
+)
 from hiveden.docker.models import DockerContainer as ContainerConfig
 from hiveden.docker.models import Network as DockerNetwork
 from hiveden.explorer.models import FilesystemLocation
@@ -109,10 +117,57 @@ class ContainerListResponse(BaseResponse):
     data: List[DockerContainer]
 
 
+class ContainerSummaryListResponse(BaseResponse):
+    data: List[ContainerSummary]
+
+
 class ContainerResponse(BaseResponse):
     data: DockerContainer
 
 
+class ContainerStatsResponse(BaseResponse):
+    data: ContainerStats
+
+
+class ContainerStatsTopResponse(BaseResponse):
+    data: List[ContainerStatsTop]
+
+
+class DiskUsageResponse(BaseResponse):
+    data: DiskUsage
+
+
+class ReclaimPlanResponse(BaseResponse):
+    data: ReclaimPlan
+
+
+class DiskPruneRequest(BaseModel):
+    """Items to remove; without any, the default reclaim plan is pruned."""
+    items: Optional[List[ReclaimItem]] = None
+
+
+class DockerApiEndpointStats(BaseModel):
+    endpoint: str
+    calls: int
+    errors: int
+    total_seconds: float
+    max_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+
+
+class DockerApiStats(BaseModel):
+    pool_size: int
+    timeout_seconds: int
+    client_created: bool
+    calls: int
+    endpoints: List[DockerApiEndpointStats]
+
+
+class DockerApiStatsResponse(BaseResponse):
+    data: DockerApiStats
+
+
 class ContainerCreateResponse(BaseResponse):
     data: DockerContainer
 
@@ -121,6 +176,19 @@ class ContainerConfigResponse(BaseResponse):
     data: ContainerCreate
 
 
+class ContainerBulkRequest(BaseModel):
+    action: str
+    names: Optional[List[str]] = None
+    only_managed: bool = False
+    max_workers: Optional[int] = Field(default=None, ge=1)
+    timeout: Optional[int] = Field(default=None, ge=0)
+
+
+class ImagePullRequest(BaseModel):
+    images: List[str] = Field(min_length=1)
+    only_missing: bool = False
+
+
 class ContainerDependencyCheckRequest(BaseModel):
     dependencies: List[str]
 
@@ -212,6 +280,8 @@ class DomainInfoResponse(BaseResponse):
 
 class DomainUpdateRequest(BaseModel):
     domain: str
+    # Replace ingress containers blue/green instead of in place.
+    zero_downtime: bool = False
 
 
 class DomainUpdateResponse(BaseModel):
@@ -283,6 +353,59 @@ class DatabaseUserListResponse(BaseResponse):
     data: List[DatabaseUser]
 
 
+class DatabasePoolStats(BaseModel):
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    in_use: int
+    checkouts: int
+    waits: int
+    wait_time_seconds: float
+    max_wait_time_seconds: float
+    timeouts: int
+    connections_created: int
+    connections_discarded: int
+    failed_health_checks: int
+
+
+class DatabasePoolStatsResponse(BaseResponse):
+    data: DatabasePoolStats
+
+
+class RouteQueryStats(BaseModel):
+    requests: int
+    queries: int
+    queries_per_request_p50: float
+    queries_per_request_p95: float
+    query_time_seconds: float
+    query_time_p50_seconds: float
+    query_time_p95_seconds: float
+    latency_p50_seconds: float
+    latency_p95_seconds: float
+
+
+class QueryFingerprintStats(BaseModel):
+    fingerprint: str
+    calls: int
+    rows: int
+    total_seconds: float
+    max_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+
+
+class DatabaseQueryStats(BaseModel):
+    slow_query_threshold_seconds: float
+    slow_queries: int
+    routes: Dict[str, RouteQueryStats]
+    queries: List[QueryFingerprintStats]
+
+
+class DatabaseQueryStatsResponse(BaseResponse):
+    data: DatabaseQueryStats
+
+
 class ImageContainerInfo(BaseModel):
     id: str
     name: str
@@ -455,3 +578,6 @@ class LogEntry(BaseModel):
 
 class LogListResponse(BaseResponse):
     data: List[LogEntry]
+    # Cursor for the next (older) page; unset once the last page is reached.
+    next_before_id: Optional[int] = None
+    next_before_ts: Optional[datetime] = None
@@ -0,0 +1,29 @@
+import time
+
+from fastapi import Request
+
+from hiveden.db.instrumentation import begin_request, end_request, query_stats
+
+
+async def query_metrics_middleware(request: Request, call_next):
+    """Attribute database queries to the route serving each request.
+
+    Adds ``X-DB-Query-Count`` and ``X-DB-Query-Time`` headers to the response
+    and feeds the per-route aggregates behind ``GET /db/queries``.
+    """
+    token = begin_request()
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        queries = end_request(token)
+        route = request.scope.get("route")
+        # The route template keeps /apps/{app_id} as one series.
+        path = getattr(route, "path", None) or "unmatched"
+        query_stats.record_request(
+            f"{request.method} {path}", time.perf_counter() - started, queries
+        )
+
+    response.headers["X-DB-Query-Count"] = str(queries.count)
+    response.headers["X-DB-Query-Time"] = f"{queries.duration:.6f}"
+    return response
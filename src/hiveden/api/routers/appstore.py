@@ -111,7 +111,7 @@ async def sync_catalog():
 
 
 @router.get("/apps", response_model=AppListResponse)
-def list_apps(
+async def list_apps(
     q: Optional[str] = Query(None, description="Search query"),
     category: Optional[str] = Query(None, description="Category filter"),
     installed: Optional[bool] = Query(None, description="Filter by install state"),
@@ -120,7 +120,7 @@ def list_apps(
 ):
     try:
         service = AppCatalogService()
-        entries = service.list_apps(
+        entries = await service.alist_apps(
             q=q, category=category, installed=installed, limit=limit, offset=offset
         )
         return AppListResponse(data=[_to_summary(entry) for entry in entries])
@@ -132,10 +132,10 @@ def list_apps(
 
 
 @router.get("/installed", response_model=AppListResponse)
-def list_installed_apps():
+async def list_installed_apps():
     try:
         service = AppCatalogService()
-        entries = service.list_installed_apps()
+        entries = await service.alist_installed_apps()
         return AppListResponse(data=[_to_summary(entry) for entry in entries])
     except Exception as exc:
         logger.error(
@@ -147,9 +147,9 @@ def list_installed_apps():
 
 
 @router.get("/apps/{app_id}", response_model=AppDetailResponse)
-def get_app_detail(app_id: str):
+async def get_app_detail(app_id: str):
     service = AppCatalogService()
-    entry = service.get_app(app_id)
+    entry = await service.aget_app(app_id)
     if not entry:
         raise HTTPException(status_code=404, detail=f"App '{app_id}' not found")
     return AppDetailResponse(data=_to_detail(entry))
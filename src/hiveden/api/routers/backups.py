@@ -1,9 +1,12 @@
+import asyncio
 import traceback
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from hiveden.api.dtos import JobInfo
 from hiveden.backups.manager import BackupManager
 from hiveden.backups.scheduler import BackupScheduler
+from hiveden.jobs.manager import JobManager
 
 router = APIRouter(prefix="/backups", tags=["backups"])
 
@@ -15,17 +18,21 @@ class Backup(BaseModel):
     timestamp: str
     size: int
     mtime: float
+    format: Optional[str] = None # 'plain', 'custom', 'directory' or 'archive'
 
 class BackupCreateRequest(BaseModel):
     type: str # 'database' or 'application'
     target: str # db_name or app name (used for filename/retention)
     source_dirs: Optional[List[str]] = None
     container_name: Optional[str] = None
+    format: Optional[str] = None # database only: 'directory', 'custom' or 'plain'
+    jobs: Optional[int] = None # database only: parallel pg_dump workers
 
 class BackupRestoreRequest(BaseModel):
     backup_file: str
     target: str # db_name or dest_dir
     type: str # 'database' or 'application'
+    jobs: Optional[int] = None # database only: parallel pg_restore workers
 
 class BackupConfig(BaseModel):
     directory: str
@@ -121,23 +128,38 @@ def list_backups(
         print(f"Error listing backups: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _database_options(request) -> Dict[str, Any]:
+    options = {}
+    if getattr(request, "format", None):
+        options["format"] = request.format
+    if request.jobs:
+        options["jobs"] = request.jobs
+    return options
+
+def _validate_create_request(request: BackupCreateRequest):
+    if request.type not in ("database", "application"):
+        raise HTTPException(status_code=400, detail="Invalid backup type. Must be 'database' or 'application'.")
+    if request.type == "application" and not request.source_dirs:
+        raise HTTPException(status_code=400, detail="source_dirs required for application backup")
+
+def _run_backup(manager: BackupManager, request: BackupCreateRequest, actor: str, progress=None) -> str:
+    if request.type == "database":
+        options = _database_options(request)
+        if progress:
+            options["progress"] = progress
+        return manager.create_postgres_backup(db_name=request.target, actor=actor, **options)
+    return manager.create_app_data_backup(
+        source_dirs=request.source_dirs,
+        container_name=request.container_name,
+        actor=actor
+    )
+
 @router.post("", status_code=201)
 def create_backup(request: BackupCreateRequest):
+    _validate_create_request(request)
     try:
         manager = BackupManager()
-        path = None
-        if request.type == "database":
-            path = manager.create_postgres_backup(db_name=request.target, actor="api")
-        elif request.type == "application":
-            if not request.source_dirs:
-                raise HTTPException(status_code=400, detail="source_dirs required for application backup")
-            path = manager.create_app_data_backup(
-                source_dirs=request.source_dirs,
-                container_name=request.container_name,
-                actor="api"
-            )
-        else:
-            raise HTTPException(status_code=400, detail="Invalid backup type. Must be 'database' or 'application'.")
+        path = _run_backup(manager, request, actor="api")
         
         return {"path": path, "message": "Backup created successfully"}
     except ValueError as e:
@@ -147,12 +169,63 @@ def create_backup(request: BackupCreateRequest):
         print(f"Error creating backup: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/jobs", response_model=JobInfo, status_code=202)
+async def create_backup_job(request: BackupCreateRequest):
+    """Start a backup in the background and report progress through a job."""
+    _validate_create_request(request)
+    job_manager = JobManager()
+    job_id = job_manager.create_external_job(f"backups.create:{request.type}:{request.target}")
+
+    async def worker(current_job_id: str, manager: JobManager):
+        await manager.log(current_job_id, f"Starting {request.type} backup of {request.target}")
+        path = await asyncio.to_thread(
+            _run_backup, BackupManager(), request, "api", manager.threadsafe_logger(current_job_id)
+        )
+        await manager.log(current_job_id, f"Backup written to {path}")
+
+    asyncio.create_task(job_manager.run_external_job(job_id, worker))
+    return JobInfo(job_id=job_id, message="Backup started")
+
+@router.post("/restore/jobs", response_model=JobInfo, status_code=202)
+async def restore_backup_job(request: BackupRestoreRequest):
+    """Start a restore in the background and report progress through a job."""
+    if request.type not in ("database", "application"):
+        raise HTTPException(status_code=400, detail="Invalid backup type")
+    job_manager = JobManager()
+    job_id = job_manager.create_external_job(f"backups.restore:{request.type}:{request.target}")
+
+    async def worker(current_job_id: str, manager: JobManager):
+        await manager.log(current_job_id, f"Restoring {request.backup_file} to {request.target}")
+        bm = BackupManager()
+        if request.type == "database":
+            await asyncio.to_thread(
+                bm.restore_postgres_backup,
+                backup_file=request.backup_file,
+                db_name=request.target,
+                actor="api",
+                progress=manager.threadsafe_logger(current_job_id),
+                **_database_options(request),
+            )
+        else:
+            await asyncio.to_thread(
+                bm.restore_app_data_backup,
+                backup_file=request.backup_file,
+                dest_dir=request.target,
+                actor="api",
+            )
+        await manager.log(current_job_id, "Restore completed successfully")
+
+    asyncio.create_task(job_manager.run_external_job(job_id, worker))
+    return JobInfo(job_id=job_id, message="Restore started")
+
 @router.post("/restore")
 def restore_backup(request: BackupRestoreRequest):
     try:
         manager = BackupManager()
         if request.type == "database":
-            manager.restore_postgres_backup(backup_file=request.backup_file, db_name=request.target, actor="api")
+            manager.restore_postgres_backup(
+                backup_file=request.backup_file, db_name=request.target, actor="api", **_database_options(request)
+            )
         elif request.type == "application":
             manager.restore_app_data_backup(backup_file=request.backup_file, dest_dir=request.target, actor="api")
         else:
@@ -174,7 +247,7 @@ def delete_backup(filename: str):
         return {"message": "Backup deleted successfully"}
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except ValueError as e:
+    except (ValueError, IsADirectoryError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         traceback.print_exc()
@@ -1,5 +1,5 @@
 import yaml
-from fastapi import APIRouter, Body, HTTPException
+from fastapi import APIRouter, Body, HTTPException, Query
 from fastapi.logger import logger
 import traceback
 
@@ -9,11 +9,17 @@ from hiveden.docker.actions import apply_configuration
 router = APIRouter(prefix="/config", tags=["Config"])
 
 @router.post("", response_model=DataResponse)
-def submit_config(config: str = Body(...)):
-    """Submit a YAML configuration."""
+def submit_config(
+    config: str = Body(...),
+    dry_run: bool = Query(False, description="Only report what would change."),
+):
+    """Submit a YAML configuration.
+
+    Only containers whose configuration changed are recreated.
+    """
     try:
         data = yaml.safe_load(config)
-        messages = apply_configuration(data['docker'])
+        messages = apply_configuration(data['docker'], dry_run=dry_run)
         return DataResponse(data=messages)
     except yaml.YAMLError as e:
         logger.error(f"Invalid YAML: {e}\n{traceback.format_exc()}")
@@ -1,14 +1,18 @@
 import traceback
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from fastapi.logger import logger
 
 from hiveden.api.dtos import (
     DatabaseCreateRequest,
     DatabaseListResponse,
+    DatabasePoolStatsResponse,
+    DatabaseQueryStatsResponse,
     DatabaseUserListResponse,
     SuccessResponse,
 )
+from hiveden.db.instrumentation import query_stats
 from hiveden.db.session import get_db_manager
 from hiveden.services.logs import LogService
 
@@ -77,3 +81,21 @@ def list_users():
     except Exception as e:
         logger.error(f"Error listing users: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/pool", response_model=DatabasePoolStatsResponse)
+def get_pool_stats():
+    """Get connection pool statistics for the Hiveden database."""
+    manager = get_db_manager()
+    return DatabasePoolStatsResponse(data=manager.pool_stats())
+
+@router.get("/queries", response_model=DatabaseQueryStatsResponse)
+def get_query_stats(top: int = Query(20, ge=0, le=500)):
+    """Get query counts and latency per API route and the costliest queries."""
+    return DatabaseQueryStatsResponse(data=query_stats.snapshot(top=top))
+
+@router.get("/queries/metrics", response_class=PlainTextResponse)
+def get_query_metrics():
+    """Per-route query counts and p50/p95 latency in Prometheus text format."""
+    return PlainTextResponse(
+        query_stats.prometheus(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,5 +1,7 @@
 from fastapi import APIRouter
-from hiveden.api.routers.docker import containers, images, volumes
+from hiveden.api.dtos import DockerApiStatsResponse
+from hiveden.api.routers.docker import containers, disk, images, volumes
+from hiveden.docker.client import api_stats
 
 router = APIRouter(prefix="/docker")
 
@@ -11,3 +13,12 @@ router.include_router(images.router)
 
 # Include volume routes
 router.include_router(volumes.router)
+
+# Include disk usage routes
+router.include_router(disk.router)
+
+
+@router.get("/api-stats", response_model=DockerApiStatsResponse, tags=["Docker"])
+def get_api_stats():
+    """Get call counts and latency of Docker API requests per endpoint."""
+    return DockerApiStatsResponse(data=api_stats.snapshot())
@@ -1,28 +1,35 @@
+import asyncio
 import json
 import traceback
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.logger import logger
 from fastapi.responses import StreamingResponse
 
 from hiveden.api.dtos import (
+    ContainerBulkRequest,
     ContainerDependencyCheckRequest,
     ContainerDependencyCheckResponse,
     ContainerConfigResponse,
     ContainerCreateResponse,
     ContainerListResponse,
     ContainerResponse,
+    ContainerStatsResponse,
+    ContainerStatsTopResponse,
+    ContainerSummaryListResponse,
     ErrorResponse,
     FileUploadResponse,
+    JobInfo,
     NetworkListResponse,
     NetworkResponse,
     SuccessResponse,
 )
+from hiveden.jobs.manager import JobManager
 from hiveden.services.logs import LogService
 from hiveden.db.session import get_db_manager
-from hiveden.docker.models import ContainerCreate, NetworkCreate
+from hiveden.docker.models import ContainerCreate, ContainerStats, NetworkCreate
 
 
 def get_db():
@@ -40,6 +47,32 @@ def list_all_containers():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/containers/summary",
+    response_model=ContainerSummaryListResponse,
+    response_model_exclude_unset=True,
+)
+def list_container_summaries(
+    all: bool = Query(True, description="Include stopped containers."),
+    only_managed: bool = Query(False, description="Only containers managed by hiveden."),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. Id,Name,State."
+    ),
+):
+    """List containers in a single Docker round trip, without inspecting each one."""
+    from hiveden.docker.containers import list_container_summaries
+
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        data = list_container_summaries(all=all, only_managed=only_managed, fields=selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing container summaries: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return ContainerSummaryListResponse(status="success", data=data)
+
+
 @router.post("/containers", response_model=ContainerCreateResponse)
 def create_new_container(container: ContainerCreate):
     from hiveden.docker.containers import create_container
@@ -72,26 +105,219 @@ def create_new_container(container: ContainerCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/containers/bulk", response_model=JobInfo, status_code=202)
+async def bulk_container_action(request: ContainerBulkRequest):
+    """Start, stop, restart or remove containers in dependency order.
+
+    Targets are the named containers, the hiveden-managed ones, or all of
+    them. Progress for each container is reported through the returned job.
+    """
+    from hiveden.docker.bulk import BULK_ACTIONS, summarize
+    from hiveden.docker.containers import DockerManager
+
+    if request.action not in BULK_ACTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown action '{request.action}', expected one of {', '.join(BULK_ACTIONS)}",
+        )
+
+    docker_manager = DockerManager()
+    containers = await asyncio.to_thread(
+        docker_manager.list_container_summaries,
+        all=True,
+        only_managed=request.only_managed,
+        fields=["Id", "Name", "State", "Labels"],
+    )
+    if request.names:
+        by_name = {c.Name: c for c in containers}
+        missing = [n for n in request.names if n not in by_name]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Containers not found: {', '.join(missing)}")
+        containers = [by_name[n] for n in request.names]
+    if not containers:
+        raise HTTPException(status_code=400, detail="No containers selected")
+
+    job_manager = JobManager()
+    job_id = job_manager.create_external_job(f"docker.bulk:{request.action}")
+
+    async def worker(current_job_id: str, manager: JobManager):
+        await manager.log(current_job_id, f"Running {request.action} on {len(containers)} container(s)")
+        results = await asyncio.to_thread(
+            docker_manager.bulk_action,
+            request.action,
+            containers,
+            max_workers=request.max_workers,
+            timeout=request.timeout,
+            progress=manager.threadsafe_logger(current_job_id),
+        )
+        summary = summarize(results)
+        LogService().info(
+            actor="user",
+            action=f"container.bulk_{request.action}",
+            message=f"Bulk {request.action}: {len(summary['done'])} done, "
+                    f"{len(summary['failed'])} failed, {len(summary['skipped'])} skipped",
+            module="docker",
+            metadata={"job_id": current_job_id, "results": results},
+        )
+        if summary["failed"] or summary["skipped"]:
+            raise RuntimeError(
+                f"Failed: {', '.join(summary['failed']) or '-'}; "
+                f"skipped: {', '.join(summary['skipped']) or '-'}"
+            )
+        await manager.log(current_job_id, f"{request.action} completed for all containers")
+
+    asyncio.create_task(job_manager.run_external_job(job_id, worker))
+    return JobInfo(job_id=job_id, message=f"Bulk {request.action} started")
+
+
+def _stats_sampler():
+    from hiveden.docker.stats import current_stats_sampler
+
+    sampler = current_stats_sampler()
+    if sampler is None:
+        raise HTTPException(status_code=503, detail="Container stats sampler is not running")
+    return sampler
+
+
+@router.get("/containers/stats/top", response_model=ContainerStatsTopResponse)
+def get_top_container_stats(
+    by: str = Query("cpu_percent", description="Stat to rank by, e.g. cpu_percent or memory_bytes"),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """Running containers using the most of a resource, with their latest sample."""
+    sampler = _stats_sampler()
+    try:
+        return ContainerStatsTopResponse(data=sampler.top(by=by, limit=limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _open_log_stream(names, label, app_id, since, until, tail, follow):
+    """Resolve the selected containers and start their merged log stream.
+
+    Raises:
+        HTTPException: 400 for invalid selectors or times, 404 if nothing matches.
+    """
+    from hiveden.docker.aio import AsyncDockerManager
+    from hiveden.docker.logs import multiplex_logs, parse_log_time, resolve_log_targets
+
+    manager = AsyncDockerManager()
+    try:
+        since_ts, until_ts = parse_log_time(since), parse_log_time(until)
+        containers = await resolve_log_targets(manager, names=names, labels=label, app_id=app_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not containers:
+        raise HTTPException(status_code=404, detail="No containers match the selection")
+    return containers, multiplex_logs(
+        containers, manager, follow=follow, tail=tail, since=since_ts, until=until_ts
+    )
+
+
+@router.get("/containers/logs")
+async def stream_merged_container_logs(
+    names: Optional[List[str]] = Query(None, description="Container names"),
+    label: Optional[List[str]] = Query(None, description="Label filters: key or key=value"),
+    app_id: Optional[str] = Query(None, description="Appstore app whose containers to tail"),
+    since: Optional[str] = Query(None, description="UNIX seconds, RFC 3339 or a duration like 15m"),
+    until: Optional[str] = Query(None, description="UNIX seconds, RFC 3339 or a duration like 15m"),
+    tail: Optional[int] = Query(100, ge=0),
+    follow: bool = True,
+):
+    """Stream the logs of several containers, merged by timestamp, as Server-Sent Events.
+
+    Each event carries a JSON frame with a batch of ``lines`` (container,
+    stream, timestamp, message) and, when the client falls behind, the
+    number of ``dropped`` lines per container.
+    """
+    containers, frames = await _open_log_stream(names, label, app_id, since, until, tail, follow)
+
+    async def event_generator():
+        try:
+            yield f"event: containers\ndata: {json.dumps(containers)}\n\n"
+            async for frame in frames:
+                yield f"data: {json.dumps(frame)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming logs of {containers}: {e}\n{traceback.format_exc()}")
+            yield f"data: Error: {str(e)}\n\n"
+        finally:
+            await frames.aclose()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.websocket("/containers/logs/ws")
+async def websocket_merged_container_logs(
+    websocket: WebSocket,
+    names: Optional[List[str]] = Query(None),
+    label: Optional[List[str]] = Query(None),
+    app_id: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    tail: Optional[int] = 100,
+    follow: bool = True,
+):
+    """WebSocket variant of ``GET /containers/logs``.
+
+    Sends ``{"type": "containers", "data": [...]}`` first, then one
+    ``{"type": "logs", "data": frame}`` message per batch.
+    """
+    await websocket.accept()
+    frames = None
+    try:
+        try:
+            containers, frames = await _open_log_stream(names, label, app_id, since, until, tail, follow)
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "message": e.detail})
+            return
+        await websocket.send_json({"type": "containers", "data": containers})
+        async for frame in frames:
+            await websocket.send_json({"type": "logs", "data": frame})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error streaming container logs over WebSocket: {e}\n{traceback.format_exc()}")
+        try:
+            await websocket.send_json({"type": "error", "message": str(e)})
+        except Exception:
+            pass
+    finally:
+        if frames is not None:
+            await frames.aclose()
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
 @router.get("/containers/{container_id}", response_model=ContainerResponse)
-def get_one_container(container_id: str):
-    from hiveden.docker.containers import get_container
+async def get_one_container(container_id: str):
+    from hiveden.docker.aio import AsyncDockerManager
     try:
-        return ContainerResponse(data=get_container(container_id))
+        return ContainerResponse(data=await AsyncDockerManager().get_container(container_id))
     except Exception as e:
         logger.error(f"Error getting container {container_id}: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/containers/{container_id}/start", response_model=ContainerResponse)
-def start_one_container(container_id: str):
-    from hiveden.docker.containers import start_container
+async def start_one_container(container_id: str):
+    from hiveden.docker.aio import AsyncDockerManager
     try:
-        container = start_container(container_id)
+        container = await AsyncDockerManager().start_container(container_id)
         
         LogService().info(
             actor="user",
             action="container.start",
-            message=f"Started container {container.name}",
+            message=f"Started container {container.Name}",
             module="docker",
             metadata={
                 "container_id": container_id,
@@ -100,17 +326,17 @@ def start_one_container(container_id: str):
             }
         )
 
-        return ContainerResponse(data=container.dict())
+        return ContainerResponse(data=container)
     except Exception as e:
         logger.error(f"Error starting container {container_id}: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/containers/{container_id}/stop", response_model=ContainerResponse)
-def stop_one_container(container_id: str):
-    from hiveden.docker.containers import stop_container
+async def stop_one_container(container_id: str, timeout: Optional[int] = Query(None, ge=0)):
+    from hiveden.docker.aio import AsyncDockerManager
     try:
-        container = stop_container(container_id)
+        container = await AsyncDockerManager().stop_container(container_id, timeout=timeout)
         
         LogService().info(
             actor="user",
@@ -131,10 +357,12 @@ def stop_one_container(container_id: str):
 
 
 @router.post("/containers/{container_id}/restart", response_model=ContainerResponse)
-def restart_one_container(container_id: str):
-    from hiveden.docker.containers import restart_container
+async def restart_one_container(container_id: str, timeout: Optional[int] = Query(None, ge=0)):
+    from hiveden.docker.aio import AsyncDockerManager
     try:
-        return ContainerResponse(data=restart_container(container_id))
+        return ContainerResponse(
+            data=await AsyncDockerManager().restart_container(container_id, timeout=timeout)
+        )
     except Exception as e:
         logger.error(f"Error restarting container {container_id}: {e}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -152,12 +380,19 @@ def get_container_configuration(container_id: str):
 
 
 @router.put("/containers/{container_id}", response_model=ContainerCreateResponse)
-def update_container_configuration(container_id: str, container: ContainerCreate):
+def update_container_configuration(
+    container_id: str,
+    container: ContainerCreate,
+    zero_downtime: bool = Query(
+        False,
+        description="Start the replacement next to the running container and switch once it is ready.",
+    ),
+):
     from hiveden.docker.containers import get_container, update_container
 
     try:
         # 1. Update Docker
-        c = update_container(container_id, container)
+        c = update_container(container_id, container, zero_downtime=zero_downtime)
 
         # Return new container info
         docker_response = get_container(c.id)
@@ -220,7 +455,7 @@ def remove_one_container(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/containers/{container_id}/logs")
-def stream_container_logs(
+async def stream_container_logs(
     container_id: str,
     follow: Optional[bool] = True,
     tail: Optional[int] = 100
@@ -233,12 +468,12 @@ def stream_container_logs(
     Returns:
         StreamingResponse with text/event-stream content type
     """
-    from hiveden.docker.containers import DockerManager
+    from hiveden.docker.aio import AsyncDockerManager
 
-    def event_generator():
+    async def event_generator():
         try:
-            manager = DockerManager()
-            for log_line in manager.stream_logs(container_id, follow=follow, tail=tail):
+            manager = AsyncDockerManager()
+            async for log_line in manager.stream_logs(container_id, follow=follow, tail=tail):
                 # Format as Server-Sent Event
                 yield f"data: {log_line}\n\n"
         except Exception as e:
@@ -256,6 +491,61 @@ def stream_container_logs(
     )
 
 
+@router.get("/containers/{container_id}/stats", response_model=ContainerStatsResponse)
+def get_container_stats(
+    container_id: str,
+    tier: str = Query("1s", description="Sample resolution: 1s, 1m or 1h"),
+    limit: Optional[int] = Query(None, ge=1, description="Return only the most recent samples"),
+):
+    """Resource usage history of a running container from the stats sampler."""
+    sampler = _stats_sampler()
+    full_id = sampler.resolve(container_id)
+    if full_id is None:
+        raise HTTPException(status_code=404, detail=f"No stats for container {container_id}")
+    try:
+        samples = sampler.history(full_id, tier=tier, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ContainerStatsResponse(
+        data=ContainerStats(Id=full_id, Name=sampler.name(full_id), tier=tier, samples=samples)
+    )
+
+
+@router.get("/containers/{container_id}/stats/stream")
+async def stream_container_stats(container_id: str):
+    """Stream a container's latest stats sample each second as Server-Sent Events.
+
+    Clients only read what the sampler already collected, so any number of
+    them can watch without extra work on the Docker host.
+    """
+    sampler = _stats_sampler()
+    full_id = sampler.resolve(container_id)
+    if full_id is None:
+        raise HTTPException(status_code=404, detail=f"No stats for container {container_id}")
+
+    async def event_generator():
+        last = None
+        while sampler.running:
+            sample = sampler.latest(full_id)
+            if sample is None and last is not None:
+                # The container stopped.
+                return
+            if sample is not None and sample["timestamp"] != last:
+                last = sample["timestamp"]
+                yield f"data: {json.dumps(sample)}\n\n"
+            await asyncio.sleep(sampler.interval)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.get("/networks", response_model=NetworkListResponse)
 def list_all_networks():
     from hiveden.docker.networks import list_networks
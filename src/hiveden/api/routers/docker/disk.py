@@ -0,0 +1,88 @@
+import asyncio
+import traceback
+from typing import Optional
+
+from docker.errors import APIError
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.logger import logger
+
+from hiveden.api.dtos import DiskPruneRequest, DiskUsageResponse, JobInfo, ReclaimPlanResponse
+from hiveden.docker.disk_usage import get_disk_usage_service, plan_reclaim, prune
+from hiveden.jobs.manager import JobManager
+
+router = APIRouter(tags=["Docker Disk Usage"])
+
+
+def _snapshot(max_age: Optional[float] = None):
+    try:
+        return get_disk_usage_service().snapshot(max_age=max_age)
+    except APIError as e:
+        logger.error(f"Error computing docker disk usage: {e}\n{traceback.format_exc()}")
+        raise HTTPException(status_code=503, detail=f"Docker disk usage is not available: {e}")
+
+
+@router.get("/disk-usage", response_model=DiskUsageResponse)
+def get_disk_usage(
+    max_age: Optional[float] = Query(
+        None,
+        ge=0,
+        description="Recompute when the cached snapshot is older than this many seconds.",
+    ),
+):
+    """Get space used by images, containers, volumes and build cache."""
+    return DiskUsageResponse(data=_snapshot(max_age))
+
+
+@router.get("/disk-usage/plan", response_model=ReclaimPlanResponse)
+def get_reclaim_plan(
+    images: bool = Query(True, description="Include images no container uses."),
+    volumes: bool = Query(True, description="Include volumes no container references."),
+    dangling_images_only: bool = Query(False, description="Only untagged images."),
+    named_volumes: bool = Query(False, description="Also named volumes, not only anonymous ones."),
+    min_bytes: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """Rank unused images and volumes by the space removing them frees."""
+    plan = plan_reclaim(
+        _snapshot(),
+        images=images,
+        volumes=volumes,
+        dangling_images_only=dangling_images_only,
+        named_volumes=named_volumes,
+        min_bytes=min_bytes,
+        limit=limit,
+    )
+    return ReclaimPlanResponse(data=plan)
+
+
+@router.post("/disk-usage/prune", response_model=JobInfo, status_code=202)
+async def prune_disk_usage(request: DiskPruneRequest):
+    """Remove the given images and volumes, or the default reclaim plan, as a job."""
+    service = get_disk_usage_service()
+    if request.items is None:
+        # Plan against fresh data so nothing started using an item meanwhile;
+        # when it cannot be computed, nothing is removed (503).
+        snapshot = await asyncio.to_thread(_snapshot, 0)
+        items = plan_reclaim(snapshot)["items"]
+    else:
+        items = [item.model_dump() for item in request.items]
+
+    job_manager = JobManager()
+    job_id = job_manager.create_external_job(f"docker.disk.prune:{len(items)} item(s)")
+
+    async def worker(current_job_id: str, manager: JobManager):
+        try:
+            result = await asyncio.to_thread(
+                prune, service.client, items, manager.threadsafe_logger(current_job_id)
+            )
+        finally:
+            service.invalidate()
+        await manager.log(
+            current_job_id,
+            f"Removed {len(result['removed'])} item(s), freed {result['bytes']} bytes",
+        )
+        if result["failed"]:
+            raise RuntimeError(f"Failed to remove: {', '.join(result['failed'])}")
+
+    asyncio.create_task(job_manager.run_external_job(job_id, worker))
+    return JobInfo(job_id=job_id, message=f"Pruning {len(items)} item(s)")
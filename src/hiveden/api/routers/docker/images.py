@@ -1,3 +1,4 @@
+import asyncio
 import traceback
 from fastapi import APIRouter, HTTPException
 from fastapi.logger import logger
@@ -11,10 +12,13 @@ from hiveden.api.dtos import (
     ImageLayerListResponse,
     DockerImage,
     ImageLayer,
-    ImageContainerInfo
+    ImageContainerInfo,
+    ImagePullRequest,
+    JobInfo,
 )
-from hiveden.docker.images import DockerImageManager
+from hiveden.docker.images import DockerImageManager, get_image_pull_service
 from hiveden.docker.containers import DockerManager
+from hiveden.jobs.manager import JobManager
 
 router = APIRouter(tags=["Docker Images"])
 
@@ -50,6 +54,27 @@ def delete_image(image_id: str):
             content=ErrorResponse(message=str(e)).model_dump()
         )
 
+@router.post("/images/pull", response_model=JobInfo, status_code=202)
+async def pull_images(request: ImagePullRequest):
+    """Pull images in parallel, streaming per-layer progress into a job."""
+    job_manager = JobManager()
+    job_id = job_manager.create_external_job(f"docker.images.pull:{','.join(request.images)}")
+
+    async def worker(current_job_id: str, manager: JobManager):
+        results = await asyncio.to_thread(
+            get_image_pull_service().pull_many,
+            request.images,
+            progress=manager.threadsafe_logger(current_job_id),
+            only_missing=request.only_missing,
+        )
+        failed = [image for image, error in results.items() if error]
+        if failed:
+            raise RuntimeError(f"Failed to pull: {', '.join(failed)}")
+        await manager.log(current_job_id, f"Pulled {len(results)} image(s)")
+
+    asyncio.create_task(job_manager.run_external_job(job_id, worker))
+    return JobInfo(job_id=job_id, message="Image pull started")
+
 @router.get("/images", response_model=ImageListResponse)
 def list_images():
     """List all Docker images."""
@@ -59,7 +84,9 @@ def list_images():
         
         # Fetch all containers to map them to images
         container_manager = DockerManager()
-        containers = container_manager.list_containers(all=True)
+        containers = container_manager.list_container_summaries(
+            all=True, fields=["Id", "Name", "ImageID"]
+        )
         
         # Create a map: ImageID -> List[ImageContainerInfo]
         image_container_map = {}
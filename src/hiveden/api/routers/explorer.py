@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, status
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from typing import List, Optional
+import asyncio
+import json
 import os
 from datetime import datetime
 import logging
@@ -9,6 +11,10 @@ from hiveden.explorer.models import (
     DirectoryListingResponse,
     FileEntry,
     FilePropertyResponse,
+    FileType,
+    FilenameIndexStatusResponse,
+    ListingCacheStatsResponse,
+    SearchResultsPage,
     CreateDirectoryRequest,
     DeleteRequest,
     DeleteResponse,
@@ -30,8 +36,11 @@ from hiveden.explorer.models import (
     OperationStatus,
     OperationType
 )
+from hiveden.explorer.cache import get_listing_cache
+from hiveden.explorer.index import current_filename_indexer, get_filename_indexer
 from hiveden.explorer.manager import ExplorerManager
 from hiveden.explorer.operations import ExplorerService
+from hiveden.explorer.search import SEARCH_PAGE_SIZE, get_search_run
 from hiveden.explorer.tasks import perform_search, perform_paste
 
 router = APIRouter(
@@ -41,6 +50,9 @@ router = APIRouter(
 
 logger = logging.getLogger(__name__)
 
+# How long deleting a running search waits for it to stop storing results.
+SEARCH_CANCEL_TIMEOUT = 10.0
+
 # In-memory clipboard store
 # { session_id: { operation: "copy"|"cut", paths: [], timestamp: datetime } }
 clipboard_store = {}
@@ -55,30 +67,109 @@ def get_service():
 
 # --- Navigation ---
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 5000
+# Entries serialized per chunk of a streamed listing.
+STREAM_BATCH_SIZE = 200
+
 @router.get("/list", response_model=DirectoryListingResponse)
 def list_directory(
     path: str,
     show_hidden: bool = False,
     sort_by: SortBy = SortBy.NAME,
-    sort_order: SortOrder = SortOrder.ASC
+    sort_order: SortOrder = SortOrder.ASC,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all entries when omitted."),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page."),
+    restat: bool = Query(False, description="Re-read the stats of the returned entries instead of using cached ones."),
 ):
+    """List a directory, optionally one page at a time.
+
+    With ``limit``, entries come in pages of that size; pass the returned
+    ``next_cursor`` (with the same sort) to get the following page. It is
+    null on the last page. Totals always cover the whole directory.
+
+    Listings of unchanged directories are served from a cache; see
+    ``GET /explorer/listing-cache``.
+    """
     service = get_service()
     try:
-        entries, count, total_size = service.list_directory(path, show_hidden, sort_by, sort_order)
+        next_cursor = None
+        if limit is None and cursor is None:
+            entries, count, total_size = service.list_directory(path, show_hidden, sort_by, sort_order, restat)
+        else:
+            entries, count, total_size, next_cursor = service.list_directory_page(
+                path, show_hidden, sort_by, sort_order, limit or DEFAULT_PAGE_SIZE, cursor, restat
+            )
         return DirectoryListingResponse(
             current_path=path,
             parent_path=os.path.dirname(path),
             entries=entries,
             total_entries=count,
             total_size=total_size,
-            total_size_human=service._human_readable_size(total_size)
+            total_size_human=service._human_readable_size(total_size),
+            next_cursor=next_cursor,
         )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error listing directory: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/list/stream")
+def stream_directory(path: str, show_hidden: bool = False):
+    """Stream a directory listing as NDJSON, in directory (unsorted) order.
+
+    Entries are sent as they are read, one ``{"entry": {...}}`` object per
+    line, followed by a ``{"summary": {"total_entries", "total_size",
+    "total_size_human"}}`` line, or an ``{"error": "..."}`` line if reading
+    fails midway.
+    """
+    service = get_service()
+    try:
+        entries = service.iter_directory(path, show_hidden)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing directory: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    def lines():
+        count = total_size = 0
+        batch = []
+        try:
+            for entry in entries:
+                count += 1
+                if entry.type != FileType.DIRECTORY:
+                    total_size += entry.size
+                batch.append(f'{{"entry":{entry.model_dump_json()}}}\n')
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    yield "".join(batch)
+                    batch = []
+        except Exception as e:
+            logger.error(f"Error streaming directory {path}: {e}")
+            yield "".join(batch) + json.dumps({"error": str(e)}) + "\n"
+            return
+        summary = {
+            "total_entries": count,
+            "total_size": total_size,
+            "total_size_human": service._human_readable_size(total_size),
+        }
+        yield "".join(batch) + json.dumps({"summary": summary}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/listing-cache", response_model=ListingCacheStatsResponse)
+def get_listing_cache_stats():
+    """Hit/miss counts and memory use of the directory listing cache."""
+    return ListingCacheStatsResponse(data=get_listing_cache().stats())
+
+@router.delete("/listing-cache", response_model=GenericResponse)
+def clear_listing_cache():
+    get_listing_cache().invalidate()
+    return GenericResponse(message="Listing cache cleared")
+
 @router.post("/navigate", response_model=DirectoryListingResponse)
 def navigate(
     body: dict, # Hack to allow flexible body or define model. 
@@ -89,7 +180,7 @@ def navigate(
         raise HTTPException(status_code=400, detail="Path required")
     show_hidden = body.get("show_hidden", False)
     
-    return list_directory(path, show_hidden=show_hidden)
+    return list_directory(path, show_hidden=show_hidden, limit=None, cursor=None, restat=False)
 
 @router.get("/properties", response_model=FilePropertyResponse)
 def get_properties(path: str):
@@ -302,6 +393,7 @@ def list_bookmarks():
 def create_bookmark(req: LocationCreateRequest):
     manager = get_manager()
     loc = manager.create_location(req.label, req.path, req.type, req.description)
+    _reindex_locations()
     return {"success": True, "message": "Bookmark created successfully", "bookmark": loc}
 
 @router.put("/bookmarks/{bookmark_id}")
@@ -310,6 +402,7 @@ def update_bookmark(bookmark_id: int, req: LocationUpdateRequest):
     loc = manager.update_location(bookmark_id, req.label, req.path, req.description)
     if not loc:
         raise HTTPException(status_code=404, detail="Bookmark not found")
+    _reindex_locations()
     return {"success": True, "message": "Bookmark updated successfully", "bookmark": loc}
 
 @router.delete("/bookmarks/{bookmark_id}")
@@ -319,8 +412,15 @@ def delete_bookmark(bookmark_id: int):
         manager.delete_location(bookmark_id)
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
+    _reindex_locations()
     return {"success": True, "message": "Bookmark deleted successfully"}
 
+def _reindex_locations():
+    # Locations are the roots of the filename index.
+    indexer = current_filename_indexer()
+    if indexer is not None:
+        indexer.request_reconcile()
+
 # --- USB ---
 
 @router.get("/usb-devices")
@@ -346,7 +446,9 @@ def search_files(req: SearchRequest, background_tasks: BackgroundTasks):
         req.use_regex,
         req.case_sensitive,
         req.type_filter,
-        req.show_hidden
+        req.show_hidden,
+        req.max_results,
+        req.follow_symlinks,
     )
     
     return {
@@ -357,6 +459,111 @@ def search_files(req: SearchRequest, background_tasks: BackgroundTasks):
         "status": "pending"
     }
 
+def _search_operation(operation_id: str) -> ExplorerOperation:
+    op = get_manager().get_operation(operation_id)
+    if not op or op.operation_type != OperationType.SEARCH:
+        raise HTTPException(status_code=404, detail="Search not found")
+    return op
+
+def _search_summary(op: ExplorerOperation) -> dict:
+    if isinstance(op.result, str):
+        return json.loads(op.result)
+    return op.result or {}
+
+@router.get("/search/{operation_id}/results", response_model=SearchResultsPage)
+def get_search_results(operation_id: str, page: int = Query(0, ge=0)):
+    """One page of a search's matches, also while the search runs."""
+    op = _search_operation(operation_id)
+    run = get_search_run(operation_id)
+    if run is not None:
+        matches = run.page(page) or []
+        total, pages, page_size = run.total, run.pages, run.page_size
+    else:
+        summary = _search_summary(op)
+        matches = get_manager().get_search_page(operation_id, page) or []
+        total = summary.get("total_matches", 0)
+        pages = summary.get("pages", 0)
+        page_size = summary.get("page_size", SEARCH_PAGE_SIZE)
+    return SearchResultsPage(
+        operation_id=operation_id,
+        status=op.status,
+        page=page,
+        page_size=page_size,
+        pages=pages,
+        total_matches=total,
+        matches=matches,
+    )
+
+@router.get("/search/{operation_id}/stream")
+async def stream_search_results(operation_id: str):
+    """Server-Sent Events with each match of a search as it is found.
+
+    Matches found before subscribing are sent first. A final ``done``
+    event carries the status and summary of the search.
+    """
+    _search_operation(operation_id)
+    manager = get_manager()
+
+    async def event_generator():
+        run = get_search_run(operation_id)
+        if run is not None:
+            sent = 0
+            while True:
+                matches, finished = await asyncio.to_thread(run.read, sent, 15.0)
+                for match in matches:
+                    yield f"data: {json.dumps(match)}\n\n"
+                sent += len(matches)
+                if finished:
+                    break
+                if not matches:
+                    yield ": keep-alive\n\n"
+        op = await asyncio.to_thread(manager.get_operation, operation_id)
+        summary = _search_summary(op) if op else {}
+        if run is None:
+            # Finished before subscribing: replay the stored pages.
+            for page in range(summary.get("pages", 0)):
+                matches = await asyncio.to_thread(manager.get_search_page, operation_id, page)
+                for match in matches or []:
+                    yield f"data: {json.dumps(match)}\n\n"
+        done = {"status": op.status if op else None, **summary}
+        yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@router.post("/search/{operation_id}/cancel", status_code=202)
+def cancel_search(operation_id: str):
+    run = get_search_run(operation_id)
+    if run is None:
+        _search_operation(operation_id)
+        raise HTTPException(status_code=409, detail="Search is not running")
+    run.cancel.set()
+    return {"success": True, "message": "Search cancellation requested"}
+
+@router.get("/index", response_model=FilenameIndexStatusResponse)
+def get_index_status():
+    """Roots, size and freshness of the filename index used by search."""
+    indexer = get_filename_indexer()
+    if indexer is None:
+        return FilenameIndexStatusResponse(enabled=False)
+    return FilenameIndexStatusResponse(enabled=True, data=indexer.status())
+
+@router.post("/index/reconcile", status_code=202)
+def reconcile_index():
+    """Re-crawl the filesystem locations into the filename index."""
+    indexer = current_filename_indexer()
+    if indexer is None:
+        raise HTTPException(status_code=409, detail="Filename index is not running")
+    indexer.request_reconcile()
+    return {"success": True, "message": "Index reconciliation requested"}
+
 # --- Operations ---
 
 @router.get("/operations/{operation_id}", response_model=OperationResponse)
@@ -398,9 +605,13 @@ def list_operations(
 @router.delete("/operations/{operation_id}")
 def delete_operation(operation_id: str):
     manager = get_manager()
-    # If in progress, should cancel task? 
-    # Cancelling background tasks in FastAPI/Python threads is hard without specific mechanism.
-    # For now just deleting record.
+    # Running searches stop first: deleting the operation also deletes its
+    # stored pages, and pages saved afterwards would fail.
+    run = get_search_run(operation_id)
+    if run is not None:
+        run.cancel.set()
+        if not run.wait(SEARCH_CANCEL_TIMEOUT):
+            logger.warning(f"Search {operation_id} did not stop within {SEARCH_CANCEL_TIMEOUT:.0f}s")
     manager.delete_operation(operation_id)
     return {"success": True, "message": "Operation cancelled/deleted successfully"}
 
@@ -1,24 +1,42 @@
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Query
 
 from hiveden.api.dtos import LogListResponse
 from hiveden.db.session import get_db_manager
-from hiveden.db.repositories.logs import LogRepository
+from hiveden.db.repositories.logs import AsyncLogRepository
 
 router = APIRouter(prefix="/logs", tags=["Logs"])
 
 @router.get("", response_model=LogListResponse)
-def get_logs(
+async def get_logs(
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
     level: Optional[str] = None,
-    module: Optional[str] = None
+    module: Optional[str] = None,
+    before_id: Optional[int] = Query(None, ge=1),
+    before_ts: Optional[datetime] = None,
 ):
     """
     Retrieve system logs with optional filtering.
+
+    Deep pages are cheaper with the keyset cursor than with ``offset``: pass
+    the ``next_before_id``/``next_before_ts`` of the previous response as
+    ``before_id``/``before_ts`` to get the next (older) page.
     """
     db_manager = get_db_manager()
-    repo = LogRepository(db_manager)
+    repo = AsyncLogRepository(db_manager)
     
-    logs = repo.get_logs(limit=limit, offset=offset, level=level, module=module)
-    return LogListResponse(data=logs)
+    logs = await repo.get_logs(
+        limit=limit,
+        offset=offset,
+        level=level,
+        module=module,
+        before_id=before_id,
+        before_ts=before_ts,
+    )
+    response = LogListResponse(data=logs)
+    if len(logs) == limit:
+        response.next_before_id = logs[-1].id
+        response.next_before_ts = logs[-1].created_at
+    return response
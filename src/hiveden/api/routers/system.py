@@ -6,8 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 
 from hiveden.db.session import get_db_manager
-from hiveden.db.repositories.locations import LocationRepository
-from hiveden.db.repositories.core import ConfigRepository, ModuleRepository
+from hiveden.db.repositories.locations import AsyncLocationRepository, LocationRepository
 from hiveden.docker.containers import DockerManager
 from hiveden.config.settings import config
 from hiveden.config.utils.domain import get_system_domain_value
@@ -26,6 +25,7 @@ from hiveden.api.dtos import (
 )
 from hiveden.explorer.models import FilesystemLocation
 from hiveden.docker.models import IngressConfig
+from hiveden.services.config import ConfigService
 from hiveden.services.logs import LogService
 
 router = APIRouter(prefix="/system", tags=["System"])
@@ -163,32 +163,19 @@ def get_dns_config():
     """
     Get DNS configuration and Pi-hole status.
     """
-    db_manager = get_db_manager()
-    module_repo = ModuleRepository(db_manager)
-    config_repo = ConfigRepository(db_manager)
-
     # 1. Get Domain and API Key from DB
     dns_domain = None
     api_key = None
     try:
-        core_module = module_repo.get_by_short_name('core')
-        if core_module:
-            # Get domain
-            cfg_domain = config_repo.get_by_module_and_key(core_module.id, 'dns.domain')
-            if cfg_domain:
-                dns_domain = cfg_domain['value']
-
-            # Get API Key
-            cfg_key = config_repo.get_by_module_and_key(core_module.id, 'dns.api_key')
-            if cfg_key:
-                api_key = cfg_key['value']
-
+        config_service = ConfigService()
+        dns_domain = config_service.get('dns.domain')
+        api_key = config_service.get('dns.api_key')
     except Exception as e:
         logger.warning(f"Failed to fetch DNS config from DB: {e}")
 
     # 2. Check for Pi-hole Container
     docker_manager = DockerManager()
-    containers = docker_manager.list_containers(all=False) # Only running containers
+    containers = docker_manager.list_container_summaries(all=False, fields=["Id", "Image"]) # Only running containers
 
     pihole_enabled = False
     container_id = None
@@ -212,11 +199,8 @@ def update_dns_config(req: DNSUpdateRequest):
     """
     Update DNS API key.
     """
-    db_manager = get_db_manager()
-    config_repo = ConfigRepository(db_manager)
-
     try:
-        config_repo.set_value('core', 'dns.api_key', req.api_key)
+        ConfigService().set('dns.api_key', req.api_key)
 
         LogService().info(
             actor="user",
@@ -248,9 +232,7 @@ def update_system_domain(req: DomainUpdateRequest):
     existing_domain = get_system_domain_value()
 
     # 1. Update DB
-    db_manager = get_db_manager()
-    config_repo = ConfigRepository(db_manager)
-    config_repo.set_value('core', 'domain', new_domain)
+    ConfigService().set('domain', new_domain)
 
     LogService().info(
         actor="user",
@@ -303,7 +285,7 @@ def update_system_domain(req: DomainUpdateRequest):
 
             # Update
             try:
-                docker_manager.update_container(c.Id, config_dict)
+                docker_manager.update_container(c.Id, config_dict, zero_downtime=req.zero_downtime)
                 updated_list.append(c.Name)
             except Exception as e:
                 logger.error(f"Failed to update container {c.Name}: {e}")
@@ -315,13 +297,13 @@ def update_system_domain(req: DomainUpdateRequest):
     )
 
 @router.get("/locations", response_model=LocationListResponse)
-def get_system_locations():
+async def get_system_locations():
     """
     Retrieve all system locations (system_root).
     """
     db_manager = get_db_manager()
-    repo = LocationRepository(db_manager)
-    locations = repo.get_system_locations()
+    repo = AsyncLocationRepository(db_manager)
+    locations = await repo.get_system_locations()
     return LocationListResponse(data=locations)
 
 def perform_location_update(key: str, new_path: str, old_path: str):
@@ -483,6 +465,7 @@ def update_system_location(key: str, req: UpdateLocationRequest, background_task
 
     # Update DB immediately to reflect intent
     repo.update(location.id, path=new_path)
+    ConfigService().invalidate(f"filesystem_locations:{key}")
 
     LogService().info(
         actor="user",
@@ -20,7 +20,9 @@ from hiveden.api.routers import (
     systemd,
     database,
 )
+from hiveden.api.middleware import query_metrics_middleware
 from hiveden.db.session import get_db_manager
+from hiveden.services.logs import stop_log_writer
 
 app = FastAPI(
     title="Hiveden API",
@@ -40,6 +42,50 @@ def startup_db():
     except Exception as e:
         print(f"Failed to start backup scheduler: {e}")
 
+    # Follow Docker events so container listings are served from memory
+    try:
+        from hiveden.docker.inventory import get_container_inventory
+        inventory = get_container_inventory()
+        if inventory is not None:
+            inventory.start()
+    except Exception as e:
+        print(f"Failed to start Docker inventory: {e}")
+
+    # Sample container resource usage from cgroups
+    try:
+        from hiveden.docker.stats import get_container_stats_sampler
+        sampler = get_container_stats_sampler()
+        if sampler is not None:
+            sampler.start()
+    except Exception as e:
+        print(f"Failed to start container stats sampler: {e}")
+
+    # Index file names under the filesystem locations for explorer search
+    try:
+        from hiveden.explorer.index import get_filename_indexer
+        indexer = get_filename_indexer()
+        if indexer is not None:
+            indexer.start()
+    except Exception as e:
+        print(f"Failed to start explorer filename index: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_db():
+    from hiveden.docker.inventory import stop_container_inventory
+    from hiveden.docker.stats import stop_container_stats_sampler
+    from hiveden.docker.client import close_docker_client
+    from hiveden.explorer.index import stop_filename_indexer
+    stop_container_inventory()
+    stop_container_stats_sampler()
+    stop_filename_indexer()
+    close_docker_client()
+    stop_log_writer()
+    await get_db_manager().aclose()
+
+# Count database queries per request and route
+app.middleware("http")(query_metrics_middleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
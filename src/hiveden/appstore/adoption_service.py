@@ -85,18 +85,22 @@ class AppAdoptionService:
                     resource_name=container.Name,
                 )
 
-        for container in resolved:
-            self.catalog.add_resource(
-                app_id=app_id,
-                resource_type="container",
-                resource_name=container.Name,
-                metadata={
-                    "external": True,
-                    "container_id": container.Id,
-                    "image": container.Image,
-                    "status": container.Status,
-                },
-            )
+        self.catalog.add_resources(
+            app_id,
+            [
+                {
+                    "resource_type": "container",
+                    "resource_name": container.Name,
+                    "metadata": {
+                        "external": True,
+                        "container_id": container.Id,
+                        "image": container.Image,
+                        "status": container.Status,
+                    },
+                }
+                for container in resolved
+            ],
+        )
 
         self.catalog.set_installation_status(
             app_id=app_id,
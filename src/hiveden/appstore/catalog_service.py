@@ -1,14 +1,23 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from psycopg2.extras import Json
 
 from hiveden.appstore.models import AppCatalogEntry, CatalogSyncResult
+from hiveden.db import aio
+from hiveden.db.repositories.base import BaseRepository
 from hiveden.db.session import get_db_manager
 
 
 CATALOG_RAW_BASE_URL = "https://raw.githubusercontent.com/hivedenos/hivedenos-apps/main"
 
+_GET_APP_QUERY = """
+    SELECT c.*, i.status AS install_status
+    FROM app_catalog_entries c
+    LEFT JOIN app_installations i ON i.app_id = c.app_id
+    WHERE c.app_id = %s
+"""
+
 
 class AppCatalogService:
     def __init__(self):
@@ -18,64 +27,19 @@ class AppCatalogService:
         if not apps:
             return CatalogSyncResult(total=0, upserted=0)
 
-        conn = self.db.get_connection()
-        upserted = 0
-        try:
-            cursor = conn.cursor()
-            for app in apps:
-                entry = self._normalize_app_entry(app)
-                cursor.execute(
-                    """
-                    INSERT INTO app_catalog_entries (
-                        app_id, title, version, tagline, description, category, icon,
-                        developer, website, repo, support, dependencies_apps,
-                        dependencies_system_packages, manifest_url, compose_url,
-                        compose_sha256, repository_path, icon_url, image_urls,
-                        source, install, search, dependencies, source_updated_at,
-                        raw_manifest, updated_at
-                    ) VALUES (
-                        %(app_id)s, %(title)s, %(version)s, %(tagline)s, %(description)s, %(category)s, %(icon)s,
-                        %(developer)s, %(website)s, %(repo)s, %(support)s, %(dependencies_apps)s,
-                        %(dependencies_system_packages)s, %(manifest_url)s, %(compose_url)s,
-                        %(compose_sha256)s, %(repository_path)s, %(icon_url)s,
-                        %(image_urls)s, %(source)s, %(install)s, %(search)s,
-                        %(dependencies)s, %(source_updated_at)s, %(raw_manifest)s,
-                        CURRENT_TIMESTAMP
-                    )
-                    ON CONFLICT (app_id) DO UPDATE SET
-                        title = EXCLUDED.title,
-                        version = EXCLUDED.version,
-                        tagline = EXCLUDED.tagline,
-                        description = EXCLUDED.description,
-                        category = EXCLUDED.category,
-                        icon = EXCLUDED.icon,
-                        developer = EXCLUDED.developer,
-                        website = EXCLUDED.website,
-                        repo = EXCLUDED.repo,
-                        support = EXCLUDED.support,
-                        dependencies_apps = EXCLUDED.dependencies_apps,
-                        dependencies_system_packages = EXCLUDED.dependencies_system_packages,
-                        manifest_url = EXCLUDED.manifest_url,
-                        compose_url = EXCLUDED.compose_url,
-                        compose_sha256 = EXCLUDED.compose_sha256,
-                        repository_path = EXCLUDED.repository_path,
-                        icon_url = EXCLUDED.icon_url,
-                        image_urls = EXCLUDED.image_urls,
-                        source = EXCLUDED.source,
-                        install = EXCLUDED.install,
-                        search = EXCLUDED.search,
-                        dependencies = EXCLUDED.dependencies,
-                        source_updated_at = EXCLUDED.source_updated_at,
-                        raw_manifest = EXCLUDED.raw_manifest,
-                        updated_at = CURRENT_TIMESTAMP
-                    """,
-                    entry,
-                )
-                upserted += 1
-            conn.commit()
-            return CatalogSyncResult(total=len(apps), upserted=upserted)
-        finally:
-            conn.close()
+        # One multi-row upsert may not touch the same app twice; the last
+        # occurrence wins, as it did when rows were written one at a time.
+        entries = {}
+        for app in apps:
+            entry = self._normalize_app_entry(app)
+            entries[entry["app_id"]] = entry
+
+        rows = BaseRepository(self.db, "app_catalog_entries").upsert_many(
+            list(entries.values()),
+            conflict_columns=["app_id"],
+            touch_columns=["updated_at"],
+        )
+        return CatalogSyncResult(total=len(apps), upserted=len(rows))
 
     def list_apps(
         self,
@@ -85,63 +49,86 @@ class AppCatalogService:
         limit: int = 50,
         offset: int = 0,
     ) -> List[AppCatalogEntry]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
-            filters = []
-            params: List[Any] = []
-
-            if q:
-                like = f"%{q}%"
-                filters.append(
-                    "(c.app_id ILIKE %s OR c.title ILIKE %s OR COALESCE(c.tagline, '') ILIKE %s OR COALESCE(c.description, '') ILIKE %s OR COALESCE(c.developer, '') ILIKE %s)"
-                )
-                params.extend([like, like, like, like, like])
-            if category:
-                filters.append("c.category = %s")
-                params.append(category)
-            if installed is True:
-                filters.append("COALESCE(i.status, 'not_installed') = 'installed'")
-            elif installed is False:
-                filters.append("COALESCE(i.status, 'not_installed') <> 'installed'")
-
-            where = f"WHERE {' AND '.join(filters)}" if filters else ""
-            params.extend([limit, offset])
-            query = f"""
-                SELECT c.*, i.status AS install_status
-                FROM app_catalog_entries c
-                LEFT JOIN app_installations i ON i.app_id = c.app_id
-                {where}
-                ORDER BY c.title ASC
-                LIMIT %s OFFSET %s
-            """
-            cursor.execute(query, tuple(params))
+            cursor.execute(
+                *self._list_apps_query(q, category, installed, limit, offset)
+            )
             rows = cursor.fetchall()
             return [self._row_to_entry(dict(row)) for row in rows]
-        finally:
-            conn.close()
+
+    async def alist_apps(
+        self,
+        q: Optional[str] = None,
+        category: Optional[str] = None,
+        installed: Optional[bool] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[AppCatalogEntry]:
+        """Async variant of list_apps for use from async endpoints."""
+        async with self.db.aconnection() as conn:
+            cursor = await aio.execute(
+                conn, *self._list_apps_query(q, category, installed, limit, offset)
+            )
+            return [self._row_to_entry(dict(row)) for row in cursor.fetchall()]
 
     def get_app(self, app_id: str) -> Optional[AppCatalogEntry]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT c.*, i.status AS install_status
-                FROM app_catalog_entries c
-                LEFT JOIN app_installations i ON i.app_id = c.app_id
-                WHERE c.app_id = %s
-                """,
-                (app_id,),
-            )
+            cursor.execute(_GET_APP_QUERY, (app_id,))
+            row = cursor.fetchone()
+            return self._row_to_entry(dict(row)) if row else None
+
+    async def aget_app(self, app_id: str) -> Optional[AppCatalogEntry]:
+        """Async variant of get_app for use from async endpoints."""
+        async with self.db.aconnection() as conn:
+            cursor = await aio.execute(conn, _GET_APP_QUERY, (app_id,))
             row = cursor.fetchone()
             return self._row_to_entry(dict(row)) if row else None
-        finally:
-            conn.close()
 
     def list_installed_apps(self) -> List[AppCatalogEntry]:
         return self.list_apps(installed=True, limit=500, offset=0)
 
+    async def alist_installed_apps(self) -> List[AppCatalogEntry]:
+        return await self.alist_apps(installed=True, limit=500, offset=0)
+
+    def _list_apps_query(
+        self,
+        q: Optional[str],
+        category: Optional[str],
+        installed: Optional[bool],
+        limit: int,
+        offset: int,
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        filters = []
+        params: List[Any] = []
+
+        if q:
+            like = f"%{q}%"
+            filters.append(
+                "(c.app_id ILIKE %s OR c.title ILIKE %s OR COALESCE(c.tagline, '') ILIKE %s OR COALESCE(c.description, '') ILIKE %s OR COALESCE(c.developer, '') ILIKE %s)"
+            )
+            params.extend([like, like, like, like, like])
+        if category:
+            filters.append("c.category = %s")
+            params.append(category)
+        if installed is True:
+            filters.append("COALESCE(i.status, 'not_installed') = 'installed'")
+        elif installed is False:
+            filters.append("COALESCE(i.status, 'not_installed') <> 'installed'")
+
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        params.extend([limit, offset])
+        query = f"""
+            SELECT c.*, i.status AS install_status
+            FROM app_catalog_entries c
+            LEFT JOIN app_installations i ON i.app_id = c.app_id
+            {where}
+            ORDER BY c.title ASC
+            LIMIT %s OFFSET %s
+        """
+        return query, tuple(params)
+
     def set_installation_status(
         self,
         app_id: str,
@@ -149,8 +136,7 @@ class AppCatalogService:
         installed_version: Optional[str] = None,
         last_error: Optional[str] = None,
     ):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -166,20 +152,15 @@ class AppCatalogService:
                 (app_id, installed_version, status, last_error, status),
             )
             conn.commit()
-        finally:
-            conn.close()
 
     def list_resources(self, app_id: str) -> List[Dict[str, Any]]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM app_install_resources WHERE app_id = %s ORDER BY id DESC",
                 (app_id,),
             )
             return [dict(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
 
     def add_resource(
         self,
@@ -188,8 +169,7 @@ class AppCatalogService:
         resource_name: str,
         metadata: Optional[Dict[str, Any]] = None,
     ):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -199,23 +179,35 @@ class AppCatalogService:
                 (app_id, resource_type, resource_name, Json(metadata or {})),
             )
             conn.commit()
-        finally:
-            conn.close()
+
+    def add_resources(self, app_id: str, resources: List[Dict[str, Any]]):
+        """Record several resources of an app in one statement.
+
+        Each item holds ``resource_type``, ``resource_name`` and optionally
+        ``metadata``.
+        """
+        BaseRepository(self.db, "app_install_resources").create_many(
+            [
+                {
+                    "app_id": app_id,
+                    "resource_type": resource["resource_type"],
+                    "resource_name": resource["resource_name"],
+                    "metadata": Json(resource.get("metadata") or {}),
+                }
+                for resource in resources
+            ]
+        )
 
     def delete_resources(self, app_id: str):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM app_install_resources WHERE app_id = %s", (app_id,)
             )
             conn.commit()
-        finally:
-            conn.close()
 
     def delete_resource(self, app_id: str, resource_type: str, resource_name: str):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -225,12 +217,9 @@ class AppCatalogService:
                 (app_id, resource_type, resource_name),
             )
             conn.commit()
-        finally:
-            conn.close()
 
     def delete_resources_by_type(self, app_id: str, resource_type: str):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -240,16 +229,13 @@ class AppCatalogService:
                 (app_id, resource_type),
             )
             conn.commit()
-        finally:
-            conn.close()
 
     def list_container_resource_owners(
         self,
         container_name: str,
         exclude_app_id: Optional[str] = None,
     ) -> List[str]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             params: List[Any] = [container_name]
             exclusion = ""
@@ -271,8 +257,6 @@ class AppCatalogService:
             )
             rows = cursor.fetchall()
             return [row["app_id"] for row in rows if row.get("app_id")]
-        finally:
-            conn.close()
 
     def _row_to_entry(self, row: Dict[str, Any]) -> AppCatalogEntry:
         install_status = row.get("install_status") or "not_installed"
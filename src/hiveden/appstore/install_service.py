@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 from typing import Any, Dict, Optional
 from urllib.request import Request, urlopen
@@ -46,6 +47,8 @@ class AppInstallService:
             )
             translated = self._sort_services_by_dependencies(translated)
 
+            await self._pull_images(job_id, job_manager, translated)
+
             await job_manager.log(job_id, f"Installing {len(translated)} service(s)")
             for service in translated:
                 await job_manager.log(
@@ -64,19 +67,22 @@ class AppInstallService:
                     labels=service["labels"],
                     privileged=service["privileged"],
                 )
-                self.catalog.add_resource(
-                    app_id=app_id,
-                    resource_type="container",
-                    resource_name=container.name,
-                    metadata={"image": service["image"]},
+                resources = [
+                    {
+                        "resource_type": "container",
+                        "resource_name": container.name,
+                        "metadata": {"image": service["image"]},
+                    }
+                ]
+                resources.extend(
+                    {
+                        "resource_type": "directory",
+                        "resource_name": app_dir,
+                        "metadata": {"service": service["name"]},
+                    }
+                    for app_dir in service["app_directories"]
                 )
-                for app_dir in service["app_directories"]:
-                    self.catalog.add_resource(
-                        app_id=app_id,
-                        resource_type="directory",
-                        resource_name=app_dir,
-                        metadata={"service": service["name"]},
-                    )
+                self.catalog.add_resources(app_id, resources)
 
             self.catalog.set_installation_status(
                 app_id,
@@ -127,6 +133,22 @@ class AppInstallService:
             pm.install(pkg)
             await job_manager.log(job_id, f"Installed package: {pkg}")
 
+    async def _pull_images(self, job_id: str, job_manager: JobManager, services: list[dict]):
+        """Pull every missing service image in parallel before creating containers."""
+        from hiveden.docker.images import get_image_pull_service
+
+        images = list(dict.fromkeys(service["image"] for service in services))
+        await job_manager.log(job_id, f"Pulling {len(images)} image(s)")
+        results = await asyncio.to_thread(
+            get_image_pull_service().pull_many,
+            images,
+            progress=job_manager.threadsafe_logger(job_id),
+        )
+        failed = {image: error for image, error in results.items() if error}
+        if failed:
+            details = "; ".join(f"{image}: {error}" for image, error in failed.items())
+            raise ValueError(f"Failed to pull images: {details}")
+
     def _download_text(self, url: Optional[str]) -> str:
         if not url:
             raise ValueError("Catalog entry does not include compose_url")
@@ -1,14 +1,76 @@
 import subprocess
 import os
+import shutil
 import tarfile
 import glob
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from hiveden.config.settings import config
 from hiveden.docker.containers import DockerManager
 from hiveden.services.logs import LogService
+from hiveden.db.manager import detect_dump_format
 from hiveden.db.session import get_db_manager
 
+# Backup name suffix -> (backup type, format). Database backups use the
+# pg_dump format named in HIVEDEN_BACKUP_DATABASE_FORMAT.
+BACKUP_SUFFIXES = {
+    ".sql": ("database", "plain"),
+    ".dump": ("database", "custom"),
+    ".dumpdir": ("database", "directory"),
+    ".tar.gz": ("application", "archive"),
+}
+DATABASE_BACKUP_SUFFIX = {fmt: suffix for suffix, (kind, fmt) in BACKUP_SUFFIXES.items() if kind == "database"}
+
+
+def parse_backup_name(name: str) -> Dict[str, str]:
+    """Split ``<target>_<YYYYMMDD>_<HHMMSS><suffix>`` into its parts."""
+    for suffix, (b_type, b_format) in BACKUP_SUFFIXES.items():
+        if name.endswith(suffix):
+            break
+    else:
+        return {"type": "unknown", "format": "unknown", "target": "unknown", "timestamp": "unknown"}
+
+    base = name[:-len(suffix)]
+    timestamp = "unknown"
+    parts = base.rsplit("_", 2) # split at last 2 underscores
+    if len(parts) >= 3:
+        # name_YYYYMMDD_HHMMSS
+        ts_str = f"{parts[-2]}_{parts[-1]}"
+        try:
+            timestamp = datetime.strptime(ts_str, "%Y%m%d_%H%M%S").isoformat()
+        except ValueError:
+            timestamp = ts_str
+        target = "_".join(parts[:-2])
+    else:
+        target = base
+    return {"type": b_type, "format": b_format, "target": target, "timestamp": timestamp}
+
+
+def _backup_size(path: str) -> int:
+    """Size of a backup file, or the total of a directory-format dump."""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for f in files:
+            total += os.path.getsize(os.path.join(root, f))
+    return total
+
+
+def _remove_backup(path: str):
+    """Delete a backup file, or a directory-format dump.
+
+    Raises:
+        IsADirectoryError: for any other directory, which is never removed.
+    """
+    if os.path.isdir(path):
+        info = parse_backup_name(os.path.basename(path))
+        if info["format"] != "directory" or info["timestamp"] == "unknown":
+            raise IsADirectoryError(f"Not a backup directory: {path}")
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
 class BackupManager:
     def __init__(self):
         self.log_service = LogService()
@@ -17,18 +79,9 @@ class BackupManager:
     def _get_db_config(self, key: str) -> Optional[str]:
         """Helper to fetch config from DB 'core' module."""
         try:
-            from hiveden.db.session import get_db_manager
-            from hiveden.db.repositories.core import ConfigRepository, ModuleRepository
-            
-            db_manager = get_db_manager()
-            module_repo = ModuleRepository(db_manager)
-            config_repo = ConfigRepository(db_manager)
-            
-            core_module = module_repo.get_by_short_name('core')
-            if core_module:
-                cfg = config_repo.get_by_module_and_key(core_module.id, key)
-                if cfg:
-                    return cfg['value']
+            from hiveden.services.config import ConfigService
+
+            return ConfigService().get(key)
         except Exception as e:
             # print(f"Error fetching DB config for {key}: {e}")
             pass
@@ -88,62 +141,28 @@ class BackupManager:
         backups = []
         
         for f in files:
-            if not os.path.isfile(f):
-                continue
-                
             name = os.path.basename(f)
-            # Parse filename: name_timestamp.ext
-            # Timestamps are YYYYMMDD_HHMMSS (15 chars)
-            # Extension is .sql or .tar.gz
-            
-            b_type = "unknown"
-            b_target = "unknown"
-            timestamp = "unknown"
-            
-            if f.endswith(".sql"):
-                b_type = "database"
-                # Remove extension
-                base = name[:-4]
-                # Check for timestamp suffix
-                parts = base.rsplit("_", 2) # split at last 2 underscores
-                if len(parts) >= 3:
-                    # name_YYYYMMDD_HHMMSS
-                    ts_str = f"{parts[-2]}_{parts[-1]}"
-                    try:
-                        dt = datetime.strptime(ts_str, "%Y%m%d_%H%M%S")
-                        timestamp = dt.isoformat()
-                    except ValueError:
-                        timestamp = ts_str
-                    b_target = "_".join(parts[:-2])
-                else:
-                    b_target = base
-            elif f.endswith(".tar.gz"):
-                b_type = "application"
-                base = name[:-7]
-                parts = base.rsplit("_", 2)
-                if len(parts) >= 3:
-                    ts_str = f"{parts[-2]}_{parts[-1]}"
-                    try:
-                        dt = datetime.strptime(ts_str, "%Y%m%d_%H%M%S")
-                        timestamp = dt.isoformat()
-                    except ValueError:
-                        timestamp = ts_str
-                    b_target = "_".join(parts[:-2])
-                else:
-                    b_target = base
+            # Directory-format dumps are directories; everything else is a file.
+            if os.path.isdir(f) and not name.endswith(".dumpdir"):
+                continue
+            if not os.path.isdir(f) and not os.path.isfile(f):
+                continue
+
+            info = parse_backup_name(name)
             
-            if backup_type and b_type != backup_type:
+            if backup_type and info["type"] != backup_type:
                 continue
-            if target and b_target != target:
+            if target and info["target"] != target:
                 continue
                 
             backups.append({
                 "path": f,
                 "filename": name,
-                "type": b_type,
-                "target": b_target,
-                "timestamp": timestamp,
-                "size": os.path.getsize(f),
+                "type": info["type"],
+                "format": info["format"],
+                "target": info["target"],
+                "timestamp": info["timestamp"],
+                "size": _backup_size(f),
                 "mtime": os.path.getmtime(f)
             })
             
@@ -162,7 +181,7 @@ class BackupManager:
             deleted_count = 0
             for b in to_delete:
                 try:
-                    os.remove(b["path"])
+                    _remove_backup(b["path"])
                     deleted_count += 1
                 except OSError as e:
                     self.log_service.error(
@@ -181,8 +200,24 @@ class BackupManager:
                     module=self.log_module
                 )
 
-    def create_postgres_backup(self, db_name: str, output_dir: Optional[str] = None, actor: str = "system") -> str:
-        """Creates a backup of the specified PostgreSQL database."""
+    def create_postgres_backup(
+        self,
+        db_name: str,
+        output_dir: Optional[str] = None,
+        actor: str = "system",
+        format: Optional[str] = None,
+        jobs: Optional[int] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Creates a backup of the specified PostgreSQL database.
+
+        ``format`` and ``jobs`` default to HIVEDEN_BACKUP_DATABASE_FORMAT and
+        HIVEDEN_BACKUP_JOBS. ``progress`` receives pg_dump's progress lines.
+        """
+        format = format or config.backup_database_format
+        jobs = jobs or config.backup_jobs
+        if format not in DATABASE_BACKUP_SUFFIX:
+            raise ValueError(f"Unknown backup format '{format}'")
         self.log_service.info(
             actor=actor,
             action="backup_database",
@@ -197,20 +232,27 @@ class BackupManager:
             target_dir = self.get_backup_directory(output_dir)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{db_name}_{timestamp}.sql"
+            filename = f"{db_name}_{timestamp}{DATABASE_BACKUP_SUFFIX[format]}"
             filepath = os.path.join(target_dir, filename)
             
             os.makedirs(target_dir, exist_ok=True)
         
             # Delegate to DatabaseManager
             db_manager = get_db_manager()
-            db_manager.backup_database(db_name, filepath)
+            db_manager.backup_database(
+                db_name,
+                filepath,
+                format=format,
+                jobs=jobs,
+                compression=config.backup_compression,
+                progress=progress,
+            )
             
             self.log_service.info(
                 actor=actor,
                 action="backup_database",
                 message=f"Backup completed successfully for {db_name}",
-                metadata={"file": filepath, "size": os.path.getsize(filepath)},
+                metadata={"file": filepath, "format": format, "jobs": jobs, "size": _backup_size(filepath)},
                 module=self.log_module
             )
 
@@ -219,7 +261,7 @@ class BackupManager:
             return filepath
         except Exception as e:
             if filepath and os.path.exists(filepath):
-                os.remove(filepath)
+                _remove_backup(filepath)
             
             self.log_service.error(
                 actor=actor,
@@ -299,8 +341,19 @@ class BackupManager:
                     self.log_service.error(actor=actor, action="start_container", message=f"Failed to restart container {container_name}", error_details=str(e), module=self.log_module)
                     print(f"Failed to restart container {container_name}: {e}")
 
-    def restore_postgres_backup(self, backup_file: str, db_name: str, actor: str = "system") -> None:
-        """Restores a PostgreSQL database from a backup file."""
+    def restore_postgres_backup(
+        self,
+        backup_file: str,
+        db_name: str,
+        actor: str = "system",
+        jobs: Optional[int] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Restores a PostgreSQL database from a backup file or dump directory.
+
+        Custom and directory-format dumps are restored with ``jobs`` parallel
+        pg_restore workers (HIVEDEN_BACKUP_JOBS by default).
+        """
         self.log_service.info(
             actor=actor,
             action="restore_database",
@@ -315,7 +368,12 @@ class BackupManager:
         try:
              # Delegate to DatabaseManager
              db_manager = get_db_manager()
-             db_manager.restore_database(db_name, backup_file)
+             kwargs = {}
+             if detect_dump_format(backup_file) != "plain":
+                 kwargs["jobs"] = jobs or config.backup_jobs
+             if progress:
+                 kwargs["progress"] = progress
+             db_manager.restore_database(db_name, backup_file, **kwargs)
 
              self.log_service.info(
                 actor=actor,
@@ -381,11 +439,17 @@ class BackupManager:
         filepath = os.path.join(backup_dir, filename)
         
         # Security check: prevent path traversal
-        # resolve absolute paths
+        # only plain names of entries directly inside the backup directory
         abs_backup_dir = os.path.abspath(backup_dir)
         abs_filepath = os.path.abspath(filepath)
+        separators = [sep for sep in (os.sep, os.altsep) if sep]
         
-        if not abs_filepath.startswith(abs_backup_dir):
+        if (
+            filename in ("", ".", "..")
+            or any(sep in filename for sep in separators)
+            or os.path.dirname(abs_filepath) != abs_backup_dir
+            or os.path.commonpath([abs_backup_dir, abs_filepath]) != abs_backup_dir
+        ):
             msg = f"Security violation: Invalid backup filename {filename}"
             self.log_service.warning(
                 actor=actor,
@@ -406,7 +470,7 @@ class BackupManager:
             raise FileNotFoundError(msg)
 
         try:
-            os.remove(filepath)
+            _remove_backup(filepath)
             self.log_service.info(
                 actor=actor,
                 action="delete_backup",
@@ -36,24 +36,14 @@ class BackupScheduler:
             )
         self.load_jobs()
 
-    def _get_db_access(self):
-        from hiveden.db.session import get_db_manager
-        from hiveden.db.repositories.core import ConfigRepository, ModuleRepository
-        
-        db_manager = get_db_manager()
-        module_repo = ModuleRepository(db_manager)
-        config_repo = ConfigRepository(db_manager)
-        core_module = module_repo.get_by_short_name('core')
-        
-        return config_repo, core_module
+    def _get_config_service(self):
+        from hiveden.services.config import ConfigService
+
+        return ConfigService()
 
     def get_schedules(self):
         try:
-            config_repo, core_module = self._get_db_access()
-            if core_module:
-                cfg = config_repo.get_by_module_and_key(core_module.id, 'backups.schedules')
-                if cfg and cfg['value']:
-                    return json.loads(cfg['value'])
+            return self._get_config_service().get_json('backups.schedules', [])
         except Exception as e:
             logger.error(f"Failed to load schedules: {e}")
             self.log_service.error(
@@ -67,10 +57,8 @@ class BackupScheduler:
 
     def save_schedules(self, schedules):
         try:
-            config_repo, core_module = self._get_db_access()
-            if core_module:
-                config_repo.set_value('core', 'backups.schedules', json.dumps(schedules))
-                self.load_jobs() # Reload to apply changes
+            self._get_config_service().set('backups.schedules', json.dumps(schedules))
+            self.load_jobs() # Reload to apply changes
         except Exception as e:
             logger.error(f"Failed to save schedules: {e}")
             self.log_service.error(
@@ -69,6 +69,8 @@ def get_default_containers() -> List[DockerContainer]:
             name="prometheus",
             image="prom/prometheus:v3.8.1",
             command=["--config.file=/etc/prometheus/prometheus.yml"],
+            # Scrape targets; everything else starts independently.
+            dependencies=["cadvisor", "node-exporter"],
             ports=[Port(host_port=9090, container_port=9090, protocol="tcp")],
             mounts=[
                 Mount(
@@ -1,6 +1,10 @@
 import os
 import shutil
+import socket
+import struct
+import threading
 import time
+from contextlib import contextmanager
 from urllib.parse import urlparse
 import click
 import psycopg2
@@ -8,59 +12,129 @@ from docker import errors
 from hiveden.config.settings import config
 from hiveden.bootstrap.defaults import get_default_containers
 from hiveden.bootstrap.configs import PROMETHEUS_DEFAULT_CONFIG
+from hiveden.docker.bulk import run_dependency_graph
 from hiveden.docker.containers import DockerManager
 from hiveden.db.session import get_db_manager
 from hiveden.db.repositories.locations import LocationRepository
 
 TEMP_ROOT = "/hiveden-temp-root"
+# How long a freshly created default container may take to become ready.
+CONTAINER_READY_TIMEOUT = 60
+# Postgres SSLRequest code; any server that is listening answers it.
+_PG_SSL_REQUEST = struct.pack("!II", 8, 80877103)
+
+
+class StartupTimer:
+    """Records how long each bootstrap step took."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.entries = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, label):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(label, time.monotonic() - started)
+
+    def record(self, label, seconds):
+        with self._lock:
+            self.entries.append((label, seconds))
+
+    def report(self):
+        lines = [f"  {label:<32} {seconds:6.2f}s" for label, seconds in self.entries]
+        lines.append(f"  {'total':<32} {time.monotonic() - self.started:6.2f}s")
+        return lines
+
+
+startup_timer = StartupTimer()
+
 
 def bootstrap_infrastructure():
     """Phase 1: Bootstrap infrastructure (dirs and containers) without DB."""
     click.echo("Bootstrapping infrastructure...")
     
     # 1. Create basic directories (using defaults) so containers can mount them
-    ensure_directories(use_db=False)
+    with startup_timer.step("directories"):
+        ensure_directories(use_db=False)
 
     # 2. Ensure App Configs
-    ensure_app_configs()
+    with startup_timer.step("app configs"):
+        ensure_app_configs()
     
     # 3. Start Containers (Postgres, Redis, Traefik)
-    ensure_containers()
+    ensure_containers(timer=startup_timer)
 
 def bootstrap_data():
     """Phase 2: Bootstrap data (migrations and directory moves) using DB."""
     click.echo("Bootstrapping data and migrations...")
     
     # 1. Wait for DB Server to be ready
-    wait_for_db()
+    with startup_timer.step("database ready"):
+        wait_for_db()
     
     # 2. Ensure Database Exists
-    ensure_database_exists()
-    
-    db_manager = get_db_manager()
-    db_manager.initialize_db()
+    with startup_timer.step("database migrations"):
+        ensure_database_exists()
+
+        db_manager = get_db_manager()
+        db_manager.initialize_db()
     
     # 3. Directory Migration (using DB paths)
-    ensure_directories(use_db=True)
+    with startup_timer.step("directory migration"):
+        ensure_directories(use_db=True)
+
+    click.echo("Startup timings:")
+    for line in startup_timer.report():
+        click.echo(line)
+
+def postgres_ping(host, port=5432, timeout=1.0):
+    """Check that a Postgres server is accepting connections, like pg_isready.
 
-def wait_for_db(retries=30, delay=2):
-    """Wait for database server to be ready by connecting to 'postgres' db."""
+    Sends the protocol's SSLRequest, which the server answers with a single
+    byte before any authentication, so no credentials are needed.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall(_PG_SSL_REQUEST)
+            return sock.recv(1) in (b"S", b"N")
+    except OSError:
+        return False
+
+def wait_for_db(timeout=60):
+    """Wait for database server to be ready by connecting to 'postgres' db.
+
+    The server is pinged at the protocol level first with a short, growing
+    backoff, then a real connection confirms it accepts queries.
+    """
     db_manager = get_db_manager()
     
     # Parse URL to switch to 'postgres' db
     parsed = urlparse(db_manager.db_url)
     postgres_url = parsed._replace(path="/postgres").geturl()
     
-    for i in range(retries):
-        try:
-            conn = psycopg2.connect(postgres_url)
-            conn.close()
-            return
-        except psycopg2.OperationalError as e:
-            if i == 0:
-                click.echo(f"Waiting for database server... ({e})")
-            time.sleep(delay)
-    raise Exception("Database server failed to start.")
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    error = None
+    while True:
+        if postgres_ping(parsed.hostname or "localhost", parsed.port or 5432):
+            try:
+                conn = psycopg2.connect(postgres_url)
+                conn.close()
+                return
+            except psycopg2.OperationalError as e:
+                # Listening but still starting up or recovering.
+                error = e
+        if error is None:
+            error = "not accepting connections"
+            click.echo("Waiting for database server...")
+        if time.monotonic() >= deadline:
+            raise Exception(f"Database server failed to start: {error}")
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
 
 def ensure_database_exists():
     """Ensure the target database exists, creating it if necessary."""
@@ -172,31 +246,68 @@ def ensure_app_configs():
         except OSError as e:
             click.echo(f"Error writing prometheus config: {e}")
 
-def ensure_containers():
-    """Ensure default containers are running."""
+def ensure_containers(timer=None):
+    """Ensure default containers are running.
+
+    Missing images are pulled concurrently, then missing containers are
+    created in dependency order: each starts as soon as the containers it
+    depends on are ready, independent ones in parallel.
+    """
+    timer = timer or StartupTimer()
     manager = DockerManager(network_name=config.docker_network_name)
     defaults = get_default_containers()
     
     app_root = manager._resolve_app_directory()
     
+    missing = {}
     for container_def in defaults:
         try:
-            try:
-                manager.client.containers.get(container_def.name)
-                pass
-            except errors.NotFound:
-                click.echo(f"Creating container '{container_def.name}'...")
-                # We pass app_root here to override the default in the manager if possible,
-                # or ensure the manager uses the right root.
-                manager.create_container(
-                    name=container_def.name,
-                    image=container_def.image,
-                    env=container_def.env,
-                    ports=container_def.ports,
-                    mounts=container_def.mounts,
-                    command=container_def.command,
-                    network_name=config.docker_network_name,
-                    app_directory=app_root # Assuming we update DockerManager to accept this
-                )
+            manager.client.containers.get(container_def.name)
+        except errors.NotFound:
+            missing[container_def.name] = container_def
         except Exception as e:
             click.echo(f"Error bootstrapping container '{container_def.name}': {e}")
+    if not missing:
+        return
+
+    from hiveden.docker.images import get_image_pull_service
+
+    with timer.step("image pulls"):
+        failures = get_image_pull_service().pull_many(c.image for c in missing.values())
+    for image, error in failures.items():
+        if error:
+            click.echo(f"Error pulling image '{image}': {error}")
+
+    def start(name):
+        container_def = missing[name]
+        click.echo(f"Creating container '{name}'...")
+        started = time.monotonic()
+        container = manager.create_container(
+            name=container_def.name,
+            image=container_def.image,
+            dependencies=container_def.dependencies,
+            env=container_def.env,
+            ports=container_def.ports,
+            mounts=container_def.mounts,
+            command=container_def.command,
+            network_name=config.docker_network_name,
+            app_directory=app_root
+        )
+        created = time.monotonic()
+        port = container_def.ports[0].container_port if container_def.ports else None
+        manager.wait_until_ready(container, port=port, timeout=CONTAINER_READY_TIMEOUT, interval=0.25)
+        timer.record(f"container {name}", time.monotonic() - started)
+        return f"created in {created - started:.1f}s, ready after {time.monotonic() - created:.1f}s"
+
+    # Dependencies that already exist are already running.
+    graph = {
+        name: [d for d in container_def.dependencies or [] if d in missing]
+        for name, container_def in missing.items()
+    }
+    with timer.step("containers"):
+        results = run_dependency_graph(graph, start, max_workers=config.docker_bulk_workers)
+    for name, result in results.items():
+        if result["status"] == "done":
+            click.echo(f"Container '{name}' {result['message']}.")
+        else:
+            click.echo(f"Error bootstrapping container '{name}': {result['message']}")
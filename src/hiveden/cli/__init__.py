@@ -26,8 +26,12 @@ main.add_command(apps)
 
 @main.command()
 @click.option("--config", help="Path to the configuration file.")
-def apply(config):
-    """Apply the configuration from a file."""
+@click.option("--dry-run", is_flag=True, help="Show what would change without applying it.")
+def apply(config, dry_run):
+    """Apply the configuration from a file.
+
+    Only containers whose configuration changed are recreated.
+    """
     if config:
         config_path = config
     elif os.path.exists("config.yaml"):
@@ -47,7 +51,7 @@ def apply(config):
             apply_configuration as apply_docker_configuration,
         )
 
-        messages = apply_docker_configuration(full_config["docker"])
+        messages = apply_docker_configuration(full_config["docker"], dry_run=dry_run)
         for message in messages:
             click.echo(message)
 
@@ -43,10 +43,11 @@ def list_containers(ctx, only_managed):
     """List all docker containers."""
     manager = get_docker_manager()
 
-    containers = manager.list_containers(all=True, only_managed=only_managed)
+    containers = manager.list_container_summaries(
+        all=True, only_managed=only_managed, fields=["Name", "Image", "Status"]
+    )
     for container in containers:
-        name = container.Names[0] if container.Names else "N/A"
-        click.echo(f"{name} - {container.Image} - {container.Status}")
+        click.echo(f"{container.Name} - {container.Image} - {container.Status}")
 
 
 @docker.command(name="describe-container")
@@ -171,3 +172,63 @@ def delete_container(all_containers, managed, name):
         return
 
     manager.delete_containers(containers_to_delete)
+
+
+@docker.command(name="bulk")
+@click.argument("action", type=click.Choice(["start", "stop", "restart", "remove"]))
+@click.option(
+    "--all",
+    "all_containers",
+    is_flag=True,
+    cls=MutuallyExclusiveOption,
+    mutually_exclusive=["managed", "names"],
+    help="Act on all containers.",
+)
+@click.option(
+    "--managed",
+    is_flag=True,
+    cls=MutuallyExclusiveOption,
+    mutually_exclusive=["all_containers", "names"],
+    help="Act only on containers managed by hiveden.",
+)
+@click.option(
+    "--name",
+    "names",
+    multiple=True,
+    cls=MutuallyExclusiveOption,
+    mutually_exclusive=["all_containers", "managed"],
+    help="A container to act on; repeat for several.",
+)
+@click.option("--workers", type=int, default=None, help="Containers handled concurrently.")
+@click.option("--timeout", type=int, default=None, help="Seconds to wait for each container to stop.")
+def bulk(action, all_containers, managed, names, workers, timeout):
+    """Start, stop, restart or remove containers in dependency order."""
+    from hiveden.docker.bulk import summarize
+
+    manager = get_docker_manager()
+
+    if not all_containers and not managed and not names:
+        raise click.UsageError(
+            "Either --all, --managed, or --name must be provided."
+        )
+
+    containers = manager.list_container_summaries(
+        all=True, only_managed=managed, fields=["Id", "Name", "State", "Labels"]
+    )
+    if names:
+        containers = [c for c in containers if c.Name in names]
+
+    if not containers:
+        click.echo("No containers found.")
+        return
+
+    results = manager.bulk_action(
+        action, containers, max_workers=workers, timeout=timeout, progress=click.echo
+    )
+    summary = summarize(results)
+    click.echo(
+        f"{len(summary['done'])} done, {len(summary['failed'])} failed, "
+        f"{len(summary['skipped'])} skipped."
+    )
+    if summary["failed"] or summary["skipped"]:
+        raise click.exceptions.Exit(1)
@@ -30,6 +30,16 @@ class Config:
         self.backup_directory = os.getenv(
             "HIVEDEN_BACKUP_DIRECTORY", "/hiveden-temp-root/backups"
         )
+        # pg_dump output format for database backups: directory, custom or plain
+        self.backup_database_format = os.getenv(
+            "HIVEDEN_BACKUP_DATABASE_FORMAT", "directory"
+        )
+        # Parallel pg_dump (directory format) and pg_restore workers
+        self.backup_jobs = int(
+            os.getenv("HIVEDEN_BACKUP_JOBS", str(min(4, os.cpu_count() or 1)))
+        )
+        # pg_dump --compress value, e.g. "6" (gzip) or "zstd:3" (pg_dump 16+)
+        self.backup_compression = os.getenv("HIVEDEN_BACKUP_COMPRESSION", "6")
         self.pictures_directory = os.getenv(
             "HIVEDEN_PICTURES_DIRECTORY", "/hiveden-temp-root/pictures"
         )
@@ -45,6 +55,39 @@ class Config:
         self.docker_network_name = os.getenv(
             "HIVEDEN_DOCKER_NETWORK_NAME", "hiveden-net"
         )
+        # Serve container listings from an in-memory inventory kept current by
+        # the Docker events stream.
+        self.docker_inventory_enabled = (
+            os.getenv("HIVEDEN_DOCKER_INVENTORY_ENABLED", "true").lower() == "true"
+        )
+        # Connections kept open to the Docker daemon and its request timeout.
+        self.docker_pool_size = int(os.getenv("HIVEDEN_DOCKER_POOL_SIZE", "10"))
+        self.docker_timeout = int(os.getenv("HIVEDEN_DOCKER_TIMEOUT", "60"))
+        # Containers started/stopped concurrently by bulk operations.
+        self.docker_bulk_workers = int(os.getenv("HIVEDEN_DOCKER_BULK_WORKERS", "8"))
+        # Image pulls allowed to download at the same time.
+        self.docker_pull_concurrency = int(os.getenv("HIVEDEN_DOCKER_PULL_CONCURRENCY", "3"))
+        # Sample running containers' cgroup v2 stats in the background.
+        self.docker_stats_enabled = (
+            os.getenv("HIVEDEN_DOCKER_STATS_ENABLED", "true").lower() == "true"
+        )
+        # Seconds a cached Docker disk usage snapshot is served before it is
+        # recomputed in the background.
+        self.docker_disk_usage_ttl = float(os.getenv("HIVEDEN_DOCKER_DISK_USAGE_TTL", "300"))
+        # Memory budget of the explorer's directory listing cache (0 disables it).
+        self.explorer_listing_cache_mb = float(os.getenv("HIVEDEN_EXPLORER_LISTING_CACHE_MB", "64"))
+        # Filename index of the filesystem locations, used by explorer search.
+        self.explorer_index_enabled = (
+            os.getenv("HIVEDEN_EXPLORER_INDEX_ENABLED", "true").lower() == "true"
+        )
+        self.explorer_index_path = os.getenv(
+            "HIVEDEN_EXPLORER_INDEX_PATH", "/var/lib/hiveden/explorer-index.sqlite3"
+        )
+        self.explorer_index_reconcile_seconds = float(
+            os.getenv("HIVEDEN_EXPLORER_INDEX_RECONCILE_SECONDS", "21600")
+        )
+        # Directories read concurrently when crawling a tree.
+        self.explorer_crawl_workers = int(os.getenv("HIVEDEN_EXPLORER_CRAWL_WORKERS", "8"))
         self.domain = os.getenv("HIVEDEN_DOMAIN", "hiveden.local")
 
         # Pi-hole Configuration
@@ -76,5 +119,25 @@ class Config:
             os.getenv("HIVEDEN_APPSTORE_HTTP_TIMEOUT_SECONDS", "15")
         )
 
+        # Statements slower than this are written to the slow-query log
+        # (0 disables it).
+        self.db_slow_query_threshold_ms = float(
+            os.getenv("HIVEDEN_DB_SLOW_QUERY_MS", "200")
+        )
+
+        # Audit log writer configuration
+        self.log_queue_size = int(os.getenv("HIVEDEN_LOG_QUEUE_SIZE", "10000"))
+        self.log_batch_size = int(os.getenv("HIVEDEN_LOG_BATCH_SIZE", "500"))
+        self.log_flush_interval_seconds = float(
+            os.getenv("HIVEDEN_LOG_FLUSH_INTERVAL_SECONDS", "1.0")
+        )
+        # One of: drop_oldest, drop_newest, block, stdout
+        self.log_overflow_policy = os.getenv(
+            "HIVEDEN_LOG_OVERFLOW_POLICY", "drop_oldest"
+        )
+        # Months of audit logs to keep (0 keeps everything); older monthly
+        # partitions are dropped by the log writer.
+        self.log_retention_months = int(os.getenv("HIVEDEN_LOG_RETENTION_MONTHS", "0"))
+
 
 config = Config()
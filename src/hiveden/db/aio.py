@@ -0,0 +1,274 @@
+"""Asyncio access to PostgreSQL on top of psycopg2's native async mode.
+
+Async connections are driven by ``connection.poll()`` and the event loop's
+reader/writer callbacks, so awaiting a query never occupies a worker thread.
+They always run in autocommit mode: every statement is its own transaction.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Sequence
+
+import psycopg2
+from psycopg2.extensions import POLL_OK, POLL_READ, POLL_WRITE
+from psycopg2.extras import RealDictCursor
+
+from hiveden.db.instrumentation import query_stats
+
+logger = logging.getLogger(__name__)
+
+
+async def wait_ready(conn):
+    """Wait until an async connection has finished its current operation."""
+    loop = asyncio.get_running_loop()
+    while True:
+        state = conn.poll()
+        if state == POLL_OK:
+            return
+
+        fd = conn.fileno()
+        ready = loop.create_future()
+
+        def _wake():
+            if not ready.done():
+                ready.set_result(None)
+
+        if state == POLL_READ:
+            loop.add_reader(fd, _wake)
+            remove = loop.remove_reader
+        elif state == POLL_WRITE:
+            loop.add_writer(fd, _wake)
+            remove = loop.remove_writer
+        else:
+            raise psycopg2.OperationalError(f"Unexpected poll state: {state}")
+
+        try:
+            await ready
+        finally:
+            remove(fd)
+
+
+async def execute(conn, query: str, params: Optional[Sequence[Any]] = None):
+    """Run a statement on an async connection and return its cursor."""
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    try:
+        cursor.execute(query, params)
+        await wait_ready(conn)
+    finally:
+        query_stats.record_query(query, time.perf_counter() - started, cursor.rowcount)
+    return cursor
+
+
+async def open_connection(dsn: str):
+    """Open an async connection that returns rows as dictionaries."""
+    conn = psycopg2.connect(dsn, async_=True, cursor_factory=RealDictCursor)
+    try:
+        await wait_ready(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class AsyncConnectionPool:
+    """Asyncio counterpart of ``hiveden.db.pool.ConnectionPool``.
+
+    Connections are opened on demand. The pool binds to the first event loop
+    that uses it; if it is later used from a different loop, idle connections
+    are dropped and it starts over.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_size: int = 10,
+        max_age: float = 1800.0,
+        timeout: float = 30.0,
+        check_interval: float = 30.0,
+        connect: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError(f"Invalid pool size: max_size={max_size}")
+        self.dsn = dsn
+        self.max_size = max_size
+        self.max_age = max_age
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._connect = connect or (lambda: open_connection(dsn))
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._failed_checks = 0
+
+    async def getconn(self):
+        """Check a connection out of the pool.
+
+        Raises:
+            TimeoutError: If no connection became available within
+                ``timeout`` seconds.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        slots = self._bind_loop()
+
+        if slots.locked():
+            self._waits += 1
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                self._record_wait(started)
+                raise TimeoutError(
+                    f"No database connection available after "
+                    f"{self.timeout:.1f}s (pool size {self.max_size})"
+                ) from None
+            self._record_wait(started)
+        else:
+            await slots.acquire()
+
+        try:
+            pooled = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if await self._is_usable(candidate):
+                    pooled = candidate
+                    break
+                self._discard(candidate)
+            if pooled is None:
+                pooled = _PooledConnection(await self._connect())
+                self._created += 1
+        except BaseException:
+            slots.release()
+            raise
+
+        self._checkouts += 1
+        self._in_use[id(pooled.conn)] = pooled
+        return pooled.conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool.
+
+        Connections still executing a query (e.g. after the awaiting task was
+        cancelled) are closed, as are broken or expired ones.
+        """
+        pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            if not conn.closed:
+                conn.close()
+            return
+
+        if (
+            discard
+            or self._closed
+            or conn.closed
+            or conn.isexecuting()
+            or self._is_expired(pooled)
+        ):
+            self._discard(pooled)
+        else:
+            pooled.last_used = time.monotonic()
+            self._idle.append(pooled)
+        if self._slots is not None:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """Borrow a connection for the duration of an ``async with`` block."""
+        conn = await self.getconn()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, asyncio.CancelledError):
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    async def close(self):
+        """Close idle connections and refuse further checkouts."""
+        self._closed = True
+        while self._idle:
+            self._discard(self._idle.pop())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool counters for sizing and monitoring."""
+        return {
+            "max_size": self.max_size,
+            "size": len(self._idle) + len(self._in_use),
+            "idle": len(self._idle),
+            "in_use": len(self._in_use),
+            "checkouts": self._checkouts,
+            "waits": self._waits,
+            "wait_time_seconds": round(self._wait_time, 6),
+            "max_wait_time_seconds": round(self._max_wait_time, 6),
+            "timeouts": self._timeouts,
+            "connections_created": self._created,
+            "connections_discarded": self._discarded,
+            "failed_health_checks": self._failed_checks,
+        }
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Readers registered by wait_ready() belong to a single loop.
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._in_use.clear()
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_size)
+        return self._slots
+
+    def _record_wait(self, started: float):
+        elapsed = time.monotonic() - started
+        self._wait_time += elapsed
+        self._max_wait_time = max(self._max_wait_time, elapsed)
+
+    def _is_expired(self, pooled: _PooledConnection) -> bool:
+        return bool(
+            self.max_age and time.monotonic() - pooled.created_at > self.max_age
+        )
+
+    async def _is_usable(self, pooled: _PooledConnection) -> bool:
+        if pooled.conn.closed or self._is_expired(pooled):
+            return False
+        if time.monotonic() - pooled.last_used < self.check_interval:
+            return True
+        try:
+            await execute(pooled.conn, "SELECT 1")
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding unhealthy pooled async connection: {e}")
+            self._failed_checks += 1
+            return False
+
+    def _discard(self, pooled: _PooledConnection):
+        try:
+            if not pooled.conn.closed:
+                pooled.conn.close()
+        except psycopg2.Error:
+            pass
+        self._discarded += 1
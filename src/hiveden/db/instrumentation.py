@@ -0,0 +1,280 @@
+"""Per-query and per-request database instrumentation.
+
+Every statement run through a pooled connection (``InstrumentedCursor``) or
+``hiveden.db.aio.execute`` is recorded with its fingerprint, duration and row
+count. Statements executed while an HTTP request is being served are also
+attributed to that request's route (see ``hiveden.api.middleware``), so the
+number of round trips an endpoint makes is visible in ``GET /db/queries``.
+"""
+import contextvars
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from psycopg2.extras import RealDictCursor
+
+from hiveden.config.settings import config
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("hiveden.db.slow_queries")
+
+# Latency samples kept per route/fingerprint for percentile estimates.
+SAMPLE_WINDOW = 1024
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(query: Any) -> str:
+    """Normalize a statement so executions with different parameters group.
+
+    Literals and placeholders become ``?`` and multi-row VALUES lists collapse
+    to a single ``(?)``.
+    """
+    if not isinstance(query, str):
+        query = query.decode() if isinstance(query, bytes) else str(query)
+    text = _STRING_LITERAL.sub("?", query)
+    text = _PLACEHOLDER.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _VALUE_LIST.sub("(?)", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (0 when empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered), max(1, math.ceil(pct / 100.0 * len(ordered)))) - 1
+    return ordered[index]
+
+
+class RequestQueries:
+    """Queries issued while serving one HTTP request."""
+
+    __slots__ = ("count", "duration", "rows")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.rows = 0
+
+
+_current_request: contextvars.ContextVar[Optional[RequestQueries]] = contextvars.ContextVar(
+    "hiveden_db_request_queries", default=None
+)
+
+
+class _Series:
+    __slots__ = ("count", "total", "rows", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, duration: float, rows: int = 0):
+        self.count += 1
+        self.total += duration
+        self.rows += rows
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+
+
+class _RouteSeries:
+    __slots__ = ("requests", "queries", "query_time", "latency", "query_counts", "query_times")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.query_time = 0.0
+        self.latency: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+        self.query_counts: Deque[int] = deque(maxlen=SAMPLE_WINDOW)
+        self.query_times: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+
+class QueryStats:
+    """Process-wide aggregates of recorded queries and requests."""
+
+    def __init__(self, slow_query_threshold: float = 0.2):
+        self.slow_query_threshold = slow_query_threshold
+        self._lock = threading.Lock()
+        self._queries: Dict[str, _Series] = {}
+        self._routes: Dict[str, _RouteSeries] = {}
+        self._slow_queries = 0
+
+    def record_query(self, query: Any, duration: float, rows: int = 0):
+        # rowcount is -1 for statements that report no row count.
+        rows = rows if isinstance(rows, int) and rows > 0 else 0
+        key = fingerprint(query)
+        with self._lock:
+            series = self._queries.get(key)
+            if series is None:
+                series = self._queries[key] = _Series()
+            series.add(duration, rows)
+            slow = bool(self.slow_query_threshold) and duration >= self.slow_query_threshold
+            if slow:
+                self._slow_queries += 1
+
+        request = _current_request.get()
+        if request is not None:
+            request.count += 1
+            request.duration += duration
+            request.rows += rows
+
+        if slow:
+            slow_query_logger.warning(
+                f"Slow query ({duration * 1000:.1f} ms, {rows} rows): {key}"
+            )
+
+    def record_request(self, route: str, duration: float, queries: RequestQueries):
+        with self._lock:
+            series = self._routes.get(route)
+            if series is None:
+                series = self._routes[route] = _RouteSeries()
+            series.requests += 1
+            series.queries += queries.count
+            series.query_time += queries.duration
+            series.latency.append(duration)
+            series.query_counts.append(queries.count)
+            series.query_times.append(queries.duration)
+
+    def snapshot(self, top: int = 20) -> Dict[str, Any]:
+        """Return per-route and top per-fingerprint aggregates."""
+        with self._lock:
+            routes = {
+                route: {
+                    "requests": s.requests,
+                    "queries": s.queries,
+                    "queries_per_request_p50": percentile(list(s.query_counts), 50),
+                    "queries_per_request_p95": percentile(list(s.query_counts), 95),
+                    "query_time_seconds": round(s.query_time, 6),
+                    "query_time_p50_seconds": round(percentile(list(s.query_times), 50), 6),
+                    "query_time_p95_seconds": round(percentile(list(s.query_times), 95), 6),
+                    "latency_p50_seconds": round(percentile(list(s.latency), 50), 6),
+                    "latency_p95_seconds": round(percentile(list(s.latency), 95), 6),
+                }
+                for route, s in self._routes.items()
+            }
+            ranked = sorted(self._queries.items(), key=lambda item: item[1].total, reverse=True)
+            queries = [
+                {
+                    "fingerprint": key,
+                    "calls": s.count,
+                    "rows": s.rows,
+                    "total_seconds": round(s.total, 6),
+                    "max_seconds": round(s.max, 6),
+                    "p50_seconds": round(percentile(list(s.samples), 50), 6),
+                    "p95_seconds": round(percentile(list(s.samples), 95), 6),
+                }
+                for key, s in ranked[:top]
+            ]
+            return {
+                "slow_query_threshold_seconds": self.slow_query_threshold,
+                "slow_queries": self._slow_queries,
+                "routes": routes,
+                "queries": queries,
+            }
+
+    def prometheus(self) -> str:
+        """Render route aggregates in the Prometheus text exposition format."""
+        snapshot = self.snapshot(top=0)
+        lines = [
+            "# HELP hiveden_db_slow_queries_total Queries slower than the slow-query threshold.",
+            "# TYPE hiveden_db_slow_queries_total counter",
+            f"hiveden_db_slow_queries_total {snapshot['slow_queries']}",
+            "# HELP hiveden_db_route_requests_total HTTP requests served per route.",
+            "# TYPE hiveden_db_route_requests_total counter",
+        ]
+        routes = sorted(snapshot["routes"].items())
+        for route, s in routes:
+            lines.append(f'hiveden_db_route_requests_total{{route="{_label(route)}"}} {s["requests"]}')
+        lines += [
+            "# HELP hiveden_db_route_queries_total Database queries issued per route.",
+            "# TYPE hiveden_db_route_queries_total counter",
+        ]
+        for route, s in routes:
+            lines.append(f'hiveden_db_route_queries_total{{route="{_label(route)}"}} {s["queries"]}')
+        lines += [
+            "# HELP hiveden_db_route_query_seconds Database time per request.",
+            "# TYPE hiveden_db_route_query_seconds summary",
+        ]
+        for route, s in routes:
+            label = _label(route)
+            lines.append(f'hiveden_db_route_query_seconds{{route="{label}",quantile="0.5"}} {s["query_time_p50_seconds"]}')
+            lines.append(f'hiveden_db_route_query_seconds{{route="{label}",quantile="0.95"}} {s["query_time_p95_seconds"]}')
+            lines.append(f'hiveden_db_route_query_seconds_sum{{route="{label}"}} {s["query_time_seconds"]}')
+            lines.append(f'hiveden_db_route_query_seconds_count{{route="{label}"}} {s["requests"]}')
+        lines += [
+            "# HELP hiveden_http_route_latency_seconds Request latency per route.",
+            "# TYPE hiveden_http_route_latency_seconds summary",
+        ]
+        for route, s in routes:
+            label = _label(route)
+            lines.append(f'hiveden_http_route_latency_seconds{{route="{label}",quantile="0.5"}} {s["latency_p50_seconds"]}')
+            lines.append(f'hiveden_http_route_latency_seconds{{route="{label}",quantile="0.95"}} {s["latency_p95_seconds"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._queries.clear()
+            self._routes.clear()
+            self._slow_queries = 0
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+query_stats = QueryStats(config.db_slow_query_threshold_ms / 1000.0)
+
+
+def begin_request() -> contextvars.Token:
+    """Start attributing queries in the current context to a new request."""
+    return _current_request.set(RequestQueries())
+
+
+def end_request(token: contextvars.Token) -> RequestQueries:
+    queries = _current_request.get()
+    _current_request.reset(token)
+    return queries
+
+
+def current_request() -> Optional[RequestQueries]:
+    return _current_request.get()
+
+
+class InstrumentedCursor(RealDictCursor):
+    """RealDictCursor that records every statement in ``query_stats``."""
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            query_stats.record_query(self._text(query), time.perf_counter() - started, self.rowcount)
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            query_stats.record_query(self._text(query), time.perf_counter() - started, self.rowcount)
+
+    def _text(self, query):
+        # psycopg2.sql objects only render against a connection.
+        if hasattr(query, "as_string"):
+            try:
+                return query.as_string(self.connection)
+            except Exception:
+                return str(query)
+        return query
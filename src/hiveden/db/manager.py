@@ -1,22 +1,91 @@
 import os
 import subprocess
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
 from urllib.parse import urlparse
 
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from psycopg2.extras import RealDictCursor
 from yoyo import get_backend, read_migrations
 
+from hiveden.db.aio import AsyncConnectionPool
+from hiveden.db.instrumentation import InstrumentedCursor
+from hiveden.db.pool import ConnectionPool
+
 
 class DatabaseManager:
-    def __init__(self, db_url: str):
+    def __init__(
+        self,
+        db_url: str,
+        pool_min_size: int = 1,
+        pool_max_size: int = 10,
+        pool_max_age: float = 1800.0,
+        pool_timeout: float = 30.0,
+    ):
         self.db_url = db_url
         self.parsed_url = urlparse(db_url)
         self.db_type = self.parsed_url.scheme
+        self.pool = ConnectionPool(
+            db_url,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            max_age=pool_max_age,
+            timeout=pool_timeout,
+            connect=self.get_connection,
+        )
+        self.async_pool = AsyncConnectionPool(
+            db_url,
+            max_size=pool_max_size,
+            max_age=pool_max_age,
+            timeout=pool_timeout,
+        )
 
     def get_connection(self):
-        """Get a raw database connection."""
-        return psycopg2.connect(self.db_url, cursor_factory=RealDictCursor)
+        """Get a raw, unpooled database connection.
+
+        The caller owns the connection and must close it. Prefer
+        ``connection()`` for regular queries.
+        """
+        return psycopg2.connect(self.db_url, cursor_factory=InstrumentedCursor)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a pooled connection for the duration of a ``with`` block.
+
+        Changes must be committed explicitly; anything left uncommitted is
+        rolled back when the connection returns to the pool.
+        """
+        with self.pool.connection() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def aconnection(self) -> AsyncIterator[Any]:
+        """Borrow a pooled asyncio connection for an ``async with`` block.
+
+        Async connections run in autocommit mode and must be used through
+        ``hiveden.db.aio.execute`` so queries never block the event loop.
+        """
+        async with self.async_pool.connection() as conn:
+            yield conn
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool counters (checkouts, waits, wait time)."""
+        return self.pool.stats()
+
+    @property
+    def closed(self) -> bool:
+        """True once ``close`` was called; no connection can be borrowed."""
+        return self.pool.closed
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
+
+    async def aclose(self):
+        """Close all pooled connections, including asyncio ones."""
+        await self.async_pool.close()
+        self.close()
 
     def _get_admin_connection(self):
         """
@@ -25,7 +94,7 @@ class DatabaseManager:
         """
         # Replace the path (database name) with 'postgres'
         postgres_url = self.parsed_url._replace(path="/postgres").geturl()
-        conn = psycopg2.connect(postgres_url, cursor_factory=RealDictCursor)
+        conn = psycopg2.connect(postgres_url, cursor_factory=InstrumentedCursor)
         conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         return conn
 
@@ -129,35 +198,119 @@ class DatabaseManager:
         finally:
             conn.close()
 
-    def backup_database(self, db_name: str, output_path: str):
-        """Backup a database to a file."""
+    def backup_database(
+        self,
+        db_name: str,
+        output_path: str,
+        format: str = "plain",
+        jobs: int = 1,
+        compression: Optional[str] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        """Backup a database to a file or, for the directory format, a directory.
+
+        Args:
+            format: ``plain`` (SQL script), ``custom`` (``pg_dump -Fc``) or
+                ``directory`` (``pg_dump -Fd``, the only format that dumps
+                tables in parallel).
+            jobs: Parallel dump workers; used by the directory format only.
+            compression: Passed to ``pg_dump --compress``, e.g. ``6`` or
+                ``zstd:3`` (zstd needs pg_dump 16+). Ignored for plain dumps.
+            progress: Called with each progress line pg_dump reports.
+        """
         # Construct connection string for the specific target DB
         target_url = self.parsed_url._replace(path=f"/{db_name}").geturl()
-        
+
+        if format == "plain":
+            cmd = ["pg_dump", "--dbname", target_url, "-f", output_path]
+        elif format in ARCHIVE_FORMATS:
+            cmd = ["pg_dump", "--dbname", target_url, f"--format={format}", "-f", output_path]
+            if format == "directory" and jobs > 1:
+                cmd += ["--jobs", str(jobs)]
+            if compression:
+                cmd.append(f"--compress={compression}")
+        else:
+            raise ValueError(f"Unknown backup format '{format}'")
+
         try:
-            subprocess.run(
-                ["pg_dump", "--dbname", target_url, "-f", output_path],
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            _run_with_progress(cmd, progress)
         except subprocess.CalledProcessError as e:
             raise Exception(f"Database backup failed: {e.stderr}") from e
 
-    def restore_database(self, db_name: str, input_path: str):
-        """Restore a database from a file."""
+    def restore_database(
+        self,
+        db_name: str,
+        input_path: str,
+        jobs: int = 1,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        """Restore a database from a backup.
+
+        Plain SQL dumps are replayed through ``psql``; custom and directory
+        archives go through ``pg_restore``, with ``jobs`` parallel workers.
+        """
         if not os.path.exists(input_path):
              raise FileNotFoundError(f"Backup file not found: {input_path}")
              
         # Construct connection string for the specific target DB
         target_url = self.parsed_url._replace(path=f"/{db_name}").geturl()
-        
+
+        if detect_dump_format(input_path) == "plain":
+            cmd = ["psql", "--dbname", target_url, "-f", input_path]
+        else:
+            cmd = ["pg_restore", "--dbname", target_url, "--clean", "--if-exists"]
+            if jobs > 1:
+                cmd += ["--jobs", str(jobs)]
+            cmd.append(input_path)
+
         try:
-            subprocess.run(
-                ["psql", "--dbname", target_url, "-f", input_path],
-                check=True,
-                capture_output=True,
-                text=True
-            )
+            _run_with_progress(cmd, progress)
         except subprocess.CalledProcessError as e:
-            raise Exception(f"Database restore failed: {e.stderr}") from e
\ No newline at end of file
+            raise Exception(f"Database restore failed: {e.stderr}") from e
+
+
+# pg_dump output formats that pg_restore understands.
+ARCHIVE_FORMATS = ("custom", "directory")
+
+
+def detect_dump_format(path: str) -> str:
+    """Return ``directory``, ``custom`` or ``plain`` for a pg_dump output."""
+    if os.path.isdir(path):
+        return "directory"
+    with open(path, "rb") as f:
+        # Custom-format archives start with this magic string.
+        if f.read(5) == b"PGDMP":
+            return "custom"
+    return "plain"
+
+
+def _run_with_progress(cmd: List[str], progress: Optional[Callable[[str], None]]):
+    """Run a pg_dump/pg_restore/psql command, optionally streaming progress.
+
+    With a ``progress`` callback the tool runs in verbose mode and every
+    line it writes to stderr is reported as it arrives.
+
+    Raises:
+        subprocess.CalledProcessError: With the collected stderr on failure.
+    """
+    if progress is None:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return
+
+    if cmd[0] != "psql":
+        cmd = cmd[:1] + ["--verbose"] + cmd[1:]
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    # Verbose output can be long; keep the tail for the error message.
+    lines = deque(maxlen=200)
+    for line in process.stderr:
+        line = line.rstrip()
+        lines.append(line)
+        progress(line.split(": ", 1)[-1] if line.startswith(("pg_dump:", "pg_restore:")) else line)
+    process.wait()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stderr="\n".join(lines))
@@ -0,0 +1,8 @@
+-- Rollback configuration change notifications
+-- depends: 00005_config_notify
+
+-- migrate: apply
+
+DROP TRIGGER IF EXISTS trg_filesystem_locations_notify ON filesystem_locations;
+DROP TRIGGER IF EXISTS trg_configs_notify ON configs;
+DROP FUNCTION IF EXISTS hiveden_notify_config_change();
@@ -0,0 +1,36 @@
+-- Publish configuration changes on the hiveden_config channel
+-- depends: 00004_app_store_catalog_contract
+
+-- migrate: apply
+
+CREATE OR REPLACE FUNCTION hiveden_notify_config_change() RETURNS trigger AS $$
+DECLARE
+    changed RECORD;
+    payload TEXT;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+
+    IF TG_TABLE_NAME = 'configs' THEN
+        payload := 'configs:'
+            || COALESCE((SELECT short_name FROM modules WHERE id = changed.module_id), '')
+            || ':' || changed.key;
+    ELSE
+        payload := TG_TABLE_NAME || ':' || COALESCE(changed.key, '');
+    END IF;
+
+    PERFORM pg_notify('hiveden_config', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_configs_notify
+AFTER INSERT OR UPDATE OR DELETE ON configs
+FOR EACH ROW EXECUTE FUNCTION hiveden_notify_config_change();
+
+CREATE TRIGGER trg_filesystem_locations_notify
+AFTER INSERT OR UPDATE OR DELETE ON filesystem_locations
+FOR EACH ROW EXECUTE FUNCTION hiveden_notify_config_change();
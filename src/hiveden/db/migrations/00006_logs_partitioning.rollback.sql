@@ -0,0 +1,25 @@
+-- Rollback monthly log partitions to a single table
+-- depends: 00006_logs_partitioning
+
+-- migrate: apply
+
+ALTER TABLE logs RENAME TO logs_partitioned;
+
+CREATE TABLE logs (
+    id INTEGER PRIMARY KEY DEFAULT nextval('logs_id_seq'),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    message TEXT NOT NULL,
+    actor TEXT DEFAULT 'system',
+    action TEXT,
+    level TEXT DEFAULT 'info',
+    module TEXT,
+    metadata JSONB DEFAULT '{}'
+);
+
+INSERT INTO logs (id, created_at, message, actor, action, level, module, metadata)
+SELECT id, created_at, message, actor, action, level, module, metadata
+FROM logs_partitioned;
+
+ALTER SEQUENCE logs_id_seq OWNED BY logs.id;
+DROP TABLE logs_partitioned;
+DROP FUNCTION IF EXISTS hiveden_ensure_logs_partition(DATE);
@@ -0,0 +1,81 @@
+-- Partition logs by month and index the columns the API filters on
+-- depends: 00005_config_notify
+
+-- migrate: apply
+
+ALTER TABLE logs RENAME TO logs_legacy;
+ALTER INDEX logs_pkey RENAME TO logs_legacy_pkey;
+
+-- The primary key of a partitioned table must include the partition key.
+CREATE TABLE logs (
+    id INTEGER NOT NULL DEFAULT nextval('logs_id_seq'),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    message TEXT NOT NULL,
+    actor TEXT DEFAULT 'system',
+    action TEXT,
+    level TEXT DEFAULT 'info',
+    module TEXT,
+    metadata JSONB DEFAULT '{}',
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- Catches rows outside the monthly partitions created so far.
+CREATE TABLE logs_default PARTITION OF logs DEFAULT;
+
+-- Newest-first listing and keyset pagination on (created_at, id).
+CREATE INDEX idx_logs_created_at_id ON logs (created_at DESC, id DESC);
+CREATE INDEX idx_logs_level_created_at_id ON logs (level, created_at DESC, id DESC);
+CREATE INDEX idx_logs_module_created_at_id ON logs (module, created_at DESC, id DESC);
+
+-- Create the partition holding the month that starts at month_start. Rows
+-- that already landed in logs_default for that month are moved into it.
+CREATE OR REPLACE FUNCTION hiveden_ensure_logs_partition(month_start DATE) RETURNS TEXT AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month_start)::DATE;
+    range_end DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'logs_p' || to_char(range_start, 'YYYYMM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE logs INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM logs_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        range_start, range_end, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, range_start, range_end
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    first_month DATE;
+    partition_month DATE;
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN(created_at), LOCALTIMESTAMP))::DATE
+    INTO first_month FROM logs_legacy;
+
+    FOR partition_month IN
+        SELECT generate_series(
+            first_month::TIMESTAMP,
+            date_trunc('month', LOCALTIMESTAMP) + INTERVAL '2 months',
+            INTERVAL '1 month'
+        )::DATE
+    LOOP
+        PERFORM hiveden_ensure_logs_partition(partition_month);
+    END LOOP;
+END;
+$$;
+
+INSERT INTO logs (id, created_at, message, actor, action, level, module, metadata)
+SELECT id, COALESCE(created_at, CURRENT_TIMESTAMP), message, actor, action, level, module, metadata
+FROM logs_legacy;
+
+ALTER SEQUENCE logs_id_seq OWNED BY logs.id;
+DROP TABLE logs_legacy;
@@ -0,0 +1,6 @@
+-- Rollback paged explorer search results
+-- depends: 00007_explorer_search_results
+
+-- migrate: apply
+
+DROP TABLE IF EXISTS explorer_search_results;
@@ -0,0 +1,12 @@
+-- Store explorer search matches in pages instead of the operation result
+-- depends: 00006_logs_partitioning
+
+-- migrate: apply
+
+CREATE TABLE explorer_search_results (
+    operation_id TEXT NOT NULL REFERENCES explorer_operations(id) ON DELETE CASCADE,
+    page INTEGER NOT NULL,
+    matches JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (operation_id, page)
+);
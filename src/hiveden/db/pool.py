@@ -0,0 +1,305 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledConnection:
+    """Bookkeeping wrapper for a connection owned by the pool."""
+
+    __slots__ = ("conn", "created_at", "last_used")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections.
+
+    Connections are opened lazily up to ``max_size``. Callers that find the
+    pool exhausted block for up to ``timeout`` seconds. Connections older
+    than ``max_age`` seconds are recycled, connections idle for longer than
+    ``max_idle`` seconds are closed while the pool is above ``min_size``,
+    and connections idle for longer than ``check_interval`` seconds are
+    pinged with ``SELECT 1`` before being handed out.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_age: float = 1800.0,
+        max_idle: float = 600.0,
+        timeout: float = 30.0,
+        check_interval: float = 30.0,
+        connect: Optional[Callable[[], Any]] = None,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(
+                f"Invalid pool size: min_size={min_size}, max_size={max_size}"
+            )
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._connect = connect or (
+            lambda: psycopg2.connect(dsn, cursor_factory=RealDictCursor)
+        )
+
+        self._lock = threading.Condition(threading.Lock())
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._size = 0
+        self._closed = False
+        self._pid = os.getpid()
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._failed_checks = 0
+
+    # --- Checkout / return ---
+
+    def getconn(self):
+        """Check a connection out of the pool.
+
+        Raises:
+            TimeoutError: If no connection became available within
+                ``timeout`` seconds.
+        """
+        self._check_fork()
+        deadline = time.monotonic() + self.timeout
+        waited_since = None
+
+        while True:
+            candidate = None
+            reserve = False
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    candidate = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    reserve = True
+                else:
+                    if waited_since is None:
+                        waited_since = time.monotonic()
+                        self._waits += 1
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._record_wait(waited_since)
+                        raise TimeoutError(
+                            f"No database connection available after "
+                            f"{self.timeout:.1f}s (pool size {self.max_size})"
+                        )
+                    self._lock.wait(remaining)
+                    continue
+
+            # Network round trips happen outside the lock.
+            if reserve:
+                try:
+                    pooled = _PooledConnection(self._connect())
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._created += 1
+            elif self._is_usable(candidate):
+                pooled = candidate
+            else:
+                self._discard(candidate)
+                continue
+
+            with self._lock:
+                self._checkouts += 1
+                if waited_since is not None:
+                    self._record_wait(waited_since)
+                self._in_use[id(pooled.conn)] = pooled
+            return pooled.conn
+
+    def putconn(self, conn, discard: bool = False):
+        """Return a connection to the pool.
+
+        Any open transaction is rolled back so the next borrower starts from
+        a clean state. Broken or expired connections are closed instead.
+        """
+        with self._lock:
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            # Not ours (or returned twice); just make sure it does not leak.
+            if not conn.closed:
+                conn.close()
+            return
+
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        if discard or conn.closed or self._is_expired(pooled) or self._closed:
+            self._discard(pooled)
+            return
+
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(pooled)
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of a ``with`` block.
+
+        The transaction is rolled back on error and whenever the block
+        leaves it uncommitted.
+        """
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    # --- Lifecycle ---
+
+    def warm(self):
+        """Open connections until ``min_size`` are available."""
+        while True:
+            with self._lock:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                pooled = _PooledConnection(self._connect())
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                raise
+            with self._lock:
+                self._created += 1
+                self._idle.appendleft(pooled)
+                self._lock.notify()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        """Close idle connections and refuse further checkouts.
+
+        Connections that are still checked out are closed when returned.
+        """
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._lock.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool counters for sizing and monitoring."""
+        with self._lock:
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_seconds": round(self._wait_time, 6),
+                "max_wait_time_seconds": round(self._max_wait_time, 6),
+                "timeouts": self._timeouts,
+                "connections_created": self._created,
+                "connections_discarded": self._discarded,
+                "failed_health_checks": self._failed_checks,
+            }
+
+    # --- Internals ---
+
+    def _record_wait(self, waited_since: float):
+        elapsed = time.monotonic() - waited_since
+        self._wait_time += elapsed
+        self._max_wait_time = max(self._max_wait_time, elapsed)
+
+    def _is_expired(self, pooled: _PooledConnection) -> bool:
+        now = time.monotonic()
+        if self.max_age and now - pooled.created_at > self.max_age:
+            return True
+        if (
+            self.max_idle
+            and now - pooled.last_used > self.max_idle
+            and self._size > self.min_size
+        ):
+            return True
+        return False
+
+    def _is_usable(self, pooled: _PooledConnection) -> bool:
+        conn = pooled.conn
+        if conn.closed or self._is_expired(pooled):
+            return False
+        if time.monotonic() - pooled.last_used < self.check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding unhealthy pooled connection: {e}")
+            with self._lock:
+                self._failed_checks += 1
+            return False
+
+    def _discard(self, pooled: _PooledConnection):
+        try:
+            if not pooled.conn.closed:
+                pooled.conn.close()
+        except psycopg2.Error:
+            pass
+        with self._lock:
+            self._size -= 1
+            self._discarded += 1
+            self._lock.notify()
+
+    def _check_fork(self):
+        # Sockets inherited across fork() must not be shared with the parent.
+        pid = os.getpid()
+        if pid == self._pid:
+            return
+        with self._lock:
+            if pid == self._pid:
+                return
+            self._pid = pid
+            self._idle.clear()
+            self._in_use.clear()
+            self._size = 0
@@ -1,4 +1,37 @@
-from typing import Generic, TypeVar, Type, List, Optional, Any, Dict
+from typing import Generic, TypeVar, Type, List, Optional, Any, Dict, Sequence
+
+from psycopg2.extras import execute_values
+
+from hiveden.db import aio
+
+
+def _merge_model_data(model: Optional[Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    if model:
+        if isinstance(model, dict):
+            model_data = model
+        else:
+            # If model is provided, convert to dict, excluding None values (to let DB defaults work)
+            # Assuming pydantic model
+            model_data = model.dict(exclude_unset=True) if hasattr(model, 'dict') else model.__dict__
+        
+        # Filter out None values for id/created_at if they are None
+        model_data = {k: v for k, v in model_data.items() if v is not None}
+        data.update(model_data)
+    return data
+
+
+def _rows_to_columns(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    # Dict rows are taken as-is so explicit NULLs keep every row's columns
+    # aligned; models go through the same filtering as create().
+    data = [dict(row) if isinstance(row, dict) else _merge_model_data(row, {}) for row in rows]
+    columns = list(data[0].keys())
+    for item in data[1:]:
+        if set(item.keys()) != set(columns):
+            raise ValueError(
+                f"All rows must set the same columns: {sorted(columns)} != {sorted(item.keys())}"
+            )
+    return data
+
 
 class BaseRepository:
     def __init__(self, manager, table_name: str, model_class: Optional[Type] = None):
@@ -12,92 +45,240 @@ class BaseRepository:
         return row
 
     def get(self, id: int) -> Optional[Any]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = f"SELECT * FROM {self.table_name} WHERE id = %s"
             cursor.execute(query, (id,))
             row = cursor.fetchone()
             return self._to_model(dict(row)) if row else None
-        finally:
-            conn.close()
 
     def get_all(self) -> List[Any]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = f"SELECT * FROM {self.table_name}"
             cursor.execute(query)
             rows = cursor.fetchall()
             return [self._to_model(dict(row)) for row in rows]
-        finally:
-            conn.close()
 
     def create(self, model: Optional[Any] = None, **kwargs) -> Any:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             
-            data = kwargs
-            if model:
-                if isinstance(model, dict):
-                    model_data = model
-                else:
-                    # If model is provided, convert to dict, excluding None values (to let DB defaults work)
-                    # Assuming pydantic model
-                    model_data = model.dict(exclude_unset=True) if hasattr(model, 'dict') else model.__dict__
-                
-                # Filter out None values for id/created_at if they are None
-                model_data = {k: v for k, v in model_data.items() if v is not None}
-                data.update(model_data)
+            data = _merge_model_data(model, kwargs)
 
             columns = ', '.join(data.keys())
             placeholders = ', '.join(['%s'] * len(data))
             
-            query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) RETURNING id"
+            query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) RETURNING *"
             
             cursor.execute(query, tuple(data.values()))
-            last_id = cursor.fetchone()['id']
+            row = cursor.fetchone()
                 
             conn.commit()
-            
-            # Fetch the created record to return full object/dict
-            return self.get(last_id)
-        finally:
-            conn.close()
+            return self._to_model(dict(row))
 
     def update(self, id: int, **kwargs) -> Optional[Any]:
         if not kwargs:
             return self.get(id)
             
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             set_clause = ', '.join([f"{k} = %s" for k in kwargs.keys()])
             values = list(kwargs.values())
             values.append(id)
             
-            query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = %s"
+            query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = %s RETURNING *"
             
             cursor.execute(query, tuple(values))
+            row = cursor.fetchone()
             conn.commit()
             
-            if cursor.rowcount == 0:
-                return None
-                
-            return self.get(id)
-        finally:
-            conn.close()
+            return self._to_model(dict(row)) if row else None
+
+    def create_many(self, rows: Sequence[Any]) -> List[Any]:
+        """Insert many rows with one statement in one transaction.
+
+        Every row (a dict or model) must set the same columns.
+
+        Returns:
+            The inserted rows.
+        """
+        if not rows:
+            return []
+        data = _rows_to_columns(rows)
+        columns = list(data[0].keys())
+        query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES %s RETURNING *"
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            result = execute_values(
+                cursor,
+                query,
+                [tuple(item[c] for c in columns) for item in data],
+                page_size=len(data),
+                fetch=True,
+            )
+            conn.commit()
+        return [self._to_model(dict(row)) for row in result]
+
+    def update_many(self, rows: Sequence[Dict[str, Any]]) -> List[Any]:
+        """Update many rows by ``id`` with one statement in one transaction.
+
+        Each row is a dict holding ``id`` and the columns to set; every row
+        must set the same columns.
+
+        Returns:
+            The updated rows. Ids that matched nothing are left out.
+        """
+        if not rows:
+            return []
+        data = _rows_to_columns(rows)
+        if 'id' not in data[0]:
+            raise ValueError("update_many rows must include 'id'")
+        columns = ['id'] + [c for c in data[0] if c != 'id']
+        if len(columns) == 1:
+            return [row for row in (self.get(item['id']) for item in data) if row]
+
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            # VALUES has no target column to infer types from, so cast each
+            # placeholder to the column's declared type.
+            types = self._column_types(cursor)
+            template = '(' + ', '.join(f"%s::{types[c]}" for c in columns) + ')'
+            set_clause = ', '.join(f"{c} = v.{c}" for c in columns[1:])
+            query = (
+                f"UPDATE {self.table_name} AS t SET {set_clause} "
+                f"FROM (VALUES %s) AS v ({', '.join(columns)}) "
+                f"WHERE t.id = v.id RETURNING t.*"
+            )
+            result = execute_values(
+                cursor,
+                query,
+                [tuple(item[c] for c in columns) for item in data],
+                template=template,
+                page_size=len(data),
+                fetch=True,
+            )
+            conn.commit()
+        return [self._to_model(dict(row)) for row in result]
+
+    def upsert_many(
+        self,
+        rows: Sequence[Any],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        touch_columns: Sequence[str] = (),
+    ) -> List[Any]:
+        """Insert many rows, updating those that collide on ``conflict_columns``.
+
+        Args:
+            rows: Dicts or models; every row must set the same columns. A
+                batch may not contain the same conflict key twice.
+            conflict_columns: Columns of the unique constraint to upsert on.
+            update_columns: Columns overwritten on conflict. Defaults to every
+                inserted column outside ``conflict_columns``.
+            touch_columns: Columns set to ``CURRENT_TIMESTAMP`` on conflict,
+                e.g. ``updated_at``.
+
+        Returns:
+            The inserted or updated rows.
+        """
+        if not rows:
+            return []
+        data = _rows_to_columns(rows)
+        columns = list(data[0].keys())
+        if update_columns is None:
+            update_columns = [c for c in columns if c not in conflict_columns]
+        assignments = [f"{c} = EXCLUDED.{c}" for c in update_columns]
+        assignments += [f"{c} = CURRENT_TIMESTAMP" for c in touch_columns]
+        action = f"DO UPDATE SET {', '.join(assignments)}" if assignments else "DO NOTHING"
+        query = (
+            f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES %s "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {action} RETURNING *"
+        )
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            result = execute_values(
+                cursor,
+                query,
+                [tuple(item[c] for c in columns) for item in data],
+                page_size=len(data),
+                fetch=True,
+            )
+            conn.commit()
+        return [self._to_model(dict(row)) for row in result]
+
+    def _column_types(self, cursor) -> Dict[str, str]:
+        cursor.execute(
+            "SELECT attname, format_type(atttypid, atttypmod) AS type "
+            "FROM pg_attribute "
+            "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped",
+            (self.table_name,),
+        )
+        return {row['attname']: row['type'] for row in cursor.fetchall()}
 
     def delete(self, id: int) -> bool:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = f"DELETE FROM {self.table_name} WHERE id = %s"
             cursor.execute(query, (id,))
             conn.commit()
             return cursor.rowcount > 0
-        finally:
-            conn.close()
 
 
+class AsyncBaseRepository:
+    """Asyncio counterpart of BaseRepository for use from async endpoints.
+
+    Queries run on ``DatabaseManager.aconnection()`` and never block the
+    event loop. Each statement commits on its own.
+    """
+
+    def __init__(self, manager, table_name: str, model_class: Optional[Type] = None):
+        self.manager = manager
+        self.table_name = table_name
+        self.model_class = model_class
+
+    def _to_model(self, row: Dict[str, Any]) -> Any:
+        if self.model_class:
+            return self.model_class(**row)
+        return row
+
+    async def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        async with self.manager.aconnection() as conn:
+            cursor = await aio.execute(conn, query, params)
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    async def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        async with self.manager.aconnection() as conn:
+            cursor = await aio.execute(conn, query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    async def get(self, id: int) -> Optional[Any]:
+        row = await self.fetch_one(f"SELECT * FROM {self.table_name} WHERE id = %s", (id,))
+        return self._to_model(row) if row else None
+
+    async def get_all(self) -> List[Any]:
+        rows = await self.fetch_all(f"SELECT * FROM {self.table_name}")
+        return [self._to_model(row) for row in rows]
+
+    async def create(self, model: Optional[Any] = None, **kwargs) -> Any:
+        data = _merge_model_data(model, kwargs)
+        columns = ', '.join(data.keys())
+        placeholders = ', '.join(['%s'] * len(data))
+        query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) RETURNING *"
+        row = await self.fetch_one(query, tuple(data.values()))
+        return self._to_model(row)
+
+    async def update(self, id: int, **kwargs) -> Optional[Any]:
+        if not kwargs:
+            return await self.get(id)
+
+        set_clause = ', '.join([f"{k} = %s" for k in kwargs.keys()])
+        query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = %s RETURNING *"
+        row = await self.fetch_one(query, (*kwargs.values(), id))
+        return self._to_model(row) if row else None
+
+    async def delete(self, id: int) -> bool:
+        async with self.manager.aconnection() as conn:
+            cursor = await aio.execute(conn, f"DELETE FROM {self.table_name} WHERE id = %s", (id,))
+            return cursor.rowcount > 0
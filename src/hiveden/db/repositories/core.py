@@ -7,46 +7,49 @@ class ModuleRepository(BaseRepository):
         super().__init__(manager, 'modules', model_class=Module)
 
     def get_by_name(self, name: str) -> Optional[Module]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM modules WHERE name = %s"
             cursor.execute(query, (name,))
             row = cursor.fetchone()
             return self._to_model(dict(row)) if row else None
-        finally:
-            conn.close()
 
     def get_by_short_name(self, short_name: str) -> Optional[Module]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM modules WHERE short_name = %s"
             cursor.execute(query, (short_name,))
             row = cursor.fetchone()
             return self._to_model(dict(row)) if row else None
-        finally:
-            conn.close()
 
 class ConfigRepository(BaseRepository):
     def __init__(self, manager):
         super().__init__(manager, 'configs')
 
     def get_by_module_and_key(self, module_id: int, key: str) -> Optional[Dict[str, Any]]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM configs WHERE module_id = %s AND key = %s"
             cursor.execute(query, (module_id, key))
             row = cursor.fetchone()
             return dict(row) if row else None
-        finally:
-            conn.close()
+
+    def get_module_values(self, module_short_name: str) -> Dict[str, Optional[str]]:
+        """Get every configuration value of a module in a single query."""
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            query = """
+                SELECT c.key, c.value
+                FROM configs c
+                JOIN modules m ON m.id = c.module_id
+                WHERE m.short_name = %s
+            """
+            cursor.execute(query, (module_short_name,))
+            return {row['key']: row['value'] for row in cursor.fetchall()}
 
     def set_value(self, module_short_name: str, key: str, value: str) -> Dict[str, Any]:
         """Set a configuration value, creating or updating as needed."""
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             
             # 1. Get Module ID
@@ -81,6 +84,4 @@ class ConfigRepository(BaseRepository):
             
             conn.commit()
             return dict(cursor.fetchone())
-        finally:
-            conn.close()
 
@@ -1,6 +1,6 @@
 import os.path
 from typing import Optional, List
-from hiveden.db.repositories.base import BaseRepository
+from hiveden.db.repositories.base import AsyncBaseRepository, BaseRepository
 from hiveden.explorer.models import FilesystemLocation
 
 class LocationRepository(BaseRepository):
@@ -14,8 +14,7 @@ class LocationRepository(BaseRepository):
         return super()._to_model(row)
 
     def get_by_key(self, key: str) -> Optional[FilesystemLocation]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM filesystem_locations WHERE key = %s"
             cursor.execute(query, (key,))
@@ -36,30 +35,36 @@ class LocationRepository(BaseRepository):
                 created_at=row['created_at'],
                 updated_at=row['updated_at']
             )
-        finally:
-            conn.close()
 
     def get_system_locations(self) -> List[FilesystemLocation]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM filesystem_locations WHERE type = 'system_root'"
             cursor.execute(query)
             rows = cursor.fetchall()
-            return [
-                FilesystemLocation(
-                    id=row['id'],
-                    key=row['key'],
-                    label=row['label'],
-                    name=row['label'],
-                    path=row['path'],
-                    type=row['type'],
-                    description=row['description'],
-                    is_editable=row['is_editable'],
-                    created_at=row['created_at'],
-                    updated_at=row['updated_at'],
-                    exists=(os.path.exists(row['path']) and os.path.isdir(row['path']) and not row['path'].startswith("/hiveden-temp-root"))
-                ) for row in rows
-            ]
-        finally:
-            conn.close()
+            return [_row_to_system_location(row) for row in rows]
+
+
+class AsyncLocationRepository(AsyncBaseRepository):
+    def __init__(self, manager):
+        super().__init__(manager, 'filesystem_locations', model_class=FilesystemLocation)
+
+    async def get_system_locations(self) -> List[FilesystemLocation]:
+        rows = await self.fetch_all("SELECT * FROM filesystem_locations WHERE type = 'system_root'")
+        return [_row_to_system_location(row) for row in rows]
+
+
+def _row_to_system_location(row) -> FilesystemLocation:
+    return FilesystemLocation(
+        id=row['id'],
+        key=row['key'],
+        label=row['label'],
+        name=row['label'],
+        path=row['path'],
+        type=row['type'],
+        description=row['description'],
+        is_editable=row['is_editable'],
+        created_at=row['created_at'],
+        updated_at=row['updated_at'],
+        exists=(os.path.exists(row['path']) and os.path.isdir(row['path']) and not row['path'].startswith("/hiveden-temp-root"))
+    )
@@ -1,8 +1,13 @@
-from typing import List, Dict, Any, Optional
-from psycopg2.extras import Json
-from hiveden.db.repositories.base import BaseRepository
+import datetime
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from psycopg2.extras import Json, execute_values
+from hiveden.db.repositories.base import AsyncBaseRepository, BaseRepository
 from hiveden.api.dtos import LogEntry
 
+# Monthly partitions created by hiveden_ensure_logs_partition().
+_PARTITION_NAME = re.compile(r"^logs_p(\d{4})(\d{2})$")
+
 class LogRepository(BaseRepository):
     def __init__(self, manager):
         super().__init__(manager, 'logs', LogEntry)
@@ -25,31 +30,145 @@ class LogRepository(BaseRepository):
         }
         return self.create(**data)
 
-    def get_logs(self, limit: int = 100, offset: int = 0, level: Optional[str] = None, module: Optional[str] = None) -> List[LogEntry]:
-        conn = self.manager.get_connection()
-        try:
+    def insert_logs(self, entries: List[Dict[str, Any]]) -> int:
+        """Insert many log entries in one statement and one transaction."""
+        if not entries:
+            return 0
+        rows = [
+            (
+                entry["message"],
+                entry.get("level", "info"),
+                entry.get("actor", "system"),
+                entry.get("action"),
+                entry.get("module"),
+                Json(entry.get("metadata") or {}),
+                entry.get("created_at"),
+            )
+            for entry in entries
+        ]
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            execute_values(
+                cursor,
+                "INSERT INTO logs (message, level, actor, action, module, metadata, created_at) VALUES %s",
+                rows,
+                template="(%s, %s, %s, %s, %s, %s, COALESCE(%s, CURRENT_TIMESTAMP))",
+                page_size=len(rows),
+            )
+            conn.commit()
+        return len(rows)
+
+    def get_logs(self, limit: int = 100, offset: int = 0, level: Optional[str] = None, module: Optional[str] = None,
+                 before_id: Optional[int] = None, before_ts: Optional[datetime.datetime] = None) -> List[LogEntry]:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
-            
-            query = "SELECT * FROM logs"
-            conditions = []
-            params = []
-            
-            if level:
-                conditions.append("level = %s")
-                params.append(level)
-            
-            if module:
-                conditions.append("module = %s")
-                params.append(module)
-            
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-                
-            query += " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
-            params.extend([limit, offset])
-            
-            cursor.execute(query, tuple(params))
+            cursor.execute(*_build_logs_query(limit, offset, level, module, before_id, before_ts))
             rows = cursor.fetchall()
             return [self._to_model(dict(row)) for row in rows]
-        finally:
-            conn.close()
\ No newline at end of file
+
+    def ensure_partitions(self, months_ahead: int = 2, today: Optional[datetime.date] = None) -> List[str]:
+        """Create monthly partitions from the current month up to ``months_ahead``."""
+        month = _month_start(today or datetime.date.today())
+        months = [_add_months(month, n) for n in range(months_ahead + 1)]
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            created = []
+            for start in months:
+                cursor.execute("SELECT hiveden_ensure_logs_partition(%s) AS name", (start,))
+                created.append(cursor.fetchone()['name'])
+            conn.commit()
+        return created
+
+    def drop_partitions_before(self, cutoff: datetime.date) -> List[str]:
+        """Drop monthly partitions whose whole range is older than ``cutoff``.
+
+        Dropping a partition is a metadata operation, unlike a DELETE that
+        has to visit and vacuum every expired row.
+        """
+        cutoff = _month_start(cutoff)
+        with self.manager.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'logs'::regclass"
+            )
+            expired = []
+            for row in cursor.fetchall():
+                match = _PARTITION_NAME.match(row['relname'])
+                if match and _add_months(datetime.date(int(match[1]), int(match[2]), 1), 1) <= cutoff:
+                    expired.append(row['relname'])
+            for name in sorted(expired):
+                cursor.execute(f'DROP TABLE "{name}"')
+            conn.commit()
+        return sorted(expired)
+
+    def maintain_partitions(self, months_ahead: int = 2, retention_months: int = 0,
+                            today: Optional[datetime.date] = None) -> Dict[str, List[str]]:
+        """Pre-create upcoming partitions and apply the retention window.
+
+        Args:
+            months_ahead: Number of future months to create partitions for.
+            retention_months: Months of logs to keep, including the current
+                one. ``0`` keeps everything.
+        """
+        today = today or datetime.date.today()
+        result = {"created": self.ensure_partitions(months_ahead, today), "dropped": []}
+        if retention_months > 0:
+            cutoff = _add_months(_month_start(today), 1 - retention_months)
+            result["dropped"] = self.drop_partitions_before(cutoff)
+        return result
+
+
+class AsyncLogRepository(AsyncBaseRepository):
+    def __init__(self, manager):
+        super().__init__(manager, 'logs', LogEntry)
+
+    async def get_logs(self, limit: int = 100, offset: int = 0, level: Optional[str] = None, module: Optional[str] = None,
+                       before_id: Optional[int] = None, before_ts: Optional[datetime.datetime] = None) -> List[LogEntry]:
+        rows = await self.fetch_all(*_build_logs_query(limit, offset, level, module, before_id, before_ts))
+        return [self._to_model(row) for row in rows]
+
+
+def _month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def _add_months(month: datetime.date, months: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _build_logs_query(limit: int, offset: int, level: Optional[str], module: Optional[str],
+                      before_id: Optional[int] = None,
+                      before_ts: Optional[datetime.datetime] = None) -> Tuple[str, tuple]:
+    query = "SELECT * FROM logs"
+    conditions = []
+    params = []
+
+    # Keyset cursor: rows strictly after (before_ts, before_id) in
+    # newest-first order, served from the (created_at, id) indexes.
+    if before_id is not None and before_ts is not None:
+        conditions.append("(created_at, id) < (%s, %s)")
+        params.extend([before_ts, before_id])
+    elif before_id is not None:
+        conditions.append("(created_at, id) < (SELECT created_at, id FROM logs WHERE id = %s LIMIT 1)")
+        params.append(before_id)
+    elif before_ts is not None:
+        conditions.append("created_at < %s")
+        params.append(before_ts)
+    
+    if level:
+        conditions.append("level = %s")
+        params.append(level)
+    
+    if module:
+        conditions.append("module = %s")
+        params.append(module)
+    
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+        
+    query += " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+    params.extend([limit, offset])
+    return query, tuple(params)
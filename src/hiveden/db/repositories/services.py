@@ -9,15 +9,12 @@ class ServiceTemplateRepository(BaseRepository):
         super().__init__(manager, 'service_templates', model_class=ServiceTemplate)
 
     def get_by_slug(self, slug: str) -> Optional[ServiceTemplate]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM service_templates WHERE slug = %s"
             cursor.execute(query, (slug,))
             row = cursor.fetchone()
             return self._to_model(dict(row)) if row else None
-        finally:
-            conn.close()
 
     def create(self, model: Optional[ServiceTemplate] = None, **kwargs) -> ServiceTemplate:
         # Override to handle JSON serialization if needed, though BaseRepository might need adjustment 
@@ -45,15 +42,12 @@ class ManagedServiceRepository(BaseRepository):
         super().__init__(manager, 'managed_services', model_class=ManagedService)
 
     def get_by_identifier(self, identifier: str, type: str) -> Optional[ManagedService]:
-        conn = self.manager.get_connection()
-        try:
+        with self.manager.connection() as conn:
             cursor = conn.cursor()
             query = "SELECT * FROM managed_services WHERE identifier = %s AND type = %s AND deleted_at IS NULL"
             cursor.execute(query, (identifier, type))
             row = cursor.fetchone()
             return self._to_model(dict(row)) if row else None
-        finally:
-            conn.close()
 
     def create(self, model: Optional[ManagedService] = None, **kwargs) -> ManagedService:
         data = kwargs
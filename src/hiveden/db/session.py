@@ -15,5 +15,11 @@ def get_db_manager() -> DatabaseManager:
             db_name = os.getenv("DB_NAME", "hiveden")
             db_url = f"postgresql://{db_user}:{db_pass}@{db_host}/{db_name}"
             
-        _db_manager = DatabaseManager(db_url)
+        _db_manager = DatabaseManager(
+            db_url,
+            pool_min_size=int(os.getenv("HIVEDEN_DB_POOL_MIN_SIZE", "1")),
+            pool_max_size=int(os.getenv("HIVEDEN_DB_POOL_MAX_SIZE", "10")),
+            pool_max_age=float(os.getenv("HIVEDEN_DB_POOL_MAX_AGE_SECONDS", "1800")),
+            pool_timeout=float(os.getenv("HIVEDEN_DB_POOL_TIMEOUT_SECONDS", "30")),
+        )
     return _db_manager
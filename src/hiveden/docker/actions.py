@@ -1,16 +1,103 @@
 from docker import errors
 
+from hiveden.config.settings import config as app_config
+from hiveden.docker.bulk import run_dependency_graph
 from hiveden.docker.containers import DockerManager
 from hiveden.docker.models import DockerContainer
 from hiveden.docker.networks import create_network, list_networks
 
 
-def apply_configuration(config):
-    """Apply the docker configuration."""
+def _settings(container: DockerContainer, network_name):
+    return dict(
+        command=container.command,
+        dependencies=container.dependencies,
+        network_name=network_name,
+        env=container.env,
+        ports=container.ports,
+        mounts=container.mounts,
+        devices=container.devices,
+        labels=container.labels,
+        ingress_config=container.ingress_config,
+        privileged=container.privileged,
+    )
+
+
+def plan_containers(manager: DockerManager, containers: list[DockerContainer], network_name=None) -> list[dict]:
+    """What applying ``containers`` would do, one entry per container.
+
+    Each entry is ``{"name", "action", "changes"}``; see
+    ``DockerManager.plan_container``.
+    """
+    return [
+        manager.plan_container(c.name, c.image, **_settings(c, network_name))
+        for c in containers
+    ]
+
+
+def format_plan(plan: list[dict]) -> list[str]:
+    lines = []
+    for entry in plan:
+        line = f"{entry['action']}: {entry['name']}"
+        if entry["changes"]:
+            line += f" ({', '.join(entry['changes'])} changed)"
+        lines.append(line)
+    return lines
+
+
+def apply_containers(
+    manager: DockerManager,
+    containers: list[DockerContainer],
+    network_name=None,
+    max_workers=None,
+    progress=None,
+) -> dict:
+    """Create or update containers, leaving unchanged ones running.
+
+    Containers are handled in parallel as soon as the containers they depend
+    on are done; a failure skips everything that depends on it.
+
+    Returns:
+        ``{name: {"status", "message"}}`` as from ``run_dependency_graph``.
+    """
+    by_name = {c.name: c for c in containers}
+    # Dependencies outside the configuration must already exist.
+    graph = {
+        c.name: [d for d in c.dependencies or [] if d in by_name and d != c.name]
+        for c in containers
+    }
+
+    def apply(name):
+        container = by_name[name]
+        entry = manager.plan_container(container.name, container.image, **_settings(container, network_name))
+        manager.create_container(name=container.name, image=container.image, **_settings(container, network_name))
+        if entry["action"] == "recreate":
+            return f"recreated ({', '.join(entry['changes'])} changed)"
+        return {"create": "created", "unchanged": "unchanged"}[entry["action"]]
+
+    return run_dependency_graph(
+        graph,
+        apply,
+        max_workers=max_workers or app_config.docker_bulk_workers,
+        progress=progress,
+    )
+
+
+def apply_configuration(config, dry_run=False):
+    """Apply the docker configuration.
+
+    Only containers whose configuration changed are recreated. With
+    ``dry_run`` the plan is reported and nothing is changed.
+    """
     messages = []
     network_name = config["network_name"]
-    
+
     manager = DockerManager(network_name=network_name)
+    containers = [DockerContainer(**c) for c in config["containers"]]
+
+    if dry_run:
+        if not list_networks(names=[network_name]):
+            messages.append(f"create: network '{network_name}'")
+        return messages + format_plan(plan_containers(manager, containers, network_name))
 
     # Create network
     try:
@@ -23,25 +110,17 @@ def apply_configuration(config):
     except errors.APIError as e:
         messages.append(f"Error creating network: {e}")
 
-    # Create containers
-    for container_config in config["containers"]:
-        container = DockerContainer(**container_config)
-        try:
-            manager.create_container(
-                image=container.image,
-                name=container.name,
-                command=container.command,
-                dependencies=container.dependencies,
-                detach=True,
-                network_name=network_name,
-                env=container.env,
-                ports=container.ports,
-                mounts=container.mounts,
-                labels=container.labels,
-            )
-        except errors.ImageNotFound as e:
-            messages.append(str(e))
-        except errors.APIError as e:
-            messages.append(f"Error creating container '{container.name}': {e}")
+    try:
+        results = apply_containers(manager, containers, network_name)
+    except ValueError as e:
+        # Circular dependencies
+        messages.append(str(e))
+        return messages
+    for container in containers:
+        result = results[container.name]
+        if result["status"] == "done":
+            messages.append(f"Container '{container.name}' {result['message']}.")
+        else:
+            messages.append(f"Error creating container '{container.name}': {result['message']}")
 
     return messages
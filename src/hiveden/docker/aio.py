@@ -0,0 +1,301 @@
+"""Asyncio access to the Docker Engine API.
+
+Requests are written with h11 over an asyncio connection to the daemon
+socket (``DOCKER_HOST``, ``unix:///var/run/docker.sock`` by default), so
+awaiting a container stop or a log follow never occupies a worker thread.
+``AsyncDockerManager`` mirrors the read and lifecycle methods of
+``DockerManager`` and returns the same models.
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import h11
+from docker import errors
+
+from hiveden.docker.containers import (
+    container_from_attrs,
+    container_summaries,
+    summary_fields,
+    summary_filters,
+)
+from hiveden.docker.models import Container, ContainerSummary
+
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+READ_SIZE = 65536
+
+# Log stream frame header: stream type, 3 padding bytes, big-endian size.
+LOG_HEADER_SIZE = 8
+
+
+class AsyncDockerClient:
+    """Minimal asyncio HTTP/1.1 client for the Docker daemon.
+
+    Every request uses its own connection, so concurrent calls and long-lived
+    streams never wait on each other.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = 60):
+        self.base_url = base_url or os.getenv("DOCKER_HOST") or DEFAULT_DOCKER_HOST
+        self.timeout = timeout
+        target = urlsplit(self.base_url)
+        if target.scheme in ("unix", "http+unix"):
+            self._socket_path = target.path
+            self._address = None
+        elif target.scheme in ("tcp", "http"):
+            self._socket_path = None
+            self._address = (target.hostname, target.port or 2375)
+        else:
+            raise ValueError(f"Unsupported Docker host for the async client: {self.base_url}")
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Any = None,
+        timeout: Any = "default",
+    ) -> Any:
+        """Send a request and return the decoded JSON body (None when empty).
+
+        ``timeout`` bounds the whole call; pass None for calls that last as
+        long as the daemon needs, such as stopping a container.
+        """
+        timeout = self.timeout if timeout == "default" else timeout
+
+        async def call():
+            async with self._exchange(method, path, params, body) as (response, chunks):
+                data = b"".join([chunk async for chunk in chunks])
+            return json.loads(data) if data else None
+
+        return await asyncio.wait_for(call(), timeout)
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield raw body chunks as the daemon sends them."""
+        async with self._exchange(method, path, params, None) as (_response, chunks):
+            async for chunk in chunks:
+                yield chunk
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._socket_path:
+            return await asyncio.open_unix_connection(self._socket_path)
+        return await asyncio.open_connection(*self._address)
+
+    @asynccontextmanager
+    async def _exchange(self, method, path, params, body):
+        if params:
+            query = {k: _param(v) for k, v in params.items() if v is not None}
+            path = f"{path}?{urlencode(query)}" if query else path
+        headers = [("Host", "docker"), ("Accept", "application/json")]
+        payload = b""
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers += [("Content-Type", "application/json")]
+        headers += [("Content-Length", str(len(payload)))]
+
+        reader, writer = await self._open()
+        conn = h11.Connection(our_role=h11.CLIENT)
+        try:
+            writer.write(conn.send(h11.Request(method=method, target=path, headers=headers)))
+            if payload:
+                writer.write(conn.send(h11.Data(data=payload)))
+            writer.write(conn.send(h11.EndOfMessage()))
+            await writer.drain()
+
+            response = await _next_event(conn, reader)
+            while isinstance(response, h11.InformationalResponse):
+                response = await _next_event(conn, reader)
+
+            async def chunks():
+                while True:
+                    event = await _next_event(conn, reader)
+                    if isinstance(event, h11.Data):
+                        yield bytes(event.data)
+                    elif isinstance(event, (h11.EndOfMessage, h11.ConnectionClosed)):
+                        return
+
+            if response.status_code >= 400:
+                data = b"".join([chunk async for chunk in chunks()])
+                raise _api_error(method, path, response, data)
+            yield response, chunks()
+        finally:
+            writer.close()
+
+
+async def _next_event(conn: h11.Connection, reader: asyncio.StreamReader):
+    while True:
+        event = conn.next_event()
+        if event is h11.NEED_DATA:
+            conn.receive_data(await reader.read(READ_SIZE))
+            continue
+        return event
+
+
+def _param(value):
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _api_error(method: str, path: str, response, data: bytes) -> errors.APIError:
+    try:
+        explanation = json.loads(data).get("message")
+    except (ValueError, AttributeError):
+        explanation = data.decode(errors="replace")
+    # docker.errors.APIError formats itself from a requests-like response.
+    shim = SimpleNamespace(
+        status_code=response.status_code,
+        reason=response.reason.decode(errors="replace"),
+        url=f"{method} {path}",
+    )
+    error_class = errors.NotFound if response.status_code == 404 else errors.APIError
+    return error_class(explanation, response=shim, explanation=explanation)
+
+
+def demux_log_frames(buffer: bytes) -> Tuple[list, bytes]:
+    """Split multiplexed log stream bytes into ``(stream, payload)`` frames.
+
+    Returns the complete frames and the unconsumed remainder.
+    """
+    frames = []
+    while len(buffer) >= LOG_HEADER_SIZE:
+        size = int.from_bytes(buffer[4:LOG_HEADER_SIZE], "big")
+        end = LOG_HEADER_SIZE + size
+        if len(buffer) < end:
+            break
+        frames.append((buffer[0], buffer[LOG_HEADER_SIZE:end]))
+        buffer = buffer[end:]
+    return frames, buffer
+
+
+def _unix_time(value: Optional[float]) -> Optional[str]:
+    # The daemon parses "seconds.nanoseconds".
+    return None if value is None else f"{value:.9f}"
+
+
+_client: Optional[AsyncDockerClient] = None
+
+
+def get_async_docker_client() -> AsyncDockerClient:
+    global _client
+    if _client is None:
+        _client = AsyncDockerClient()
+    return _client
+
+
+class AsyncDockerManager:
+    """Asyncio counterpart of ``DockerManager`` for API routers."""
+
+    def __init__(self, network_name="hiveden-network", client: Optional[AsyncDockerClient] = None):
+        self.network_name = network_name
+        self.client = client or get_async_docker_client()
+
+    async def inspect_container(self, container_id) -> Dict[str, Any]:
+        return await self.client.request("GET", f"/containers/{container_id}/json")
+
+    async def get_container(self, container_id) -> Container:
+        """Get a Docker container by its ID or name."""
+        attrs = await self.inspect_container(container_id)
+        try:
+            image = await self.client.request("GET", f"/images/{attrs.get('Image')}/json")
+            tags = image.get("RepoTags") or []
+        except errors.NotFound:
+            tags = None
+        return container_from_attrs(attrs, tags, self.network_name)
+
+    async def list_container_summaries(self, all=False, only_managed=False, names=None, fields=None) -> list[ContainerSummary]:
+        """List containers from a single ``containers/json`` call."""
+        fields = summary_fields(fields)
+        rows = await self.client.request(
+            "GET",
+            "/containers/json",
+            {"all": all, "filters": summary_filters(only_managed, names)},
+        )
+        image_tags = {}
+        if rows and "Image" in fields:
+            images = await self.client.request("GET", "/images/json", {"all": True})
+            image_tags = {
+                image["Id"]: [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"]
+                for image in images
+            }
+        return container_summaries(rows, image_tags, fields, self.network_name)
+
+    async def start_container(self, container_id) -> Container:
+        """Start a stopped Docker container."""
+        await self.client.request("POST", f"/containers/{container_id}/start")
+        return await self.get_container(container_id)
+
+    async def stop_container(self, container_id, timeout: Optional[int] = None) -> Container:
+        """Stop a running container, waiting for it without blocking a thread."""
+        await self.client.request(
+            "POST", f"/containers/{container_id}/stop", {"t": timeout}, timeout=None
+        )
+        return await self.get_container(container_id)
+
+    async def restart_container(self, container_id, timeout: Optional[int] = None) -> Container:
+        """Restart a Docker container."""
+        await self.client.request(
+            "POST", f"/containers/{container_id}/restart", {"t": timeout}, timeout=None
+        )
+        return await self.get_container(container_id)
+
+    async def stream_logs(self, container_id, follow=True, tail=100, timestamps=False) -> AsyncIterator[str]:
+        """Stream logs from a Docker container.
+
+        Args:
+            container_id: Container ID or name
+            follow: If True, stream logs in real-time
+            tail: Number of lines to show from the end (default 100)
+
+        Yields:
+            Log output as it is generated
+        """
+        async for _stream, text in self.stream_log_frames(
+            container_id, follow=follow, tail=tail, timestamps=timestamps
+        ):
+            yield text
+
+    async def stream_log_frames(
+        self,
+        container_id,
+        follow=True,
+        tail=100,
+        timestamps=False,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Yield ``(stream, text)`` log frames; stream is 1 for stdout, 2 for stderr.
+
+        ``since`` and ``until`` are UNIX timestamps. TTY containers have a
+        single combined stream reported as stdout.
+        """
+        attrs = await self.inspect_container(container_id)
+        tty = attrs.get("Config", {}).get("Tty", False)
+        params = {
+            "stdout": True,
+            "stderr": True,
+            "follow": follow,
+            "tail": tail if tail is not None else "all",
+            "timestamps": timestamps,
+            "since": _unix_time(since),
+            "until": _unix_time(until),
+        }
+        buffer = b""
+        async for chunk in self.client.stream("GET", f"/containers/{container_id}/logs", params):
+            if tty:
+                yield 1, chunk.decode("utf-8", errors="replace")
+                continue
+            frames, buffer = demux_log_frames(buffer + chunk)
+            for stream, payload in frames:
+                yield stream, payload.decode("utf-8", errors="replace")
@@ -0,0 +1,96 @@
+"""Dependency-ordered, parallel execution of container operations.
+
+Containers form a DAG through their ``hiveden.dependencies`` labels. Starting
+runs dependencies before their dependents; stopping and removing run
+dependents first. Independent branches run concurrently on a bounded thread
+pool, and a container is skipped when one of the containers it waits on
+failed.
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from hiveden.docker.dependencies import dependency_levels
+
+BULK_ACTIONS = ("start", "stop", "restart", "remove")
+
+
+def reverse_graph(graph: Dict[str, Sequence[str]]) -> Dict[str, Set[str]]:
+    """Map each name to the names that depend on it."""
+    dependents: Dict[str, Set[str]] = {name: set() for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            if dep in dependents and dep != name:
+                dependents[dep].add(name)
+    return dependents
+
+
+def run_dependency_graph(
+    graph: Dict[str, Sequence[str]],
+    task: Callable[[str], Optional[str]],
+    max_workers: int = 8,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, dict]:
+    """Run ``task`` for every name once all of its prerequisites succeeded.
+
+    ``graph`` maps a name to the names that must finish first. ``task`` may
+    return a message for the progress log; exceptions mark the name failed
+    and everything waiting on it skipped.
+
+    Returns:
+        ``{name: {"status": "done" | "failed" | "skipped", "message": str}}``
+    """
+    dependency_levels(graph)  # reject cycles before touching anything
+    waiting = {
+        name: {dep for dep in deps if dep in graph and dep != name}
+        for name, deps in graph.items()
+    }
+    dependents = reverse_graph(graph)
+    results: Dict[str, dict] = {}
+
+    def report(name: str, status: str, message: str):
+        results[name] = {"status": status, "message": message}
+        if progress:
+            progress(f"[{status}] {name}: {message}")
+
+    def skip_dependents_of(name: str):
+        stack = list(dependents[name])
+        while stack:
+            dependent = stack.pop()
+            if dependent in waiting:
+                del waiting[dependent]
+                report(dependent, "skipped", f"'{name}' did not complete")
+                stack.extend(dependents[dependent])
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running = {}
+
+        def submit_ready():
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                running[pool.submit(task, name)] = name
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    message = future.result()
+                except Exception as e:
+                    report(name, "failed", str(e))
+                    skip_dependents_of(name)
+                    continue
+                report(name, "done", message or "ok")
+                for dependent in dependents[name]:
+                    if dependent in waiting:
+                        waiting[dependent].discard(name)
+            submit_ready()
+    return results
+
+
+def summarize(results: Dict[str, dict]) -> Dict[str, List[str]]:
+    """Group result names by status."""
+    summary = {"done": [], "failed": [], "skipped": []}
+    for name, result in results.items():
+        summary[result["status"]].append(name)
+    return summary
@@ -0,0 +1,173 @@
+"""The process-wide Docker client.
+
+Every module talks to the daemon through ``get_docker_client()``, so they
+share one HTTP connection pool, and nothing connects to Docker until the
+first call (the client probes the daemon for its API version when created);
+managers declare ``client = SharedDockerClient()`` to get it on first use.
+Pool size and timeout come from the ``HIVEDEN_DOCKER_*`` settings.
+
+Each API request made through the client is timed and counted per endpoint;
+see ``GET /docker/api-stats``.
+"""
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import docker
+
+from hiveden.config.settings import config
+from hiveden.db.instrumentation import SAMPLE_WINDOW, percentile
+
+# Path segments that name a collection action rather than an object.
+_COLLECTION_ACTIONS = {"json", "create", "prune", "search", "load", "get", "build"}
+_OBJECTS = {"containers", "images", "networks", "volumes", "exec", "plugins", "services", "tasks", "nodes"}
+_VERSION_PREFIX = re.compile(r"^/v\d+(?:\.\d+)?/")
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Group requests by API endpoint, e.g. ``GET /containers/{id}/json``."""
+    path = url.split("://", 1)[-1]
+    path = path[path.find("/"):] if "/" in path else "/"
+    path = _VERSION_PREFIX.sub("/", path.split("?", 1)[0])
+    parts = path.strip("/").split("/")
+    if len(parts) > 1 and parts[0] in _OBJECTS and parts[1] not in _COLLECTION_ACTIONS:
+        # Image references contain slashes; the action is the last segment.
+        action = parts[-1] if len(parts) > 2 and parts[-1].isalpha() else None
+        parts = [parts[0], "{id}"] + ([action] if action else [])
+    return f"{method.upper()} /{'/'.join(parts)}"
+
+
+class _Endpoint:
+    __slots__ = ("calls", "errors", "total", "max", "samples")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+
+class DockerApiStats:
+    """Call counts and latency of Docker API requests, per endpoint.
+
+    Latency is the time until the response was read, or until headers for
+    streamed responses (logs, events, pulls).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+
+    def record(self, key: str, duration: float, error: bool = False):
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = _Endpoint()
+            endpoint.calls += 1
+            endpoint.errors += int(error)
+            endpoint.total += duration
+            endpoint.max = max(endpoint.max, duration)
+            endpoint.samples.append(duration)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            ranked = sorted(self._endpoints.items(), key=lambda item: item[1].total, reverse=True)
+            endpoints = [
+                {
+                    "endpoint": key,
+                    "calls": e.calls,
+                    "errors": e.errors,
+                    "total_seconds": round(e.total, 6),
+                    "max_seconds": round(e.max, 6),
+                    "p50_seconds": round(percentile(list(e.samples), 50), 6),
+                    "p95_seconds": round(percentile(list(e.samples), 95), 6),
+                }
+                for key, e in ranked
+            ]
+        return {
+            "pool_size": config.docker_pool_size,
+            "timeout_seconds": config.docker_timeout,
+            "client_created": _client is not None,
+            "calls": sum(e["calls"] for e in endpoints),
+            "endpoints": endpoints,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+api_stats = DockerApiStats()
+
+
+def instrument(docker_client, stats: Optional[DockerApiStats] = None):
+    """Record every HTTP request ``docker_client`` makes in ``stats``."""
+    stats = stats or api_stats
+    api = docker_client.api
+    request = api.request
+
+    def timed_request(method, url, *args, **kwargs):
+        started = time.perf_counter()
+        error = True
+        try:
+            response = request(method, url, *args, **kwargs)
+            error = response.status_code >= 400
+            return response
+        finally:
+            stats.record(endpoint_key(method, url), time.perf_counter() - started, error)
+
+    # APIClient is a requests.Session; get/post/... all go through request().
+    api.request = timed_request
+    return docker_client
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_docker_client():
+    """The shared ``docker.DockerClient``, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = instrument(
+                    docker.from_env(
+                        timeout=config.docker_timeout,
+                        max_pool_size=config.docker_pool_size,
+                    )
+                )
+    return _client
+
+
+class SharedDockerClient:
+    """Class attribute giving instances the shared client on first access.
+
+    Constructing a manager does not connect to Docker; assigning the
+    attribute (e.g. a mock in tests) overrides it for that instance.
+    """
+
+    def __set_name__(self, owner, name):
+        self.attribute = f"_{name}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        docker_client = instance.__dict__.get(self.attribute)
+        if docker_client is None:
+            docker_client = instance.__dict__[self.attribute] = get_docker_client()
+        return docker_client
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.attribute] = value
+
+
+def close_docker_client():
+    global _client
+    with _client_lock:
+        docker_client, _client = _client, None
+    if docker_client is not None:
+        docker_client.close()
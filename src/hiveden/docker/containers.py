@@ -1,43 +1,246 @@
 import os
+import re
+import socket
+import time
 
-import docker
 from docker import errors
 
 from hiveden.apps.pihole import PiHoleManager
 from hiveden.apps.traefik import generate_traefik_labels
 from hiveden.config import config as app_config
 from hiveden.config.utils.domain import get_system_domain_value
+from hiveden.docker.bulk import BULK_ACTIONS, reverse_graph, run_dependency_graph
+from hiveden.docker.client import SharedDockerClient
 from hiveden.docker.dependencies import (
     DEPENDENCIES_LABEL_KEY,
     evaluate_dependencies,
     parse_dependencies_label,
     serialize_dependencies_label,
 )
-from hiveden.docker.images import image_exists, pull_image
-from hiveden.docker.models import Container, Device, EnvVar, IngressConfig, Mount, Port
+from hiveden.docker.fingerprint import (
+    CONFIG_HASH_LABEL,
+    CONFIG_SECTIONS_LABEL,
+    changed_sections,
+    config_fingerprint,
+    fingerprint_labels,
+)
+from hiveden.docker.images import get_image_pull_service, image_exists, image_tags_by_id
+from hiveden.docker.inventory import current_inventory
+from hiveden.docker.models import (
+    Container,
+    ContainerSummary,
+    Device,
+    DockerContainer,
+    EnvVar,
+    IngressConfig,
+    Mount,
+    Port,
+)
 from hiveden.docker.networks import create_network, network_exists
 from hiveden.hwosinfo.hw import get_host_ip
 
-client = docker.from_env()
+# Names used while a blue/green update runs both containers.
+BLUE_GREEN_SUFFIX = "-next"
+RETIRED_SUFFIX = "-prev"
+# Label keys of a Traefik router or service: (protocol, kind, name, setting).
+TRAEFIK_OBJECT_LABEL = re.compile(r"^traefik\.(http|tcp|udp)\.(routers|services)\.([^.]+)\.(.+)$")
+# Container settings accepted by update_container.
+UPDATE_FIELDS = (
+    "name",
+    "image",
+    "command",
+    "dependencies",
+    "env",
+    "ports",
+    "mounts",
+    "devices",
+    "labels",
+    "ingress_config",
+    "privileged",
+)
+
+
+def container_config(config) -> DockerContainer:
+    """Container settings from a model or a ``get_container_config`` dict."""
+    if isinstance(config, DockerContainer):
+        return config
+    if isinstance(config, dict):
+        values = {key: config.get(key) for key in UPDATE_FIELDS}
+    else:
+        values = {key: getattr(config, key, None) for key in UPDATE_FIELDS}
+    return DockerContainer(**{key: value for key, value in values.items() if value is not None})
+
+
+def _traefik_objects(labels) -> dict[tuple, dict[str, str]]:
+    objects: dict[tuple, dict[str, str]] = {}
+    for key, value in (labels or {}).items():
+        match = TRAEFIK_OBJECT_LABEL.match(key)
+        if match:
+            objects.setdefault(match.group(1, 2, 3), {})[match.group(4)] = value
+    return objects
+
+
+def separate_traefik_objects(labels, current_labels, suffix=BLUE_GREEN_SUFFIX) -> dict[str, str]:
+    """``labels`` with the Traefik routers and services that
+    ``current_labels`` defines differently renamed to ``<name><suffix>``.
+
+    Traefik drops a router or service defined differently by two
+    containers, so a replacement changing e.g. a router's ``Host`` rule
+    would take the route down while both containers run. Renamed, the old
+    and new definitions are served side by side until the old container
+    goes. Identical definitions keep their names and are shared.
+    """
+    current = _traefik_objects(current_labels)
+    result = dict(labels)
+    # Services first: renaming one changes the routers that use it, and
+    # routers without a ``service`` setting use the container's service.
+    services_renamed = False
+    for kind in ("services", "routers"):
+        renamed = {
+            key: f"{key[2]}{suffix}"
+            for key, settings in _traefik_objects(result).items()
+            if key[1] == kind and key in current and (
+                current[key] != settings or (services_renamed and "service" not in settings)
+            )
+        }
+        if renamed:
+            result = _rename_traefik_objects(result, renamed)
+            services_renamed = True
+    return result
+
+
+def _rename_traefik_objects(labels, renamed) -> dict[str, str]:
+    result = {}
+    for key, value in labels.items():
+        match = TRAEFIK_OBJECT_LABEL.match(key)
+        if match:
+            protocol, kind, name, setting = match.groups()
+            key = f"traefik.{protocol}.{kind}.{renamed.get((protocol, kind, name), name)}.{setting}"
+            if kind == "routers" and setting == "service":
+                value = renamed.get((protocol, "services", value), value)
+        result[key] = value
+    return result
+
+
+def shared_writable_binds(container_attrs, spec) -> set[str]:
+    """Host paths bind mounted both in an existing container and in a new
+    container ``spec``, writable in at least one of them."""
+    current = {
+        mount.get("Source"): mount.get("RW", True)
+        for mount in container_attrs.get("Mounts") or []
+        if mount.get("Type") == "bind"
+    }
+    return {
+        source
+        for source, volume in (spec.get("volumes") or {}).items()
+        if source in current and (current[source] or volume.get("mode") != "ro")
+    }
+
+
+def extract_ip(container_attrs, network_name):
+    """Extract IP address from container attributes."""
+    ip_address = None
+    networks = container_attrs.get("NetworkSettings", {}).get("Networks", {})
+
+    if network_name in networks:
+        ip_address = networks[network_name].get("IPAddress")
+    elif networks:
+        # Fallback to first network
+        first_net = next(iter(networks.values()))
+        ip_address = first_net.get("IPAddress")
+    return ip_address
+
+
+def container_from_attrs(attrs, image_tags, network_name) -> Container:
+    """Build a Container from inspect data.
+
+    ``image_tags`` are the tags of the container's image, or None when the
+    image no longer exists.
+    """
+    image_id = attrs.get("Image")
+    if image_tags is None:
+        image = "Not Found (404)"
+        image_id = "Not Found (404)"
+    else:
+        image = image_tags[0] if image_tags else "N/A"
+
+    state = attrs.get("State", {})
+    return Container(
+        Id=attrs.get("Id"),
+        Name=attrs.get("Name", "").lstrip("/") or "N/A",
+        Image=image,
+        ImageID=image_id,
+        Command=attrs.get("Config", {}).get("Cmd", []) or [],
+        Created=attrs.get("Created", 0),
+        State=state.get("Status", "N/A"),
+        Status=state.get("Status"),
+        Ports=attrs.get("NetworkSettings", {}).get("Ports", {}),
+        Labels=attrs.get("Config", {}).get("Labels") or {},
+        NetworkSettings=attrs.get("NetworkSettings", {}),
+        HostConfig=attrs.get("HostConfig", {}),
+        IPAddress=extract_ip(attrs, network_name),
+    )
+
+
+def summary_fields(fields=None) -> set[str]:
+    """Validate a ContainerSummary field selection (all fields by default)."""
+    available = ContainerSummary.model_fields
+    fields = set(fields or available)
+    unknown = fields - set(available)
+    if unknown:
+        raise ValueError(f"Unknown container fields: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def summary_filters(only_managed=False, names=None):
+    """``containers/json`` filters for the listing options DockerManager accepts."""
+    filters = None
+    if only_managed:
+        filters = {"label": "managed-by=hiveden"}
+    if names:
+        filters = {"name": names}
+    return filters
+
+
+def container_summaries(rows, image_tags, fields, network_name) -> list[ContainerSummary]:
+    """Build ContainerSummary models from ``containers/json`` rows.
+
+    Untagged images keep the reference the container was created from.
+    """
+    summaries = []
+    for row in rows:
+        values = {
+            "Id": row.get("Id"),
+            "Name": (row.get("Names") or ["N/A"])[0].lstrip("/"),
+            "Image": (image_tags.get(row.get("ImageID")) or [row.get("Image")])[0],
+            "ImageID": row.get("ImageID"),
+            "Command": row.get("Command"),
+            "Created": row.get("Created"),
+            "State": row.get("State"),
+            "Status": row.get("Status"),
+            "Ports": row.get("Ports") or [],
+            "Labels": row.get("Labels") or {},
+            "IPAddress": extract_ip(row, network_name),
+        }
+        summaries.append(
+            ContainerSummary(**{k: v for k, v in values.items() if k in fields})
+        )
+    return summaries
 
 
 class DockerManager:
+    client = SharedDockerClient()
+
     def __init__(self, network_name="hiveden-network"):
         self.network_name = network_name
-        self.client = client
 
     def _resolve_app_directory(self):
         """Resolve the effective application directory, preferring DB configuration."""
         app_root = app_config.app_directory
         try:
-            from hiveden.db.repositories.locations import LocationRepository
-            from hiveden.db.session import get_db_manager
-
-            db_manager = get_db_manager()
-            repo = LocationRepository(db_manager)
-            apps_location = repo.get_by_key('apps')
-            if apps_location:
-                app_root = apps_location.path
+            from hiveden.services.config import ConfigService
+
+            app_root = ConfigService().get_location_path('apps', app_root)
         except Exception:
             pass
         return app_root
@@ -57,18 +260,16 @@ class DockerManager:
 
     def extract_ip(self, container_attrs):
         """Extract IP address from container attributes."""
-        ip_address = None
-        networks = container_attrs.get("NetworkSettings", {}).get("Networks", {})
+        return extract_ip(container_attrs, self.network_name)
 
-        if self.network_name in networks:
-            ip_address = networks[self.network_name].get("IPAddress")
-        elif networks:
-            # Fallback to first network
-            first_net = next(iter(networks.values()))
-            ip_address = first_net.get("IPAddress")
-        return ip_address
+    def _inventory(self):
+        """The events-driven inventory, when it mirrors this manager's client."""
+        inventory = current_inventory()
+        if inventory is not None and inventory.client is self.client:
+            return inventory
+        return None
 
-    def create_container(
+    def container_spec(
         self,
         name: str,
         image: str,
@@ -78,34 +279,21 @@ class DockerManager:
         env: list[EnvVar]|None=None,
         ports: list[Port]|None=None,
         mounts: list[Mount]|None=None,
-        devices:list[Device]|None=None,
+        devices: list[Device]|None=None,
         labels: dict[str, str]|None=None,
         ingress_config: IngressConfig|None=None,
         app_directory=None,
         privileged: bool|None=False,
         **kwargs,
-    ):
-        """Create a new Docker container and connect it to the hiveden network."""
-        # Use instance network_name if not provided, though argument overrides it
-        target_network = network_name or self.network_name
-        # Use provided app_directory or resolve it
-        effective_app_dir = app_directory or self._resolve_app_directory()
-        self.ensure_dependencies_exist(dependencies)
-
-        if not image_exists(image):
-            print(f"Image '{image}' not found locally. Pulling from registry...")
-            try:
-                pull_image(image)
-                print(f"Image '{image}' pulled successfully.")
-            except errors.ImageNotFound:
-                raise errors.ImageNotFound(f"Image '{image}' not found in registry.")
-
-        if not network_exists(target_network):
-            create_network(target_network)
+    ) -> dict:
+        """Translate container settings into ``containers.create`` arguments.
 
-        container_labels = kwargs.get("labels", {})
-        if labels:
-            container_labels.update(labels)
+        Has no side effects; ``app_directories`` lists the host directories
+        that must exist before the container is created.
+        """
+        container_labels = dict(labels or {})
+        for key in (CONFIG_HASH_LABEL, CONFIG_SECTIONS_LABEL):
+            container_labels.pop(key, None)
         serialized_dependencies = serialize_dependencies_label(dependencies)
         if serialized_dependencies:
             container_labels[DEPENDENCIES_LABEL_KEY] = serialized_dependencies
@@ -113,122 +301,229 @@ class DockerManager:
             container_labels.pop(DEPENDENCIES_LABEL_KEY, None)
 
         if ingress_config:
-            # Handle Ingress Configuration
-            traefik_labels = generate_traefik_labels(ingress_config.domain, ingress_config.port)
-            container_labels.update(traefik_labels)
-
+            container_labels.update(generate_traefik_labels(ingress_config.domain, ingress_config.port))
             # Filter ports: Remove the port that is being managed by ingress
             if ports:
                 ports = [p for p in ports if p.container_port != ingress_config.port]
 
-            # Construct PiHole URL based on system domain
-            # "The pihole subdomain is 'dns'"
-            try:
-                system_domain = get_system_domain_value()
-                pihole_host = f"http://dns.{system_domain}"
-
-                # Fetch API Key from DB
-                from hiveden.db.repositories.core import (
-                    ConfigRepository,
-                    ModuleRepository,
-                )
-                from hiveden.db.session import get_db_manager
-
-                pihole_password = app_config.pihole_password
-                try:
-                    db_manager = get_db_manager()
-                    module_repo = ModuleRepository(db_manager)
-                    config_repo = ConfigRepository(db_manager)
-                    core_module = module_repo.get_by_short_name('core')
-                    if core_module:
-                        cfg_key = config_repo.get_by_module_and_key(core_module.id, 'dns.api_key')
-                        if cfg_key and cfg_key['value']:
-                            pihole_password = cfg_key['value']
-                except Exception as ex:
-                    print(f"Failed to fetch DNS API key from DB, using default: {ex}")
-
-                # We assume standard port 80/443 or routed via Traefik
-                # Try to use this host
-                pihole_manager = PiHoleManager(pihole_host, pihole_password)
-                target_ip = get_host_ip()
-                pihole_manager.add_ingress_domain_to_pihole(f"{ingress_config.domain}.{system_domain}", target_ip)
-            except Exception as e:
-                print(f"Failed to add ingress domain {ingress_config.domain} to pihole: {e}")
-
         container_labels["managed-by"] = "hiveden"
-        kwargs["labels"] = container_labels
 
-        environment = []
-        if env:
-            for item in env:
-                environment.append(f"{item.name}={item.value}")
+        environment = [f"{item.name}={item.value}" for item in env or []]
 
         port_bindings = {}
-        if ports:
-            for port in ports:
-                port_bindings[f"{port.container_port}/{port.protocol}"] = port.host_port
+        for port in ports or []:
+            port_bindings[f"{port.container_port}/{port.protocol}"] = port.host_port
 
-        container_name = name
         volumes = {}
-        if mounts:
-            for mount in mounts:
-                source_path = mount.source
-                if getattr(mount, "is_app_directory", False):
-                    source_path = os.path.join(effective_app_dir, container_name, mount.source)
-                    if not os.path.exists(source_path):
-                        try:
-                            os.makedirs(source_path, exist_ok=True)
-                            print(f"Created app directory: {source_path}")
-                        except OSError as e:
-                            print(f"Error creating app directory {source_path}: {e}")
-
-                mode = "ro" if getattr(mount, "read_only", False) else "rw"
-                volumes[source_path] = {"bind": mount.target, "mode": mode}
+        app_directories = []
+        for mount in mounts or []:
+            source_path = mount.source
+            if getattr(mount, "is_app_directory", False):
+                app_directory = app_directory or self._resolve_app_directory()
+                source_path = os.path.join(app_directory, name, mount.source)
+                app_directories.append(source_path)
+            mode = "ro" if getattr(mount, "read_only", False) else "rw"
+            volumes[source_path] = {"bind": mount.target, "mode": mode}
 
         device_requests = []
-        if devices:
-            for device in devices:
-                # Format: /host:/container:rwm
-                device_str = f"{device.path_on_host}:{device.path_in_container}:{device.cgroup_permissions}"
-                device_requests.append(device_str)
+        for device in devices or []:
+            # Format: /host:/container:rwm
+            device_requests.append(
+                f"{device.path_on_host}:{device.path_in_container}:{device.cgroup_permissions}"
+            )
+
+        return {
+            "name": name,
+            "image": image,
+            "command": command,
+            "environment": environment,
+            "ports": port_bindings,
+            "volumes": volumes,
+            "devices": device_requests,
+            "labels": container_labels,
+            "privileged": privileged,
+            "network": network_name or self.network_name,
+            "app_directories": app_directories,
+            "kwargs": kwargs,
+        }
+
+    def _existing_attrs(self, name):
+        inventory = self._inventory()
+        if inventory is not None:
+            return inventory.get(name)
+        try:
+            return self.client.api.inspect_container(name)
+        except errors.NotFound:
+            return None
+
+    def plan_container(self, name: str, image: str, **settings) -> dict:
+        """Decide what ``create_container`` would do with these settings.
+
+        Returns:
+            ``{"name", "action", "changes"}`` where action is ``create``,
+            ``recreate`` or ``unchanged`` and changes lists the changed
+            configuration sections of a recreated container.
+        """
+        spec = self.container_spec(name=name, image=image, **settings)
+        try:
+            image_attrs = self.client.images.get(image).attrs
+        except errors.ImageNotFound:
+            image_attrs = None
+        fingerprint, sections = config_fingerprint(spec, image_attrs)
+
+        attrs = self._existing_attrs(name)
+        if attrs is None:
+            return {"name": name, "action": "create", "changes": []}
+        labels = attrs.get("Config", {}).get("Labels") or {}
+        if labels.get(CONFIG_HASH_LABEL) == fingerprint:
+            return {"name": name, "action": "unchanged", "changes": []}
+        return {"name": name, "action": "recreate", "changes": changed_sections(labels, sections)}
+
+    def create_container(
+        self,
+        name: str,
+        image: str,
+        command: list[str]|None=None,
+        dependencies: list[str]|None=None,
+        network_name=None,
+        env: list[EnvVar]|None=None,
+        ports: list[Port]|None=None,
+        mounts: list[Mount]|None=None,
+        devices:list[Device]|None=None,
+        labels: dict[str, str]|None=None,
+        ingress_config: IngressConfig|None=None,
+        app_directory=None,
+        privileged: bool|None=False,
+        recreate: bool=False,
+        **kwargs,
+    ):
+        """Create a new Docker container and connect it to the hiveden network.
+
+        A container of the same name is recreated only when its configuration
+        fingerprint changed (or ``recreate`` is set); otherwise it is left as
+        is and just started if it was stopped.
+        """
+        self.ensure_dependencies_exist(dependencies)
+
+        if not image_exists(image):
+            print(f"Image '{image}' not found locally. Pulling from registry...")
+            try:
+                # Shared with any concurrent pull of the same image.
+                get_image_pull_service().pull(image)
+                print(f"Image '{image}' pulled successfully.")
+            except errors.ImageNotFound:
+                raise errors.ImageNotFound(f"Image '{image}' not found in registry.")
+
+        spec = self.container_spec(
+            name=name,
+            image=image,
+            command=command,
+            dependencies=dependencies,
+            network_name=network_name,
+            env=env,
+            ports=ports,
+            mounts=mounts,
+            devices=devices,
+            labels=labels,
+            ingress_config=ingress_config,
+            app_directory=app_directory,
+            privileged=privileged,
+            **kwargs,
+        )
+        target_network = spec["network"]
+        if not network_exists(target_network):
+            create_network(target_network)
 
+        fingerprint, sections = config_fingerprint(spec, self.client.images.get(image).attrs)
+        spec["labels"].update(fingerprint_labels(fingerprint, sections))
+
+        container_name = name
         try:
             container = self.client.containers.get(container_name)
-            print(f"Container '{container_name}' already exists. Recreating with new configuration...")
-            container.stop()
-            container.remove()
-            container = self.client.containers.create(
-                image,
-                command,
-                environment=environment,
-                ports=port_bindings,
-                volumes=volumes,
-                devices=device_requests,
-                restart_policy={"Name": "always"},
-                privileged=privileged,
-                **kwargs,
-            )
-            print(f"Container '{container_name}' recreated.")
         except errors.NotFound:
-            container = self.client.containers.create(
-                image,
-                command,
-                environment=environment,
-                ports=port_bindings,
-                volumes=volumes,
-                devices=device_requests,
-                restart_policy={"Name": "always"},
-                privileged=privileged,
-                name=container_name,
-                **kwargs,
+            container = None
+
+        if container is not None and not recreate and container.labels.get(CONFIG_HASH_LABEL) == fingerprint:
+            print(f"Container '{container_name}' is up to date.")
+            if container.status != "running":
+                container.start()
+                print(f"Container '{container_name}' started.")
+            return container
+
+        if ingress_config:
+            self._register_ingress_dns(ingress_config)
+        self._create_app_directories(spec)
+
+        if container is not None:
+            changes = changed_sections(container.labels, sections)
+            print(
+                f"Container '{container_name}' already exists. Recreating with new configuration"
+                f" ({', '.join(changes)} changed)..."
             )
-            print(f"Container '{container_name}' created.")
+            container.stop()
+            container.remove()
+
+        container = self._create_from_spec(spec, container_name)
+        self._record_dns_type(image)
+        return container
+
+    def _register_ingress_dns(self, ingress_config: IngressConfig):
+        # Construct PiHole URL based on system domain
+        # "The pihole subdomain is 'dns'"
+        try:
+            system_domain = get_system_domain_value()
+            pihole_host = f"http://dns.{system_domain}"
+
+            # Fetch API Key from DB
+            from hiveden.services.config import ConfigService
+
+            pihole_password = app_config.pihole_password
+            try:
+                pihole_password = ConfigService().get('dns.api_key', pihole_password)
+            except Exception as ex:
+                print(f"Failed to fetch DNS API key from DB, using default: {ex}")
+
+            # We assume standard port 80/443 or routed via Traefik
+            # Try to use this host
+            pihole_manager = PiHoleManager(pihole_host, pihole_password)
+            target_ip = get_host_ip()
+            pihole_manager.add_ingress_domain_to_pihole(f"{ingress_config.domain}.{system_domain}", target_ip)
+        except Exception as e:
+            print(f"Failed to add ingress domain {ingress_config.domain} to pihole: {e}")
 
-        network = self.client.networks.get(target_network)
+    def _create_app_directories(self, spec: dict):
+        for source_path in spec["app_directories"]:
+            if not os.path.exists(source_path):
+                try:
+                    os.makedirs(source_path, exist_ok=True)
+                    print(f"Created app directory: {source_path}")
+                except OSError as e:
+                    print(f"Error creating app directory {source_path}: {e}")
+
+    def _create_from_spec(self, spec: dict, container_name: str):
+        """Create, connect and start a container from ``container_spec`` output."""
+        container = self.client.containers.create(
+            spec["image"],
+            spec["command"],
+            environment=spec["environment"],
+            ports=spec["ports"],
+            volumes=spec["volumes"],
+            devices=spec["devices"],
+            restart_policy={"Name": "always"},
+            privileged=spec["privileged"],
+            name=container_name,
+            labels=spec["labels"],
+            **spec["kwargs"],
+        )
+        print(f"Container '{container_name}' created.")
+
+        network = self.client.networks.get(spec["network"])
         network.connect(container)
         container.start()
         print(f"Container '{container_name}' started.")
+        return container
 
+    def _record_dns_type(self, image: str):
         # Update core.dns.type if this is a DNS container
         try:
             target_dns_type = None
@@ -239,21 +534,20 @@ class DockerManager:
                     break
 
             if target_dns_type:
-                from hiveden.db.repositories.core import ConfigRepository
-                from hiveden.db.session import get_db_manager
+                from hiveden.services.config import ConfigService
 
-                db_manager = get_db_manager()
-                config_repo = ConfigRepository(db_manager)
-                config_repo.set_value('core', 'dns.type', target_dns_type)
+                ConfigService().set('dns.type', target_dns_type)
                 print(f"Updated core.dns.type to {target_dns_type}")
         except Exception as e:
             print(f"Failed to update DNS config: {e}")
 
-        return container
-
     def get_container(self, container_id) -> Container:
         """Get a Docker container by its ID."""
         c = self.client.containers.get(container_id)
+        inventory = self._inventory()
+        if inventory is not None:
+            # Fresh inspect data; usually fetched right after a state change.
+            inventory.remember(c.attrs)
 
         try:
             image = c.image.tags[0] if c.image and c.image.tags else "N/A"
@@ -282,7 +576,21 @@ class DockerManager:
         )
 
     def list_containers(self, all=False, only_managed=False, names=None, **kwargs) -> list[Container]:
-        """List all Docker containers."""
+        """List all Docker containers.
+
+        Served from the container inventory when it is following Docker
+        events and no extra API filters are requested.
+        """
+        inventory = self._inventory()
+        if inventory is not None and not kwargs:
+            labels = {"managed-by": "hiveden"} if only_managed and not names else None
+            return [
+                container_from_attrs(
+                    attrs, inventory.image_tags(attrs.get("Image")), self.network_name
+                )
+                for attrs in inventory.filter(all=all, labels=labels, names=names)
+            ]
+
         if only_managed:
             kwargs["filters"] = {"label": "managed-by=hiveden"}
 
@@ -290,13 +598,17 @@ class DockerManager:
             kwargs["filters"] = {"name": names}
 
         response_data = []
-        for c in self.client.containers.list(all=all, **kwargs):
-            try:
-                image = c.image.tags[0] if c.image and c.image.tags else "N/A"
-                image_id = c.image.id
-            except errors.ImageNotFound:
+        containers = self.client.containers.list(all=all, **kwargs)
+        # One images/json call instead of resolving c.image per container.
+        image_tags = image_tags_by_id(self.client) if containers else {}
+        for c in containers:
+            image_id = c.attrs.get("Image")
+            tags = image_tags.get(image_id)
+            if tags is None:
                 image = "Not Found (404)"
                 image_id = "Not Found (404)"
+            else:
+                image = tags[0] if tags else "N/A"
 
             name = c.name if c.name else "N/A"
 
@@ -321,6 +633,18 @@ class DockerManager:
             )
         return response_data
 
+    def list_container_summaries(self, all=False, only_managed=False, names=None, fields=None) -> list[ContainerSummary]:
+        """List containers from a single ``containers/json`` call.
+
+        No container is inspected. Image tags come from one ``images/json``
+        call, made only when ``Image`` is selected. ``fields`` limits the
+        attributes that are populated (all by default).
+        """
+        fields = summary_fields(fields)
+        rows = self.client.api.containers(all=all, filters=summary_filters(only_managed, names))
+        image_tags = image_tags_by_id(self.client) if rows and "Image" in fields else {}
+        return container_summaries(rows, image_tags, fields, self.network_name)
+
     def stream_logs(self, container_id, follow=True, tail=100):
         """Stream logs from a Docker container.
 
@@ -340,13 +664,67 @@ class DockerManager:
             yield log_line.decode('utf-8', errors='replace')
 
     def stop_containers(self, containers):
-        """Stop a list of containers."""
-        for container in containers:
-            if container.Status != "running":
-                print(f"Container '{container.Name}' is already stopped.")
-                continue
-            self.stop_container(container.Id)
-            print(f"Container '{container.Name}' stopped.")
+        """Stop a list of containers, dependents first."""
+        return self.bulk_action("stop", containers, progress=print)
+
+    def bulk_action(self, action, containers, max_workers=None, timeout=None, progress=None) -> dict:
+        """Start, stop, restart or remove containers in dependency order.
+
+        ``containers`` are ``Container`` or ``ContainerSummary`` models; the
+        graph comes from their ``hiveden.dependencies`` labels and only edges
+        between the given containers are followed. Dependencies start before
+        their dependents and stop after them, with independent containers
+        handled concurrently by up to ``max_workers`` threads. ``timeout`` is
+        the stop grace period in seconds (Docker's default when None).
+
+        Returns:
+            ``{name: {"status": "done" | "failed" | "skipped", "message": str}}``
+        """
+        if action not in BULK_ACTIONS:
+            raise ValueError(f"Unknown bulk action '{action}', expected one of {BULK_ACTIONS}")
+        max_workers = max_workers or app_config.docker_bulk_workers
+        stop_options = {"timeout": timeout} if timeout is not None else {}
+
+        by_name = {c.Name.lstrip('/'): c for c in containers}
+        dependencies = {
+            name: parse_dependencies_label((c.Labels or {}).get(DEPENDENCIES_LABEL_KEY))
+            for name, c in by_name.items()
+        }
+        running = {name for name, c in by_name.items() if c.State == "running"}
+
+        def get(name):
+            return self.client.containers.get(by_name[name].Id or name)
+
+        def start(name):
+            if action == "start" and name in running:
+                return "already running"
+            get(name).start()
+            return "started"
+
+        def stop(name):
+            if name not in running:
+                return "already stopped"
+            get(name).stop(**stop_options)
+            return "stopped"
+
+        def remove(name):
+            if name in running:
+                get(name).stop(**stop_options)
+            self.remove_container(by_name[name].Id or name)
+            return "removed"
+
+        if action == "start":
+            return run_dependency_graph(dependencies, start, max_workers, progress)
+        if action == "remove":
+            return run_dependency_graph(reverse_graph(dependencies), remove, max_workers, progress)
+
+        stopped = run_dependency_graph(reverse_graph(dependencies), stop, max_workers, progress)
+        if action == "stop":
+            return stopped
+        results = run_dependency_graph(dependencies, start, max_workers, progress)
+        # A container that could not be stopped was not restarted.
+        results.update({n: r for n, r in stopped.items() if r["status"] != "done"})
+        return results
 
     def start_container(self, container_id):
         """Start a stopped Docker container."""
@@ -404,26 +782,15 @@ class DockerManager:
                     from hiveden.apps.pihole import PiHoleManager
                     from hiveden.config import config as app_config
                     from hiveden.config.utils.domain import get_system_domain_value
-                    from hiveden.db.repositories.core import (
-                        ConfigRepository,
-                        ModuleRepository,
-                    )
-                    from hiveden.db.session import get_db_manager
                     from hiveden.hwosinfo.hw import get_host_ip
+                    from hiveden.services.config import ConfigService
 
                     system_domain = get_system_domain_value()
                     pihole_host = f"http://dns.{system_domain}"
 
                     pihole_password = app_config.pihole_password
                     try:
-                        db_manager = get_db_manager()
-                        module_repo = ModuleRepository(db_manager)
-                        config_repo = ConfigRepository(db_manager)
-                        core_module = module_repo.get_by_short_name('core')
-                        if core_module:
-                            cfg_key = config_repo.get_by_module_and_key(core_module.id, 'dns.api_key')
-                            if cfg_key and cfg_key['value']:
-                                pihole_password = cfg_key['value']
+                        pihole_password = ConfigService().get('dns.api_key', pihole_password)
                     except Exception as ex:
                         print(f"Failed to fetch DNS API key from DB, using default: {ex}")
 
@@ -443,6 +810,9 @@ class DockerManager:
 
         container_model = self.get_container(container_id)
         container.remove()
+        inventory = self._inventory()
+        if inventory is not None:
+            inventory.forget(container.id)
 
         # Cleanup Volumes (App Directory)
         if delete_volumes:
@@ -487,12 +857,8 @@ class DockerManager:
         return container_model
 
     def delete_containers(self, containers):
-        """Delete a list of containers."""
-        for container in containers:
-            if container.Status == "running":
-                self.stop_container(container.Id)
-            self.remove_container(container.Id)
-            print(f"Container '{container.Name}' deleted.")
+        """Delete a list of containers, dependents first."""
+        return self.bulk_action("remove", containers, progress=print)
 
     def describe_container(self, container_id=None, name=None):
         """Describe a Docker container by its ID or name."""
@@ -540,6 +906,13 @@ class DockerManager:
     def list_existing_container_names(self) -> set[str]:
         """List all container names known by the local Docker daemon."""
         names = set()
+        inventory = self._inventory()
+        if inventory is not None:
+            for attrs in inventory.containers():
+                if attrs.get("Name"):
+                    names.add(attrs["Name"].lstrip('/'))
+            return names
+
         for container in self.client.containers.list(all=True):
             if container.name:
                 names.add(container.name.lstrip('/'))
@@ -559,9 +932,15 @@ class DockerManager:
 
     def get_container_config(self, container_id):
         """Retrieve the configuration of a container."""
-        c = self.client.containers.get(container_id)
-        config = c.attrs['Config']
-        host_config = c.attrs['HostConfig']
+        inventory = self._inventory()
+        attrs = inventory.get(container_id) if inventory is not None else None
+        if attrs is not None:
+            name = attrs.get('Name', '')
+        else:
+            c = self.client.containers.get(container_id)
+            attrs, name = c.attrs, c.name
+        config = attrs['Config']
+        host_config = attrs['HostConfig']
 
         # Env: ["VAR=VAL", ...] -> [{"name": "VAR", "value": "VAL"}]
         env = []
@@ -603,7 +982,7 @@ class DockerManager:
 
                 if source == effective_app_dir or source.startswith(os.path.join(effective_app_dir, "")):
                     is_app_dir = True
-                    source = os.path.relpath(source, f"{effective_app_dir}/{c.name}")
+                    source = os.path.relpath(source, f"{effective_app_dir}/{name.lstrip('/')}")
 
                 mounts.append({'source': source, 'target': target, 'is_app_directory': is_app_dir, 'read_only': read_only})
 
@@ -618,7 +997,7 @@ class DockerManager:
             })
 
         return {
-            "name": c.name.lstrip('/'),
+            "name": name.lstrip('/'),
             "image": config.get('Image'),
             "command": config.get('Cmd'),
             "dependencies": parse_dependencies_label(
@@ -635,39 +1014,209 @@ class DockerManager:
             "type": "docker"
         }
 
-    def update_container(self, container_id, config, app_directory=None):
-        """Update a container by removing the old one and creating a new one."""
+    def update_container(self, container_id, config, app_directory=None, zero_downtime=False):
+        """Update a container, recreating it only if its configuration changed.
+
+        With ``zero_downtime`` the replacement is started next to the old
+        container first; see ``blue_green_update``.
+        """
+        config = container_config(config)
+        if zero_downtime:
+            return self.blue_green_update(container_id, config, app_directory=app_directory)
+
         try:
             old_container = self.client.containers.get(container_id)
-            # Always remove the old container to avoid conflicts and ensure clean state
-            # If name is same, create_container would handle it, but if name changed, we need this.
-            old_container.remove(force=True)
+            # create_container replaces a container of the same name only if
+            # its configuration changed; a renamed one must go first.
+            if old_container.name != config.name:
+                old_container.remove(force=True)
 
         except errors.NotFound:
             print(f"Container {container_id} not found during update. Proceeding to create.")
 
-        # Helper to get value from dict or object
-        def get_val(obj, key):
-            if isinstance(obj, dict):
-                return obj.get(key)
-            return getattr(obj, key, None)
-
-        # Call create_container
         return self.create_container(
-            name=get_val(config, 'name'),
-            image=get_val(config, 'image'),
-            command=get_val(config, 'command'),
-            dependencies=get_val(config, 'dependencies'),
-            env=get_val(config, 'env'),
-            ports=get_val(config, 'ports'),
-            mounts=get_val(config, 'mounts'),
-            devices=get_val(config, 'devices'),
-            labels=get_val(config, 'labels'),
-            ingress_config=get_val(config, 'ingress_config'),
-            privileged=get_val(config, 'privileged') or False,
-            app_directory=app_directory
+            app_directory=app_directory, **{key: getattr(config, key) for key in UPDATE_FIELDS}
         )
 
+    def wait_until_ready(self, container, port=None, timeout: float = 120.0, interval: float = 1.0):
+        """Wait for a started container to be able to serve.
+
+        Ready means its Docker healthcheck reports healthy, or, without a
+        healthcheck, that ``port`` accepts TCP connections on the container's
+        IP; with neither it only has to stay running for one interval. While
+        a healthcheck is starting, Docker's health events are awaited instead
+        of polling.
+
+        Raises:
+            RuntimeError: if the container exits, turns unhealthy or is not
+                ready within ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        checks = 0
+        seen = 0
+        while True:
+            container.reload()
+            state = container.attrs.get("State", {})
+            if state.get("Status") in ("exited", "dead"):
+                raise RuntimeError(
+                    f"Container '{container.name}' exited with code {state.get('ExitCode')}"
+                )
+            health = (state.get("Health") or {}).get("Status")
+            if health == "healthy":
+                return
+            if health == "unhealthy":
+                raise RuntimeError(f"Container '{container.name}' is unhealthy")
+            if health == "starting" and time.monotonic() < deadline:
+                received = self._wait_for_health_event(container, deadline, seen)
+                if received > seen:
+                    seen = received
+                    continue
+            if health is None:
+                if port:
+                    ip_address = extract_ip(container.attrs, self.network_name)
+                    try:
+                        socket.create_connection((ip_address, port), timeout=interval).close()
+                        return
+                    except OSError:
+                        pass
+                elif checks > 0 and state.get("Running"):
+                    return
+            checks += 1
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Container '{container.name}' was not ready after {timeout:.0f}s")
+            time.sleep(interval)
+
+    def _wait_for_health_event(self, container, deadline: float, seen: int = 0) -> int:
+        """Block until ``container`` reports a health status or ``deadline`` passes.
+
+        Returns:
+            The ``timeNano`` of the event received, to skip it next time.
+        """
+        remaining = max(0.0, deadline - time.monotonic())
+        now = time.time()
+        events = self.client.events(
+            # Whole seconds; replays an event from just before the call.
+            since=int(now),
+            until=int(now + remaining) + 1,
+            filters={"container": container.id, "event": "health_status"},
+            decode=True,
+        )
+        try:
+            for event in events:
+                if event.get("timeNano", 0) > seen:
+                    return event.get("timeNano", 0)
+        finally:
+            events.close()
+        return seen
+
+    def blue_green_update(self, container_id, config, app_directory=None, timeout: float = 120.0):
+        """Replace a container without taking its ingress route offline.
+
+        The image is pulled and the replacement started as ``<name>-next``
+        while the old container keeps serving. It carries the final Traefik
+        labels, so Traefik adds it to the same service once it is healthy.
+        When it is ready (see ``wait_until_ready``; the ingress port is
+        probed if there is no healthcheck) it takes over the name and the old
+        container is stopped and removed.
+
+        Traefik routers and services whose definition changes (e.g. the
+        ``Host`` rule after a domain change) are renamed on the replacement
+        (see ``separate_traefik_objects``), so both routes work during the
+        handover.
+
+        If anything fails before the switch, the replacement is removed and
+        the old container is left running. Containers that cannot run twice
+        at once are updated in place instead: those that publish host ports
+        or that would share a writable bind mount with the old container
+        (two instances of an app using sqlite or lock files). That includes
+        most containers with app directories, so for those a domain change
+        still briefly takes the route down.
+
+        Raises:
+            RuntimeError: when the update was rolled back.
+        """
+        config = container_config(config)
+        old = self.client.containers.get(container_id)
+        name = config.name
+        if name != old.name:
+            # A rename is a different container; nothing to hand over.
+            return self.update_container(container_id, config, app_directory=app_directory)
+
+        settings = {key: getattr(config, key) for key in UPDATE_FIELDS}
+        image = settings.pop('image')
+        self.ensure_dependencies_exist(config.dependencies)
+        if not image_exists(image):
+            print(f"Pulling '{image}' while '{name}' keeps running...")
+            get_image_pull_service().pull(image)
+
+        spec = self.container_spec(image=image, app_directory=app_directory, **settings)
+        fingerprint, sections = config_fingerprint(spec, self.client.images.get(image).attrs)
+        if old.labels.get(CONFIG_HASH_LABEL) == fingerprint:
+            print(f"Container '{name}' is up to date.")
+            if old.status != "running":
+                old.start()
+            return old
+        reason = None
+        if spec["ports"]:
+            reason = "publishes host ports"
+        elif shared_writable_binds(old.attrs, spec):
+            reason = "shares writable bind mounts with the running container"
+        if reason:
+            print(f"Container '{name}' {reason}; updating it in place.")
+            return self.update_container(container_id, config, app_directory=app_directory)
+        spec["labels"] = separate_traefik_objects(spec["labels"], old.labels)
+        spec["labels"].update(fingerprint_labels(fingerprint, sections))
+
+        next_name = f"{name}{BLUE_GREEN_SUFFIX}"
+        prev_name = f"{name}{RETIRED_SUFFIX}"
+        self._remove_if_exists(next_name)
+        if not network_exists(spec["network"]):
+            create_network(spec["network"])
+        ingress_config = config.ingress_config
+        if ingress_config:
+            self._register_ingress_dns(ingress_config)
+        self._create_app_directories(spec)
+
+        replacement = None
+        try:
+            replacement = self._create_from_spec(spec, next_name)
+            self.wait_until_ready(
+                replacement, port=ingress_config.port if ingress_config else None, timeout=timeout
+            )
+        except Exception as e:
+            if replacement is not None:
+                replacement.remove(force=True)
+            raise RuntimeError(f"Update of '{name}' rolled back: {e}") from e
+
+        # Hand the name over; the old container keeps serving meanwhile.
+        try:
+            old.rename(prev_name)
+        except Exception as e:
+            replacement.remove(force=True)
+            raise RuntimeError(f"Update of '{name}' rolled back: {e}") from e
+        try:
+            replacement.rename(name)
+        except Exception as e:
+            old.rename(name)
+            replacement.remove(force=True)
+            raise RuntimeError(f"Update of '{name}' rolled back: {e}") from e
+
+        try:
+            old.stop()
+            old.remove()
+        except Exception as e:
+            print(f"Container '{name}' was replaced but '{prev_name}' could not be removed: {e}")
+        print(f"Container '{name}' replaced without downtime.")
+        self._record_dns_type(image)
+        return replacement
+
+    def _remove_if_exists(self, container_name):
+        try:
+            self.client.containers.get(container_name).remove(force=True)
+            print(f"Removed leftover container '{container_name}'.")
+        except errors.NotFound:
+            pass
+
 
 # Wrappers for backward compatibility
 def create_container(name: str, image: str, command: list[str]|None=None, dependencies: list[str]|None=None, env: list[EnvVar]|None=None, ports: list[Port]|None=None, mounts: list[Mount]|None=None, devices: list[Device]|None=None, labels: dict[str, str]|None=None, ingress_config: IngressConfig|None=None, privileged: bool|None=False, *args, **kwargs):
@@ -679,12 +1228,18 @@ def get_container(container_id):
 def list_containers(*args, **kwargs):
     return DockerManager().list_containers(*args, **kwargs)
 
+def list_container_summaries(*args, **kwargs):
+    return DockerManager().list_container_summaries(*args, **kwargs)
+
 def stop_containers(containers):
     return DockerManager().stop_containers(containers)
 
 def start_container(container_id):
     return DockerManager().start_container(container_id)
 
+def bulk_action(action, containers, **kwargs):
+    return DockerManager().bulk_action(action, containers, **kwargs)
+
 def restart_container(container_id):
     return DockerManager().restart_container(container_id)
 
@@ -703,5 +1258,5 @@ def describe_container(container_id=None, name=None):
 def get_container_config(container_id):
     return DockerManager().get_container_config(container_id)
 
-def update_container(container_id, config, app_directory=None):
-    return DockerManager().update_container(container_id, config, app_directory)
+def update_container(container_id, config, app_directory=None, zero_downtime=False):
+    return DockerManager().update_container(container_id, config, app_directory, zero_downtime)
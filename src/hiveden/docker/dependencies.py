@@ -1,4 +1,4 @@
-from typing import Iterable, List, Sequence
+from typing import Dict, Iterable, List, Sequence
 
 
 DEPENDENCIES_LABEL_KEY = "hiveden.dependencies"
@@ -49,3 +49,27 @@ def parse_dependencies_label(value: str | None) -> List[str]:
     if not value:
         return []
     return normalize_dependency_names(value.split(","))
+
+
+def dependency_levels(graph: Dict[str, Sequence[str]]) -> List[List[str]]:
+    """Group container names so each level only depends on earlier levels.
+
+    ``graph`` maps a name to its dependencies; dependencies that are not keys
+    of the graph are ignored. Raises ValueError when the graph has a cycle.
+    """
+    remaining = {
+        name: {dep for dep in deps if dep in graph and dep != name}
+        for name, deps in graph.items()
+    }
+    levels = []
+    while remaining:
+        level = sorted(name for name, deps in remaining.items() if not deps)
+        if not level:
+            cycle = ", ".join(sorted(remaining))
+            raise ValueError(f"Circular container dependencies between: {cycle}")
+        levels.append(level)
+        for name in level:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(level)
+    return levels
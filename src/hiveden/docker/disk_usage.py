@@ -0,0 +1,341 @@
+"""Cached Docker disk usage and a planner for reclaiming space.
+
+``GET /system/df`` walks every volume and container layer and can take a
+long time on a busy host, so its result is cached and refreshed in the
+background once older than ``HIVEDEN_DOCKER_DISK_USAGE_TTL``: readers get
+the last snapshot immediately and only the first read waits. On Docker API
+1.42+ the images, containers, volumes and build cache sections are fetched
+in parallel.
+
+``plan_reclaim`` ranks unused images and dangling volumes by the space
+removing them frees, and ``prune`` removes a plan's items.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from docker import errors
+from docker.utils import version_gte
+
+from hiveden.config.settings import config
+from hiveden.docker.client import get_docker_client
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("images", "containers", "volumes", "build_cache")
+# ``type`` values of /system/df, per section.
+_DF_TYPES = {"images": "image", "containers": "container", "volumes": "volume", "build_cache": "build-cache"}
+_DF_KEYS = {"images": "Images", "containers": "Containers", "volumes": "Volumes", "build_cache": "BuildCache"}
+ANONYMOUS_VOLUME_LABEL = "com.docker.volume.anonymous"
+
+
+def _size(value) -> Optional[int]:
+    # Docker reports -1 for sizes it did not compute.
+    return value if isinstance(value, int) and value >= 0 else None
+
+
+def _image(raw: Dict[str, Any]) -> Dict[str, Any]:
+    size = _size(raw.get("Size")) or 0
+    shared = _size(raw.get("SharedSize")) or 0
+    return {
+        "id": raw.get("Id", ""),
+        "tags": [t for t in raw.get("RepoTags") or [] if t != "<none>:<none>"],
+        "size": size,
+        "shared_size": shared,
+        "unique_size": max(0, size - shared),
+        "containers": max(0, raw.get("Containers") or 0),
+    }
+
+
+def _container(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": raw.get("Id", ""),
+        "name": ((raw.get("Names") or [""])[0]).lstrip("/"),
+        "image_id": raw.get("ImageID", ""),
+        "state": raw.get("State", ""),
+        "size_rw": _size(raw.get("SizeRw")) or 0,
+    }
+
+
+def _volume(raw: Dict[str, Any]) -> Dict[str, Any]:
+    usage = raw.get("UsageData") or {}
+    return {
+        "name": raw.get("Name", ""),
+        "driver": raw.get("Driver", ""),
+        "anonymous": ANONYMOUS_VOLUME_LABEL in (raw.get("Labels") or {}),
+        "size": _size(usage.get("Size")),
+        "ref_count": max(0, usage.get("RefCount") or 0),
+    }
+
+
+def _build_cache(raw: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": raw.get("ID", ""),
+        "type": raw.get("Type", ""),
+        "size": _size(raw.get("Size")) or 0,
+        "in_use": bool(raw.get("InUse")),
+        "shared": bool(raw.get("Shared")),
+    }
+
+
+_PARSERS = {"images": _image, "containers": _container, "volumes": _volume, "build_cache": _build_cache}
+
+
+def _totals(snapshot: Dict[str, List[Dict[str, Any]]], layers_size: Optional[int]) -> Dict[str, Dict[str, int]]:
+    images = snapshot["images"]
+    volumes = snapshot["volumes"]
+    cache = snapshot["build_cache"]
+    return {
+        "images": {
+            "count": len(images),
+            # Shared layers are stored once.
+            "bytes": layers_size if layers_size is not None else sum(i["size"] for i in images),
+            "reclaimable_bytes": sum(i["unique_size"] for i in images if not i["containers"]),
+        },
+        "containers": {
+            "count": len(snapshot["containers"]),
+            "bytes": sum(c["size_rw"] for c in snapshot["containers"]),
+            "reclaimable_bytes": sum(
+                c["size_rw"] for c in snapshot["containers"] if c["state"] != "running"
+            ),
+        },
+        "volumes": {
+            "count": len(volumes),
+            "bytes": sum(v["size"] or 0 for v in volumes),
+            "reclaimable_bytes": sum(v["size"] or 0 for v in volumes if not v["ref_count"]),
+        },
+        "build_cache": {
+            "count": len(cache),
+            "bytes": sum(c["size"] for c in cache if not c["shared"]),
+            "reclaimable_bytes": sum(c["size"] for c in cache if not c["in_use"] and not c["shared"]),
+        },
+    }
+
+
+def read_disk_usage(docker_client) -> Dict[str, Any]:
+    """Query ``/system/df`` and normalize the result (see module docstring)."""
+    api = docker_client.api
+    started = time.monotonic()
+    if version_gte(api.api_version, "1.42"):
+
+        def fetch(section):
+            response = api._get(api._url("/system/df"), params={"type": _DF_TYPES[section]})
+            return api._result(response, True)
+
+        df = {}
+        with ThreadPoolExecutor(max_workers=len(SECTIONS)) as pool:
+            for result in pool.map(fetch, SECTIONS):
+                df.update({key: value for key, value in result.items() if value is not None})
+    else:
+        df = api.df()
+
+    snapshot: Dict[str, Any] = {
+        section: [_PARSERS[section](item) for item in df.get(_DF_KEYS[section]) or []]
+        for section in SECTIONS
+    }
+    snapshot["totals"] = _totals(snapshot, _size(df.get("LayersSize")))
+    snapshot["computed_at"] = time.time()
+    snapshot["duration_seconds"] = round(time.monotonic() - started, 3)
+    return snapshot
+
+
+def plan_reclaim(
+    snapshot: Dict[str, Any],
+    images: bool = True,
+    volumes: bool = True,
+    dangling_images_only: bool = False,
+    named_volumes: bool = False,
+    min_bytes: int = 0,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Rank what could be removed by the space it frees, largest first.
+
+    Images are candidates when no container (running or stopped) uses them;
+    their unique bytes are what removing them is sure to free (layers shared
+    with other images stay until those go too). Volumes are candidates when
+    no container references them; like ``docker volume prune``, only
+    anonymous volumes unless ``named_volumes`` is set.
+
+    Returns:
+        ``{"items": [{"type", "id", "name", "bytes"}], "bytes": total}``
+    """
+    items = []
+    if images:
+        for image in snapshot["images"]:
+            if image["containers"] or (dangling_images_only and image["tags"]):
+                continue
+            name = image["tags"][0] if image["tags"] else "<none>"
+            items.append({"type": "image", "id": image["id"], "name": name, "bytes": image["unique_size"]})
+    if volumes:
+        for volume in snapshot["volumes"]:
+            if volume["ref_count"] or not (volume["anonymous"] or named_volumes):
+                continue
+            items.append({"type": "volume", "id": volume["name"], "name": volume["name"], "bytes": volume["size"] or 0})
+
+    items = [item for item in items if item["bytes"] >= min_bytes]
+    items.sort(key=lambda item: item["bytes"], reverse=True)
+    if limit is not None:
+        items = items[:limit]
+    return {"items": items, "bytes": sum(item["bytes"] for item in items)}
+
+
+def _remove_image(api, image_id: str):
+    # An image tagged in several repositories cannot be removed by ID
+    # without force, which would also take it from stopped containers:
+    # untag it instead, the last tag takes the image with it.
+    tags = [t for t in api.inspect_image(image_id).get("RepoTags") or [] if t != "<none>:<none>"]
+    if len(tags) < 2:
+        api.remove_image(image_id)
+        return
+    users = api.containers(all=True, quiet=True, filters={"ancestor": image_id})
+    if users:
+        raise errors.APIError(
+            "conflict", explanation=f"image is being used by container {users[0]['Id'][:12]}"
+        )
+    for tag in tags:
+        api.remove_image(tag)
+
+
+def prune(
+    docker_client,
+    items: List[Dict[str, Any]],
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Remove the images and volumes of a reclaim plan.
+
+    Items that are gone already are skipped; items Docker refuses to remove
+    (e.g. an image a container started using since the plan was made) are
+    reported and skipped.
+
+    Returns:
+        ``{"removed": [ids], "failed": {id: error}, "bytes": freed}``
+    """
+    removed, failed, freed = [], {}, 0
+    for item in items:
+        try:
+            if item["type"] == "image":
+                _remove_image(docker_client.api, item["id"])
+            elif item["type"] == "volume":
+                docker_client.api.remove_volume(item["id"])
+            else:
+                raise ValueError(f"Unknown item type '{item['type']}'")
+        except errors.NotFound:
+            if progress:
+                progress(f"{item['type']} {item['name']}: already removed")
+            continue
+        except (errors.APIError, ValueError) as e:
+            failed[item["id"]] = getattr(e, "explanation", None) or str(e)
+            if progress:
+                progress(f"{item['type']} {item['name']}: {failed[item['id']]}")
+            continue
+        removed.append(item["id"])
+        freed += item.get("bytes") or 0
+        if progress:
+            progress(f"Removed {item['type']} {item['name']} ({item.get('bytes') or 0} bytes)")
+    return {"removed": removed, "failed": failed, "bytes": freed}
+
+
+class _Refresh(threading.Event):
+    """Set when a computation ends; ``error`` tells whether it failed."""
+
+    error: Optional[Exception] = None
+
+
+class DiskUsageService:
+    """Serves disk usage snapshots, recomputing them in the background."""
+
+    def __init__(self, docker_client=None, ttl: Optional[float] = None):
+        self._client = docker_client
+        self.ttl = config.docker_disk_usage_ttl if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._refreshing: Optional[_Refresh] = None
+
+    @property
+    def client(self):
+        return self._client or get_docker_client()
+
+    def snapshot(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """The latest snapshot, refreshed in the background when stale.
+
+        Only blocks when nothing was computed yet, or when the cached
+        snapshot is older than ``max_age`` seconds (0 forces a refresh).
+
+        Raises:
+            docker.errors.APIError: when a computation it waits for fails.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+        age = time.time() - snapshot["computed_at"]
+        if max_age is not None and age >= max_age:
+            return self.refresh()
+        if age >= self.ttl:
+            self._start_refresh()
+        return self._view(snapshot)
+
+    def refresh(self) -> Dict[str, Any]:
+        """Recompute now, joining a computation already in progress.
+
+        Raises:
+            docker.errors.APIError: when the computation fails; the previous
+                snapshot is not a substitute for a fresh one.
+        """
+        done = self._start_refresh(background=False)
+        done.wait()
+        if done.error is not None:
+            raise errors.APIError(str(done.error)) from done.error
+        with self._lock:
+            snapshot = self._snapshot
+        return self._view(snapshot)
+
+    def _view(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        age = max(0.0, time.time() - snapshot["computed_at"])
+        return dict(snapshot, age_seconds=round(age, 3), stale=age >= self.ttl)
+
+    def invalidate(self):
+        """Recompute in the background, e.g. after removing images."""
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot = dict(self._snapshot, computed_at=0.0)
+        self._start_refresh()
+
+    def _start_refresh(self, background: bool = True) -> _Refresh:
+        with self._lock:
+            if self._refreshing is not None:
+                return self._refreshing
+            done = self._refreshing = _Refresh()
+        if background:
+            threading.Thread(target=self._compute, args=(done,), daemon=True, name="docker-disk-usage").start()
+        else:
+            self._compute(done)
+        return done
+
+    def _compute(self, done: _Refresh):
+        try:
+            snapshot = read_disk_usage(self.client)
+            with self._lock:
+                self._snapshot = snapshot
+        except Exception as e:
+            logger.warning(f"Computing Docker disk usage failed: {e}")
+            done.error = e
+        finally:
+            with self._lock:
+                self._refreshing = None
+            done.set()
+
+
+_service: Optional[DiskUsageService] = None
+_service_lock = threading.Lock()
+
+
+def get_disk_usage_service() -> DiskUsageService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = DiskUsageService()
+    return _service
@@ -0,0 +1,91 @@
+"""Fingerprints of the configuration a container was created from.
+
+``DockerManager.create_container`` stores a hash of everything that shapes a
+container (image ID, command, env, ports, mounts, devices, labels,
+privileges, network) in its labels, plus a short hash per section. A later
+create with the same fingerprint leaves the container alone, and comparing
+the section hashes tells which parts of the configuration changed.
+
+Values the image itself provides (default env, labels and command) are left
+out, so a configuration read back from a running container hashes the same
+as the one it was created with.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+CONFIG_HASH_LABEL = "hiveden.config-hash"
+CONFIG_SECTIONS_LABEL = "hiveden.config-sections"
+SECTIONS = (
+    "image",
+    "command",
+    "env",
+    "ports",
+    "mounts",
+    "devices",
+    "labels",
+    "privileged",
+    "network",
+)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def config_fingerprint(spec: Dict[str, Any], image_attrs: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, str]]:
+    """Hash a container create spec.
+
+    Args:
+        spec: The spec built by ``DockerManager.container_spec``.
+        image_attrs: Inspect data of the local image, or None when it has
+            not been pulled yet (the image reference is hashed instead).
+
+    Returns:
+        ``(fingerprint, {section: short hash})``
+    """
+    image_config = (image_attrs or {}).get("Config") or {}
+    image_labels = image_config.get("Labels") or {}
+    command = spec.get("command")
+    if isinstance(command, str):
+        command = command.split()
+    if command == image_config.get("Cmd"):
+        command = None
+    labels = {
+        key: value
+        for key, value in (spec.get("labels") or {}).items()
+        if key not in (CONFIG_HASH_LABEL, CONFIG_SECTIONS_LABEL) and image_labels.get(key) != value
+    }
+    values = {
+        "image": (image_attrs or {}).get("Id") or spec.get("image"),
+        "command": command or None,
+        "env": sorted(set(spec.get("environment") or []) - set(image_config.get("Env") or [])),
+        "ports": sorted((str(k), str(v)) for k, v in (spec.get("ports") or {}).items()),
+        "mounts": spec.get("volumes") or {},
+        "devices": sorted(spec.get("devices") or []),
+        "labels": labels,
+        "privileged": bool(spec.get("privileged")),
+        "network": spec.get("network"),
+    }
+    sections = {name: _digest(values[name])[:12] for name in SECTIONS}
+    return _digest(sections), sections
+
+
+def fingerprint_labels(fingerprint: str, sections: Dict[str, str]) -> Dict[str, str]:
+    return {
+        CONFIG_HASH_LABEL: fingerprint,
+        CONFIG_SECTIONS_LABEL: ",".join(f"{name}={value}" for name, value in sections.items()),
+    }
+
+
+def changed_sections(labels: Optional[Dict[str, str]], sections: Dict[str, str]) -> List[str]:
+    """Sections whose hash differs from the one recorded in a container's labels.
+
+    Containers created before fingerprints were recorded report every section.
+    """
+    recorded = {}
+    for item in ((labels or {}).get(CONFIG_SECTIONS_LABEL) or "").split(","):
+        name, _, value = item.partition("=")
+        if value:
+            recorded[name] = value
+    return [name for name in sections if recorded.get(name) != sections[name]]
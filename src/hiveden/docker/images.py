@@ -1,27 +1,221 @@
-import docker
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from docker import errors
 from docker.errors import ImageNotFound
-from typing import List, Dict, Any
+from docker.utils import parse_repository_tag
+
+from hiveden.config.settings import config
+from hiveden.docker.client import SharedDockerClient, get_docker_client
 
-client = docker.from_env()
+# Download/extract progress is reported at these percentage steps per layer.
+PROGRESS_STEP = 25
+# Pull stream errors meaning the registry has no such image or tag.
+NOT_FOUND_ERRORS = ("manifest unknown", "not found", "repository does not exist")
 
 def image_exists(image_name: str) -> bool:
     """Check if a Docker image exists locally."""
     try:
-        client.images.get(image_name)
+        get_docker_client().images.get(image_name)
         return True
     except ImageNotFound:
         return False
 
+def image_tags_by_id(docker_client=None) -> Dict[str, List[str]]:
+    """Map every local image ID to its repo tags with one ``images/json`` call."""
+    docker_client = docker_client or get_docker_client()
+    tags = {}
+    for image in docker_client.api.images(all=True):
+        tags[image["Id"]] = [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"]
+    return tags
+
 def pull_image(image_name: str):
     """Pull a Docker image from a registry."""
-    try:
-        return client.images.pull(image_name)
-    except ImageNotFound:
-        raise
+    get_image_pull_service().pull(image_name)
+    return get_docker_client().images.get(image_name)
+
+
+def normalize_reference(reference: str) -> str:
+    """Canonical form of an image reference: an implicit tag becomes ``latest``."""
+    repository, tag = parse_repository_tag(reference)
+    if not tag:
+        return f"{repository}:latest"
+    separator = "@" if tag.startswith("sha256:") else ":"
+    return f"{repository}{separator}{tag}"
+
+
+class _Pull:
+    """An in-flight pull that later callers of the same reference wait on."""
 
-class DockerImageManager:
     def __init__(self):
-        self.client = client
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.listeners: List[Callable[[str], None]] = []
+
+
+class ImagePullService:
+    """Pulls images with bounded concurrency and per-layer progress.
+
+    Concurrent requests for the same reference share a single pull: the
+    first caller downloads, later ones receive the remaining progress and the
+    same result.
+    """
+
+    def __init__(self, docker_client=None, max_concurrent: Optional[int] = None):
+        self.client = docker_client or get_docker_client()
+        self.max_concurrent = max_concurrent or config.docker_pull_concurrency
+        self._slots = threading.Semaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Pull] = {}
+
+    def image_exists(self, reference: str) -> bool:
+        try:
+            self.client.images.get(reference)
+            return True
+        except ImageNotFound:
+            return False
+
+    def pull(self, reference: str, progress: Optional[Callable[[str], None]] = None):
+        """Pull ``reference``, joining an identical pull already in progress.
+
+        Raises:
+            docker.errors.ImageNotFound: when the registry has no such image.
+            docker.errors.APIError: when the daemon or registry reports another error.
+        """
+        key = normalize_reference(reference)
+        with self._lock:
+            pull = self._inflight.get(key)
+            owner = pull is None
+            if owner:
+                pull = self._inflight[key] = _Pull()
+            if progress:
+                pull.listeners.append(progress)
+
+        if not owner:
+            if progress:
+                progress(f"{key}: waiting for pull already in progress")
+            pull.done.wait()
+            if pull.error is not None:
+                raise pull.error
+            return
+
+        try:
+            self._download(key, pull)
+        except BaseException as e:
+            pull.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pull.done.set()
+
+    def ensure_image(self, reference: str, progress: Optional[Callable[[str], None]] = None) -> bool:
+        """Pull ``reference`` unless it exists locally.
+
+        Returns:
+            True if the image was pulled.
+        """
+        if self.image_exists(reference):
+            return False
+        self.pull(reference, progress)
+        return True
+
+    def pull_many(
+        self,
+        references: Iterable[str],
+        progress: Optional[Callable[[str], None]] = None,
+        only_missing: bool = True,
+    ) -> Dict[str, Optional[str]]:
+        """Pull several images in parallel.
+
+        Returns:
+            ``{reference: error message or None}``
+        """
+        unique = list(dict.fromkeys(references))
+        if not unique:
+            return {}
+        fetch = self.ensure_image if only_missing else self.pull
+
+        def run(reference):
+            try:
+                fetch(reference, progress)
+                return None
+            except Exception as e:
+                message = getattr(e, "explanation", None) or str(e)
+                if progress:
+                    progress(f"{reference}: pull failed: {message}")
+                return message
+
+        with ThreadPoolExecutor(max_workers=min(len(unique), self.max_concurrent)) as pool:
+            return dict(zip(unique, pool.map(run, unique)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"in_flight": sorted(self._inflight), "max_concurrent": self.max_concurrent}
+
+    def _download(self, key: str, pull: _Pull):
+        def emit(line: str):
+            with self._lock:
+                listeners = list(pull.listeners)
+            for listener in listeners:
+                listener(line)
+
+        repository, tag = parse_repository_tag(key)
+        with self._slots:
+            emit(f"{key}: pulling")
+            layers: Dict[str, tuple] = {}
+            try:
+                events = self.client.api.pull(repository, tag=tag, stream=True, decode=True)
+            except errors.NotFound as e:
+                raise ImageNotFound(str(e), explanation=e.explanation) from e
+            for event in events:
+                message = event.get("error")
+                if message:
+                    if any(text in message.lower() for text in NOT_FOUND_ERRORS):
+                        raise ImageNotFound(message, explanation=message)
+                    raise errors.APIError(message, explanation=message)
+                line = _progress_line(key, event, layers)
+                if line:
+                    emit(line)
+            emit(f"{key}: pull complete")
+
+
+def _progress_line(key: str, event: Dict[str, Any], layers: Dict[str, tuple]) -> Optional[str]:
+    """Format a pull event, skipping repeats of a layer's status and step."""
+    status = event.get("status")
+    if not status:
+        return None
+    layer = event.get("id")
+    if not layer or layer == key.rsplit(":", 1)[-1]:
+        return f"{key}: {status}"
+
+    detail = event.get("progressDetail") or {}
+    current, total = detail.get("current"), detail.get("total")
+    step = None
+    if current is not None and total:
+        step = min(100, int(current * 100 / total)) // PROGRESS_STEP * PROGRESS_STEP
+    if layers.get(layer) == (status, step):
+        return None
+    layers[layer] = (status, step)
+    suffix = f" {step}%" if step is not None else ""
+    return f"{key}: layer {layer} {status}{suffix}"
+
+
+_pull_service: Optional[ImagePullService] = None
+_pull_service_lock = threading.Lock()
+
+
+def get_image_pull_service() -> ImagePullService:
+    global _pull_service
+    if _pull_service is None:
+        with _pull_service_lock:
+            if _pull_service is None:
+                _pull_service = ImagePullService()
+    return _pull_service
+
+class DockerImageManager:
+    client = SharedDockerClient()
 
     def list_images(self) -> List[Any]:
         """List all local images."""
@@ -39,5 +233,3 @@ class DockerImageManager:
     def delete_image(self, image_id: str):
         """Delete an image."""
         self.client.images.remove(image_id)
-
-    
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""In-memory container and image inventory kept current by Docker events.
+
+The inventory loads every container's inspect data and the image tag map
+once, then follows ``/events`` to re-inspect only the containers that
+changed. Reads never touch the Docker API while the event stream is
+connected; when the stream drops, the inventory reports itself as not ready
+(callers fall back to the API) until it reconnects and resyncs in full.
+"""
+import logging
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from docker import errors
+
+from hiveden.config.settings import config
+from hiveden.docker.client import get_docker_client
+from hiveden.docker.images import image_tags_by_id
+
+logger = logging.getLogger(__name__)
+
+# Container event actions that do not change inspect data.
+IGNORED_CONTAINER_ACTIONS = (
+    "exec_",
+    "attach",
+    "detach",
+    "resize",
+    "top",
+    "export",
+    "commit",
+    "copy",
+    "archive-path",
+    "extract-to-dir",
+)
+IMAGE_ACTIONS = ("pull", "push", "tag", "untag", "delete", "import", "load")
+
+
+class ContainerInventory:
+    """Container inspect data and image tags mirrored from the Docker daemon."""
+
+    def __init__(self, docker_client, reconnect_delay: float = 1.0):
+        self.client = docker_client
+        self.reconnect_delay = reconnect_delay
+        self._lock = threading.RLock()
+        self._containers: Dict[str, Dict[str, Any]] = {}
+        self._images: Dict[str, List[str]] = {}
+        self._synced = threading.Event()
+        self._stream = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._resyncs = 0
+        self._events = 0
+
+    @property
+    def ready(self) -> bool:
+        """True while the inventory is synced and following the event stream."""
+        return self._synced.is_set() and self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="hiveden-docker-inventory", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._synced.clear()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_ready(self, timeout: float = 5.0) -> bool:
+        """Block until a full sync completed and events are being followed."""
+        return self._synced.wait(timeout) and self.ready
+
+    def containers(self) -> List[Dict[str, Any]]:
+        """Inspect data of every container, newest first.
+
+        The returned dicts are shared with the inventory and must not be
+        modified.
+        """
+        with self._lock:
+            items = list(self._containers.values())
+        return sorted(items, key=lambda attrs: attrs.get("Created") or "", reverse=True)
+
+    def get(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Look a container up by full ID, unique ID prefix or name."""
+        with self._lock:
+            attrs = self._containers.get(container_id)
+            if attrs is not None:
+                return attrs
+            name = "/" + container_id.lstrip("/")
+            matches = [
+                a for cid, a in self._containers.items()
+                if a.get("Name") == name or cid.startswith(container_id)
+            ]
+        return matches[0] if len(matches) == 1 else None
+
+    def image_tags(self, image_id: str) -> Optional[List[str]]:
+        """Tags of a local image, or None when the image is unknown."""
+        with self._lock:
+            return self._images.get(image_id)
+
+    def filter(
+        self,
+        all: bool = False,
+        labels: Optional[Dict[str, str]] = None,
+        names: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Mirror the ``containers/json`` filters used by ``DockerManager``."""
+        if isinstance(names, str):
+            names = [names]
+        result = []
+        for attrs in self.containers():
+            if not all and not attrs.get("State", {}).get("Running"):
+                continue
+            container_labels = attrs.get("Config", {}).get("Labels") or {}
+            if labels and any(container_labels.get(k) != v for k, v in labels.items()):
+                continue
+            # The daemon matches name filters as regular expressions.
+            if names and not any(re.search(n, attrs.get("Name", "")) for n in names):
+                continue
+            result.append(attrs)
+        return result
+
+    def remember(self, attrs: Dict[str, Any]):
+        """Store fresh inspect data obtained outside the event stream."""
+        if attrs and attrs.get("Id"):
+            with self._lock:
+                self._containers[attrs["Id"]] = attrs
+
+    def forget(self, container_id: str):
+        with self._lock:
+            self._containers.pop(container_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "containers": len(self._containers),
+                "images": len(self._images),
+                "resyncs": self._resyncs,
+                "events": self._events,
+            }
+
+    def resync(self):
+        """Reload every container and the image map from the daemon."""
+        images = self._load_images()
+        containers = {}
+        for summary in self.client.api.containers(all=True):
+            attrs = self._inspect(summary["Id"])
+            if attrs is not None:
+                containers[attrs["Id"]] = attrs
+        with self._lock:
+            self._containers = containers
+            self._images = images
+            self._resyncs += 1
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                # Open the stream before the full load so no change made in
+                # between is missed; replayed events only cause a re-inspect.
+                self._stream = self.client.events(
+                    decode=True, filters={"type": ["container", "image", "network"]}
+                )
+                self.resync()
+                self._synced.set()
+                for event in self._stream:
+                    if self._stopping.is_set():
+                        break
+                    self._apply(event)
+            except Exception as e:
+                if not self._stopping.is_set():
+                    logger.warning(f"Docker event stream interrupted, resyncing: {e}")
+            finally:
+                self._synced.clear()
+                self._stream = None
+            self._stopping.wait(self.reconnect_delay)
+
+    def _apply(self, event: Dict[str, Any]):
+        with self._lock:
+            self._events += 1
+        event_type = event.get("Type")
+        action = event.get("Action") or event.get("status") or ""
+        actor = event.get("Actor") or {}
+
+        if event_type == "container":
+            container_id = actor.get("ID") or event.get("id")
+            if not container_id or action.startswith(IGNORED_CONTAINER_ACTIONS):
+                return
+            if action == "destroy":
+                self.forget(container_id)
+                return
+            self._refresh(container_id)
+        elif event_type == "network" and action in ("connect", "disconnect"):
+            # The container's IP address lives in its inspect data.
+            container_id = (actor.get("Attributes") or {}).get("container")
+            if container_id:
+                self._refresh(container_id)
+        elif event_type == "image" and action in IMAGE_ACTIONS:
+            images = self._load_images()
+            with self._lock:
+                self._images = images
+
+    def _refresh(self, container_id: str):
+        attrs = self._inspect(container_id)
+        if attrs is None:
+            self.forget(container_id)
+        else:
+            self.remember(attrs)
+
+    def _inspect(self, container_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.client.api.inspect_container(container_id)
+        except errors.NotFound:
+            return None
+
+    def _load_images(self) -> Dict[str, List[str]]:
+        return image_tags_by_id(self.client)
+
+
+_inventory: Optional[ContainerInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_container_inventory() -> Optional[ContainerInventory]:
+    """Return the process-wide inventory, or None when it is disabled."""
+    global _inventory
+    if not config.docker_inventory_enabled:
+        return None
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                _inventory = ContainerInventory(get_docker_client())
+    return _inventory
+
+
+def current_inventory() -> Optional[ContainerInventory]:
+    """The inventory if it was created and is ready to serve reads."""
+    if _inventory is not None and _inventory.ready:
+        return _inventory
+    return None
+
+
+def stop_container_inventory():
+    """Stop following Docker events; used on shutdown."""
+    if _inventory is not None:
+        _inventory.stop()
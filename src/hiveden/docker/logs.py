@@ -0,0 +1,264 @@
+"""Merged log tailing across several containers.
+
+Each container is read by its own task into a bounded buffer and the
+merger emits lines in timestamp order, in batches, to one consumer. Memory
+stays bounded however slow the consumer is: live tails drop (and report)
+their oldest lines, history reads pause the Docker stream until there is room.
+"""
+import asyncio
+import heapq
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from hiveden.docker.aio import AsyncDockerManager
+
+MAX_BATCH_LINES = 200
+FLUSH_INTERVAL = 0.25
+MAX_BUFFERED_LINES = 1000
+
+STREAM_NAMES = {1: "stdout", 2: "stderr"}
+_RELATIVE_TIME = re.compile(r"^(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_log_time(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parse a ``since``/``until`` value into a UNIX timestamp.
+
+    Accepts UNIX seconds (``1700000000``), RFC 3339 / ISO 8601 times and
+    durations relative to now (``30s``, ``15m``, ``2h``, ``1d``).
+
+    Raises:
+        ValueError: if the value is in none of these forms.
+    """
+    if value is None or value == "":
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    relative = _RELATIVE_TIME.match(value)
+    if relative:
+        amount, unit = relative.groups()
+        return (now if now is not None else time.time()) - float(amount) * _UNITS[unit]
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}': use UNIX seconds, RFC 3339 or a duration like 15m")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def timestamp_key(timestamp: str) -> str:
+    """Sortable form of a Docker RFC 3339 nano timestamp.
+
+    The daemon trims trailing zeros from the fraction, so the fraction is
+    padded to nanoseconds before comparing.
+    """
+    head, _, rest = timestamp.partition(".")
+    if not rest:
+        return head.rstrip("Z") + ".000000000"
+    fraction = rest.rstrip("Z")
+    return f"{head}.{fraction:0<9}"
+
+
+class _Tail:
+    """Bounded buffer of parsed lines for one container."""
+
+    def __init__(self, name: str, max_buffer: int, drop_oldest: bool, started: float):
+        self.name = name
+        self.lines: deque = deque()
+        self.max_buffer = max_buffer
+        self.drop_oldest = drop_oldest
+        self.room = asyncio.Event()
+        self.dropped = 0
+        self.partial = {1: "", 2: ""}
+        self.latest: Optional[str] = None
+        self.updated = started
+        self.done = False
+        self.error: Optional[str] = None
+
+    async def feed(self, stream: int, text: str, now: float):
+        """Add a frame, keeping incomplete lines until their newline arrives."""
+        data = self.partial.get(stream, "") + text
+        *complete, self.partial[stream] = data.split("\n")
+        for line in complete:
+            while not self.drop_oldest and len(self.lines) >= self.max_buffer:
+                self.room.clear()
+                await self.room.wait()
+            self._add(stream, line)
+        self.updated = now
+
+    def finish(self):
+        for stream, rest in self.partial.items():
+            if rest:
+                self._add(stream, rest)
+        self.partial = {1: "", 2: ""}
+        self.done = True
+
+    def _add(self, stream: int, line: str):
+        timestamp, _, message = line.rstrip("\r").partition(" ")
+        key = timestamp_key(timestamp)
+        if self.drop_oldest and len(self.lines) >= self.max_buffer:
+            self.lines.popleft()
+            self.dropped += 1
+        self.lines.append((key, self.name, timestamp, STREAM_NAMES.get(stream, str(stream)), message))
+        self.latest = key
+
+    def take(self, watermark: Optional[str]) -> List[tuple]:
+        """Remove and return buffered lines up to ``watermark`` (all if None)."""
+        taken = []
+        while self.lines and (watermark is None or self.lines[0][0] <= watermark):
+            taken.append(self.lines.popleft())
+        self.room.set()
+        return taken
+
+
+async def resolve_log_targets(
+    manager: AsyncDockerManager,
+    names: Optional[List[str]] = None,
+    labels: Optional[List[str]] = None,
+    app_id: Optional[str] = None,
+) -> List[str]:
+    """Names of the containers matching every given selector.
+
+    ``labels`` are ``key`` or ``key=value`` filters; ``app_id`` selects the
+    containers of an installed appstore app.
+    """
+    label_filters = list(labels or [])
+    if app_id:
+        label_filters.append(f"hiveden.app.id={app_id}")
+    filters: Dict[str, Any] = {}
+    if label_filters:
+        filters["label"] = label_filters
+    if names:
+        filters["name"] = names
+    if not filters:
+        raise ValueError("Select containers by name, label or app_id")
+
+    rows = await manager.client.request(
+        "GET", "/containers/json", {"all": True, "filters": filters}
+    )
+    found = sorted((row.get("Names") or ["/"])[0].lstrip("/") for row in rows)
+    if names:
+        # The daemon's name filter matches substrings.
+        found = [name for name in found if name in names]
+    return found
+
+
+async def multiplex_logs(
+    containers: List[str],
+    manager: Optional[AsyncDockerManager] = None,
+    follow: bool = True,
+    tail: Optional[int] = 100,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    max_batch: int = MAX_BATCH_LINES,
+    flush_interval: float = FLUSH_INTERVAL,
+    max_buffer: int = MAX_BUFFERED_LINES,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Tail several containers and yield their lines merged by timestamp.
+
+    Yields frames of the form::
+
+        {"lines": [{"container", "stream", "timestamp", "message"}, ...],
+         "dropped": {container: count}, "errors": {container: message}}
+
+    ``dropped`` and ``errors`` are only present when non-empty. A frame is
+    sent every ``flush_interval`` seconds, or sooner once ``max_batch`` lines
+    are waiting. A line is held back while a container that logged within
+    the last interval may still send an earlier one.
+
+    When following, a container whose buffer fills up because the consumer
+    is slow loses its oldest lines (reported in ``dropped``); otherwise its
+    reader waits for room, so history is never lost.
+    """
+    manager = manager or AsyncDockerManager()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    tails = [_Tail(name, max_buffer, follow, started) for name in containers]
+    wake = asyncio.Event()
+
+    async def read(state: _Tail):
+        try:
+            async for stream, text in manager.stream_log_frames(
+                state.name, follow=follow, tail=tail, timestamps=True, since=since, until=until
+            ):
+                await state.feed(stream, text, loop.time())
+                wake.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            state.error = str(e)
+        state.finish()
+        wake.set()
+
+    def buffered() -> int:
+        return sum(len(t.lines) for t in tails)
+
+    readers = [asyncio.create_task(read(state)) for state in tails]
+    try:
+        while True:
+            deadline = loop.time() + flush_interval
+            while buffered() < max_batch and not all(t.done for t in tails):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            now = loop.time()
+            active = [t for t in tails if not t.done and now - t.updated < flush_interval]
+            if any(t.latest is None for t in active) and buffered() < max_batch:
+                # A container has only just started: give it the first
+                # interval to send lines that may precede what we have.
+                continue
+            marks = [t.latest for t in active if t.latest is not None]
+            watermark = min(marks) if marks else None
+
+            merged = list(heapq.merge(*(t.take(watermark) for t in tails)))
+            extra: Dict[str, Any] = {}
+            dropped = {t.name: t.dropped for t in tails if t.dropped}
+            if dropped:
+                extra["dropped"] = dropped
+            errors = {t.name: t.error for t in tails if t.error}
+            if errors:
+                extra["errors"] = errors
+            for t in tails:
+                t.dropped = 0
+                t.error = None
+
+            batches = [merged[i:i + max_batch] for i in range(0, len(merged), max_batch)]
+            if extra and not batches:
+                batches = [[]]
+            for batch in batches:
+                yield {
+                    "lines": [
+                        {"container": name, "stream": stream, "timestamp": timestamp, "message": message}
+                        for _key, name, timestamp, stream, message in batch
+                    ],
+                    **extra,
+                }
+                extra = {}
+
+            if all(t.done and not t.lines for t in tails):
+                return
+            if not merged and buffered() >= max_batch:
+                # Everything buffered is held back; wait for the lagging
+                # container instead of spinning.
+                wake.clear()
+                try:
+                    await asyncio.wait_for(wake.wait(), flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
@@ -80,6 +80,117 @@ class Container(BaseModel):
     HostConfig: HostConfig
     IPAddress: Optional[str] = None
 
+class ContainerSummary(BaseModel):
+    """Container fields available from ``containers/json`` without an inspect.
+
+    Fields left out of a field selection stay unset.
+    """
+    Id: Optional[str] = None
+    Name: Optional[str] = None
+    Image: Optional[str] = None
+    ImageID: Optional[str] = None
+    Command: Optional[str] = None
+    Created: Optional[datetime] = None
+    State: Optional[str] = None
+    Status: Optional[str] = None
+    Ports: Optional[List[Dict]] = None
+    Labels: Optional[Dict] = None
+    IPAddress: Optional[str] = None
+
+class ContainerStatsSample(BaseModel):
+    """Resource usage at ``timestamp``, averaged over the tier's period.
+
+    Stats of controllers that are not enabled for the container are None;
+    network stats are None for containers using the host network.
+    """
+    timestamp: float
+    cpu_percent: Optional[float] = None
+    memory_bytes: Optional[float] = None
+    memory_limit: Optional[float] = None
+    io_read_bps: Optional[float] = None
+    io_write_bps: Optional[float] = None
+    net_rx_bps: Optional[float] = None
+    net_tx_bps: Optional[float] = None
+    pids: Optional[float] = None
+
+
+class ContainerStats(BaseModel):
+    Id: str
+    Name: str
+    tier: str
+    samples: List[ContainerStatsSample]
+
+
+class ContainerStatsTop(BaseModel):
+    Id: str
+    Name: str
+    sample: ContainerStatsSample
+
+
+class DiskUsageImage(BaseModel):
+    id: str
+    tags: List[str]
+    size: int
+    shared_size: int
+    unique_size: int
+    containers: int
+
+
+class DiskUsageContainer(BaseModel):
+    id: str
+    name: str
+    image_id: str
+    state: str
+    size_rw: int
+
+
+class DiskUsageVolume(BaseModel):
+    name: str
+    driver: str
+    anonymous: bool
+    size: Optional[int] = None
+    ref_count: int
+
+
+class DiskUsageBuildCache(BaseModel):
+    id: str
+    type: str
+    size: int
+    in_use: bool
+    shared: bool
+
+
+class DiskUsageTotal(BaseModel):
+    count: int
+    bytes: int
+    reclaimable_bytes: int
+
+
+class DiskUsage(BaseModel):
+    """A cached ``/system/df`` snapshot; ``stale`` while it is being recomputed."""
+    images: List[DiskUsageImage]
+    containers: List[DiskUsageContainer]
+    volumes: List[DiskUsageVolume]
+    build_cache: List[DiskUsageBuildCache]
+    totals: Dict[str, DiskUsageTotal]
+    computed_at: float
+    duration_seconds: float
+    age_seconds: float
+    stale: bool
+
+
+class ReclaimItem(BaseModel):
+    type: str
+    id: str
+    name: str
+    bytes: int
+
+
+class ReclaimPlan(BaseModel):
+    items: List[ReclaimItem]
+    bytes: int
+
+
 class Network(BaseModel):
     Name: str
     Id: str
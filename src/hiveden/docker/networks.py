@@ -1,26 +1,24 @@
-import docker
-
-client = docker.from_env()
+from hiveden.docker.client import get_docker_client
 
 
 def create_network(name, **kwargs):
     """Create a new Docker network."""
-    return client.networks.create(name, **kwargs)
+    return get_docker_client().networks.create(name, **kwargs)
 
 
 def get_network(network_id):
     """Get a Docker network by its ID."""
-    return client.networks.get(network_id)
+    return get_docker_client().networks.get(network_id)
 
 
 def list_networks(**kwargs):
     """List all Docker networks."""
-    return client.networks.list(**kwargs)
+    return get_docker_client().networks.list(**kwargs)
 
 
 def network_exists(network_name):
     """Check if a Docker network exists."""
-    networks = client.networks.list(names=[network_name])
+    networks = get_docker_client().networks.list(names=[network_name])
     return len(networks) > 0
 
 
@@ -0,0 +1,409 @@
+"""Container resource usage sampled from cgroup v2.
+
+One background thread reads the cgroup files of every running container
+each second (``/sys/fs/cgroup/system.slice/docker-<id>.scope`` with the
+systemd cgroup driver, ``/sys/fs/cgroup/docker/<id>`` with cgroupfs), so the
+cost does not depend on how many containers or API clients there are and no
+Docker stats stream is opened. Samples are kept in fixed-size ring buffers
+at three resolutions: 1s, 1m and 1h averages.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from hiveden.config.settings import config
+from hiveden.docker.client import get_docker_client
+
+logger = logging.getLogger(__name__)
+
+FIELDS = (
+    "cpu_percent",
+    "memory_bytes",
+    "memory_limit",
+    "io_read_bps",
+    "io_write_bps",
+    "net_rx_bps",
+    "net_tx_bps",
+    "pids",
+)
+# Tier name -> (seconds per sample, samples kept).
+TIERS = {"1s": (1, 300), "1m": (60, 360), "1h": (3600, 168)}
+
+_CONTAINER_ID = re.compile(r"^[0-9a-f]{64}$")
+_SCOPE = re.compile(r"^docker-([0-9a-f]{64})\.scope$")
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _read_int(path: str) -> Optional[int]:
+    value = _read(path)
+    if value is None or value.strip() == "max":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _keyed(text: Optional[str]) -> Dict[str, int]:
+    """Parse ``key value`` lines such as ``cpu.stat`` and ``memory.stat``."""
+    values = {}
+    for line in (text or "").splitlines():
+        key, _, value = line.partition(" ")
+        if value.strip().isdigit():
+            values[key] = int(value)
+    return values
+
+
+def read_cgroup_counters(cgroup: str, proc_root: str = "/proc") -> Dict[str, Optional[int]]:
+    """Raw cumulative counters and gauges of one container cgroup.
+
+    Values of controllers that are not enabled are None.
+    """
+    cpu = _keyed(_read(os.path.join(cgroup, "cpu.stat")))
+    memory_current = _read_int(os.path.join(cgroup, "memory.current"))
+    memory_stat = _keyed(_read(os.path.join(cgroup, "memory.stat")))
+    io_read = io_write = None
+    io_stat = _read(os.path.join(cgroup, "io.stat"))
+    if io_stat is not None:
+        io_read = io_write = 0
+        for line in io_stat.splitlines():
+            for item in line.split()[1:]:
+                key, _, value = item.partition("=")
+                if key == "rbytes":
+                    io_read += int(value)
+                elif key == "wbytes":
+                    io_write += int(value)
+
+    memory = None
+    if memory_current is not None:
+        # Same as `docker stats`: page cache that can be reclaimed is not usage.
+        memory = memory_current - memory_stat.get("inactive_file", 0)
+    rx, tx = _read_net(cgroup, proc_root)
+    return {
+        "cpu_usec": cpu.get("usage_usec"),
+        "memory_bytes": memory,
+        "memory_limit": _read_int(os.path.join(cgroup, "memory.max")),
+        "io_read": io_read,
+        "io_write": io_write,
+        "net_rx": rx,
+        "net_tx": tx,
+        "pids": _read_int(os.path.join(cgroup, "pids.current")),
+    }
+
+
+def _read_net(cgroup: str, proc_root: str) -> Tuple[Optional[int], Optional[int]]:
+    """Network totals of the container's namespace, read through one of its processes."""
+    procs = (_read(os.path.join(cgroup, "cgroup.procs")) or "").split()
+    if not procs:
+        return None, None
+    try:
+        namespace = os.readlink(os.path.join(proc_root, procs[0], "ns", "net"))
+        if namespace == os.readlink(os.path.join(proc_root, "1", "ns", "net")):
+            # Host networking: the counters would be the host's.
+            return None, None
+    except OSError:
+        pass
+    text = _read(os.path.join(proc_root, procs[0], "net", "dev"))
+    if text is None:
+        return None, None
+    rx = tx = 0
+    for line in text.splitlines()[2:]:
+        interface, _, values = line.partition(":")
+        columns = values.split()
+        if interface.strip() == "lo" or len(columns) < 9:
+            continue
+        rx += int(columns[0])
+        tx += int(columns[8])
+    return rx, tx
+
+
+def _rate(current: Optional[int], previous: Optional[int], seconds: float) -> Optional[float]:
+    if current is None or previous is None or current < previous:
+        return None
+    return (current - previous) / seconds
+
+
+def _average(rows: List[tuple]) -> tuple:
+    averaged = []
+    for column in zip(*rows):
+        values = [v for v in column if v is not None]
+        averaged.append(sum(values) / len(values) if values else None)
+    return tuple(averaged)
+
+
+class ContainerHistory:
+    """Ring buffers of one container's samples at each tier.
+
+    Each sample is a tuple of the timestamp followed by ``FIELDS``.
+    """
+
+    def __init__(self):
+        self.tiers = {name: deque(maxlen=size) for name, (_step, size) in TIERS.items()}
+        # Samples of the minute/hour currently being averaged.
+        self._buckets: Dict[str, Tuple[Optional[int], List[tuple]]] = {
+            "1m": (None, []),
+            "1h": (None, []),
+        }
+
+    def add(self, sample: tuple):
+        self.tiers["1s"].append(sample)
+        self._accumulate("1m", sample)
+
+    def _accumulate(self, tier: str, sample: tuple):
+        step = TIERS[tier][0]
+        bucket, rows = self._buckets[tier]
+        slot = int(sample[0] // step)
+        if bucket is not None and slot != bucket and rows:
+            averaged = (float(bucket * step),) + _average([row[1:] for row in rows])
+            self.tiers[tier].append(averaged)
+            if tier == "1m":
+                self._accumulate("1h", averaged)
+            rows = []
+        self._buckets[tier] = (slot, rows + [sample])
+
+    def latest(self) -> Optional[tuple]:
+        samples = self.tiers["1s"]
+        return samples[-1] if samples else None
+
+
+def sample_dict(sample: tuple) -> Dict[str, Any]:
+    return {"timestamp": sample[0], **dict(zip(FIELDS, sample[1:]))}
+
+
+class ContainerStatsSampler:
+    """Samples every running container's cgroup on a fixed interval."""
+
+    def __init__(
+        self,
+        docker_client=None,
+        cgroup_root: str = "/sys/fs/cgroup",
+        proc_root: str = "/proc",
+        interval: float = 1.0,
+    ):
+        self.client = docker_client
+        self.cgroup_root = cgroup_root
+        self.proc_root = proc_root
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._history: Dict[str, ContainerHistory] = {}
+        self._previous: Dict[str, Tuple[float, Dict[str, Optional[int]]]] = {}
+        self._names: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._samples = 0
+        self._last_duration = 0.0
+
+    @property
+    def supported(self) -> bool:
+        """True when the host uses the unified (v2) cgroup hierarchy."""
+        return os.path.exists(os.path.join(self.cgroup_root, "cgroup.controllers"))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        if not self.supported:
+            logger.warning(f"Container stats disabled: {self.cgroup_root} is not a cgroup v2 mount")
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="hiveden-docker-stats", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def container_cgroups(self) -> Dict[str, str]:
+        """Cgroup directory of every running container, by container ID."""
+        found = {}
+        for parent, pattern in (("system.slice", _SCOPE), ("docker", _CONTAINER_ID)):
+            try:
+                entries = os.scandir(os.path.join(self.cgroup_root, parent))
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    match = pattern.match(entry.name)
+                    if match and entry.is_dir():
+                        found[match.group(match.lastindex or 0)] = entry.path
+        return found
+
+    def sample(self, now: Optional[float] = None):
+        """Take one sample of every running container."""
+        now = time.time() if now is None else now
+        started = time.monotonic()
+        cgroups = self.container_cgroups()
+        samples = {}
+        counters = {}
+        for container_id, path in cgroups.items():
+            current = read_cgroup_counters(path, self.proc_root)
+            counters[container_id] = (now, current)
+            previous = self._previous.get(container_id)
+            if previous is None or now <= previous[0]:
+                continue
+            seconds = now - previous[0]
+            before = previous[1]
+            cpu = _rate(current["cpu_usec"], before["cpu_usec"], seconds)
+            samples[container_id] = (
+                now,
+                cpu / 1e4 if cpu is not None else None,
+                current["memory_bytes"],
+                current["memory_limit"],
+                _rate(current["io_read"], before["io_read"], seconds),
+                _rate(current["io_write"], before["io_write"], seconds),
+                _rate(current["net_rx"], before["net_rx"], seconds),
+                _rate(current["net_tx"], before["net_tx"], seconds),
+                current["pids"],
+            )
+
+        unknown = [cid for cid in cgroups if cid not in self._names]
+        if unknown:
+            self._load_names(unknown)
+        with self._lock:
+            self._previous = counters
+            # Stopped containers' cgroups are gone; drop their history too.
+            self._history = {cid: h for cid, h in self._history.items() if cid in cgroups}
+            for container_id, sample in samples.items():
+                self._history.setdefault(container_id, ContainerHistory()).add(sample)
+            self._names = {cid: n for cid, n in self._names.items() if cid in cgroups}
+            self._samples += 1
+            self._last_duration = time.monotonic() - started
+
+    def resolve(self, container_id: str) -> Optional[str]:
+        """Full ID of a sampled container given its ID, unique prefix or name."""
+        with self._lock:
+            if container_id in self._history:
+                return container_id
+            name = container_id.lstrip("/")
+            matches = [
+                cid for cid in self._history
+                if cid.startswith(container_id) or self._names.get(cid) == name
+            ]
+        return matches[0] if len(matches) == 1 else None
+
+    def name(self, container_id: str) -> str:
+        with self._lock:
+            return self._names.get(container_id, container_id[:12])
+
+    def history(self, container_id: str, tier: str = "1s", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Samples of a tier, oldest first; the last ``limit`` when given.
+
+        Raises:
+            ValueError: for an unknown tier.
+        """
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier '{tier}', expected one of {', '.join(TIERS)}")
+        with self._lock:
+            history = self._history.get(container_id)
+            samples = list(history.tiers[tier]) if history else []
+        if limit:
+            samples = samples[-limit:]
+        return [sample_dict(s) for s in samples]
+
+    def latest(self, container_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            history = self._history.get(container_id)
+            sample = history.latest() if history else None
+        return sample_dict(sample) if sample else None
+
+    def top(self, by: str = "cpu_percent", limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest sample of the ``limit`` containers using the most of ``by``.
+
+        Raises:
+            ValueError: for an unknown field.
+        """
+        if by not in FIELDS:
+            raise ValueError(f"Unknown stat '{by}', expected one of {', '.join(FIELDS)}")
+        column = FIELDS.index(by) + 1
+        with self._lock:
+            latest = [
+                (cid, h.latest()) for cid, h in self._history.items() if h.latest() is not None
+            ]
+            names = dict(self._names)
+        latest.sort(key=lambda item: item[1][column] or 0, reverse=True)
+        return [
+            {"Id": cid, "Name": names.get(cid, cid[:12]), "sample": sample_dict(sample)}
+            for cid, sample in latest[:limit]
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "containers": len(self._history),
+                "samples": self._samples,
+                "last_duration": self._last_duration,
+            }
+
+    def _load_names(self, unknown: List[str]):
+        from hiveden.docker.inventory import current_inventory
+
+        inventory = current_inventory()
+        if inventory is not None:
+            rows = [(a["Id"], a.get("Name", "")) for a in inventory.containers()]
+        elif self.client is not None:
+            try:
+                rows = [(c["Id"], (c.get("Names") or [""])[0]) for c in self.client.api.containers()]
+            except Exception as e:
+                logger.warning(f"Could not load container names: {e}")
+                return
+        else:
+            return
+        names = {cid: name.lstrip("/") for cid, name in rows}
+        # Containers Docker does not list keep their short ID as name.
+        names.update({cid: cid[:12] for cid in unknown if cid not in names})
+        with self._lock:
+            self._names.update(names)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            tick = time.monotonic()
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning(f"Container stats sample failed: {e}")
+            self._stopping.wait(max(0.0, self.interval - (time.monotonic() - tick)))
+
+
+_sampler: Optional[ContainerStatsSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_container_stats_sampler() -> Optional[ContainerStatsSampler]:
+    """Return the process-wide sampler, or None when it is disabled."""
+    global _sampler
+    if not config.docker_stats_enabled:
+        return None
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = ContainerStatsSampler(get_docker_client())
+    return _sampler
+
+
+def current_stats_sampler() -> Optional[ContainerStatsSampler]:
+    """The sampler if it was created and is running."""
+    if _sampler is not None and _sampler.running:
+        return _sampler
+    return None
+
+
+def stop_container_stats_sampler():
+    """Stop sampling; used on shutdown."""
+    if _sampler is not None:
+        _sampler.stop()
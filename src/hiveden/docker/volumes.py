@@ -1,16 +1,13 @@
 from typing import Any, Dict, List, Optional
 
-import docker
 from docker import errors
 
+from hiveden.docker.client import SharedDockerClient
 from hiveden.docker.volume_rules import normalize_volume_attrs
 
-client = docker.from_env()
-
 
 class DockerVolumeManager:
-    def __init__(self):
-        self.client = client
+    client = SharedDockerClient()
 
     def list_volumes(self, dangling: Optional[bool] = None) -> List[Dict[str, Any]]:
         """List Docker volumes, optionally filtering by dangling state."""
@@ -0,0 +1,135 @@
+"""LRU cache of scanned directory listings.
+
+Adding, removing or renaming an entry updates its directory's mtime, so a
+listing scanned earlier is still valid while the directory's
+``(st_dev, st_ino, st_mtime_ns)`` is unchanged: a revisit costs one
+``stat`` of the directory instead of one per entry. Changes *inside*
+entries (a file growing, a chmod) do not touch the directory, so cached
+entry stats may lag behind; callers re-stat the entries they return when
+they need them current (``ScannedEntry.restat``).
+
+A directory modified within ``RACY_WINDOW_NS`` of being scanned is not
+cached, since a later change in the same timestamp tick would not change
+its mtime.
+
+Memory use is estimated per entry and bounded by
+``HIVEDEN_EXPLORER_LISTING_CACHE_MB``; least recently used listings are
+evicted first.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from hiveden.config.settings import config
+from hiveden.explorer.listing import ScannedEntry, scan_directory
+
+# Rough size of a cached entry besides its name and path: the ScannedEntry,
+# its DirEntry and stat_result.
+ENTRY_OVERHEAD_BYTES = 400
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class _Listing(NamedTuple):
+    validator: Tuple[int, int, int]
+    entries: List[ScannedEntry]
+    total_size: int
+    size: int
+
+
+def _estimate_size(entries: List[ScannedEntry]) -> int:
+    return sum(ENTRY_OVERHEAD_BYTES + len(e.entry.name) + len(e.entry.path) for e in entries)
+
+
+class ListingCache:
+    """Scanned listings keyed by (path, show_hidden), validated against the
+    directory's inode and mtime."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(config.explorer_listing_cache_mb * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[Tuple[str, bool], _Listing]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def scan(self, path: str, show_hidden: bool = False) -> Tuple[List[ScannedEntry], int]:
+        """``scan_directory(path, show_hidden)``, served from the cache when
+        the directory is unchanged.
+
+        The returned list is the caller's own; the entries are shared and
+        must not be modified.
+        """
+        st = os.stat(path)
+        validator = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        key = (path, show_hidden)
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached.validator == validator:
+                self._listings.move_to_end(key)
+                self.hits += 1
+                return list(cached.entries), cached.total_size
+            self.misses += 1
+            if cached is not None:
+                self.stale += 1
+                self._remove(key)
+
+        entries, total_size = scan_directory(path, show_hidden)
+        if time.time_ns() - st.st_mtime_ns >= RACY_WINDOW_NS:
+            self._store(key, _Listing(validator, list(entries), total_size, _estimate_size(entries)))
+        return entries, total_size
+
+    def _store(self, key: Tuple[str, bool], listing: _Listing):
+        if listing.size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._listings:
+                self._remove(key)
+            self._listings[key] = listing
+            self._bytes += listing.size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._listings)))
+                self.evictions += 1
+
+    def _remove(self, key: Tuple[str, bool]):
+        self._bytes -= self._listings.pop(key).size
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop the listings of ``path``, or all listings."""
+        with self._lock:
+            for key in list(self._listings):
+                if path is None or key[0] == path:
+                    self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "listings": len(self._listings),
+                "entries": sum(len(listing.entries) for listing in self._listings.values()),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache: Optional[ListingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_listing_cache() -> ListingCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ListingCache()
+    return _cache
@@ -0,0 +1,228 @@
+"""Parallel directory tree walk.
+
+``os.walk`` reads one directory at a time, so walking a large tree is
+bound by the latency of each ``scandir``. ``Crawler`` reads directories
+with several threads (``scandir`` releases the GIL) and hands results to
+the caller as they complete, in no particular order.
+
+Each worker keeps its own deque of directories to read, taking the most
+recently found one (depth first, so the kernel's dentry cache stays warm)
+and stealing the oldest one of another worker when it runs out.
+
+Entries are filtered on what ``readdir`` returns: hidden names and
+non-matching names are dropped before anything is stat'ed, and the entry
+type comes from ``d_type``. Only symlinks, and directories when following
+symlinks (to detect loops by device and inode), cost a ``stat``.
+"""
+import os
+import queue
+import threading
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Optional, Pattern, Set, Tuple
+
+# Entries of a directory: (name, is_dir). Like ``os.walk``, symlinks to
+# directories count as directories.
+DirectoryEntries = List[Tuple[str, bool]]
+
+_DONE = object()
+
+
+class _WorkQueues:
+    """Per-worker deques of directories with stealing and idle detection."""
+
+    def __init__(self, workers: int):
+        self._deques: List[Deque[str]] = [deque() for _ in range(workers)]
+        self._condition = threading.Condition()
+        # Directories queued or being read; the walk is over at zero.
+        self._outstanding = 0
+        self._closed = False
+
+    def push(self, worker: int, paths: List[str]):
+        if not paths:
+            return
+        with self._condition:
+            self._deques[worker].extend(paths)
+            self._outstanding += len(paths)
+            self._condition.notify(len(paths))
+
+    def pop(self, worker: int) -> Optional[str]:
+        """The next directory for ``worker``; None when the walk is over."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                own = self._deques[worker]
+                if own:
+                    return own.pop()
+                count = len(self._deques)
+                for offset in range(1, count):
+                    victim = self._deques[(worker + offset) % count]
+                    if victim:
+                        return victim.popleft()
+                if self._outstanding == 0:
+                    self._closed = True
+                    self._condition.notify_all()
+                    return None
+                self._condition.wait()
+
+    def done(self) -> bool:
+        """Mark a popped directory as read; True when it was the last one."""
+        with self._condition:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._condition.notify_all()
+                return True
+            return False
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class Crawler:
+    """Walks ``root`` with ``workers`` threads.
+
+    Args:
+        show_hidden: when False, names starting with '.' are skipped and
+            hidden directories are not entered.
+        follow_symlinks: enter symlinked directories; each directory is
+            entered once, so symlink loops end.
+        cancel: stops the walk when set.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        workers: int = 8,
+        show_hidden: bool = True,
+        follow_symlinks: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ):
+        self.root = root
+        self.workers = max(1, workers)
+        self.show_hidden = show_hidden
+        self.follow_symlinks = follow_symlinks
+        self.cancel = cancel or threading.Event()
+        # Entries read so far (after the hidden filter).
+        self.scanned = 0
+        self._visited: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def directories(self) -> Iterator[Tuple[str, Optional[DirectoryEntries]]]:
+        """Yield ``(directory, entries)`` for ``root`` and every directory
+        below it; ``entries`` is None for directories that could not be read."""
+        return self._run(lambda path, entries: [(path, entries)])
+
+    def matches(self, regex: Pattern, type_filter: str = "all") -> Iterator[Tuple[str, bool]]:
+        """Yield ``(path, is_dir)`` of the entries below ``root`` whose name
+        matches ``regex`` (``re.search``) and type ``type_filter``
+        ("all", "file" or "directory")."""
+        want_dirs = type_filter in ("all", "directory")
+        want_files = type_filter in ("all", "file")
+
+        def select(path, entries):
+            return [
+                (os.path.join(path, name), is_dir)
+                for name, is_dir in entries or ()
+                if (want_dirs if is_dir else want_files) and regex.search(name)
+            ]
+
+        return self._run(select)
+
+    def _first_visit(self, st: os.stat_result) -> bool:
+        key = (st.st_dev, st.st_ino)
+        with self._lock:
+            if key in self._visited:
+                return False
+            self._visited.add(key)
+            return True
+
+    def _read(self, path: str) -> Tuple[Optional[DirectoryEntries], List[str]]:
+        entries, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if not self.show_hidden and name.startswith('.'):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                        if is_dir:
+                            if self.follow_symlinks:
+                                if self._first_visit(entry.stat()):
+                                    subdirs.append(entry.path)
+                            elif not entry.is_symlink():
+                                subdirs.append(entry.path)
+                    except OSError:
+                        is_dir = False
+                    entries.append((name, is_dir))
+        except OSError:
+            return None, []
+        with self._lock:
+            self.scanned += len(entries)
+        return entries, subdirs
+
+    def _run(self, select: Callable[[str, Optional[DirectoryEntries]], list]) -> Iterator:
+        work = _WorkQueues(self.workers)
+        results: "queue.Queue" = queue.Queue(maxsize=self.workers * 16)
+        cancel = self.cancel
+        stopping = threading.Event()
+
+        def put(item) -> bool:
+            while not (stopping.is_set() or cancel.is_set()):
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run(worker: int):
+            while True:
+                path = work.pop(worker)
+                if path is None:
+                    return
+                if cancel.is_set() or stopping.is_set():
+                    work.close()
+                    return
+                entries, subdirs = self._read(path)
+                work.push(worker, subdirs)
+                selected = select(path, entries)
+                if selected and not put(selected):
+                    work.close()
+                    return
+                if work.done():
+                    put(_DONE)
+
+        if self.follow_symlinks:
+            try:
+                self._first_visit(os.stat(self.root))
+            except OSError:
+                pass
+        work.push(0, [self.root])
+        threads = [
+            threading.Thread(target=run, args=(i,), name=f"hiveden-crawler-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while not cancel.is_set():
+                try:
+                    item = results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    return
+                yield from item
+        finally:
+            stopping.set()
+            work.close()
+            for thread in threads:
+                thread.join()
+
+
+def walk(root: str, workers: int = 8) -> Iterator[Tuple[str, Optional[DirectoryEntries]]]:
+    """``Crawler(root, workers).directories()``."""
+    return Crawler(root, workers).directories()
@@ -0,0 +1,475 @@
+"""Persistent filename index for explorer search.
+
+Paths under the filesystem locations are stored in a SQLite database
+(``HIVEDEN_EXPLORER_INDEX_PATH``) with an FTS5 trigram index on the
+names. A search narrows the candidates down with the trigram index using
+the literal parts of a glob, then checks them against the same regular
+expression the filesystem walk uses, so results match a walk of the tree.
+Regex searches (which have no literal parts to look up) scan the names
+stored for the searched root instead of the disk.
+
+``FilenameIndexer`` builds the index with the parallel crawler and keeps
+it current with inotify watches on every indexed directory. Changes that
+are missed, e.g. when the inotify queue overflows, the watch limit is
+reached, or a file is created while its directory is being read, are
+caught by a full reconciliation every
+``HIVEDEN_EXPLORER_INDEX_RECONCILE_SECONDS``.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from hiveden.config.settings import config
+from hiveden.explorer import inotify
+from hiveden.explorer.crawler import walk
+
+logger = logging.getLogger(__name__)
+
+# Rows written per transaction while crawling.
+WRITE_BATCH_SIZE = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    hidden INTEGER NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entry_names USING fts5(
+    name, content='entries', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entry_names(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entry_names(entry_names, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0,
+    entries INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL,
+    duration_seconds REAL
+);
+"""
+
+
+def glob_regex(pattern: str) -> str:
+    """The regular expression explorer search uses for a glob."""
+    return re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
+
+
+def _subtree(path: str) -> Tuple[str, str]:
+    # Paths below ``path`` sort between "<path>/" and "<path>0" ('0' follows '/').
+    prefix = path.rstrip('/') + '/'
+    return prefix, prefix[:-1] + '0'
+
+
+def _is_hidden(root: str, path: str) -> bool:
+    relative = os.path.relpath(path, root)
+    return any(part.startswith('.') for part in relative.split(os.sep) if part != '.')
+
+
+def _fts_query(literals: Iterable[str]) -> str:
+    return " AND ".join('"' + literal.replace('"', '""') + '"' for literal in literals)
+
+
+class FilenameIndex:
+    """The SQLite store: writes come from one thread, reads from any."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        self._write_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def close(self):
+        self._writer.close()
+
+    # --- Writes ---
+
+    def begin_generation(self, root: str) -> int:
+        with self._write_lock, self._writer:
+            self._writer.execute("INSERT OR IGNORE INTO roots(path) VALUES (?)", (root,))
+            self._writer.execute("UPDATE roots SET generation = generation + 1 WHERE path = ?", (root,))
+            return self._writer.execute("SELECT generation FROM roots WHERE path = ?", (root,)).fetchone()[0]
+
+    def upsert(self, rows: List[Tuple[str, str, bool, bool]], generation: int):
+        """Add or refresh ``(path, name, is_dir, hidden)`` rows."""
+        with self._write_lock, self._writer:
+            self._writer.executemany(
+                "INSERT INTO entries(path, name, is_dir, hidden, generation) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET is_dir = excluded.is_dir, hidden = excluded.hidden, "
+                "generation = excluded.generation",
+                [(path, name, int(is_dir), int(hidden), generation) for path, name, is_dir, hidden in rows],
+            )
+
+    def remove(self, path: str):
+        """Forget ``path`` and everything below it."""
+        low, high = _subtree(path)
+        with self._write_lock, self._writer:
+            self._writer.execute(
+                "DELETE FROM entries WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high)
+            )
+
+    def finish_generation(self, root: str, generation: int, duration: float) -> int:
+        """Drop what the crawl of ``generation`` did not see; returns the
+        number of entries of ``root``."""
+        low, high = _subtree(root)
+        with self._write_lock, self._writer:
+            self._writer.execute(
+                "DELETE FROM entries WHERE path >= ? AND path < ? AND generation < ?", (low, high, generation)
+            )
+            count = self._writer.execute(
+                "SELECT count(*) FROM entries WHERE path >= ? AND path < ?", (low, high)
+            ).fetchone()[0]
+            self._writer.execute(
+                "UPDATE roots SET entries = ?, indexed_at = ?, duration_seconds = ? WHERE path = ?",
+                (count, time.time(), round(duration, 3), root),
+            )
+        return count
+
+    def drop_root(self, root: str):
+        with self._write_lock, self._writer:
+            self._writer.execute("DELETE FROM roots WHERE path = ?", (root,))
+        self.remove(root)
+
+    # --- Reads ---
+
+    def roots(self) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT path, entries, indexed_at, duration_seconds FROM roots ORDER BY path"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"path": path, "entries": entries, "indexed_at": indexed_at, "duration_seconds": duration}
+            for path, entries, indexed_at, duration in rows
+        ]
+
+    def covering_root(self, path: str) -> Optional[str]:
+        """The indexed root ``path`` is in, if it was fully indexed."""
+        path = os.path.abspath(path)
+        for root in self.roots():
+            if root["indexed_at"] is None:
+                continue
+            if path == root["path"] or path.startswith(root["path"].rstrip('/') + '/'):
+                return root["path"]
+        return None
+
+    def search(
+        self,
+        path: str,
+        pattern: str,
+        use_regex: bool = False,
+        case_sensitive: bool = False,
+        type_filter: str = "all",
+        show_hidden: bool = False,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Tuple[str, bool]], int]:
+        """Entries below ``path`` whose name matches, like a filesystem search.
+
+        Returns:
+            ``([(path, is_dir)], number of indexed names checked)``
+        """
+        path = os.path.abspath(path)
+        regex = re.compile(pattern if use_regex else glob_regex(pattern), 0 if case_sensitive else re.IGNORECASE)
+        low, high = _subtree(path)
+        conditions = ["e.path >= ?", "e.path < ?"]
+        params: List[Any] = [low, high]
+        if type_filter == "file":
+            conditions.append("e.is_dir = 0")
+        elif type_filter == "directory":
+            conditions.append("e.is_dir = 1")
+        # ``hidden`` is relative to the root; searching inside a hidden
+        # directory only skips what is hidden below it.
+        root = self.covering_root(path)
+        check_hidden = not show_hidden and (root is None or _is_hidden(root, path))
+        if not show_hidden and not check_hidden:
+            conditions.append("e.hidden = 0")
+        literals = [] if use_regex else [part for part in re.split(r'[*?]', pattern) if len(part) >= 3]
+        query = "SELECT e.path, e.name, e.is_dir FROM entries e"
+        if literals:
+            query += " JOIN entry_names n ON n.rowid = e.id AND entry_names MATCH ?"
+            params.insert(0, _fts_query(literals))
+        query += " WHERE " + " AND ".join(conditions) + " ORDER BY e.path"
+
+        matches: List[Tuple[str, bool]] = []
+        checked = 0
+        conn = self._connect()
+        try:
+            for entry_path, name, is_dir in conn.execute(query, params):
+                if check_hidden and _is_hidden(path, entry_path):
+                    continue
+                checked += 1
+                if regex.search(name):
+                    matches.append((entry_path, bool(is_dir)))
+                    if limit is not None and len(matches) >= limit:
+                        break
+        finally:
+            conn.close()
+        return matches, checked
+
+
+class FilenameIndexer:
+    """Builds the index for a set of roots and keeps it current."""
+
+    def __init__(
+        self,
+        index: FilenameIndex,
+        roots: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+        reconcile_interval: Optional[float] = None,
+        watch: bool = True,
+    ):
+        self.index = index
+        self._configured_roots = roots
+        self.workers = workers or config.explorer_crawl_workers
+        self.reconcile_interval = (
+            config.explorer_index_reconcile_seconds if reconcile_interval is None else reconcile_interval
+        )
+        self.watch = watch and inotify.supported()
+        self._inotify: Optional[inotify.Inotify] = None
+        self._watch_limit_reached = False
+        self._roots: List[str] = []
+        self._building: Optional[str] = None
+        self._last_reconcile: Optional[float] = None
+        self._reconcile = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="hiveden-explorer-index", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def request_reconcile(self):
+        """Re-crawl every root soon (e.g. after locations changed)."""
+        self._reconcile.set()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            building = self._building
+        return {
+            "running": self.running,
+            "building": building,
+            "watching": self._inotify is not None,
+            "watches": self._inotify.watches if self._inotify is not None else 0,
+            "watch_limit_reached": self._watch_limit_reached,
+            "last_reconcile": self._last_reconcile,
+            "reconcile_interval_seconds": self.reconcile_interval,
+            "roots": self.index.roots(),
+        }
+
+    # --- Index maintenance (indexer thread) ---
+
+    def configured_roots(self) -> List[str]:
+        """Existing location directories, without ones nested in another."""
+        if self._configured_roots is not None:
+            paths = self._configured_roots
+        else:
+            from hiveden.explorer.manager import ExplorerManager
+            paths = [location.path for location in ExplorerManager().get_locations()]
+        roots: List[str] = []
+        for path in sorted({os.path.abspath(p) for p in paths if p and os.path.isdir(p)}):
+            if not any(path == root or path.startswith(root.rstrip('/') + '/') for root in roots):
+                roots.append(path)
+        return roots
+
+    def reconcile(self):
+        """Crawl every root again, dropping roots that are not configured."""
+        roots = self.configured_roots()
+        for stale in {r["path"] for r in self.index.roots()} - set(roots):
+            self.index.drop_root(stale)
+        self._roots = roots
+        for root in roots:
+            if self._stopping.is_set():
+                return
+            self.build(root)
+        self._last_reconcile = time.time()
+
+    def build(self, root: str) -> int:
+        with self._lock:
+            self._building = root
+        started = time.monotonic()
+        try:
+            generation = self.index.begin_generation(root)
+            self._crawl(root, root, generation)
+            count = self.index.finish_generation(root, generation, time.monotonic() - started)
+            logger.info(f"Indexed {count} entries under {root} in {time.monotonic() - started:.1f}s")
+            return count
+        finally:
+            with self._lock:
+                self._building = None
+
+    def _crawl(self, root: str, top: str, generation: int):
+        batch: List[Tuple[str, str, bool, bool]] = []
+        for directory, entries in walk(top, self.workers):
+            if self._stopping.is_set():
+                return
+            if entries is None:
+                continue
+            self._add_watch(directory)
+            hidden = _is_hidden(root, directory)
+            for name, is_dir in entries:
+                batch.append((os.path.join(directory, name), name, is_dir, hidden or name.startswith('.')))
+            if len(batch) >= WRITE_BATCH_SIZE:
+                self.index.upsert(batch, generation)
+                batch = []
+        if batch:
+            self.index.upsert(batch, generation)
+
+    def _add_watch(self, directory: str):
+        if self._inotify is None or self._watch_limit_reached:
+            return
+        try:
+            self._inotify.add_watch(directory)
+        except OSError as e:
+            if inotify.is_watch_limit(e):
+                self._watch_limit_reached = True
+                logger.warning(
+                    "inotify watch limit reached; the explorer index relies on periodic "
+                    "reconciliation for the remaining directories (raise fs.inotify.max_user_watches)"
+                )
+            elif e.errno not in (2, 20):  # ENOENT, ENOTDIR: gone already
+                logger.debug(f"Cannot watch {directory}: {e}")
+
+    def _root_of(self, path: str) -> Optional[str]:
+        for root in self._roots:
+            if path == root or path.startswith(root.rstrip('/') + '/'):
+                return root
+        return None
+
+    def apply(self, events: List[inotify.Event]):
+        """Update the index for a batch of inotify events."""
+        # Directories moved out, by cookie, until their IN_MOVED_TO shows
+        # whether they stayed in a watched directory.
+        moved_in = {event.cookie for event in events if event.mask & inotify.IN_MOVED_TO}
+        moved_out: Dict[int, str] = {}
+        for event in events:
+            if event.mask & inotify.IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed; reconciling the explorer index")
+                self._reconcile.set()
+                continue
+            if self._inotify is not None:
+                event = self._inotify.current(event)
+            path = event.path
+            root = self._root_of(path) if path else None
+            if root is None or not event.name:
+                continue
+            is_dir = bool(event.mask & inotify.IN_ISDIR)
+            if event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                self.index.remove(path)
+                if is_dir and self._inotify is not None:
+                    if event.mask & inotify.IN_MOVED_FROM and event.cookie in moved_in:
+                        moved_out[event.cookie] = path
+                    else:
+                        self._inotify.remove_tree(path)
+            elif event.mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+                moved_from = moved_out.pop(event.cookie, None) if event.mask & inotify.IN_MOVED_TO else None
+                if moved_from is not None:
+                    self._inotify.move_tree(moved_from, path)
+                generation = self._generation(root)
+                hidden = _is_hidden(root, path)
+                self.index.upsert([(path, event.name, is_dir, hidden)], generation)
+                if is_dir and not os.path.islink(path):
+                    # A directory moved in brings its contents along; one
+                    # created empty may already have some.
+                    self._crawl(root, path, generation)
+        for path in moved_out.values():
+            # Moved to a directory outside the indexed roots.
+            self._inotify.remove_tree(path)
+
+    def _generation(self, root: str) -> int:
+        conn = self.index._connect()
+        try:
+            row = conn.execute("SELECT generation FROM roots WHERE path = ?", (root,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
+    def _run(self):
+        if self.watch:
+            try:
+                self._inotify = inotify.Inotify()
+            except OSError as e:
+                logger.warning(f"inotify unavailable, explorer index relies on reconciliation: {e}")
+        try:
+            next_reconcile = 0.0
+            while not self._stopping.is_set():
+                if self._reconcile.is_set() or time.monotonic() >= next_reconcile:
+                    self._reconcile.clear()
+                    try:
+                        self.reconcile()
+                    except Exception as e:
+                        logger.warning(f"Explorer index reconciliation failed: {e}")
+                    next_reconcile = time.monotonic() + self.reconcile_interval
+                if self._inotify is None:
+                    self._reconcile.wait(min(1.0, max(0.0, next_reconcile - time.monotonic())))
+                    continue
+                try:
+                    self.apply(self._inotify.read(timeout=1.0))
+                except Exception as e:
+                    logger.warning(f"Applying filesystem changes to the explorer index failed: {e}")
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+                self._inotify = None
+
+
+_indexer: Optional[FilenameIndexer] = None
+_indexer_lock = threading.Lock()
+
+
+def get_filename_indexer() -> Optional[FilenameIndexer]:
+    """Return the process-wide indexer, or None when indexing is disabled."""
+    global _indexer
+    if not config.explorer_index_enabled:
+        return None
+    if _indexer is None:
+        with _indexer_lock:
+            if _indexer is None:
+                _indexer = FilenameIndexer(FilenameIndex(config.explorer_index_path))
+    return _indexer
+
+
+def current_filename_indexer() -> Optional[FilenameIndexer]:
+    """The indexer if it was created and is running."""
+    if _indexer is not None and _indexer.running:
+        return _indexer
+    return None
+
+
+def stop_filename_indexer():
+    """Stop watching and indexing; used on shutdown."""
+    if _indexer is not None:
+        _indexer.stop()
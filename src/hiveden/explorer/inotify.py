@@ -0,0 +1,148 @@
+"""Minimal inotify(7) binding over libc, for watching directory trees."""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+from typing import Dict, List, NamedTuple, Optional
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONTFOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+# Changes to the names in a directory.
+NAME_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+
+_EVENT = struct.Struct("iIII")
+
+
+class Event(NamedTuple):
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+    # Directory the watch was added for; None for queue overflows.
+    directory: Optional[str]
+
+    @property
+    def path(self) -> Optional[str]:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, self.name) if self.name else self.directory
+
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    return _libc
+
+
+def supported() -> bool:
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+class Inotify:
+    """An inotify instance and the directories it watches."""
+
+    def __init__(self):
+        libc = _load_libc()
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        self._directories: Dict[int, str] = {}
+
+    @property
+    def watches(self) -> int:
+        return len(self._directories)
+
+    def add_watch(self, path: str, mask: int = NAME_EVENTS | IN_ONLYDIR | IN_DONTFOLLOW) -> int:
+        """Watch ``path``; watching it again (e.g. after a rename) updates the
+        path reported for its events.
+
+        Raises:
+            OSError: ``ENOSPC`` when the user's watch limit is reached.
+        """
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), ctypes.c_uint32(mask))
+        if wd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e), path)
+        self._directories[wd] = path
+        return wd
+
+    def remove_tree(self, path: str):
+        """Stop watching ``path`` and the directories below it, e.g. once it
+        was deleted or moved somewhere that is not watched."""
+        for wd in self._tree(path):
+            # Fails with EINVAL when the kernel already dropped the watch.
+            self._libc.inotify_rm_watch(self.fd, ctypes.c_int(wd))
+            del self._directories[wd]
+
+    def move_tree(self, old: str, new: str):
+        """Report events of the directories below ``old`` under ``new``."""
+        for wd in self._tree(old):
+            self._directories[wd] = new + self._directories[wd][len(old):]
+
+    def _tree(self, path: str) -> List[int]:
+        prefix = path.rstrip('/') + '/'
+        return [wd for wd, directory in self._directories.items() if directory == path or directory.startswith(prefix)]
+
+    def current(self, event: Event) -> Event:
+        """``event`` with the directory its watch reports now: a directory
+        moved or unwatched after the event was read changes it."""
+        if event.directory is None:
+            return event
+        return event._replace(directory=self._directories.get(event.wd))
+
+    def read(self, timeout: Optional[float] = None) -> List[Event]:
+        """Events available within ``timeout`` seconds (all pending ones)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            directory = self._directories.get(wd)
+            if mask & IN_IGNORED:
+                # The watch was removed (directory deleted or unmounted).
+                self._directories.pop(wd, None)
+            events.append(Event(wd, mask, cookie, name, directory))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self._directories.clear()
+
+
+def is_watch_limit(error: OSError) -> bool:
+    return error.errno == errno.ENOSPC
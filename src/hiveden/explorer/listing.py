@@ -0,0 +1,323 @@
+"""Fast directory listings built from ``os.scandir``.
+
+``ExplorerService.get_file_entry`` answers every question about a path with
+its own syscalls, which is fine for one file but dominates listings of large
+directories. Here each entry costs the single ``lstat`` cached on its
+``DirEntry``; everything else is derived from it:
+
+* owner and group names are memoized per uid/gid;
+* readable/writable/executable come from the mode bits and the process
+  credentials instead of three ``os.access`` calls (ACLs and read-only
+  mounts are not taken into account);
+* only symlinks cost more syscalls (read and stat of the target), and MIME
+  types are guessed from the extension, memoized, and only for the entries
+  that are returned.
+
+Entries are scanned and sorted as ``ScannedEntry`` records and turned into
+``FileEntry`` models last, so callers that return a page of a listing only
+pay for the page.
+
+Pages are addressed by opaque cursors holding the sort key of the last entry
+returned. Sort keys end with the entry name, so they are unique within a
+directory and a page starts exactly after the previous one even when
+entries are added or removed in between; ``select_page`` picks a page with
+a bounded heap instead of sorting the whole directory.
+"""
+import base64
+import grp
+import heapq
+import json
+import mimetypes
+import os
+import pwd
+import stat
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, Iterator, List, Optional, Tuple
+
+from hiveden.explorer.models import FileEntry, FileType, SortBy, SortOrder
+
+DIRECTORY_MIME_TYPE = "inode/directory"
+DEFAULT_MIME_TYPE = "application/octet-stream"
+
+
+@lru_cache(maxsize=4096)
+def user_name(uid: int) -> str:
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=4096)
+def group_name(gid: int) -> str:
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+@lru_cache(maxsize=4096)
+def _mime_type_for_extension(extension: str) -> str:
+    mime, _ = mimetypes.guess_type(f"file{extension}")
+    return mime or DEFAULT_MIME_TYPE
+
+
+def _split_extension(name: str) -> Tuple[str, str]:
+    # os.path.splitext for a bare name: leading dots do not start an extension.
+    dot = name.rfind('.')
+    if dot <= 0 or not name[:dot].lstrip('.'):
+        return name, ''
+    return name[:dot], name[dot:]
+
+
+def mime_type(name: str) -> str:
+    """MIME type guessed from a file name's extension(s)."""
+    base, extension = _split_extension(name)
+    if extension in mimetypes.suffix_map or extension.lower() in mimetypes.encodings_map:
+        # ".tar.gz" and ".tgz" are typed by the extension before the encoding.
+        extension = _split_extension(base)[1] + extension
+    return _mime_type_for_extension(extension)
+
+
+@dataclass(frozen=True)
+class Credentials:
+    """The effective identity permission checks are made for."""
+
+    uid: int
+    gid: int
+    groups: FrozenSet[int]
+
+    @classmethod
+    def current(cls) -> "Credentials":
+        gid = os.getegid()
+        return cls(uid=os.geteuid(), gid=gid, groups=frozenset(os.getgroups()) | {gid})
+
+    def access(self, st: os.stat_result) -> Tuple[bool, bool, bool]:
+        """``(readable, writable, executable)`` as ``os.access`` would report
+        from the mode bits alone."""
+        mode = st.st_mode
+        if self.uid == 0:
+            # Root may read and write anything, and execute anything that
+            # has an execute bit (directories can always be searched).
+            any_exec = bool(mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH))
+            return True, True, any_exec or stat.S_ISDIR(mode)
+        if st.st_uid == self.uid:
+            bits = (stat.S_IRUSR, stat.S_IWUSR, stat.S_IXUSR)
+        elif st.st_gid in self.groups:
+            bits = (stat.S_IRGRP, stat.S_IWGRP, stat.S_IXGRP)
+        else:
+            bits = (stat.S_IROTH, stat.S_IWOTH, stat.S_IXOTH)
+        return tuple(bool(mode & bit) for bit in bits)
+
+    def access_path(self, entry: os.DirEntry, st: os.stat_result) -> Tuple[bool, bool, bool]:
+        """``access`` for a scanned entry; like ``os.access``, symlinks are
+        checked against their target and dangling ones allow nothing."""
+        if stat.S_ISLNK(st.st_mode):
+            try:
+                st = entry.stat()
+            except OSError:
+                return False, False, False
+        return self.access(st)
+
+
+class ScannedEntry:
+    """A directory entry and its ``lstat``; see ``to_file_entry``."""
+
+    __slots__ = ("entry", "stat", "is_dir")
+
+    def __init__(self, entry: os.DirEntry, st: os.stat_result):
+        self.entry = entry
+        self.stat = st
+        self.is_dir = stat.S_ISDIR(st.st_mode)
+
+    @property
+    def name(self) -> str:
+        return self.entry.name
+
+    @property
+    def file_type(self) -> FileType:
+        return FileType.DIRECTORY if self.is_dir else FileType.FILE
+
+    def mime_type(self) -> str:
+        if self.is_dir:
+            return DIRECTORY_MIME_TYPE
+        if stat.S_ISLNK(self.stat.st_mode):
+            # Like the single-file path, a link to a directory is a directory.
+            try:
+                if self.entry.is_dir():
+                    return DIRECTORY_MIME_TYPE
+            except OSError:
+                pass
+        return mime_type(self.entry.name)
+
+    def restat(self) -> Optional["ScannedEntry"]:
+        """A copy with a fresh ``lstat``; None if the entry is gone.
+
+        Entries may be shared through the listing cache, so they are never
+        updated in place.
+        """
+        try:
+            st = os.lstat(self.entry.path)
+        except (PermissionError, FileNotFoundError):
+            return None
+        return ScannedEntry(self.entry, st)
+
+    def to_file_entry(self, credentials: Credentials) -> FileEntry:
+        st = self.stat
+        name = self.entry.name
+        is_symlink = stat.S_ISLNK(st.st_mode)
+        symlink_target = None
+        if is_symlink:
+            try:
+                symlink_target = os.readlink(self.entry.path)
+            except OSError:
+                pass
+        readable, writable, executable = credentials.access_path(self.entry, st)
+        return FileEntry(
+            name=name,
+            path=self.entry.path,
+            type=self.file_type,
+            size=st.st_size,
+            size_human=human_readable_size(st.st_size),
+            permissions=stat.filemode(st.st_mode),
+            owner=user_name(st.st_uid),
+            group=group_name(st.st_gid),
+            modified=datetime.fromtimestamp(st.st_mtime),
+            accessed=datetime.fromtimestamp(st.st_atime),
+            created=datetime.fromtimestamp(st.st_ctime),
+            is_hidden=name.startswith('.'),
+            is_symlink=is_symlink,
+            symlink_target=symlink_target,
+            mime_type=self.mime_type(),
+            permissions_octal=oct(st.st_mode)[-4:],
+            owner_id=st.st_uid,
+            group_id=st.st_gid,
+            inode=st.st_ino,
+            hard_links=st.st_nlink,
+            is_readable=readable,
+            is_writable=writable,
+            is_executable=executable,
+        )
+
+
+def human_readable_size(size_bytes: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} PB"
+
+
+def iter_directory(path: str, show_hidden: bool = False) -> Iterator[ScannedEntry]:
+    """Scan ``path`` without following symlinks, yielding entries as they
+    are stat'ed.
+
+    Entries that vanish or cannot be stat'ed while scanning are skipped.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if not show_hidden and entry.name.startswith('.'):
+                continue
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except (PermissionError, FileNotFoundError):
+                continue
+            yield ScannedEntry(entry, st)
+
+
+def scan_directory(path: str, show_hidden: bool = False) -> Tuple[List[ScannedEntry], int]:
+    """Scan ``path`` (see ``iter_directory``).
+
+    Returns:
+        ``(entries, total size of the non-directory entries)``
+    """
+    entries = list(iter_directory(path, show_hidden))
+    total_size = sum(e.stat.st_size for e in entries if not e.is_dir)
+    return entries, total_size
+
+
+def _by_name(e: ScannedEntry):
+    name = e.entry.name
+    return (name.lower(), name)
+
+
+_SORT_KEYS = {
+    SortBy.NAME: _by_name,
+    SortBy.SIZE: lambda e: (e.stat.st_size,) + _by_name(e),
+    SortBy.MODIFIED: lambda e: (e.stat.st_mtime,) + _by_name(e),
+    SortBy.TYPE: lambda e: (e.file_type.value,) + _by_name(e),
+}
+
+
+def sort_key(sort_by: SortBy) -> Callable[[ScannedEntry], Tuple]:
+    """Key function ordering entries by ``sort_by``, then by name.
+
+    Keys are tuples of JSON-representable values, unique per entry name.
+    """
+    return _SORT_KEYS[sort_by]
+
+
+def sort_entries(entries: List[ScannedEntry], sort_by: SortBy = SortBy.NAME, sort_order: SortOrder = SortOrder.ASC):
+    """Sort scanned entries in place; ties are ordered by name."""
+    entries.sort(key=sort_key(sort_by), reverse=sort_order == SortOrder.DESC)
+
+
+def encode_cursor(sort_by: SortBy, sort_order: SortOrder, key: Tuple) -> str:
+    payload = json.dumps([sort_by.value, sort_order.value, list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: SortBy, sort_order: SortOrder) -> Tuple:
+    """The sort key stored in ``cursor``.
+
+    Raises:
+        ValueError: if the cursor is malformed or was made for another
+            sort order.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_sort_order, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (cursor_sort_by, cursor_sort_order) != (sort_by.value, sort_order.value):
+        raise ValueError("Cursor was created for a different sort order")
+    return tuple(key)
+
+
+def select_page(
+    entries: List[ScannedEntry],
+    sort_by: SortBy = SortBy.NAME,
+    sort_order: SortOrder = SortOrder.ASC,
+    limit: int = 100,
+    after: Optional[Tuple] = None,
+) -> Tuple[List[ScannedEntry], Optional[Tuple]]:
+    """The ``limit`` entries following the sort key ``after``, in order.
+
+    Only the page is sorted (``heapq``, O(n log limit)).
+
+    Returns:
+        ``(page, key of its last entry, or None when nothing follows it)``
+    """
+    key = sort_key(sort_by)
+    descending = sort_order == SortOrder.DESC
+    keyed: List[Tuple[Any, ScannedEntry]] = [(key(e), e) for e in entries]
+    if after is not None:
+        after = tuple(after)
+        try:
+            if descending:
+                keyed = [item for item in keyed if item[0] < after]
+            else:
+                keyed = [item for item in keyed if item[0] > after]
+        except TypeError as e:
+            raise ValueError("Invalid cursor") from e
+    select = heapq.nlargest if descending else heapq.nsmallest
+    page = select(limit, keyed, key=lambda item: item[0])
+    last_key = page[-1][0] if page and len(keyed) > limit else None
+    return [e for _, e in page], last_key
+
+
+def to_file_entries(entries: List[ScannedEntry], credentials: Optional[Credentials] = None) -> List[FileEntry]:
+    credentials = credentials or Credentials.current()
+    return [entry.to_file_entry(credentials) for entry in entries]
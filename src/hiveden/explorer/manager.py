@@ -18,8 +18,7 @@ class ExplorerManager:
     # --- Config ---
 
     def get_config(self) -> Dict[str, str]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT key, value FROM explorer_config")
             rows = cursor.fetchall()
@@ -32,12 +31,9 @@ class ExplorerManager:
             for row in rows:
                 config[row[0]] = row[1]
             return config
-        finally:
-            conn.close()
 
     def update_config(self, key: str, value: str):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             # Check if exists
             cursor.execute("SELECT id FROM explorer_config WHERE key = %s", (key,))
@@ -53,14 +49,11 @@ class ExplorerManager:
                     (key, value)
                 )
             conn.commit()
-        finally:
-            conn.close()
 
     # --- Locations (Bookmarks) ---
 
     def get_locations(self) -> List[FilesystemLocation]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT id, key, label, path, type, description, is_editable, created_at, updated_at FROM filesystem_locations ORDER BY label"
@@ -81,12 +74,9 @@ class ExplorerManager:
                     updated_at=row[8] if isinstance(row[8], datetime) else datetime.fromisoformat(row[8]) if row[8] else None
                 ))
             return locations
-        finally:
-            conn.close()
 
     def create_location(self, label: str, path: str, type: str = "user_bookmark", description: Optional[str] = None) -> FilesystemLocation:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO filesystem_locations (label, path, type, description) VALUES (%s, %s, %s, %s) RETURNING id",
@@ -94,14 +84,11 @@ class ExplorerManager:
             )
             location_id = cursor.fetchone()[0]
             conn.commit()
-            
-            return self.get_location(location_id)
-        finally:
-            conn.close()
+
+        return self.get_location(location_id)
 
     def update_location(self, location_id: int, label: Optional[str] = None, path: Optional[str] = None, description: Optional[str] = None) -> Optional[FilesystemLocation]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             updates = []
             params = []
@@ -115,23 +102,18 @@ class ExplorerManager:
                 updates.append("description = %s")
                 params.append(description)
             
-            if not updates:
-                return self.get_location(location_id)
-            
-            updates.append("updated_at = CURRENT_TIMESTAMP")
-            query = f"UPDATE filesystem_locations SET {', '.join(updates)} WHERE id = %s"
-            params.append(location_id)
-            
-            cursor.execute(query, tuple(params))
-            conn.commit()
-            
-            return self.get_location(location_id)
-        finally:
-            conn.close()
+            if updates:
+                updates.append("updated_at = CURRENT_TIMESTAMP")
+                query = f"UPDATE filesystem_locations SET {', '.join(updates)} WHERE id = %s"
+                params.append(location_id)
+
+                cursor.execute(query, tuple(params))
+                conn.commit()
+
+        return self.get_location(location_id)
 
     def get_location(self, location_id: int) -> Optional[FilesystemLocation]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT id, key, label, path, type, description, is_editable, created_at, updated_at FROM filesystem_locations WHERE id = %s",
@@ -152,12 +134,9 @@ class ExplorerManager:
                 created_at=row[7] if isinstance(row[7], datetime) else datetime.fromisoformat(row[7]) if row[7] else None,
                 updated_at=row[8] if isinstance(row[8], datetime) else datetime.fromisoformat(row[8]) if row[8] else None
             )
-        finally:
-            conn.close()
 
     def delete_location(self, location_id: int):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             # Prevent deleting system locations if needed, but schema allows it if not enforced here.
             # Assuming strictly UI driven 'is_editable' check happens there, but good to check here.
@@ -168,15 +147,12 @@ class ExplorerManager:
 
             cursor.execute("DELETE FROM filesystem_locations WHERE id = %s", (location_id,))
             conn.commit()
-        finally:
-            conn.close()
 
     # --- Operations ---
 
     def create_operation(self, op_type: str, status: str = OperationStatus.PENDING) -> ExplorerOperation:
         op_id = str(uuid.uuid4())
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO explorer_operations (id, operation_type, status) VALUES (?, ?, ?)",
@@ -184,12 +160,9 @@ class ExplorerManager:
             )
             conn.commit()
             return ExplorerOperation(id=op_id, operation_type=op_type, status=status)
-        finally:
-            conn.close()
 
     def update_operation(self, op: ExplorerOperation):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             
             def json_serial(obj):
@@ -216,12 +189,9 @@ class ExplorerManager:
                 )
             )
             conn.commit()
-        finally:
-            conn.close()
 
     def get_operation(self, op_id: str) -> Optional[ExplorerOperation]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT id, operation_type, status, progress, total_items, processed_items, source_paths, destination_path, error_message, result, created_at, updated_at, completed_at FROM explorer_operations WHERE id = ?",
@@ -246,12 +216,9 @@ class ExplorerManager:
                 updated_at=row[11],
                 completed_at=row[12]
             )
-        finally:
-            conn.close()
 
     def get_operations(self, limit: int = 50, offset: int = 0) -> List[ExplorerOperation]:
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT id, operation_type, status, progress, total_items, processed_items, source_paths, destination_path, error_message, result, created_at, updated_at, completed_at FROM explorer_operations ORDER BY created_at DESC LIMIT ? OFFSET ?",
@@ -276,14 +243,33 @@ class ExplorerManager:
                     completed_at=row[12]
                 ))
             return ops
-        finally:
-            conn.close()
+
+    def save_search_page(self, op_id: str, page: int, matches: List[Dict[str, Any]]):
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO explorer_search_results (operation_id, page, matches) VALUES (%s, %s, %s)
+                ON CONFLICT (operation_id, page) DO UPDATE SET matches = EXCLUDED.matches
+                """,
+                (op_id, page, json.dumps(matches, default=str))
+            )
+            conn.commit()
+
+    def get_search_page(self, op_id: str, page: int) -> Optional[List[Dict[str, Any]]]:
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT matches FROM explorer_search_results WHERE operation_id = %s AND page = %s",
+                (op_id, page)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return json.loads(row[0]) if isinstance(row[0], str) else row[0]
 
     def delete_operation(self, op_id: str):
-        conn = self.db.get_connection()
-        try:
+        with self.db.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM explorer_operations WHERE id = ?", (op_id,))
             conn.commit()
-        finally:
-            conn.close()
@@ -30,6 +30,7 @@ class OperationStatus(str, Enum):
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 # --- DB Models (Representations) ---
 
@@ -106,6 +107,54 @@ class DirectoryListingResponse(BaseModel):
     total_entries: int
     total_size: int
     total_size_human: str
+    # Set when the listing was paginated and more entries follow.
+    next_cursor: Optional[str] = None
+
+class ListingCacheStats(BaseModel):
+    hits: int
+    misses: int
+    stale: int
+    evictions: int
+    hit_ratio: float
+    listings: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+class ListingCacheStatsResponse(BaseModel):
+    success: bool = True
+    data: ListingCacheStats
+
+class FilenameIndexRoot(BaseModel):
+    path: str
+    entries: int
+    indexed_at: Optional[float] = None
+    duration_seconds: Optional[float] = None
+
+class FilenameIndexStatus(BaseModel):
+    running: bool
+    building: Optional[str] = None
+    watching: bool
+    watches: int
+    watch_limit_reached: bool
+    last_reconcile: Optional[float] = None
+    reconcile_interval_seconds: float
+    roots: List[FilenameIndexRoot]
+
+class FilenameIndexStatusResponse(BaseModel):
+    success: bool = True
+    enabled: bool
+    data: Optional[FilenameIndexStatus] = None
+
+class SearchResultsPage(BaseModel):
+    success: bool = True
+    operation_id: str
+    status: str
+    page: int
+    page_size: int
+    pages: int
+    total_matches: int
+    matches: List[Dict[str, Any]]
 
 class FilePropertyResponse(BaseModel):
     success: bool = True
@@ -167,6 +216,10 @@ class SearchRequest(BaseModel):
     case_sensitive: bool = False
     type_filter: str = "all"
     show_hidden: bool = False
+    # Stop after this many matches.
+    max_results: Optional[int] = Field(None, ge=1)
+    # Enter symlinked directories (each directory is searched once).
+    follow_symlinks: bool = False
 
 class USBDevice(BaseModel):
     device: str
@@ -8,15 +8,28 @@ import shutil
 import stat
 import subprocess
 from datetime import datetime
-from typing import Any, List, Optional, Tuple
-
+from typing import Any, Iterator, List, Optional, Tuple
+
+from hiveden.explorer.cache import ListingCache, get_listing_cache
+from hiveden.explorer.listing import (
+    Credentials,
+    ScannedEntry,
+    decode_cursor,
+    encode_cursor,
+    human_readable_size,
+    iter_directory,
+    select_page,
+    sort_entries,
+    to_file_entries,
+)
 from hiveden.explorer.models import FileEntry, FileType, SortBy, SortOrder, USBDevice
 
 logger = logging.getLogger(__name__)
 
 class ExplorerService:
-    def __init__(self, root_directory: str = "/"):
+    def __init__(self, root_directory: str = "/", listing_cache: Optional[ListingCache] = None):
         self.root_directory = os.path.abspath(root_directory)
+        self.listing_cache = listing_cache or get_listing_cache()
 
     def _resolve_path(self, path: str) -> str:
         """
@@ -33,11 +46,7 @@ class ExplorerService:
         return os.path.abspath(path)
 
     def _human_readable_size(self, size_bytes: int) -> str:
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        return human_readable_size(size_bytes)
 
     def _get_file_type(self, path: str, st: os.stat_result) -> FileType:
         if stat.S_ISDIR(st.st_mode):
@@ -94,41 +103,58 @@ class ExplorerService:
             is_executable=os.access(path, os.X_OK)
         )
 
-    def list_directory(self, path: str, show_hidden: bool = False, sort_by: SortBy = SortBy.NAME, sort_order: SortOrder = SortOrder.ASC) -> Tuple[List[FileEntry], int, int]:
+    def list_directory(self, path: str, show_hidden: bool = False, sort_by: SortBy = SortBy.NAME, sort_order: SortOrder = SortOrder.ASC, restat: bool = False) -> Tuple[List[FileEntry], int, int]:
+        abs_path = self._checked_directory(path)
+
+        scanned, total_size = self.listing_cache.scan(abs_path, show_hidden)
+        if restat:
+            scanned = [e for e in map(ScannedEntry.restat, scanned) if e is not None]
+            total_size = sum(e.stat.st_size for e in scanned if not e.is_dir)
+        sort_entries(scanned, sort_by, sort_order)
+        entries = to_file_entries(scanned)
+        return entries, len(entries), total_size
+
+    def list_directory_page(self, path: str, show_hidden: bool = False, sort_by: SortBy = SortBy.NAME, sort_order: SortOrder = SortOrder.ASC, limit: int = 100, cursor: Optional[str] = None, restat: bool = False) -> Tuple[List[FileEntry], int, int, Optional[str]]:
+        """One page of ``list_directory``.
+
+        The listing may come from the cache, whose entry stats can lag
+        behind changes made inside entries; ``restat`` refreshes the
+        entries of the page (entries that vanished are left out).
+
+        Returns:
+            ``(entries, total entries, total size, cursor of the next page
+            or None)``
+
+        Raises:
+            ValueError: if ``cursor`` is invalid for this sort order.
+        """
+        abs_path = self._checked_directory(path)
+        after = decode_cursor(cursor, sort_by, sort_order) if cursor else None
+
+        scanned, total_size = self.listing_cache.scan(abs_path, show_hidden)
+        page, last_key = select_page(scanned, sort_by, sort_order, limit, after)
+        if restat:
+            page = [e for e in map(ScannedEntry.restat, page) if e is not None]
+        next_cursor = encode_cursor(sort_by, sort_order, last_key) if last_key is not None else None
+        return to_file_entries(page), len(scanned), total_size, next_cursor
+
+    def iter_directory(self, path: str, show_hidden: bool = False) -> Iterator[FileEntry]:
+        """Entries of ``path`` in directory order, as they are stat'ed.
+
+        The path is checked before this returns, so errors are raised
+        before iteration starts.
+        """
+        abs_path = self._checked_directory(path)
+        credentials = Credentials.current()
+        return (entry.to_file_entry(credentials) for entry in iter_directory(abs_path, show_hidden))
+
+    def _checked_directory(self, path: str) -> str:
         abs_path = self._resolve_path(path)
         if not os.path.exists(abs_path):
             raise FileNotFoundError(f"Path not found: {path}")
         if not os.path.isdir(abs_path):
             raise NotADirectoryError(f"Path is not a directory: {path}")
-
-        entries = []
-        total_size = 0
-
-        with os.scandir(abs_path) as it:
-            for entry in it:
-                if not show_hidden and entry.name.startswith('.'):
-                    continue
-
-                try:
-                    file_entry = self.get_file_entry(entry.path)
-                    entries.append(file_entry)
-                    if file_entry.type == FileType.FILE:
-                        total_size += file_entry.size
-                except (PermissionError, FileNotFoundError):
-                    continue
-
-        # Sorting
-        reverse = sort_order == SortOrder.DESC
-        if sort_by == SortBy.NAME:
-            entries.sort(key=lambda x: x.name.lower(), reverse=reverse)
-        elif sort_by == SortBy.SIZE:
-            entries.sort(key=lambda x: x.size, reverse=reverse)
-        elif sort_by == SortBy.MODIFIED:
-            entries.sort(key=lambda x: x.modified or datetime.min, reverse=reverse)
-        elif sort_by == SortBy.TYPE:
-            entries.sort(key=lambda x: (x.type, x.name.lower()), reverse=reverse)
-
-        return entries, len(entries), total_size
+        return abs_path
 
     def create_directory(self, path: str, parents: bool = False) -> str:
         abs_path = self._resolve_path(path)
@@ -0,0 +1,145 @@
+"""Live state of running explorer searches.
+
+A search's matches are stored in pages of ``SEARCH_PAGE_SIZE``
+(``explorer_search_results``) as they are found, instead of as one list in
+the operation's result. While a search runs, its ``SearchRun`` holds the
+page being filled, lets subscribers follow the matches as they arrive
+(reading completed pages back from the database), and carries the event
+that cancels it.
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PAGE_SIZE = 500
+
+Match = Dict[str, Any]
+
+
+class SearchRun:
+    def __init__(
+        self,
+        operation_id: str,
+        save_page: Callable[[int, List[Match]], None],
+        load_page: Callable[[int], Optional[List[Match]]],
+        page_size: int = SEARCH_PAGE_SIZE,
+    ):
+        self.operation_id = operation_id
+        self.page_size = page_size
+        self.cancel = threading.Event()
+        self._save_page = save_page
+        self._load_page = load_page
+        self._condition = threading.Condition()
+        self._buffer: List[Match] = []
+        # Matches of the buffer already stored by a partial flush.
+        self._stored = 0
+        self._pages = 0
+        self._total = 0
+        self._finished = False
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def pages(self) -> int:
+        """Pages holding the matches found so far."""
+        with self._condition:
+            return self._pages + (1 if self._buffer else 0)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def add(self, match: Match):
+        with self._condition:
+            self._buffer.append(match)
+            self._total += 1
+            full = len(self._buffer) >= self.page_size
+            self._condition.notify_all()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Store the page being filled (it is stored again once complete)."""
+        with self._condition:
+            if len(self._buffer) == self._stored:
+                return
+            page, matches = self._pages, list(self._buffer)
+        self._save_page(page, matches)
+        with self._condition:
+            if len(matches) >= self.page_size:
+                self._pages += 1
+                del self._buffer[:len(matches)]
+                self._stored = 0
+            else:
+                self._stored = len(matches)
+
+    def finish(self):
+        """Store the last page and end the run; subscribers are released
+        even when storing fails."""
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the search to end; False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._finished, timeout)
+
+    def page(self, number: int) -> Optional[List[Match]]:
+        with self._condition:
+            if number == self._pages:
+                return list(self._buffer)
+            if number > self._pages:
+                return None
+        return self._load_page(number)
+
+    def read(self, start: int, timeout: Optional[float] = None) -> Tuple[List[Match], bool]:
+        """Matches from index ``start`` on, waiting up to ``timeout`` seconds
+        for new ones.
+
+        Returns:
+            ``(matches, True once the search ended and nothing follows)``
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._total > start or self._finished, timeout)
+            stored = self._pages * self.page_size
+            if start >= stored:
+                matches = self._buffer[start - stored:]
+                return matches, self._finished and start + len(matches) >= self._total
+        page = start // self.page_size
+        return (self._load_page(page) or [])[start - page * self.page_size:], False
+
+
+_runs: Dict[str, SearchRun] = {}
+_runs_lock = threading.Lock()
+
+
+def start_search_run(operation_id: str, save_page, load_page) -> SearchRun:
+    run = SearchRun(operation_id, save_page, load_page)
+    with _runs_lock:
+        _runs[operation_id] = run
+    return run
+
+
+def get_search_run(operation_id: str) -> Optional[SearchRun]:
+    """The run of a search that is still in progress."""
+    with _runs_lock:
+        return _runs.get(operation_id)
+
+
+def end_search_run(run: SearchRun):
+    try:
+        run.finish()
+    except Exception as e:
+        logger.warning(f"Storing the last results of search {run.operation_id} failed: {e}")
+    finally:
+        with _runs_lock:
+            if _runs.get(run.operation_id) is run:
+                del _runs[run.operation_id]
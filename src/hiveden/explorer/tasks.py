@@ -1,22 +1,37 @@
 import os
 import shutil
 import re
+import time
 import traceback
 from datetime import datetime
 from typing import List, Optional
 
+from hiveden.config.settings import config
+from hiveden.explorer.crawler import Crawler
+from hiveden.explorer.index import current_filename_indexer
 from hiveden.explorer.manager import ExplorerManager
 from hiveden.explorer.operations import ExplorerService
+from hiveden.explorer.search import end_search_run, start_search_run
 from hiveden.explorer.models import OperationStatus, ExplorerOperation, FileType, FileEntry
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-def perform_search(op_id: str, path: str, pattern: str, use_regex: bool, case_sensitive: bool, type_filter: str, show_hidden: bool):
+# Seconds between progress updates of a running search.
+SEARCH_PROGRESS_INTERVAL = 1.0
+
+def perform_search(op_id: str, path: str, pattern: str, use_regex: bool, case_sensitive: bool, type_filter: str, show_hidden: bool, max_results: Optional[int] = None, follow_symlinks: bool = False):
+    """Search ``path`` for names matching ``pattern``.
+
+    Answered from the filename index when it covers ``path``, otherwise by
+    crawling the tree in parallel. Matches are stored in pages and
+    published to subscribers as they are found (see ``explorer.search``);
+    the operation result only holds the summary.
+    """
     manager = ExplorerManager()
     service = ExplorerService()
-    
+
     logger.info(f"Starting search operation {op_id} in {path} with pattern {pattern}")
 
     op = manager.get_operation(op_id)
@@ -27,64 +42,82 @@ def perform_search(op_id: str, path: str, pattern: str, use_regex: bool, case_se
     op.status = OperationStatus.IN_PROGRESS
     manager.update_operation(op)
 
-    matches = []
-    total_scanned = 0
+    run = start_search_run(
+        op_id,
+        save_page=lambda page, matches: manager.save_search_page(op_id, page, matches),
+        load_page=lambda page: manager.get_search_page(op_id, page),
+    )
     start_time = datetime.now()
+    candidates = None
+    truncated = False
 
     try:
-        flags = 0 if case_sensitive else re.IGNORECASE
-        if not use_regex:
-            # Convert glob to regex: escape everything, then revert * and ? to regex equivalents
-            pattern = re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
-        
-        logger.info(f"Compiled regex: {pattern}")
-        regex = re.compile(pattern, flags)
-        
-        for root, dirs, files in os.walk(path):
-            # Filtering hidden
-            if not show_hidden:
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                files = [f for f in files if not f.startswith('.')]
-            
-            # Scan directories
-            if type_filter in ['all', 'directory']:
-                for d in dirs:
-                    total_scanned += 1
-                    if regex.search(d):
-                        try:
-                            full_path = os.path.join(root, d)
-                            matches.append(service.get_file_entry(full_path).dict())
-                        except Exception as e:
-                            logger.warning(f"Error getting file entry for {d}: {e}")
-            
-            # Scan files
-            if type_filter in ['all', 'file']:
-                for f in files:
-                    total_scanned += 1
-                    if regex.search(f):
-                        try:
-                            full_path = os.path.join(root, f)
-                            matches.append(service.get_file_entry(full_path).dict())
-                        except Exception as e:
-                            logger.warning(f"Error getting file entry for {f}: {e}")
-            
-            # Update progress periodically (every 100 items or so)
-            if total_scanned % 100 == 0:
-                op.processed_items = total_scanned
+        indexer = current_filename_indexer()
+        if indexer is not None and not follow_symlinks and indexer.index.covering_root(path):
+            # One more than wanted tells whether there were more.
+            limit = max_results + 1 if max_results is not None else None
+            found, checked = indexer.index.search(
+                path, pattern, use_regex, case_sensitive, type_filter, show_hidden, limit=limit
+            )
+            if limit is not None and len(found) == limit:
+                truncated = True
+                found = found[:max_results]
+            candidates = iter(found)
+            scanned = lambda: checked
+            source = "index"
+        else:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            if not use_regex:
+                # Convert glob to regex: escape everything, then revert * and ? to regex equivalents
+                pattern = re.escape(pattern).replace(r'\*', '.*').replace(r'\?', '.')
+            logger.info(f"Compiled regex: {pattern}")
+            crawler = Crawler(
+                path,
+                workers=config.explorer_crawl_workers,
+                show_hidden=show_hidden,
+                follow_symlinks=follow_symlinks,
+                cancel=run.cancel,
+            )
+            candidates = crawler.matches(re.compile(pattern, flags), type_filter)
+            scanned = lambda: crawler.scanned
+            source = "filesystem"
+
+        last_progress = time.monotonic()
+        for full_path, _ in candidates:
+            if run.cancel.is_set():
+                break
+            if max_results is not None and run.total >= max_results:
+                truncated = True
+                break
+            try:
+                run.add(service.get_file_entry(full_path).model_dump(mode="json"))
+            except FileNotFoundError:
+                # Removed since it was found (or indexed).
+                continue
+            except Exception as e:
+                logger.warning(f"Error getting file entry for {full_path}: {e}")
+                continue
+            if time.monotonic() - last_progress >= SEARCH_PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                op.processed_items = scanned()
                 manager.update_operation(op)
 
-        search_time = (datetime.now() - start_time).total_seconds()
-        
+        cancelled = run.cancel.is_set()
+        run.flush()
         op.result = {
-            "matches": matches,
-            "total_matches": len(matches),
-            "search_time_seconds": search_time
+            "total_matches": run.total,
+            "pages": run.pages,
+            "page_size": run.page_size,
+            "truncated": truncated,
+            "search_time_seconds": (datetime.now() - start_time).total_seconds(),
+            # "index" when answered from the filename index, else "filesystem".
+            "source": source,
         }
-        op.status = OperationStatus.COMPLETED
-        op.processed_items = total_scanned
+        op.status = OperationStatus.CANCELLED if cancelled else OperationStatus.COMPLETED
+        op.processed_items = scanned()
         op.completed_at = datetime.utcnow()
         manager.update_operation(op)
-        logger.info(f"Search operation {op_id} completed. Matches: {len(matches)}")
+        logger.info(f"Search operation {op_id} {op.status.value} from {source}. Matches: {run.total}")
 
     except Exception as e:
         logger.error(f"Search operation {op_id} failed: {e}", exc_info=True)
@@ -92,6 +125,11 @@ def perform_search(op_id: str, path: str, pattern: str, use_regex: bool, case_se
         op.error_message = str(e)
         op.completed_at = datetime.utcnow()
         manager.update_operation(op)
+    finally:
+        if candidates is not None and hasattr(candidates, "close"):
+            # Stops the crawler's threads when the search ended early.
+            candidates.close()
+        end_search_run(run)
 
 def perform_paste(op_id: str, source_paths: List[str], dest_path: str, conflict_resolution: str, rename_pattern: str):
     manager = ExplorerManager()
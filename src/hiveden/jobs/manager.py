@@ -55,6 +55,18 @@ class JobManager:
         job.logs.append(entry)
         await self._broadcast(job_id, entry)
 
+    def threadsafe_logger(self, job_id: str) -> Callable[[str], None]:
+        """Return a callback that appends log lines to a job from worker threads.
+
+        Must be called on the event loop that runs the job.
+        """
+        loop = asyncio.get_running_loop()
+
+        def log_line(output: str):
+            asyncio.run_coroutine_threadsafe(self.log(job_id, output), loop)
+
+        return log_line
+
     async def run_external_job(
         self,
         job_id: str,
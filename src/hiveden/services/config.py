@@ -0,0 +1,209 @@
+import json
+import logging
+import select
+import threading
+from typing import Any, Dict, Optional
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from hiveden.db.repositories.core import ConfigRepository
+from hiveden.db.repositories.locations import LocationRepository
+from hiveden.db.session import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Channel written to by the triggers in migration 00005_config_notify.
+CONFIG_CHANNEL = "hiveden_config"
+
+
+class ConfigService:
+    """Process-local cache of ``configs`` values and filesystem locations.
+
+    Values are loaded one module (or the whole locations table) per query and
+    served from memory afterwards. A background thread LISTENs on
+    ``hiveden_config`` and drops cached entries whenever the database reports
+    a change, from this process or any other. While that listener is not
+    connected, reads go straight to the database.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ConfigService, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self.db_manager = get_db_manager()
+        self.config_repo = ConfigRepository(self.db_manager)
+        self.location_repo = LocationRepository(self.db_manager)
+
+        self._lock = threading.Lock()
+        self._modules: Dict[str, Dict[str, Optional[str]]] = {}
+        self._locations: Optional[Dict[str, Any]] = None
+        # Bumped on every invalidation so a load that raced with one is not
+        # written back into the cache.
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+
+        self._listener: Optional[threading.Thread] = None
+        self._listening = threading.Event()
+        self._listener_ready = threading.Event()
+        self._stop = threading.Event()
+        self._initialized = True
+
+    # --- Reads ---
+
+    def get(self, key: str, default: Optional[str] = None, module: str = "core") -> Optional[str]:
+        """Return a configuration value, or ``default`` if it is unset or empty."""
+        value = self._module_values(module).get(key)
+        return value if value else default
+
+    def get_int(self, key: str, default: int, module: str = "core") -> int:
+        value = self.get(key, module=module)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            logger.warning(f"Config {module}.{key} is not an integer: {value!r}")
+            return default
+
+    def get_json(self, key: str, default: Any = None, module: str = "core") -> Any:
+        value = self.get(key, module=module)
+        if value is None:
+            return default
+        return json.loads(value)
+
+    def get_location(self, key: str):
+        """Return the FilesystemLocation stored under ``key``, if any."""
+        return self._location_map().get(key)
+
+    def get_location_path(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        location = self.get_location(key)
+        return location.path if location else default
+
+    # --- Writes ---
+
+    def set(self, key: str, value: str, module: str = "core") -> Dict[str, Any]:
+        """Store a value and drop it from this process's cache immediately.
+
+        Other processes are invalidated through the database trigger.
+        """
+        try:
+            return self.config_repo.set_value(module, key, value)
+        finally:
+            self.invalidate(f"configs:{module}:{key}")
+
+    def invalidate(self, payload: Optional[str] = None):
+        """Drop cached entries named by a notification payload (or all)."""
+        with self._lock:
+            self._generation += 1
+            if payload and payload.startswith("configs:"):
+                module = payload.split(":", 2)[1]
+                self._modules.pop(module, None)
+            elif payload and payload.startswith("filesystem_locations:"):
+                self._locations = None
+            else:
+                self._modules.clear()
+                self._locations = None
+
+    def stop(self):
+        """Stop the listener thread; subsequent reads go to the database."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "listening": self._listening.is_set(),
+                "cached_modules": sorted(self._modules),
+            }
+
+    # --- Cache internals ---
+
+    def _module_values(self, module: str) -> Dict[str, Optional[str]]:
+        cacheable = self._ensure_listener()
+        with self._lock:
+            if cacheable and module in self._modules:
+                self._hits += 1
+                return self._modules[module]
+            self._misses += 1
+            generation = self._generation
+
+        values = self.config_repo.get_module_values(module)
+        self._store(lambda: self._modules.__setitem__(module, values), generation, cacheable)
+        return values
+
+    def _location_map(self) -> Dict[str, Any]:
+        cacheable = self._ensure_listener()
+        with self._lock:
+            if cacheable and self._locations is not None:
+                self._hits += 1
+                return self._locations
+            self._misses += 1
+            generation = self._generation
+
+        locations = {loc.key: loc for loc in self.location_repo.get_all() if loc.key}
+        self._store(lambda: setattr(self, "_locations", locations), generation, cacheable)
+        return locations
+
+    def _store(self, write, generation: int, cacheable: bool):
+        if not cacheable:
+            return
+        with self._lock:
+            if generation == self._generation and self._listening.is_set():
+                write()
+
+    # --- LISTEN/NOTIFY ---
+
+    def _ensure_listener(self, timeout: float = 2.0) -> bool:
+        """Start the listener thread once; return True if caching is safe."""
+        if self._listener is None:
+            with self._lock:
+                if self._listener is None:
+                    self._listener = threading.Thread(
+                        target=self._listen_loop,
+                        name="hiveden-config-listener",
+                        daemon=True,
+                    )
+                    self._listener.start()
+            self._listener_ready.wait(timeout)
+        return self._listening.is_set()
+
+    def _listen_loop(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self.db_manager.get_connection()
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                conn.cursor().execute(f"LISTEN {CONFIG_CHANNEL}")
+                # Whatever was cached before (re)connecting may have missed
+                # notifications.
+                self.invalidate()
+                self._listening.set()
+                self._listener_ready.set()
+                backoff = 1.0
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self.invalidate(conn.notifies.pop(0).payload)
+            except (psycopg2.Error, OSError) as e:
+                logger.warning(f"Config listener disconnected: {e}")
+            finally:
+                self._listening.clear()
+                self.invalidate()
+                if conn is not None and not conn.closed:
+                    conn.close()
+            self._listener_ready.set()
+            self._stop.wait(backoff)
+            backoff = min(backoff * 2, 60.0)
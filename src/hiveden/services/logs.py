@@ -1,12 +1,262 @@
+import atexit
+import datetime
+import threading
+import time
 import traceback
-from typing import Optional, Dict, Any
+from collections import deque
+from typing import Optional, Dict, Any, List
+from hiveden.config.settings import config
 from hiveden.db.session import get_db_manager
 from hiveden.db.repositories.logs import LogRepository
 
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block", "stdout")
+
+
+class LogWriter:
+    """Bounded in-memory queue of audit log entries drained by a background thread.
+
+    Entries are written in batches with a single multi-row INSERT. When the
+    queue is full the ``overflow_policy`` decides what happens:
+
+    - ``drop_oldest``: discard the oldest queued entry to make room.
+    - ``drop_newest``: discard the incoming entry.
+    - ``block``: wait up to ``block_timeout`` seconds for room, then fall back
+      to stdout.
+    - ``stdout``: print the incoming entry instead of queueing it.
+
+    Batches the database rejects, or that are written once the connection
+    pool is closed, are printed to stdout so nothing is lost silently. Every
+    ``maintenance_interval`` seconds the writer also creates upcoming
+    monthly ``logs`` partitions and drops those older than
+    ``retention_months``.
+    """
+
+    def __init__(
+        self,
+        repo: LogRepository,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "drop_oldest",
+        block_timeout: float = 1.0,
+        retention_months: int = 0,
+        maintenance_interval: float = 86400.0,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown log overflow policy '{overflow_policy}', expected one of {OVERFLOW_POLICIES}"
+            )
+        self.repo = repo
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.retention_months = retention_months
+        self.maintenance_interval = maintenance_interval
+        self._next_maintenance = 0.0
+
+        self._cond = threading.Condition()
+        self._buffer = deque()
+        # Entries queued or currently being written.
+        self._pending = 0
+        self._flush_requested = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._written = 0
+        self._dropped = 0
+        self._fallback = 0
+
+    def submit(self, entry: Dict[str, Any]) -> bool:
+        """Queue an entry without waiting on the database.
+
+        Returns:
+            True if the entry was queued, False if it was dropped or printed.
+        """
+        with self._cond:
+            if self._stopping:
+                queued = False
+            elif len(self._buffer) < self.max_queue_size:
+                queued = True
+            elif self.overflow_policy == "drop_oldest":
+                self._buffer.popleft()
+                self._pending -= 1
+                self._dropped += 1
+                queued = True
+            elif self.overflow_policy == "block":
+                queued = self._cond.wait_for(
+                    lambda: len(self._buffer) < self.max_queue_size,
+                    timeout=self.block_timeout,
+                )
+            else:
+                queued = False
+                if self.overflow_policy == "drop_newest":
+                    self._dropped += 1
+                    return False
+
+            if queued:
+                self._buffer.append(entry)
+                self._pending += 1
+                self._ensure_thread()
+                if len(self._buffer) >= self.batch_size:
+                    self._cond.notify_all()
+                return True
+
+        self._print_fallback([entry])
+        return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Write everything queued so far.
+
+        Returns:
+            True if the queue drained within ``timeout`` seconds.
+        """
+        with self._cond:
+            if self._thread is None:
+                return self._pending == 0
+            self._flush_requested = True
+            self._cond.notify_all()
+            drained = self._cond.wait_for(lambda: self._pending == 0, timeout=timeout)
+            self._flush_requested = False
+            return drained
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending entries and stop the writer thread.
+
+        Entries that could not be written in time are printed to stdout.
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            leftover = list(self._buffer)
+            self._buffer.clear()
+            self._pending -= len(leftover)
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._print_fallback(leftover)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "queued": len(self._buffer),
+                "written": self._written,
+                "dropped": self._dropped,
+                "fallback": self._fallback,
+            }
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="hiveden-log-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._buffer or self._stopping)
+                if not self._buffer:
+                    return
+                if (
+                    len(self._buffer) < self.batch_size
+                    and not self._flush_requested
+                    and not self._stopping
+                ):
+                    # Give the batch a moment to fill up.
+                    self._cond.wait(self.flush_interval)
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                # Wake producers blocked on a full queue.
+                self._cond.notify_all()
+
+            written = self._write(batch)
+            self._maybe_maintain()
+
+            with self._cond:
+                self._written += written
+                self._pending -= len(batch)
+                self._cond.notify_all()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        if not batch:
+            return 0
+        if self.repo.manager.closed:
+            self._print_fallback(batch)
+            return 0
+        try:
+            return self.repo.insert_logs(batch)
+        except Exception as e:
+            # Fallback logging to stdout if DB fails
+            traceback.print_exc()
+            print(f"FAILED TO WRITE {len(batch)} LOG(S) TO DB: {e}")
+            self._print_fallback(batch)
+            return 0
+
+    def _maybe_maintain(self):
+        now = time.monotonic()
+        if now < self._next_maintenance:
+            return
+        self._next_maintenance = now + self.maintenance_interval
+        if self.repo.manager.closed:
+            return
+        try:
+            self.repo.maintain_partitions(retention_months=self.retention_months)
+        except Exception as e:
+            print(f"FAILED TO MAINTAIN LOG PARTITIONS: {e}")
+
+    def _print_fallback(self, entries: List[Dict[str, Any]]):
+        for entry in entries:
+            print(
+                f"[{entry.get('created_at')}] {entry.get('level', 'info').upper()} "
+                f"{entry.get('module')}/{entry.get('action')} ({entry.get('actor')}): "
+                f"{entry.get('message')} {entry.get('metadata') or ''}"
+            )
+        if entries:
+            with self._cond:
+                self._fallback += len(entries)
+
+
+_log_writer: Optional[LogWriter] = None
+_log_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> LogWriter:
+    global _log_writer
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = LogWriter(
+                    LogRepository(get_db_manager()),
+                    max_queue_size=config.log_queue_size,
+                    batch_size=config.log_batch_size,
+                    flush_interval=config.log_flush_interval_seconds,
+                    overflow_policy=config.log_overflow_policy,
+                    retention_months=config.log_retention_months,
+                )
+    return _log_writer
+
+
+def stop_log_writer(timeout: float = 5.0):
+    """Write queued audit logs and stop the writer; used on shutdown, before
+    the database pool is closed."""
+    global _log_writer
+    with _log_writer_lock:
+        writer, _log_writer = _log_writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+
 class LogService:
     def __init__(self):
         self.db_manager = get_db_manager()
         self.repo = LogRepository(self.db_manager)
+        self.writer = get_log_writer()
 
     def info(self, actor: str, action: str, message: str, metadata: Optional[Dict[str, Any]] = None, module: Optional[str] = None):
         """Record an info log."""
@@ -18,7 +268,7 @@ class LogService:
             metadata = {}
         if error_details:
             metadata['error'] = error_details
-            
+
         self._log("error", actor, action, message, metadata, module)
 
     def warning(self, actor: str, action: str, message: str, metadata: Optional[Dict[str, Any]] = None, module: Optional[str] = None):
@@ -26,17 +276,13 @@ class LogService:
         self._log("warning", actor, action, message, metadata, module)
 
     def _log(self, level: str, actor: str, action: str, message: str, metadata: Optional[Dict[str, Any]], module: Optional[str]):
-        try:
-            self.repo.create_log(
-                message=message,
-                level=level,
-                actor=actor,
-                action=action,
-                module=module,
-                metadata=metadata
-            )
-        except Exception as e:
-            # Fallback logging to stdout if DB fails
-            traceback.print_exc()
-
-            print(f"FAILED TO WRITE LOG TO DB: {e} - Message: {message}")
+        # Queued for the background writer; never waits on the database.
+        self.writer.submit({
+            "message": message,
+            "level": level,
+            "actor": actor,
+            "action": action,
+            "module": module,
+            "metadata": metadata,
+            "created_at": datetime.datetime.now(datetime.timezone.utc),
+        })
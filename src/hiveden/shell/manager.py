@@ -12,7 +12,6 @@ import termios
 import fcntl
 from dataclasses import dataclass
 from typing import Dict, Optional, AsyncIterator, Any
-import docker
 from docker import errors as docker_errors
 import paramiko
 
@@ -22,6 +21,7 @@ from hiveden.shell.models import (
     ShellType,
     ShellOutput,
 )
+from hiveden.docker.client import SharedDockerClient
 from hiveden.pkgs.manager import get_package_manager
 from hiveden.pkgs.base import PackageManager
 
@@ -49,9 +49,10 @@ class InteractiveSessionRuntime:
 class ShellManager:
     """Manages shell sessions for Docker, SSH, and local execution."""
 
+    docker_client = SharedDockerClient()
+
     def __init__(self):
         self.sessions: Dict[str, ShellSession] = {}
-        self.docker_client = docker.from_env()
         self._ssh_clients: Dict[str, paramiko.SSHClient] = {}
         self._interactive_sessions: Dict[str, InteractiveSessionRuntime] = {}
 
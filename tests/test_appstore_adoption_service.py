@@ -35,6 +35,10 @@ class _FakeCatalog:
             }
         )
 
+    def add_resources(self, app_id, resources):
+        for resource in resources:
+            self.add_resource(app_id=app_id, **resource)
+
     def set_installation_status(
         self,
         app_id,
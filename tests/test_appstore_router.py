@@ -112,6 +112,15 @@ class FakeCatalogService:
             install_status="installed",
         )
 
+    async def alist_apps(self, **kwargs):
+        return self.list_apps(**kwargs)
+
+    async def alist_installed_apps(self):
+        return self.list_installed_apps()
+
+    async def aget_app(self, app_id):
+        return self.get_app(app_id)
+
     def upsert_catalog(self, apps):
         return SimpleNamespace(total=len(apps), upserted=len(apps))
 
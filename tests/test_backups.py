@@ -169,3 +169,37 @@ def test_delete_backup_security(tmp_path, mock_docker_module):
     with patch("hiveden.config.settings.config.backup_directory", str(backup_dir)):
         with pytest.raises(ValueError):
             manager.delete_backup("../../../etc/passwd")
+
+@pytest.mark.parametrize("filename", [".", "", "..", "nested/db_20240101_000000.sql", "../backups-old/db_20240101_000000.sql"])
+def test_delete_backup_rejects_non_backup_paths(tmp_path, mock_docker_module, filename):
+    from hiveden.backups.manager import BackupManager
+    manager = BackupManager()
+    backup_dir = tmp_path / "backups"
+    (backup_dir / "nested").mkdir(parents=True)
+    (backup_dir / "nested" / "db_20240101_000000.sql").touch()
+    (tmp_path / "backups-old").mkdir()
+    (tmp_path / "backups-old" / "db_20240101_000000.sql").touch()
+
+    with patch("hiveden.config.settings.config.backup_directory", str(backup_dir)):
+        with pytest.raises(ValueError):
+            manager.delete_backup(filename)
+
+    assert (backup_dir / "nested" / "db_20240101_000000.sql").exists()
+    assert (tmp_path / "backups-old" / "db_20240101_000000.sql").exists()
+
+def test_delete_backup_only_removes_dump_directories(tmp_path, mock_docker_module):
+    from hiveden.backups.manager import BackupManager
+    manager = BackupManager()
+    backup_dir = tmp_path / "backups"
+    (backup_dir / "uploads").mkdir(parents=True)
+    (backup_dir / "uploads" / "keep.txt").touch()
+    (backup_dir / "db_20240101_000000.dumpdir").mkdir()
+    (backup_dir / "db_20240101_000000.dumpdir" / "toc.dat").touch()
+
+    with patch("hiveden.config.settings.config.backup_directory", str(backup_dir)):
+        with pytest.raises(IsADirectoryError):
+            manager.delete_backup("uploads")
+        manager.delete_backup("db_20240101_000000.dumpdir")
+
+    assert (backup_dir / "uploads" / "keep.txt").exists()
+    assert not (backup_dir / "db_20240101_000000.dumpdir").exists()
@@ -0,0 +1,95 @@
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.db.manager import DatabaseManager, detect_dump_format
+
+
+def _db_manager():
+    return DatabaseManager("postgresql://user:pw@localhost/hiveden")
+
+
+def test_directory_backup_runs_parallel_compressed_pg_dump():
+    with patch("hiveden.db.manager.subprocess.run") as run:
+        _db_manager().backup_database(
+            "app", "/backups/app.dumpdir", format="directory", jobs=4, compression="zstd:3"
+        )
+
+    cmd = run.call_args[0][0]
+    assert cmd[0] == "pg_dump"
+    assert "--format=directory" in cmd
+    assert cmd[cmd.index("--jobs") + 1] == "4"
+    assert "--compress=zstd:3" in cmd
+    assert cmd[cmd.index("-f") + 1] == "/backups/app.dumpdir"
+
+
+def test_plain_backup_is_unchanged():
+    with patch("hiveden.db.manager.subprocess.run") as run:
+        _db_manager().backup_database("app", "/backups/app.sql")
+
+    assert run.call_args[0][0] == [
+        "pg_dump", "--dbname", "postgresql://user:pw@localhost/app", "-f", "/backups/app.sql"
+    ]
+
+
+def test_restore_picks_tool_from_dump_format(tmp_path):
+    custom = tmp_path / "app.dump"
+    custom.write_bytes(b"PGDMP\x01\x0e")
+    plain = tmp_path / "app.sql"
+    plain.write_text("SELECT 1;")
+
+    with patch("hiveden.db.manager.subprocess.run") as run:
+        _db_manager().restore_database("app", str(custom), jobs=3)
+        restore_cmd = run.call_args[0][0]
+        _db_manager().restore_database("app", str(plain), jobs=3)
+        psql_cmd = run.call_args[0][0]
+
+    assert restore_cmd[0] == "pg_restore"
+    assert restore_cmd[restore_cmd.index("--jobs") + 1] == "3"
+    assert restore_cmd[-1] == str(custom)
+    assert psql_cmd[0] == "psql"
+    assert detect_dump_format(str(tmp_path)) == "directory"
+
+
+def test_progress_lines_are_streamed():
+    process = MagicMock()
+    process.stderr = iter(["pg_dump: dumping contents of table \"public.logs\"\n"])
+    process.returncode = 0
+    lines = []
+
+    with patch("hiveden.db.manager.subprocess.Popen", return_value=process) as popen:
+        _db_manager().backup_database(
+            "app", "/backups/app.dump", format="custom", progress=lines.append
+        )
+
+    assert "--verbose" in popen.call_args[0][0]
+    assert lines == ['dumping contents of table "public.logs"']
+
+
+def test_list_backups_recognizes_dump_formats(tmp_path, mock_docker_module):
+    from hiveden.backups.manager import BackupManager
+
+    (tmp_path / "app_20260101_120000.sql").write_text("x")
+    (tmp_path / "app_20260102_120000.dump").write_bytes(b"PGDMP")
+    dump_dir = tmp_path / "app_20260103_120000.dumpdir"
+    dump_dir.mkdir()
+    (dump_dir / "toc.dat").write_bytes(b"1234")
+    (dump_dir / "3001.dat.gz").write_bytes(b"123456")
+    (tmp_path / "unrelated").mkdir()
+
+    with patch("hiveden.config.settings.config.backup_directory", str(tmp_path)):
+        manager = BackupManager()
+        backups = {b["filename"]: b for b in manager.list_backups(backup_type="database", target="app")}
+
+        assert backups["app_20260101_120000.sql"]["format"] == "plain"
+        assert backups["app_20260102_120000.dump"]["format"] == "custom"
+        assert backups["app_20260103_120000.dumpdir"]["format"] == "directory"
+        assert backups["app_20260103_120000.dumpdir"]["size"] == 10
+        assert backups["app_20260103_120000.dumpdir"]["timestamp"] == "2026-01-03T12:00:00"
+
+        os.utime(dump_dir, (0, 0))
+        manager.enforce_retention_policy(target="app", backup_type="database", max_backups=2)
+
+    assert not dump_dir.exists()
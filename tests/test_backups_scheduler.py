@@ -7,7 +7,8 @@ sys.modules["apscheduler.schedulers.asyncio"] = MagicMock()
 sys.modules["apscheduler.triggers.cron"] = MagicMock()
 # Mock dependencies of BackupManager
 sys.modules["yoyo"] = MagicMock()
-sys.modules["hiveden.docker.containers"] = MagicMock()
+
+pytestmark = pytest.mark.usefixtures("mock_docker_module")
 
 def test_scheduler_add_job():
     from hiveden.backups.scheduler import BackupScheduler
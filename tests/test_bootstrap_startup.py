@@ -0,0 +1,128 @@
+import socket
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from docker import errors
+
+from hiveden.bootstrap import manager as bootstrap
+from hiveden.bootstrap.defaults import get_default_containers
+from hiveden.docker import containers as containers_module
+from hiveden.docker.containers import DockerManager
+
+
+def test_default_containers_form_a_valid_graph():
+    defaults = {c.name: c for c in get_default_containers()}
+    for container in defaults.values():
+        assert set(container.dependencies or []) <= set(defaults)
+    assert defaults["prometheus"].dependencies == ["cadvisor", "node-exporter"]
+
+
+def test_missing_containers_start_in_parallel_after_their_dependencies():
+    lock = threading.Lock()
+    started = []
+    # Every default without dependencies must be created concurrently.
+    independent = [c.name for c in get_default_containers() if not c.dependencies and c.name != "redis"]
+    barrier = threading.Barrier(len(independent), timeout=2)
+    docker_manager = MagicMock()
+    docker_manager._resolve_app_directory.return_value = "/apps"
+    docker_manager.client.containers.get.side_effect = lambda name: (
+        MagicMock() if name == "redis" else (_ for _ in ()).throw(errors.NotFound(name))
+    )
+
+    def create(name, **_settings):
+        if name in independent:
+            barrier.wait()
+        with lock:
+            started.append(name)
+        return MagicMock(name=name)
+
+    docker_manager.create_container.side_effect = create
+    pulls = MagicMock()
+    pulls.pull_many.return_value = {}
+    timer = bootstrap.StartupTimer()
+
+    with patch.object(bootstrap, "DockerManager", return_value=docker_manager), \
+            patch("hiveden.docker.images.get_image_pull_service", return_value=pulls), \
+            patch.object(bootstrap.click, "echo"):
+        bootstrap.ensure_containers(timer=timer)
+
+    assert sorted(started) == sorted(independent + ["prometheus"])
+    assert started.index("prometheus") > max(started.index("cadvisor"), started.index("node-exporter"))
+    pulled = list(pulls.pull_many.call_args.args[0])
+    assert "redis:8.2.2-alpine" not in pulled
+    assert len(pulled) == len(independent) + 1
+    assert docker_manager.wait_until_ready.call_count == len(independent) + 1
+    labels = [label for label, _ in timer.entries]
+    assert labels[0] == "image pulls"
+    assert "container prometheus" in labels and labels[-1] == "containers"
+
+
+def test_failed_container_skips_its_dependents():
+    docker_manager = MagicMock()
+    docker_manager.client.containers.get.side_effect = errors.NotFound("missing")
+    docker_manager.wait_until_ready.side_effect = lambda container, **kw: (
+        (_ for _ in ()).throw(RuntimeError("exited")) if container == "cadvisor" else None
+    )
+    docker_manager.create_container.side_effect = lambda name, **kw: name
+    echo = MagicMock()
+
+    with patch.object(bootstrap, "DockerManager", return_value=docker_manager), \
+            patch("hiveden.docker.images.get_image_pull_service", return_value=MagicMock()), \
+            patch.object(bootstrap.click, "echo", echo):
+        bootstrap.ensure_containers()
+
+    created = [c.kwargs["name"] for c in docker_manager.create_container.call_args_list]
+    assert "prometheus" not in created
+    messages = [c.args[0] for c in echo.call_args_list]
+    assert "Error bootstrapping container 'cadvisor': exited" in messages
+    assert "Error bootstrapping container 'prometheus': 'cadvisor' did not complete" in messages
+
+
+def test_postgres_ping_speaks_the_ssl_request_protocol():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    port = server.getsockname()[1]
+    received = []
+
+    def answer():
+        conn, _ = server.accept()
+        received.append(conn.recv(8))
+        conn.sendall(b"N")
+        conn.close()
+
+    thread = threading.Thread(target=answer)
+    thread.start()
+    try:
+        assert bootstrap.postgres_ping("127.0.0.1", port)
+    finally:
+        thread.join(2)
+        server.close()
+
+    assert received == [bytes.fromhex("0000000804d2162f")]
+    assert not bootstrap.postgres_ping("127.0.0.1", port, timeout=0.2)
+
+
+def test_wait_until_ready_waits_for_health_events():
+    manager = DockerManager()
+    manager.client = MagicMock()
+    container = MagicMock()
+    states = iter(["starting", "healthy"])
+    container.reload.side_effect = lambda: container.attrs.update(
+        {"State": {"Status": "running", "Health": {"Status": next(states)}}}
+    )
+    container.attrs = {}
+    events = MagicMock()
+    events.__iter__.return_value = iter([{"status": "health_status: healthy", "timeNano": 5}])
+    manager.client.events.return_value = events
+
+    with patch.object(containers_module.time, "sleep") as sleep:
+        manager.wait_until_ready(container, timeout=5)
+
+    sleep.assert_not_called()
+    assert manager.client.events.call_args.kwargs["filters"]["event"] == "health_status"
+    events.close.assert_called_once()
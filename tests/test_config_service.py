@@ -0,0 +1,96 @@
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.services.config import ConfigService
+
+
+@pytest.fixture
+def service():
+    ConfigService._instance = None
+    with patch("hiveden.services.config.get_db_manager"):
+        svc = ConfigService()
+    svc.config_repo = MagicMock()
+    svc.config_repo.get_module_values.return_value = {
+        "dns.api_key": "secret",
+        "backups.retention_count": "7",
+        "backups.schedules": '[{"id": "a"}]',
+        "empty": "",
+    }
+    svc.location_repo = MagicMock()
+    svc.location_repo.get_all.return_value = [
+        SimpleNamespace(key="apps", path="/data/apps"),
+        SimpleNamespace(key=None, path="/bookmark"),
+    ]
+    # Pretend the LISTEN connection is up.
+    svc._listener = MagicMock()
+    svc._listening.set()
+    yield svc
+    ConfigService._instance = None
+
+
+def test_typed_reads_share_one_query_per_module(service):
+    assert service.get("dns.api_key") == "secret"
+    assert service.get_int("backups.retention_count", 5) == 7
+    assert service.get_json("backups.schedules", []) == [{"id": "a"}]
+    assert service.get("empty", "fallback") == "fallback"
+    assert service.get("missing", "fallback") == "fallback"
+
+    service.config_repo.get_module_values.assert_called_once_with("core")
+    assert service.stats()["hits"] == 4
+
+
+def test_location_paths_are_cached(service):
+    assert service.get_location_path("apps") == "/data/apps"
+    assert service.get_location_path("movies", "/default") == "/default"
+    service.location_repo.get_all.assert_called_once()
+
+
+def test_notification_payload_invalidates_matching_entries(service):
+    service.get("dns.api_key")
+    service.get_location_path("apps")
+
+    service.invalidate("configs:core:dns.api_key")
+    service.get("dns.api_key")
+    service.get_location_path("apps")
+
+    assert service.config_repo.get_module_values.call_count == 2
+    assert service.location_repo.get_all.call_count == 1
+
+    service.invalidate("filesystem_locations:apps")
+    service.get_location_path("apps")
+    assert service.location_repo.get_all.call_count == 2
+
+
+def test_set_invalidates_local_cache(service):
+    service.get("dns.api_key")
+    service.config_repo.get_module_values.return_value = {"dns.api_key": "rotated"}
+
+    service.set("dns.api_key", "rotated")
+
+    service.config_repo.set_value.assert_called_once_with("core", "dns.api_key", "rotated")
+    assert service.get("dns.api_key") == "rotated"
+
+
+def test_reads_bypass_cache_without_listener(service):
+    service._listening.clear()
+
+    service.get("dns.api_key")
+    service.get("dns.api_key")
+
+    assert service.config_repo.get_module_values.call_count == 2
+
+
+def test_load_racing_an_invalidation_is_not_cached(service):
+    def load_then_change(_module):
+        service.invalidate("configs:core:dns.api_key")
+        return {"dns.api_key": "stale"}
+
+    service.config_repo.get_module_values.side_effect = load_then_change
+    service.get("dns.api_key")
+
+    assert "core" not in service.stats()["cached_modules"]
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg2.extensions import POLL_OK
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.db.aio import AsyncConnectionPool
+from hiveden.db.repositories.logs import AsyncLogRepository
+
+
+def _fake_connection(rows=None):
+    conn = MagicMock()
+    conn.closed = 0
+    conn.poll.return_value = POLL_OK
+    conn.isexecuting.return_value = False
+    conn.cursor.return_value.fetchall.return_value = rows or []
+
+    def close():
+        conn.closed = 1
+
+    conn.close.side_effect = close
+    return conn
+
+
+def _pool(**kwargs):
+    async def connect():
+        return _fake_connection()
+
+    return AsyncConnectionPool("postgresql://x/y", connect=connect, **kwargs)
+
+
+def test_async_pool_reuses_connections():
+    pool = _pool()
+
+    async def run():
+        async with pool.connection() as first:
+            pass
+        async with pool.connection() as second:
+            pass
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["connections_created"] == 1
+    assert stats["idle"] == 1
+
+
+def test_async_pool_times_out_when_exhausted():
+    pool = _pool(max_size=1, timeout=0.05)
+
+    async def run():
+        held = await pool.getconn()
+        with pytest.raises(TimeoutError):
+            await pool.getconn()
+        pool.putconn(held)
+
+    asyncio.run(run())
+
+    assert pool.stats()["timeouts"] == 1
+    assert pool.stats()["waits"] == 1
+
+
+def test_async_pool_discards_connection_left_executing():
+    pool = _pool()
+
+    async def run():
+        async with pool.connection() as conn:
+            conn.isexecuting.return_value = True
+        return conn
+
+    conn = asyncio.run(run())
+
+    assert conn.closed
+    assert pool.stats()["idle"] == 0
+    assert pool.stats()["connections_discarded"] == 1
+
+
+def test_async_log_repository_builds_filtered_query():
+    conn = _fake_connection(
+        rows=[
+            {
+                "id": 7,
+                "created_at": "2026-01-01T00:00:00",
+                "message": "Backup finished",
+                "level": "info",
+                "actor": "system",
+                "action": "backup.create",
+                "module": "backups",
+                "metadata": {},
+            }
+        ]
+    )
+    manager = MagicMock()
+
+    @asynccontextmanager
+    async def aconnection():
+        yield conn
+
+    manager.aconnection = aconnection
+
+    logs = asyncio.run(
+        AsyncLogRepository(manager).get_logs(limit=10, level="info", module="backups")
+    )
+
+    assert [log.id for log in logs] == [7]
+    query, params = conn.cursor.return_value.execute.call_args[0]
+    assert "level = %s AND module = %s" in query
+    assert params == ("info", "backups", 10, 0)
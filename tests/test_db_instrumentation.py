@@ -0,0 +1,91 @@
+import logging
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.api.middleware import query_metrics_middleware
+from hiveden.db.instrumentation import (
+    QueryStats,
+    begin_request,
+    end_request,
+    fingerprint,
+    percentile,
+    query_stats,
+)
+
+
+def test_fingerprint_groups_parameters_and_value_lists():
+    assert fingerprint("SELECT * FROM logs WHERE id = %s LIMIT 10") == (
+        "SELECT * FROM logs WHERE id = ? LIMIT ?"
+    )
+    assert fingerprint(
+        b"INSERT INTO t (a, b) VALUES ('x', 1),('it''s', 2.5)"
+    ) == "INSERT INTO t (a, b) VALUES (?)"
+    assert fingerprint("SELECT  *\n FROM configs_v2") == "SELECT * FROM configs_v2"
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(n) for n in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile([], 95) == 0.0
+
+
+def test_queries_are_attributed_to_the_current_request():
+    stats = QueryStats(slow_query_threshold=0)
+    token = begin_request()
+    stats.record_query("SELECT 1", 0.01, 1)
+    stats.record_query("SELECT 2", 0.02, 1)
+    queries = end_request(token)
+    stats.record_query("SELECT 3", 0.01, 1)
+
+    assert queries.count == 2
+    assert queries.duration == pytest.approx(0.03)
+    snapshot = stats.snapshot()
+    assert snapshot["queries"][0]["fingerprint"] == "SELECT ?"
+    assert snapshot["queries"][0]["calls"] == 3
+
+
+def test_slow_queries_are_logged(caplog):
+    stats = QueryStats(slow_query_threshold=0.1)
+
+    with caplog.at_level(logging.WARNING, logger="hiveden.db.slow_queries"):
+        stats.record_query("SELECT pg_sleep(%s)", 0.5, 1)
+        stats.record_query("SELECT 1", 0.001, 1)
+
+    assert stats.snapshot()["slow_queries"] == 1
+    assert [r.getMessage() for r in caplog.records] == [
+        "Slow query (500.0 ms, 1 rows): SELECT pg_sleep(?)"
+    ]
+
+
+def test_middleware_aggregates_per_route_template():
+    query_stats.reset()
+    app = FastAPI()
+    app.middleware("http")(query_metrics_middleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        for _ in range(item_id):
+            query_stats.record_query("SELECT * FROM items WHERE id = %s", 0.001, 1)
+        return {"id": item_id}
+
+    client = TestClient(app)
+    first = client.get("/items/2")
+    client.get("/items/3")
+
+    assert first.headers["X-DB-Query-Count"] == "2"
+    route = query_stats.snapshot()["routes"]["GET /items/{item_id}"]
+    assert route["requests"] == 2
+    assert route["queries"] == 5
+    assert route["queries_per_request_p95"] == 3
+
+    metrics = query_stats.prometheus()
+    assert 'hiveden_db_route_queries_total{route="GET /items/{item_id}"} 5' in metrics
+    assert 'hiveden_http_route_latency_seconds{route="GET /items/{item_id}",quantile="0.95"}' in metrics
+    query_stats.reset()
@@ -0,0 +1,130 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from hiveden.db.pool import ConnectionPool
+
+
+def _fake_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close():
+        conn.closed = 1
+
+    conn.close.side_effect = close
+    return conn
+
+
+def test_connection_is_reused_between_checkouts():
+    connect = MagicMock(side_effect=_fake_connection)
+    pool = ConnectionPool("postgresql://x/y", max_size=2, connect=connect)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert connect.call_count == 1
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["size"] == 1
+    assert stats["idle"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_uncommitted_transaction_is_rolled_back_on_return():
+    pool = ConnectionPool("postgresql://x/y", connect=_fake_connection)
+
+    with pool.connection() as conn:
+        conn.info.transaction_status = TRANSACTION_STATUS_INTRANS
+
+    conn.rollback.assert_called_once()
+
+
+def test_expired_connection_is_replaced():
+    connect = MagicMock(side_effect=_fake_connection)
+    pool = ConnectionPool("postgresql://x/y", max_age=0.01, connect=connect)
+
+    with pool.connection() as first:
+        pass
+    time.sleep(0.02)
+    with pool.connection() as second:
+        pass
+
+    assert first is not second
+    assert first.closed
+    assert pool.stats()["connections_discarded"] == 1
+
+
+def test_unhealthy_idle_connection_is_discarded():
+    import psycopg2
+
+    connect = MagicMock(side_effect=_fake_connection)
+    pool = ConnectionPool(
+        "postgresql://x/y", check_interval=0, connect=connect
+    )
+
+    with pool.connection() as first:
+        pass
+    first.cursor.return_value.execute.side_effect = psycopg2.OperationalError()
+
+    with pool.connection() as second:
+        pass
+
+    assert second is not first
+    assert pool.stats()["failed_health_checks"] == 1
+
+
+def test_exhausted_pool_waits_then_times_out():
+    pool = ConnectionPool(
+        "postgresql://x/y", max_size=1, timeout=0.05, connect=_fake_connection
+    )
+
+    conn = pool.getconn()
+    with pytest.raises(TimeoutError):
+        pool.getconn()
+    pool.putconn(conn)
+
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_time_seconds"] > 0
+
+
+def test_waiting_caller_receives_released_connection():
+    pool = ConnectionPool(
+        "postgresql://x/y", max_size=1, timeout=2, connect=_fake_connection
+    )
+    held = pool.getconn()
+    received = []
+
+    def borrow():
+        with pool.connection() as conn:
+            received.append(conn)
+
+    worker = threading.Thread(target=borrow)
+    worker.start()
+    time.sleep(0.05)
+    pool.putconn(held)
+    worker.join(timeout=2)
+
+    assert received == [held]
+    assert pool.stats()["waits"] == 1
+
+
+def test_close_discards_idle_connections():
+    pool = ConnectionPool("postgresql://x/y", min_size=2, connect=_fake_connection)
+    pool.warm()
+    assert pool.stats()["idle"] == 2
+
+    pool.close()
+
+    assert pool.stats()["size"] == 0
+    with pytest.raises(RuntimeError):
+        pool.getconn()
@@ -0,0 +1,91 @@
+import sys
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.db.repositories.base import BaseRepository
+
+
+def _repository():
+    conn = MagicMock()
+    cursor = conn.cursor.return_value
+    manager = MagicMock()
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    manager.connection = connection
+    return BaseRepository(manager, "widgets"), conn, cursor
+
+
+def test_create_many_inserts_all_rows_in_one_statement():
+    repo, conn, cursor = _repository()
+    rows = [{"name": "a", "size": 1}, {"name": "b", "size": None}]
+
+    with patch("hiveden.db.repositories.base.execute_values") as execute_values:
+        execute_values.return_value = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        created = repo.create_many(rows)
+
+    execute_values.assert_called_once()
+    _, query, values = execute_values.call_args[0]
+    assert query == "INSERT INTO widgets (name, size) VALUES %s RETURNING *"
+    assert values == [("a", 1), ("b", None)]
+    assert execute_values.call_args.kwargs["fetch"] is True
+    assert [row["id"] for row in created] == [1, 2]
+    conn.commit.assert_called_once()
+
+
+def test_create_many_rejects_mismatched_columns():
+    repo, _, _ = _repository()
+
+    with pytest.raises(ValueError):
+        repo.create_many([{"name": "a"}, {"size": 2}])
+
+
+def test_create_many_with_no_rows_skips_database():
+    repo, conn, _ = _repository()
+
+    assert repo.create_many([]) == []
+    conn.cursor.assert_not_called()
+
+
+def test_update_many_casts_values_to_column_types():
+    repo, _, cursor = _repository()
+    cursor.fetchall.return_value = [
+        {"attname": "id", "type": "integer"},
+        {"attname": "config", "type": "jsonb"},
+    ]
+
+    with patch("hiveden.db.repositories.base.execute_values") as execute_values:
+        execute_values.return_value = [{"id": 3, "config": {}}]
+        repo.update_many([{"id": 3, "config": "{}"}])
+
+    _, query, values = execute_values.call_args[0]
+    assert query == (
+        "UPDATE widgets AS t SET config = v.config "
+        "FROM (VALUES %s) AS v (id, config) WHERE t.id = v.id RETURNING t.*"
+    )
+    assert values == [(3, "{}")]
+    assert execute_values.call_args.kwargs["template"] == "(%s::integer, %s::jsonb)"
+
+
+def test_upsert_many_updates_non_key_columns_and_touches_timestamps():
+    repo, _, _ = _repository()
+
+    with patch("hiveden.db.repositories.base.execute_values") as execute_values:
+        execute_values.return_value = []
+        repo.upsert_many(
+            [{"slug": "a", "name": "A"}],
+            conflict_columns=["slug"],
+            touch_columns=["updated_at"],
+        )
+
+    query = execute_values.call_args[0][1]
+    assert query == (
+        "INSERT INTO widgets (slug, name) VALUES %s ON CONFLICT (slug) "
+        "DO UPDATE SET name = EXCLUDED.name, updated_at = CURRENT_TIMESTAMP RETURNING *"
+    )
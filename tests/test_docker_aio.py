@@ -0,0 +1,126 @@
+import asyncio
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+from docker import errors
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from hiveden.docker.aio import AsyncDockerClient, AsyncDockerManager, demux_log_frames
+
+
+ATTRS = {
+    "Id": "abc123",
+    "Name": "/web",
+    "Image": "sha256:nginx",
+    "Created": "2024-01-01T00:00:00Z",
+    "State": {"Status": "running", "Running": True},
+    "Config": {"Cmd": ["nginx"], "Labels": {"managed-by": "hiveden"}, "Tty": False},
+    "HostConfig": {"NetworkMode": "hiveden-network"},
+    "NetworkSettings": {"Ports": {}, "Networks": {"hiveden-network": {"IPAddress": "10.0.0.7"}}},
+}
+
+
+def _frame(stream, text):
+    payload = text.encode()
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+def _chunked(*parts):
+    body = b"".join(b"%x\r\n%s\r\n" % (len(p), p) for p in parts)
+    return (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+        b"Transfer-Encoding: chunked\r\n\r\n" + body + b"0\r\n\r\n"
+    )
+
+
+def _json(status, reason, payload):
+    body = json.dumps(payload).encode()
+    return (
+        b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n"
+        % (status, reason, len(body))
+    ) + body
+
+
+ROUTES = {
+    "GET /containers/abc123/json": _json(200, b"OK", ATTRS),
+    "GET /images/sha256:nginx/json": _json(200, b"OK", {"RepoTags": ["nginx:latest"]}),
+    "GET /containers/missing/json": _json(404, b"Not Found", {"message": "No such container: missing"}),
+    "POST /containers/abc123/stop?t=5": b"HTTP/1.1 204 No Content\r\n\r\n",
+    # The second frame arrives split across two chunks.
+    "GET /containers/abc123/logs": _chunked(
+        _frame(1, "hello\n") + _frame(2, "oops")[:5], _frame(2, "oops")[5:]
+    ),
+}
+
+
+async def _serve(tmp_path, requests):
+    async def handle(reader, writer):
+        head = await reader.readuntil(b"\r\n\r\n")
+        method, target, _ = head.split(b"\r\n", 1)[0].decode().split(" ")
+        requests.append(f"{method} {target}")
+        key = f"{method} {target.split('?')[0] if 'logs' in target else target}"
+        writer.write(ROUTES[key])
+        await writer.drain()
+        writer.close()
+
+    return await asyncio.start_unix_server(handle, path=str(tmp_path / "docker.sock"))
+
+
+def _run(tmp_path, scenario):
+    requests = []
+
+    async def main():
+        server = await _serve(tmp_path, requests)
+        try:
+            client = AsyncDockerClient(f"unix://{tmp_path}/docker.sock")
+            return await scenario(AsyncDockerManager(client=client))
+        finally:
+            server.close()
+
+    return asyncio.run(main()), requests
+
+
+def test_get_container_builds_model(tmp_path):
+    container, requests = _run(tmp_path, lambda m: m.get_container("abc123"))
+
+    assert container.Name == "web"
+    assert container.Image == "nginx:latest"
+    assert container.IPAddress == "10.0.0.7"
+    assert requests == ["GET /containers/abc123/json", "GET /images/sha256:nginx/json"]
+
+
+def test_error_responses_raise_docker_errors(tmp_path):
+    async def scenario(manager):
+        with pytest.raises(errors.NotFound) as info:
+            await manager.inspect_container("missing")
+        return info.value
+
+    error, _ = _run(tmp_path, scenario)
+    assert error.status_code == 404
+    assert error.explanation == "No such container: missing"
+
+
+def test_stop_passes_timeout(tmp_path):
+    async def scenario(manager):
+        await manager.client.request("POST", "/containers/abc123/stop", {"t": 5}, timeout=None)
+
+    _, requests = _run(tmp_path, scenario)
+    assert requests == ["POST /containers/abc123/stop?t=5"]
+
+
+def test_logs_are_demultiplexed_across_chunks(tmp_path):
+    async def scenario(manager):
+        return [line async for line in manager.stream_logs("abc123", follow=False)]
+
+    lines, _ = _run(tmp_path, scenario)
+    assert lines == ["hello\n", "oops"]
+
+
+def test_demux_keeps_incomplete_frames():
+    frames, rest = demux_log_frames(_frame(1, "a") + _frame(2, "bc")[:6])
+    assert frames == [(1, b"a")]
+    assert len(rest) == 6
@@ -0,0 +1,169 @@
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from docker import errors
+
+from hiveden.docker import containers as containers_module
+from hiveden.docker.actions import apply_containers, format_plan
+from hiveden.docker.containers import DockerManager
+from hiveden.docker.fingerprint import (
+    CONFIG_HASH_LABEL,
+    changed_sections,
+    config_fingerprint,
+    fingerprint_labels,
+)
+from hiveden.docker.models import DockerContainer, EnvVar, Port
+
+
+IMAGE = {
+    "Id": "sha256:img1",
+    "Config": {"Env": ["PATH=/usr/bin"], "Cmd": ["nginx"], "Labels": {"maintainer": "x"}},
+}
+
+
+def _spec(**overrides):
+    spec = {
+        "image": "nginx:latest",
+        "command": None,
+        "environment": ["MODE=prod"],
+        "ports": {"80/tcp": 8080},
+        "volumes": {},
+        "devices": [],
+        "labels": {"managed-by": "hiveden"},
+        "privileged": False,
+        "network": "hiveden-net",
+    }
+    spec.update(overrides)
+    return spec
+
+
+def test_fingerprint_ignores_values_provided_by_the_image():
+    created, _ = config_fingerprint(_spec(), IMAGE)
+    # As read back from the running container.
+    read_back, _ = config_fingerprint(
+        _spec(
+            command=["nginx"],
+            environment=["PATH=/usr/bin", "MODE=prod"],
+            labels={"managed-by": "hiveden", "maintainer": "x", CONFIG_HASH_LABEL: created},
+        ),
+        IMAGE,
+    )
+    assert created == read_back
+
+
+def test_changed_sections_name_what_differs():
+    _, before = config_fingerprint(_spec(), IMAGE)
+    _, after = config_fingerprint(_spec(ports={"80/tcp": 9090}), dict(IMAGE, Id="sha256:img2"))
+    labels = fingerprint_labels("old", before)
+
+    assert changed_sections(labels, after) == ["image", "ports"]
+    assert changed_sections({}, after) == list(after)
+
+
+def _manager(existing=None):
+    manager = DockerManager(network_name="hiveden-net")
+    manager.client = MagicMock()
+    manager.client.images.get.return_value.attrs = IMAGE
+    manager.client.api.inspect_container.side_effect = errors.NotFound("missing")
+    if existing is None:
+        manager.client.containers.get.side_effect = errors.NotFound("missing")
+    else:
+        manager.client.containers.get.return_value = existing
+        manager.client.api.inspect_container.side_effect = None
+        manager.client.api.inspect_container.return_value = {"Config": {"Labels": existing.labels}}
+    manager._inventory = lambda: None
+    return manager
+
+
+def _create(manager, **settings):
+    with patch.object(containers_module, "image_exists", return_value=True), \
+            patch.object(containers_module, "network_exists", return_value=True):
+        return manager.create_container(
+            name="web",
+            image="nginx:latest",
+            env=[EnvVar(name="MODE", value="prod")],
+            ports=[Port(host_port=8080, container_port=80)],
+            **settings,
+        )
+
+
+def test_create_records_fingerprint_and_unchanged_container_is_kept():
+    manager = _manager()
+    _create(manager)
+    labels = manager.client.containers.create.call_args.kwargs["labels"]
+    assert labels[CONFIG_HASH_LABEL]
+    assert manager.client.containers.create.call_args.kwargs["name"] == "web"
+
+    existing = MagicMock(labels=labels, status="exited")
+    manager = _manager(existing)
+    assert manager.plan_container("web", "nginx:latest", env=[EnvVar(name="MODE", value="prod")],
+                                  ports=[Port(host_port=8080, container_port=80)])["action"] == "unchanged"
+
+    assert _create(manager) is existing
+    existing.stop.assert_not_called()
+    existing.start.assert_called_once()
+    manager.client.containers.create.assert_not_called()
+
+
+def test_changed_configuration_is_recreated():
+    manager = _manager()
+    _create(manager)
+    labels = manager.client.containers.create.call_args.kwargs["labels"]
+
+    existing = MagicMock(labels=labels, status="running")
+    manager = _manager(existing)
+    plan = manager.plan_container("web", "nginx:latest", env=[EnvVar(name="MODE", value="dev")],
+                                  ports=[Port(host_port=8080, container_port=80)])
+    assert plan == {"name": "web", "action": "recreate", "changes": ["env"]}
+
+    with patch.object(containers_module, "image_exists", return_value=True), \
+            patch.object(containers_module, "network_exists", return_value=True):
+        manager.create_container(name="web", image="nginx:latest", env=[EnvVar(name="MODE", value="dev")],
+                                 ports=[Port(host_port=8080, container_port=80)])
+    existing.stop.assert_called_once()
+    existing.remove.assert_called_once()
+    assert manager.client.containers.create.call_args.kwargs["name"] == "web"
+
+
+def test_apply_runs_independent_containers_in_parallel_after_dependencies():
+    order = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(2, timeout=2)
+    manager = MagicMock()
+    manager.plan_container.side_effect = lambda name, image, **_: {
+        "name": name,
+        "action": "unchanged" if name == "cache" else "create",
+        "changes": [],
+    }
+
+    def create(name, image, **_settings):
+        if name in ("web", "worker"):
+            barrier.wait()
+        with lock:
+            order.append(name)
+
+    manager.create_container.side_effect = create
+    containers = [
+        DockerContainer(name="web", image="web", dependencies=["db", "cache"]),
+        DockerContainer(name="worker", image="worker", dependencies=["db"]),
+        DockerContainer(name="db", image="postgres", dependencies=["external"]),
+        DockerContainer(name="cache", image="redis"),
+    ]
+
+    results = apply_containers(manager, containers, max_workers=4)
+
+    assert set(order[:2]) == {"db", "cache"}
+    assert set(order[2:]) == {"web", "worker"}
+    assert results["cache"] == {"status": "done", "message": "unchanged"}
+    assert results["web"]["message"] == "created"
+
+
+def test_format_plan():
+    assert format_plan([
+        {"name": "web", "action": "recreate", "changes": ["env", "ports"]},
+        {"name": "db", "action": "unchanged", "changes": []},
+    ]) == ["recreate: web (env, ports changed)", "unchanged: db"]
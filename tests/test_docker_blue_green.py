@@ -0,0 +1,209 @@
+import socket
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from docker import errors
+
+from hiveden.docker import containers as containers_module
+from hiveden.docker.containers import DockerManager, separate_traefik_objects
+from hiveden.docker.models import DockerContainer, IngressConfig, Mount, Port
+
+
+CONFIG = DockerContainer(
+    name="web",
+    image="nginx:2",
+    ingress_config=IngressConfig(domain="web", port=80),
+)
+
+
+def _container(name, health="healthy", status="running"):
+    container = MagicMock()
+    container.name = name
+    container.labels = {}
+    container.status = status
+    state = {"Status": status, "Running": status == "running"}
+    if health:
+        state["Health"] = {"Status": health}
+    container.attrs = {
+        "State": state,
+        "NetworkSettings": {"Networks": {"hiveden-net": {"IPAddress": "127.0.0.1"}}},
+    }
+    return container
+
+
+@pytest.fixture
+def env():
+    old = _container("web")
+    old.labels = {"traefik.http.routers.web.rule": "Host(`web.local`)"}
+    replacement = _container("web-next")
+    manager = DockerManager(network_name="hiveden-net")
+    manager.client = MagicMock()
+    manager.client.images.get.return_value.attrs = {"Id": "sha256:new", "Config": {}}
+    manager.client.containers.create.return_value = replacement
+    manager._register_ingress_dns = MagicMock()
+
+    def get(name):
+        if name == "web":
+            return old
+        raise errors.NotFound(name)
+
+    manager.client.containers.get.side_effect = get
+    patches = [
+        patch.object(containers_module, "image_exists", return_value=True),
+        patch.object(containers_module, "network_exists", return_value=True),
+        patch.object(
+            containers_module,
+            "generate_traefik_labels",
+            return_value={"traefik.http.routers.web.rule": "Host(`web.local`)"},
+        ),
+    ]
+    for p in patches:
+        p.start()
+    yield manager, old, replacement
+    for p in patches:
+        p.stop()
+
+
+def test_replacement_takes_over_once_healthy(env):
+    manager, old, replacement = env
+    calls = MagicMock()
+    calls.attach_mock(old, "old")
+    calls.attach_mock(replacement, "new")
+
+    result = manager.update_container("web", CONFIG, zero_downtime=True)
+
+    assert result is replacement
+    assert manager.client.containers.create.call_args.kwargs["name"] == "web-next"
+    assert "traefik.http.routers.web.rule" in manager.client.containers.create.call_args.kwargs["labels"]
+    order = [c[0] for c in calls.mock_calls if c[0] in ("old.rename", "new.rename", "old.stop", "old.remove")]
+    assert order == ["old.rename", "new.rename", "old.stop", "old.remove"]
+    old.rename.assert_called_once_with("web-prev")
+    replacement.rename.assert_called_once_with("web")
+
+
+def test_unhealthy_replacement_is_rolled_back(env):
+    manager, old, replacement = env
+    replacement.attrs["State"]["Health"]["Status"] = "unhealthy"
+
+    with pytest.raises(RuntimeError, match="rolled back"):
+        manager.update_container("web", CONFIG, zero_downtime=True)
+
+    replacement.remove.assert_called_once_with(force=True)
+    old.rename.assert_not_called()
+    old.stop.assert_not_called()
+
+
+def test_failed_name_handover_restores_old_name(env):
+    manager, old, replacement = env
+    replacement.rename.side_effect = errors.APIError("conflict")
+
+    with pytest.raises(RuntimeError, match="rolled back"):
+        manager.update_container("web", CONFIG, zero_downtime=True)
+
+    assert [c.args[0] for c in old.rename.call_args_list] == ["web-prev", "web"]
+    replacement.remove.assert_called_once_with(force=True)
+    old.stop.assert_not_called()
+
+
+def test_containers_with_host_ports_are_updated_in_place(env):
+    manager, old, _replacement = env
+    config = CONFIG.model_copy(update={"ports": [Port(host_port=8080, container_port=8080)]})
+
+    manager.update_container("web", config, zero_downtime=True)
+
+    old.stop.assert_called_once()
+    assert manager.client.containers.create.call_args.kwargs["name"] == "web"
+
+
+def test_containers_sharing_writable_binds_are_updated_in_place(env):
+    manager, old, _replacement = env
+    old.attrs["Mounts"] = [{"Type": "bind", "Source": "/srv/web", "Destination": "/data", "RW": True}]
+    config = CONFIG.model_copy(update={"mounts": [Mount(source="/srv/web", target="/data")]})
+
+    manager.update_container("web", config, zero_downtime=True)
+
+    old.stop.assert_called_once()
+    assert manager.client.containers.create.call_args.kwargs["name"] == "web"
+
+
+def test_domain_change_serves_both_routers_during_the_handover(env):
+    manager, old, replacement = env
+    old.labels = {
+        "traefik.http.routers.web.rule": "Host(`web.old`)",
+        "traefik.http.services.web.loadbalancer.server.port": "80",
+    }
+    new_labels = {
+        "traefik.http.routers.web.rule": "Host(`web.local`)",
+        "traefik.http.routers.web.service": "web",
+        "traefik.http.services.web.loadbalancer.server.port": "80",
+    }
+
+    with patch.object(containers_module, "generate_traefik_labels", return_value=new_labels):
+        result = manager.update_container("web", CONFIG, zero_downtime=True)
+
+    assert result is replacement
+    kwargs = manager.client.containers.create.call_args.kwargs
+    assert kwargs["name"] == "web-next"
+    assert kwargs["labels"]["traefik.http.routers.web-next.rule"] == "Host(`web.local`)"
+    assert "traefik.http.routers.web.rule" not in kwargs["labels"]
+    # The unchanged service is shared by both containers.
+    assert kwargs["labels"]["traefik.http.routers.web-next.service"] == "web"
+    assert kwargs["labels"]["traefik.http.services.web.loadbalancer.server.port"] == "80"
+    replacement.rename.assert_called_once_with("web")
+
+
+def test_changed_services_are_renamed_with_the_routers_using_them():
+    current = {
+        "traefik.http.routers.web.rule": "Host(`web.local`)",
+        "traefik.http.services.web.loadbalancer.server.port": "80",
+    }
+    labels = dict(current, **{"traefik.http.services.web.loadbalancer.server.port": "8080"})
+
+    assert separate_traefik_objects(labels, current) == {
+        "traefik.http.routers.web-next.rule": "Host(`web.local`)",
+        "traefik.http.services.web-next.loadbalancer.server.port": "8080",
+    }
+    assert separate_traefik_objects(current, current) == current
+
+
+def test_update_accepts_configuration_read_from_a_container(env):
+    manager, old, _replacement = env
+    config = {
+        "name": "web",
+        "image": "nginx:2",
+        "env": [{"name": "MODE", "value": "prod"}],
+        "mounts": [{"source": "/data", "target": "/data", "is_app_directory": False}],
+        "is_container": True,
+    }
+
+    manager.update_container("web", config)
+
+    kwargs = manager.client.containers.create.call_args.kwargs
+    assert kwargs["environment"] == ["MODE=prod"]
+    assert kwargs["volumes"] == {"/data": {"bind": "/data", "mode": "rw"}}
+
+
+def test_wait_until_ready_probes_the_ingress_port():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    try:
+        manager = DockerManager(network_name="hiveden-net")
+        container = _container("web-next", health=None)
+
+        manager.wait_until_ready(container, port=server.getsockname()[1], timeout=2, interval=0.05)
+    finally:
+        server.close()
+
+
+def test_wait_until_ready_fails_when_container_exits():
+    container = _container("web-next", health=None, status="exited")
+    container.attrs["State"]["ExitCode"] = 3
+
+    with pytest.raises(RuntimeError, match="code 3"):
+        DockerManager().wait_until_ready(container, timeout=1, interval=0.01)
@@ -0,0 +1,124 @@
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from hiveden.docker.bulk import reverse_graph, run_dependency_graph, summarize
+from hiveden.docker.containers import DockerManager
+from hiveden.docker.dependencies import dependency_levels
+from hiveden.docker.models import ContainerSummary
+
+
+STACK = {"app": ["db", "cache"], "worker": ["db"], "db": [], "cache": []}
+
+
+def test_dependency_levels_orders_dependencies_first():
+    assert dependency_levels(STACK) == [["cache", "db"], ["app", "worker"]]
+
+
+def test_dependency_levels_rejects_cycles():
+    with pytest.raises(ValueError, match="a, b"):
+        dependency_levels({"a": ["b"], "b": ["a"], "c": []})
+
+
+def test_graph_runs_independent_containers_concurrently():
+    order = []
+    lock = threading.Lock()
+    # db and cache must both be running at once to pass the barrier.
+    barrier = threading.Barrier(2, timeout=2)
+
+    def task(name):
+        if name in ("db", "cache"):
+            barrier.wait()
+        with lock:
+            order.append(name)
+
+    results = run_dependency_graph(STACK, task, max_workers=4)
+
+    assert all(r["status"] == "done" for r in results.values())
+    assert set(order[:2]) == {"db", "cache"}
+    assert set(order[2:]) == {"app", "worker"}
+
+
+def test_failure_skips_everything_waiting_on_it():
+    progress = []
+
+    def task(name):
+        if name == "db":
+            raise RuntimeError("port in use")
+        return "started"
+
+    results = run_dependency_graph(STACK, task, max_workers=2, progress=progress.append)
+    summary = summarize(results)
+
+    assert summary["failed"] == ["db"]
+    assert sorted(summary["skipped"]) == ["app", "worker"]
+    assert summary["done"] == ["cache"]
+    assert "[failed] db: port in use" in progress
+
+
+def test_reverse_graph_puts_dependents_first():
+    levels = dependency_levels(reverse_graph(STACK))
+    assert levels == [["app", "worker"], ["cache", "db"]]
+
+
+def _summary(name, state="running", deps=None):
+    labels = {"hiveden.dependencies": ",".join(deps)} if deps else {}
+    return ContainerSummary(Id=f"id-{name}", Name=name, State=state, Labels=labels)
+
+
+def _manager():
+    calls = []
+    lock = threading.Lock()
+
+    def get(container_id):
+        container = MagicMock()
+
+        def record(op):
+            def call(**_kwargs):
+                with lock:
+                    calls.append((op, container_id.removeprefix("id-")))
+            return call
+
+        container.start.side_effect = record("start")
+        container.stop.side_effect = record("stop")
+        return container
+
+    manager = DockerManager()
+    manager.client = MagicMock()
+    manager.client.containers.get.side_effect = get
+    return manager, calls
+
+
+def test_bulk_stop_stops_dependents_before_dependencies():
+    manager, calls = _manager()
+    containers = [
+        _summary("db"),
+        _summary("app", deps=["db"]),
+        _summary("old", state="exited", deps=["db"]),
+    ]
+
+    results = manager.bulk_action("stop", containers, max_workers=4, timeout=3)
+
+    assert calls == [("stop", "app"), ("stop", "db")]
+    assert results["old"] == {"status": "done", "message": "already stopped"}
+
+
+def test_bulk_restart_stops_then_starts_in_dependency_order():
+    manager, calls = _manager()
+    containers = [_summary("db"), _summary("app", deps=["db"])]
+
+    results = manager.bulk_action("restart", containers, max_workers=4)
+
+    assert calls == [("stop", "app"), ("stop", "db"), ("start", "db"), ("start", "app")]
+    assert {r["status"] for r in results.values()} == {"done"}
+
+
+def test_bulk_action_rejects_unknown_action():
+    manager, _calls = _manager()
+    with pytest.raises(ValueError):
+        manager.bulk_action("pause", [_summary("db")])
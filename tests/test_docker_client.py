@@ -0,0 +1,64 @@
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.docker import client as client_module
+from hiveden.docker.client import DockerApiStats, endpoint_key, instrument
+
+
+@pytest.mark.parametrize(
+    "method,url,key",
+    [
+        ("get", "http+docker://localhost/v1.47/containers/abc123/json?size=1", "GET /containers/{id}/json"),
+        ("get", "http+docker://localhost/v1.47/containers/json", "GET /containers/json"),
+        ("post", "http+docker://localhost/v1.47/images/create", "POST /images/create"),
+        ("get", "http+docker://localhost/v1.47/images/library/nginx:1.27/json", "GET /images/{id}/json"),
+        ("delete", "http+docker://localhost/v1.47/networks/hiveden-net", "DELETE /networks/{id}"),
+        ("get", "http+docker://localhost/version", "GET /version"),
+    ],
+)
+def test_requests_are_grouped_by_endpoint(method, url, key):
+    assert endpoint_key(method, url) == key
+
+
+def test_instrumented_client_records_calls_and_errors():
+    responses = iter([SimpleNamespace(status_code=200), SimpleNamespace(status_code=404)])
+    api = SimpleNamespace(request=lambda method, url, **kwargs: next(responses))
+    stats = DockerApiStats()
+    docker_client = instrument(SimpleNamespace(api=api), stats)
+
+    docker_client.api.request("GET", "http+docker://localhost/v1.47/containers/a/json")
+    docker_client.api.request("GET", "http+docker://localhost/v1.47/containers/b/json")
+    with pytest.raises(StopIteration):
+        docker_client.api.request("POST", "http+docker://localhost/v1.47/containers/a/start")
+
+    snapshot = stats.snapshot()
+    by_endpoint = {e["endpoint"]: e for e in snapshot["endpoints"]}
+    assert snapshot["calls"] == 3
+    assert by_endpoint["GET /containers/{id}/json"]["calls"] == 2
+    assert by_endpoint["GET /containers/{id}/json"]["errors"] == 1
+    assert by_endpoint["POST /containers/{id}/start"]["errors"] == 1
+
+
+def test_client_is_created_once_on_first_use():
+    with patch.object(client_module, "_client", None), \
+            patch.object(client_module.docker, "from_env") as from_env:
+        from hiveden.shell.manager import ShellManager
+
+        shell = ShellManager()
+        from_env.assert_not_called()
+
+        assert shell.docker_client is client_module.get_docker_client()
+        from_env.assert_called_once_with(
+            timeout=client_module.config.docker_timeout,
+            max_pool_size=client_module.config.docker_pool_size,
+        )
+
+        client_module.close_docker_client()
+        from_env.return_value.close.assert_called_once()
+        assert client_module._client is None
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock, patch
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.dependencies import utils as fastapi_dep_utils
+from fastapi.testclient import TestClient
+
+# Mock optional runtime dependencies used during router package imports.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+sys.modules["apscheduler"] = MagicMock()
+sys.modules["apscheduler.schedulers"] = MagicMock()
+sys.modules["apscheduler.schedulers.asyncio"] = MagicMock()
+sys.modules["apscheduler.triggers"] = MagicMock()
+sys.modules["apscheduler.triggers.cron"] = MagicMock()
+fastapi_dep_utils.ensure_multipart_is_installed = lambda: None
+from hiveden.api.routers.docker.containers import router
+from hiveden.docker.containers import DockerManager
+from hiveden.docker.models import ContainerSummary
+
+
+def _row(cid, name, image_id, image_ref):
+    return {
+        "Id": cid,
+        "Names": [f"/{name}"],
+        "Image": image_ref,
+        "ImageID": image_id,
+        "Command": "nginx -g 'daemon off;'",
+        "Created": 1700000000,
+        "State": "running",
+        "Status": "Up 2 hours",
+        "Ports": [{"PrivatePort": 80, "Type": "tcp"}],
+        "Labels": {"managed-by": "hiveden"},
+        "NetworkSettings": {"Networks": {"hiveden-network": {"IPAddress": "10.0.0.5"}}},
+    }
+
+
+def _manager():
+    manager = DockerManager()
+    manager.client = MagicMock()
+    manager.client.api.containers.return_value = [
+        _row("a1", "web", "sha256:nginx", "nginx"),
+        _row("b2", "tool", "sha256:untagged", "sha256:untagged"),
+    ]
+    manager.client.api.images.return_value = [
+        {"Id": "sha256:nginx", "RepoTags": ["nginx:latest"]},
+        {"Id": "sha256:untagged", "RepoTags": ["<none>:<none>"]},
+    ]
+    return manager
+
+
+def test_summaries_use_one_list_and_one_image_call():
+    manager = _manager()
+
+    summaries = manager.list_container_summaries(all=True, only_managed=True)
+
+    manager.client.api.containers.assert_called_once_with(
+        all=True, filters={"label": "managed-by=hiveden"}
+    )
+    manager.client.api.images.assert_called_once()
+    manager.client.api.inspect_container.assert_not_called()
+    manager.client.containers.list.assert_not_called()
+    assert [s.Name for s in summaries] == ["web", "tool"]
+    assert summaries[0].Image == "nginx:latest"
+    assert summaries[1].Image == "sha256:untagged"
+    assert summaries[0].IPAddress == "10.0.0.5"
+
+
+def test_field_selection_skips_image_lookup():
+    manager = _manager()
+
+    summaries = manager.list_container_summaries(fields=["Id", "State"])
+
+    manager.client.api.images.assert_not_called()
+    assert summaries[0].model_dump(exclude_unset=True) == {"Id": "a1", "State": "running"}
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        _manager().list_container_summaries(fields=["Id", "Secrets"])
+
+
+def test_summary_endpoint_returns_only_selected_fields():
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    def fake_list(all, only_managed, fields):
+        assert fields == ["Id", "Name"]
+        return [ContainerSummary(Id="a1", Name="web")]
+
+    with patch("hiveden.docker.containers.list_container_summaries", fake_list):
+        response = client.get("/containers/summary?fields=Id,Name")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "data": [{"Id": "a1", "Name": "web"}]}
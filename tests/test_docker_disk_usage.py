@@ -0,0 +1,192 @@
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+
+from docker import errors
+
+from hiveden.docker.disk_usage import DiskUsageService, plan_reclaim, prune, read_disk_usage
+
+DF = {
+    "LayersSize": 1000,
+    "Images": [
+        {"Id": "sha256:app", "RepoTags": ["app:1"], "Size": 600, "SharedSize": 200, "Containers": 1},
+        {"Id": "sha256:old", "RepoTags": ["app:0"], "Size": 500, "SharedSize": 200, "Containers": 0},
+        {"Id": "sha256:tmp", "RepoTags": ["<none>:<none>"], "Size": 100, "SharedSize": 0, "Containers": 0},
+    ],
+    "Containers": [
+        {"Id": "c1", "Names": ["/app"], "ImageID": "sha256:app", "State": "running", "SizeRw": 30},
+        {"Id": "c2", "Names": ["/job"], "ImageID": "sha256:app", "State": "exited", "SizeRw": 5},
+    ],
+    "Volumes": [
+        {"Name": "data", "Driver": "local", "Labels": None, "UsageData": {"Size": 900, "RefCount": 1}},
+        {"Name": "cache", "Driver": "local", "Labels": {}, "UsageData": {"Size": 700, "RefCount": 0}},
+        {"Name": "f00", "Driver": "local", "Labels": {"com.docker.volume.anonymous": ""},
+         "UsageData": {"Size": 300, "RefCount": 0}},
+        {"Name": "nfs", "Driver": "nfs", "Labels": {"com.docker.volume.anonymous": ""},
+         "UsageData": {"Size": -1, "RefCount": 0}},
+    ],
+    "BuildCache": [
+        {"ID": "b1", "Type": "regular", "Size": 40, "InUse": False, "Shared": False},
+        {"ID": "b2", "Type": "regular", "Size": 10, "InUse": True, "Shared": False},
+    ],
+}
+KEYS = {"image": ["LayersSize", "Images"], "container": ["Containers"], "volume": ["Volumes"],
+        "build-cache": ["BuildCache"]}
+
+
+def _client(version="1.47"):
+    client = MagicMock()
+    client.api.api_version = version
+    client.api._get.side_effect = lambda url, params: params["type"]
+    client.api._result.side_effect = lambda kind, json: {key: DF[key] for key in KEYS[kind]}
+    client.api.df.return_value = DF
+    return client
+
+
+def test_sections_are_fetched_separately_and_normalized():
+    client = _client()
+
+    snapshot = read_disk_usage(client)
+
+    assert sorted(c.kwargs["params"]["type"] for c in client.api._get.call_args_list) == [
+        "build-cache", "container", "image", "volume"
+    ]
+    client.api.df.assert_not_called()
+    old = snapshot["images"][1]
+    assert (old["shared_size"], old["unique_size"]) == (200, 300)
+    assert snapshot["images"][2]["tags"] == []
+    assert snapshot["volumes"][3]["size"] is None
+    assert snapshot["totals"]["images"] == {"count": 3, "bytes": 1000, "reclaimable_bytes": 400}
+    assert snapshot["totals"]["containers"]["reclaimable_bytes"] == 5
+    assert snapshot["totals"]["volumes"] == {"count": 4, "bytes": 1900, "reclaimable_bytes": 1000}
+    assert snapshot["totals"]["build_cache"]["reclaimable_bytes"] == 40
+
+
+def test_old_daemons_get_a_single_df_call():
+    client = _client(version="1.41")
+
+    snapshot = read_disk_usage(client)
+
+    client.api.df.assert_called_once()
+    client.api._get.assert_not_called()
+    assert len(snapshot["containers"]) == 2
+
+
+def test_plan_ranks_unused_images_and_anonymous_volumes():
+    snapshot = read_disk_usage(_client())
+
+    plan = plan_reclaim(snapshot)
+    assert [(i["type"], i["name"], i["bytes"]) for i in plan["items"]] == [
+        ("image", "app:0", 300),
+        ("volume", "f00", 300),
+        ("image", "<none>", 100),
+        ("volume", "nfs", 0),
+    ]
+    assert plan["bytes"] == 700
+
+    assert [i["id"] for i in plan_reclaim(snapshot, dangling_images_only=True, volumes=False)["items"]] == [
+        "sha256:tmp"
+    ]
+    named = plan_reclaim(snapshot, images=False, named_volumes=True, min_bytes=1, limit=1)
+    assert [i["name"] for i in named["items"]] == ["cache"]
+
+
+def test_prune_skips_items_docker_refuses():
+    client = MagicMock()
+    client.api.remove_image.side_effect = [None, errors.APIError("conflict", explanation="image is in use")]
+    client.api.remove_volume.side_effect = errors.NotFound("gone")
+    progress = MagicMock()
+    items = [
+        {"type": "image", "id": "sha256:old", "name": "app:0", "bytes": 300},
+        {"type": "image", "id": "sha256:tmp", "name": "<none>", "bytes": 100},
+        {"type": "volume", "id": "f00", "name": "f00", "bytes": 300},
+    ]
+
+    result = prune(client, items, progress)
+
+    assert result == {"removed": ["sha256:old"], "failed": {"sha256:tmp": "image is in use"}, "bytes": 300}
+    assert progress.call_count == 3
+
+
+def test_images_with_several_tags_are_removed_tag_by_tag():
+    client = MagicMock()
+    client.api.inspect_image.side_effect = lambda image_id: {
+        "sha256:multi": {"RepoTags": ["app:0", "registry.local/app:0"]},
+        "sha256:used": {"RepoTags": ["db:1", "db:latest"]},
+    }[image_id]
+    client.api.containers.side_effect = lambda **kwargs: (
+        [{"Id": "c0ffee00c0ffee00"}] if kwargs["filters"]["ancestor"] == "sha256:used" else []
+    )
+    items = [
+        {"type": "image", "id": "sha256:multi", "name": "app:0", "bytes": 300},
+        {"type": "image", "id": "sha256:used", "name": "db:1", "bytes": 200},
+    ]
+
+    result = prune(client, items)
+
+    assert [c.args for c in client.api.remove_image.call_args_list] == [("app:0",), ("registry.local/app:0",)]
+    assert result["removed"] == ["sha256:multi"]
+    assert result["failed"] == {"sha256:used": "image is being used by container c0ffee00c0ff"}
+
+
+def test_stale_snapshot_is_served_while_recomputing():
+    client = _client()
+    service = DiskUsageService(client, ttl=60)
+    first = service.snapshot()
+    assert first["stale"] is False
+
+    release = threading.Event()
+    client.api.df.side_effect = lambda: release.wait(2) and DF
+    client.api.api_version = "1.41"
+    service._snapshot["computed_at"] -= 120
+
+    stale = service.snapshot()
+    assert stale["stale"] is True
+    assert stale["computed_at"] == first["computed_at"] - 120
+    # A second reader does not start another computation.
+    service.snapshot()
+    computing = service._refreshing
+    release.set()
+    computing.wait(2)
+    fresh = service.snapshot()
+
+    assert client.api.df.call_count == 1
+    assert fresh["stale"] is False
+    assert fresh["computed_at"] > first["computed_at"]
+
+
+def test_first_failure_is_reported():
+    client = _client()
+    client.api._get.side_effect = errors.APIError("daemon down")
+
+    with pytest.raises(errors.APIError):
+        DiskUsageService(client).snapshot()
+
+
+def test_failed_refresh_does_not_fall_back_to_the_cached_snapshot():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from hiveden.api.routers.docker import disk
+
+    client = _client()
+    service = DiskUsageService(client)
+    service.snapshot()
+    client.api._get.side_effect = errors.APIError("daemon down")
+
+    with pytest.raises(errors.APIError, match="daemon down"):
+        service.refresh()
+    assert service.snapshot()["computed_at"] > 0
+
+    app = FastAPI()
+    app.include_router(disk.router)
+    with patch.object(disk, "get_disk_usage_service", return_value=service):
+        response = TestClient(app).post("/disk-usage/prune", json={})
+
+    assert response.status_code == 503
+    client.api.remove_image.assert_not_called()
@@ -0,0 +1,139 @@
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from docker import errors
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.docker.images import ImagePullService, normalize_reference
+
+
+def _events(layer="abc"):
+    return [
+        {"status": "Pulling from library/postgres", "id": "16"},
+        {"status": "Downloading", "id": layer, "progressDetail": {"current": 10, "total": 100}},
+        {"status": "Downloading", "id": layer, "progressDetail": {"current": 20, "total": 100}},
+        {"status": "Downloading", "id": layer, "progressDetail": {"current": 60, "total": 100}},
+        {"status": "Pull complete", "id": layer},
+        {"status": "Status: Downloaded newer image for postgres:16"},
+    ]
+
+
+def _client(pull):
+    client = MagicMock()
+    client.api.pull.side_effect = pull
+    client.images.get.side_effect = errors.ImageNotFound("missing")
+    return client
+
+
+def test_normalize_reference():
+    assert normalize_reference("postgres") == "postgres:latest"
+    assert normalize_reference("ghcr.io/org/app:1.2") == "ghcr.io/org/app:1.2"
+    assert normalize_reference("redis@sha256:abc") == "redis@sha256:abc"
+
+
+def test_progress_is_reported_per_layer_without_repeats():
+    service = ImagePullService(_client(lambda *a, **k: iter(_events())), max_concurrent=2)
+    lines = []
+
+    service.pull("postgres:16", progress=lines.append)
+
+    assert lines == [
+        "postgres:16: pulling",
+        "postgres:16: Pulling from library/postgres",
+        "postgres:16: layer abc Downloading 0%",
+        "postgres:16: layer abc Downloading 50%",
+        "postgres:16: layer abc Pull complete",
+        "postgres:16: Status: Downloaded newer image for postgres:16",
+        "postgres:16: pull complete",
+    ]
+
+
+def test_concurrent_pulls_of_the_same_image_share_one_download():
+    release = threading.Event()
+
+    def pull(*_args, **_kwargs):
+        release.wait(2)
+        return iter(_events())
+
+    client = _client(pull)
+    service = ImagePullService(client, max_concurrent=4)
+    joined = []
+
+    threads = [
+        threading.Thread(target=service.pull, args=("postgres:16",)),
+        threading.Thread(target=service.pull, args=("postgres:16", joined.append)),
+    ]
+    threads[0].start()
+    while not service.stats()["in_flight"]:
+        time.sleep(0.01)
+    threads[1].start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert client.api.pull.call_count == 1
+    assert joined[0] == "postgres:16: waiting for pull already in progress"
+    assert joined[-1] == "postgres:16: pull complete"
+
+
+def test_waiters_receive_the_pull_error():
+    def pull(*_args, **_kwargs):
+        return iter([{"error": "manifest unknown"}])
+
+    service = ImagePullService(_client(pull), max_concurrent=1)
+    with pytest.raises(errors.ImageNotFound, match="manifest unknown"):
+        service.pull("nope:1")
+    assert service.stats()["in_flight"] == []
+
+
+def test_missing_images_are_reported_as_not_found():
+    def pull(repository, **_kwargs):
+        if repository == "typo":
+            raise errors.NotFound("pull access denied for typo", explanation="pull access denied for typo")
+        return iter([{"error": f"manifest for {repository}:9 not found: manifest unknown"}])
+
+    service = ImagePullService(_client(pull), max_concurrent=1)
+    with pytest.raises(errors.ImageNotFound):
+        service.pull("typo:1")
+    with pytest.raises(errors.ImageNotFound, match="manifest for postgres:9 not found"):
+        service.pull("postgres:9")
+
+
+def test_pull_many_limits_concurrency_and_reports_failures():
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def pull(repository, tag=None, **_kwargs):
+        with lock:
+            active.append(repository)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(repository)
+        if repository == "broken":
+            return iter([{"error": "denied"}])
+        return iter([])
+
+    client = _client(pull)
+    service = ImagePullService(client, max_concurrent=2)
+
+    results = service.pull_many(["a", "b", "c", "broken", "a"])
+
+    assert results == {"a": None, "b": None, "c": None, "broken": "denied"}
+    assert max(peak) <= 2
+    assert client.api.pull.call_count == 4
+
+
+def test_pull_many_skips_local_images_by_default():
+    client = _client(lambda *a, **k: iter([]))
+    client.images.get.side_effect = None
+
+    assert ImagePullService(client).pull_many(["redis:7"]) == {"redis:7": None}
+    client.api.pull.assert_not_called()
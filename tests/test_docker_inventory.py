@@ -0,0 +1,183 @@
+import queue
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from docker import errors
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from hiveden.docker import inventory as inventory_module
+from hiveden.docker.containers import DockerManager
+from hiveden.docker.inventory import ContainerInventory
+
+_STOP = object()
+
+
+class FakeStream:
+    """Event stream fed from the test; queued exceptions simulate a disconnect."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self):
+        self.queue.put(_STOP)
+
+
+def _attrs(cid, name, running=True, labels=None, image="sha256:nginx", created="2024-01-01T00:00:00Z"):
+    return {
+        "Id": cid,
+        "Name": f"/{name}",
+        "Image": image,
+        "Created": created,
+        "State": {"Status": "running" if running else "exited", "Running": running},
+        "Config": {"Image": "nginx", "Cmd": None, "Env": [], "Labels": labels or {}},
+        "HostConfig": {
+            "NetworkMode": "hiveden-network",
+            "PortBindings": {},
+            "Binds": [],
+            "Devices": [],
+            "Privileged": False,
+        },
+        "NetworkSettings": {"Ports": {}, "Networks": {"hiveden-network": {"IPAddress": "10.0.0.2"}}},
+    }
+
+
+def _client(containers):
+    daemon = {c["Id"]: c for c in containers}
+    streams = []
+
+    def inspect(cid):
+        if cid not in daemon:
+            raise errors.NotFound("gone")
+        return daemon[cid]
+
+    def events(**_kwargs):
+        streams.append(FakeStream())
+        return streams[-1]
+
+    api = MagicMock()
+    api.containers.side_effect = lambda all=True: [{"Id": cid} for cid in daemon]
+    api.inspect_container.side_effect = inspect
+    api.images.return_value = [{"Id": "sha256:nginx", "RepoTags": ["nginx:latest"]}]
+    client = MagicMock(api=api)
+    client.events.side_effect = events
+    return client, daemon, streams
+
+
+def _started(containers):
+    client, daemon, streams = _client(containers)
+    inventory = ContainerInventory(client, reconnect_delay=0.01)
+    inventory.start()
+    assert inventory.wait_ready(2)
+    return inventory, client, daemon, streams
+
+
+def _wait_for(predicate, inventory):
+    for _ in range(200):
+        if predicate():
+            return True
+        inventory._stopping.wait(0.01)
+    return False
+
+
+def test_events_update_inventory_without_full_reload():
+    inventory, client, daemon, streams = _started([_attrs("a1", "web")])
+    try:
+        daemon["b2"] = _attrs("b2", "db", created="2024-02-01T00:00:00Z")
+        streams[0].queue.put({"Type": "container", "Action": "create", "Actor": {"ID": "b2"}})
+        assert _wait_for(lambda: inventory.get("db") is not None, inventory)
+
+        daemon["a1"] = _attrs("a1", "web", running=False)
+        streams[0].queue.put({"Type": "container", "Action": "die", "Actor": {"ID": "a1"}})
+        assert _wait_for(lambda: not inventory.get("a1")["State"]["Running"], inventory)
+
+        del daemon["b2"]
+        streams[0].queue.put({"Type": "container", "Action": "destroy", "Actor": {"ID": "b2"}})
+        assert _wait_for(lambda: inventory.get("b2") is None, inventory)
+
+        assert client.api.containers.call_count == 1
+        assert [a["Id"] for a in inventory.containers()] == ["a1"]
+    finally:
+        inventory.stop()
+
+
+def test_exec_events_are_ignored():
+    inventory, client, _daemon, streams = _started([_attrs("a1", "web")])
+    try:
+        streams[0].queue.put({"Type": "container", "Action": "exec_start: sh", "Actor": {"ID": "a1"}})
+        streams[0].queue.put({"Type": "image", "Action": "tag", "Actor": {"ID": "sha256:nginx"}})
+        assert _wait_for(lambda: client.api.images.call_count == 2, inventory)
+        assert client.api.inspect_container.call_count == 1
+    finally:
+        inventory.stop()
+
+
+def test_stream_failure_triggers_full_resync():
+    inventory, client, daemon, streams = _started([_attrs("a1", "web")])
+    try:
+        daemon["b2"] = _attrs("b2", "db")
+        streams[0].queue.put(ConnectionError("daemon restarted"))
+
+        assert _wait_for(lambda: len(streams) == 2 and inventory.ready, inventory)
+        assert inventory.stats()["resyncs"] == 2
+        assert inventory.get("b2") is not None
+    finally:
+        inventory.stop()
+
+
+def test_filter_mirrors_docker_list_filters():
+    inventory = ContainerInventory(MagicMock())
+    inventory.remember(_attrs("a1", "web", labels={"managed-by": "hiveden"}))
+    inventory.remember(_attrs("b2", "web-db", running=False, labels={"managed-by": "hiveden"}))
+    inventory.remember(_attrs("c3", "other"))
+
+    assert [a["Id"] for a in inventory.filter()] == ["a1", "c3"]
+    assert [a["Id"] for a in inventory.filter(all=True, labels={"managed-by": "hiveden"})] == ["a1", "b2"]
+    assert [a["Id"] for a in inventory.filter(all=True, names=["web"])] == ["a1", "b2"]
+
+
+def test_docker_manager_reads_from_ready_inventory():
+    inventory, client, _daemon, _streams = _started([
+        _attrs("a1", "web", labels={"managed-by": "hiveden", "hiveden.dependencies": "db"}),
+        _attrs("b2", "ghost", image="sha256:deleted"),
+    ])
+    try:
+        manager = DockerManager()
+        manager.client = client
+        with patch.object(inventory_module, "_inventory", inventory), \
+                patch.object(manager, "_resolve_app_directory", return_value="/apps"):
+            containers = manager.list_containers(all=True)
+            config = manager.get_container_config("web")
+            names = manager.list_existing_container_names()
+
+        by_id = {c.Id: c for c in containers}
+        assert by_id["a1"].Image == "nginx:latest"
+        assert by_id["a1"].IPAddress == "10.0.0.2"
+        assert by_id["b2"].Image == "Not Found (404)"
+        assert config["dependencies"] == ["db"]
+        assert names == {"web", "ghost"}
+        client.containers.list.assert_not_called()
+        client.containers.get.assert_not_called()
+    finally:
+        inventory.stop()
+
+
+def test_docker_manager_falls_back_when_inventory_is_not_ready():
+    manager = DockerManager()
+    manager.client = SimpleNamespace(
+        containers=SimpleNamespace(list=lambda all=False, **kwargs: [])
+    )
+    idle = ContainerInventory(manager.client)
+    with patch.object(inventory_module, "_inventory", idle):
+        assert manager.list_containers(all=True) == []
@@ -0,0 +1,149 @@
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+sys.modules["psutil"] = MagicMock()
+from hiveden.docker.logs import (
+    multiplex_logs,
+    parse_log_time,
+    resolve_log_targets,
+    timestamp_key,
+)
+
+
+def _ts(second, fraction=""):
+    return f"2024-05-01T10:00:{second:02d}{fraction}Z"
+
+
+class FakeManager:
+    """Serves canned log frames per container, optionally with delays."""
+
+    def __init__(self, frames, rows=None):
+        self.frames = frames
+        self.calls = []
+        self.client = MagicMock()
+
+        async def request(method, path, params=None):
+            self.calls.append((method, path, params))
+            return rows or []
+
+        self.client.request = request
+
+    async def stream_log_frames(self, container_id, **kwargs):
+        self.calls.append((container_id, kwargs))
+        for item in self.frames[container_id]:
+            if isinstance(item, Exception):
+                raise item
+            if isinstance(item, float):
+                await asyncio.sleep(item)
+                continue
+            yield item
+
+
+def _collect(containers, manager, **kwargs):
+    async def main():
+        return [frame async for frame in multiplex_logs(containers, manager, **kwargs)]
+
+    return asyncio.run(main())
+
+
+def _lines(frames):
+    return [(l["container"], l["message"]) for f in frames for l in f["lines"]]
+
+
+def test_timestamp_key_orders_trimmed_fractions():
+    assert timestamp_key(_ts(1, ".1")) > timestamp_key(_ts(1, ".09"))
+    assert timestamp_key(_ts(1)) < timestamp_key(_ts(1, ".000000001"))
+
+
+def test_parse_log_time_forms():
+    assert parse_log_time(None) is None
+    assert parse_log_time("1700000000") == 1700000000.0
+    assert parse_log_time("15m", now=1000.0) == 100.0
+    assert parse_log_time("1970-01-01T00:01:00Z") == 60.0
+    with pytest.raises(ValueError):
+        parse_log_time("yesterday")
+
+
+def test_lines_from_several_containers_are_merged_by_timestamp():
+    manager = FakeManager({
+        "app-web": [(1, f"{_ts(1)} GET /\n{_ts(3)} GET /login\n")],
+        # The database answers later, but its lines are older.
+        "app-db": [0.05, (2, f"{_ts(2)} slow query\n{_ts(4)} checkpoint\n")],
+    })
+
+    frames = _collect(["app-web", "app-db"], manager, follow=False, flush_interval=0.2)
+
+    assert _lines(frames) == [
+        ("app-web", "GET /"),
+        ("app-db", "slow query"),
+        ("app-web", "GET /login"),
+        ("app-db", "checkpoint"),
+    ]
+    assert frames[0]["lines"][1]["stream"] == "stderr"
+    assert frames[0]["lines"][0]["timestamp"] == _ts(1)
+    assert manager.calls[0][1]["timestamps"] is True
+
+
+def test_lines_split_across_frames_are_joined():
+    manager = FakeManager({"web": [(1, f"{_ts(1)} hel"), (1, "lo\n")]})
+
+    assert _lines(_collect(["web"], manager, follow=False)) == [("web", "hello")]
+
+
+def test_frames_are_batched():
+    text = "".join(f"{_ts(i)} line {i}\n" for i in range(5))
+    frames = _collect(["web"], FakeManager({"web": [(1, text)]}), follow=False, max_batch=2)
+
+    assert [len(f["lines"]) for f in frames] == [2, 2, 1]
+
+
+def test_following_drops_oldest_lines_when_buffer_is_full():
+    text = "".join(f"{_ts(i)} line {i}\n" for i in range(5))
+    frames = _collect(["web"], FakeManager({"web": [(1, text)]}), follow=True, max_buffer=2)
+
+    assert _lines(frames) == [("web", "line 3"), ("web", "line 4")]
+    assert frames[0]["dropped"] == {"web": 3}
+
+
+def test_history_waits_for_room_instead_of_dropping():
+    text = "".join(f"{_ts(i)} line {i}\n" for i in range(5))
+    frames = _collect(
+        ["web"], FakeManager({"web": [(1, text)]}), follow=False, max_buffer=2, flush_interval=0.01
+    )
+
+    assert [m for _c, m in _lines(frames)] == [f"line {i}" for i in range(5)]
+    assert not any("dropped" in f for f in frames)
+
+
+def test_reader_errors_are_reported_without_stopping_others():
+    manager = FakeManager({
+        "web": [(1, f"{_ts(1)} ok\n")],
+        "gone": [RuntimeError("No such container: gone")],
+    })
+
+    frames = _collect(["web", "gone"], manager, follow=False)
+
+    assert _lines(frames) == [("web", "ok")]
+    assert frames[0]["errors"] == {"gone": "No such container: gone"}
+
+
+def test_resolve_targets_by_app_id_and_exact_names():
+    rows = [{"Names": ["/app-web"]}, {"Names": ["/app-web-2"]}]
+    manager = FakeManager({}, rows=rows)
+
+    found = asyncio.run(resolve_log_targets(manager, names=["app-web"], app_id="app"))
+
+    assert found == ["app-web"]
+    _method, path, params = manager.calls[0]
+    assert path == "/containers/json"
+    assert params["filters"] == {"label": ["hiveden.app.id=app"], "name": ["app-web"]}
+
+
+def test_resolve_targets_requires_a_selector():
+    with pytest.raises(ValueError):
+        asyncio.run(resolve_log_targets(FakeManager({})))
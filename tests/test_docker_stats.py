@@ -0,0 +1,143 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.docker.stats import ContainerHistory, ContainerStatsSampler, read_cgroup_counters
+
+WEB = "a" * 64
+DB = "b" * 64
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _container(root, cgroup, pid, usage_usec, memory, rbytes=0, rx=0, netns="net:[2]"):
+    _write(cgroup / "cpu.stat", f"usage_usec {usage_usec}\nuser_usec 1\n")
+    _write(cgroup / "memory.current", f"{memory}\n")
+    _write(cgroup / "memory.stat", "anon 10\ninactive_file 100\n")
+    _write(cgroup / "memory.max", "max\n")
+    _write(cgroup / "io.stat", f"8:0 rbytes={rbytes} wbytes=0 rios=1 wios=0\n")
+    _write(cgroup / "pids.current", "3\n")
+    _write(cgroup / "cgroup.procs", f"{pid}\n")
+    proc = root / "proc" / str(pid)
+    (proc / "ns").mkdir(parents=True, exist_ok=True)
+    if not (proc / "ns" / "net").is_symlink():
+        os.symlink(netns, proc / "ns" / "net")
+    _write(
+        proc / "net" / "dev",
+        "Inter-|   Receive\n face |bytes packets\n"
+        "    lo: 999 1 0 0 0 0 0 0 999 1 0 0 0 0 0 0\n"
+        f"  eth0: {rx} 1 0 0 0 0 0 0 50 1 0 0 0 0 0 0\n",
+    )
+
+
+@pytest.fixture
+def host(tmp_path):
+    cgroups = tmp_path / "cgroup"
+    _write(cgroups / "cgroup.controllers", "cpu memory io pids\n")
+    (tmp_path / "proc" / "1" / "ns").mkdir(parents=True)
+    os.symlink("net:[1]", tmp_path / "proc" / "1" / "ns" / "net")
+    return tmp_path
+
+
+def _sampler(host):
+    client = MagicMock()
+    client.api.containers.return_value = [
+        {"Id": WEB, "Names": ["/web"]},
+        {"Id": DB, "Names": ["/db"]},
+    ]
+    return ContainerStatsSampler(
+        client, cgroup_root=str(host / "cgroup"), proc_root=str(host / "proc")
+    )
+
+
+def test_counters_are_read_from_cgroup_files(host):
+    cgroup = host / "cgroup" / "system.slice" / f"docker-{WEB}.scope"
+    _container(host, cgroup, 10, usage_usec=500, memory=1100, rbytes=7, rx=40)
+
+    counters = read_cgroup_counters(str(cgroup), str(host / "proc"))
+
+    assert counters["cpu_usec"] == 500
+    assert counters["memory_bytes"] == 1000
+    assert counters["memory_limit"] is None
+    assert counters["io_read"] == 7
+    assert (counters["net_rx"], counters["net_tx"]) == (40, 50)
+    assert counters["pids"] == 3
+
+
+def test_host_network_containers_have_no_network_stats(host):
+    cgroup = host / "cgroup" / "docker" / WEB
+    _container(host, cgroup, 11, usage_usec=1, memory=1, netns="net:[1]")
+
+    counters = read_cgroup_counters(str(cgroup), str(host / "proc"))
+
+    assert counters["net_rx"] is None
+
+
+def test_sampler_computes_rates_between_samples(host):
+    web = host / "cgroup" / "system.slice" / f"docker-{WEB}.scope"
+    db = host / "cgroup" / "docker" / DB
+    sampler = _sampler(host)
+
+    _container(host, web, 10, usage_usec=0, memory=1100, rbytes=0, rx=0)
+    _container(host, db, 20, usage_usec=0, memory=600)
+    sampler.sample(now=100.0)
+    assert sampler.latest(WEB) is None
+
+    _container(host, web, 10, usage_usec=1_500_000, memory=2100, rbytes=4096, rx=1000)
+    _container(host, db, 20, usage_usec=200_000, memory=600)
+    sampler.sample(now=102.0)
+
+    web_sample = sampler.latest(WEB)
+    assert web_sample["cpu_percent"] == 75.0
+    assert web_sample["memory_bytes"] == 2000
+    assert web_sample["io_read_bps"] == 2048
+    assert web_sample["net_rx_bps"] == 500
+    assert sampler.resolve("web") == WEB
+    assert sampler.resolve("bbbb") == DB
+    assert [t["Name"] for t in sampler.top("cpu_percent")] == ["web", "db"]
+    assert [t["Name"] for t in sampler.top("memory_bytes", limit=1)] == ["web"]
+
+
+def test_stopped_containers_are_forgotten(host):
+    web = host / "cgroup" / "docker" / WEB
+    sampler = _sampler(host)
+    _container(host, web, 10, usage_usec=0, memory=1)
+    sampler.sample(now=1.0)
+    sampler.sample(now=2.0)
+    assert sampler.resolve(WEB) == WEB
+
+    for item in web.iterdir():
+        item.unlink()
+    web.rmdir()
+    sampler.sample(now=3.0)
+
+    assert sampler.resolve(WEB) is None
+    assert sampler.stats()["containers"] == 0
+
+
+def test_history_downsamples_into_minutes_and_hours():
+    history = ContainerHistory()
+    for second in range(0, 2 * 3600 + 61):
+        history.add((float(second), float(second % 60), None, None, None, None, None, None, 1.0))
+
+    minutes = history.tiers["1m"]
+    hours = history.tiers["1h"]
+    assert len(history.tiers["1s"]) == 300
+    assert minutes[0][:2] == (0.0, 29.5)
+    assert minutes[0][2] is None
+    assert len(minutes) == 121
+    assert [h[0] for h in hours] == [0.0, 3600.0]
+    assert hours[0][1] == 29.5
+
+
+def test_unknown_tier_is_rejected(host):
+    with pytest.raises(ValueError):
+        _sampler(host).history(WEB, tier="5m")
@@ -0,0 +1,95 @@
+import os
+import time
+
+from hiveden.explorer.cache import ListingCache
+from hiveden.explorer.operations import ExplorerService
+
+
+def _settle(path):
+    # Move the directory's mtime out of the racy window.
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+
+def _directory(tmp_path, name, count):
+    path = tmp_path / name
+    path.mkdir()
+    for i in range(count):
+        (path / f"f{i}").write_bytes(b"x" * i)
+    _settle(path)
+    return str(path)
+
+
+def test_unchanged_directories_are_served_from_cache(tmp_path):
+    cache = ListingCache(max_bytes=1 << 20)
+    path = _directory(tmp_path, "movies", 3)
+
+    first, total = cache.scan(path)
+    second, _ = cache.scan(path)
+    assert [e.name for e in first] == [e.name for e in second]
+    assert second[0] is first[0] and second is not first
+    assert total == 3
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    (tmp_path / "movies" / "new").write_bytes(b"abc")
+    _settle(path)
+    entries, total = cache.scan(path)
+    assert len(entries) == 4 and total == 6
+    assert cache.stats()["stale"] == 1
+    assert cache.stats()["listings"] == 1
+
+    # Listing hidden entries is cached separately.
+    cache.scan(path, show_hidden=True)
+    assert cache.stats()["listings"] == 2
+
+
+def test_recently_modified_directories_are_not_cached(tmp_path):
+    cache = ListingCache(max_bytes=1 << 20)
+    path = tmp_path / "apps"
+    path.mkdir()
+
+    cache.scan(str(path))
+    cache.scan(str(path))
+
+    assert cache.hits == 0
+    assert cache.stats()["listings"] == 0
+
+
+def test_least_recently_used_listings_are_evicted(tmp_path):
+    paths = [_directory(tmp_path, f"d{i}", 5) for i in range(3)]
+    cache = ListingCache(max_bytes=1)
+    cache.scan(paths[0])
+    assert cache.stats()["listings"] == 0
+
+    probe = ListingCache(max_bytes=1 << 20)
+    probe.scan(paths[0])
+    cache = ListingCache(max_bytes=probe.stats()["bytes"] * 2)
+    cache.scan(paths[0])
+    cache.scan(paths[1])
+    cache.scan(paths[0])
+    cache.scan(paths[2])
+
+    assert cache.evictions == 1
+    cache.scan(paths[0])
+    cache.scan(paths[1])
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_restat_refreshes_cached_entries(tmp_path):
+    path = _directory(tmp_path, "backups", 2)
+    service = ExplorerService(listing_cache=ListingCache(max_bytes=1 << 20))
+    service.list_directory(path)
+
+    # Rewriting a file leaves the directory's mtime alone.
+    (tmp_path / "backups" / "f1").write_bytes(b"x" * 100)
+    entries, _, total_size = service.list_directory(path)
+    assert [e.size for e in entries] == [0, 1] and total_size == 1
+
+    page, _, _, _ = service.list_directory_page(path, restat=True)
+    assert [e.size for e in page] == [0, 100]
+    entries, _, total_size = service.list_directory(path, restat=True)
+    assert total_size == 100
+    assert service.listing_cache.hits == 3
+    # The cached entries are shared between requests and left alone.
+    cached, _ = service.listing_cache.scan(path)
+    assert sorted(e.stat.st_size for e in cached) == [0, 1]
@@ -0,0 +1,195 @@
+import os
+import re
+import shutil
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.explorer import inotify
+from hiveden.explorer.crawler import walk
+from hiveden.explorer.index import FilenameIndex, FilenameIndexer, glob_regex
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "shares"
+    for path in [
+        "movies/Alien (1979)/Alien.mkv",
+        "movies/Alien (1979)/alien.srt",
+        "movies/Aliens (1986)/Aliens.MKV",
+        "movies/.trash/Alien.mkv",
+        "music/alien-ant-farm/smooth.flac",
+        "docs/notes.txt",
+    ]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text("x")
+    os.symlink(root / "movies", root / "films")
+    return root
+
+
+def _walk_search(path, pattern, use_regex=False, case_sensitive=False, type_filter="all", show_hidden=False):
+    # What perform_search finds without an index.
+    regex = re.compile(pattern if use_regex else glob_regex(pattern), 0 if case_sensitive else re.IGNORECASE)
+    found = set()
+    for root, dirs, files in os.walk(path):
+        if not show_hidden:
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            files = [f for f in files if not f.startswith('.')]
+        names = (dirs if type_filter in ("all", "directory") else []) + (
+            files if type_filter in ("all", "file") else []
+        )
+        found.update(os.path.join(root, name) for name in names if regex.search(name))
+    return found
+
+
+@pytest.fixture
+def index(tree, tmp_path):
+    index = FilenameIndex(str(tmp_path / "index.sqlite3"))
+    FilenameIndexer(index, roots=[str(tree)], workers=3, watch=False).reconcile()
+    yield index
+    index.close()
+
+
+def test_crawler_sees_what_os_walk_sees(tree):
+    walked = {(root, name) for root, dirs, files in os.walk(tree) for name in dirs + files}
+    crawled = {(directory, name) for directory, entries in walk(str(tree), workers=4) for name, _ in entries}
+    assert crawled == walked
+
+
+@pytest.mark.parametrize("query", [
+    dict(pattern="alien*"),
+    dict(pattern="*.mkv"),
+    dict(pattern="*.mkv", case_sensitive=True),
+    dict(pattern="ali?n", type_filter="directory"),
+    dict(pattern="alien", type_filter="file", show_hidden=True),
+    dict(pattern=r"^alien.*\.(mkv|srt)$", use_regex=True),
+    dict(pattern="*"),
+])
+def test_index_search_matches_a_walk(tree, index, query):
+    found, checked = index.search(str(tree), **query)
+    assert {path for path, _ in found} == _walk_search(str(tree), **query)
+    assert checked >= len(found)
+
+
+def test_search_inside_hidden_directory_and_symlinks(tree, index):
+    found, _ = index.search(str(tree / "movies" / ".trash"), "alien*")
+    assert [path for path, _ in found] == [str(tree / "movies" / ".trash" / "Alien.mkv")]
+
+    found, _ = index.search(str(tree), "films", type_filter="directory")
+    assert found == [(str(tree / "films"), True)]
+    assert index.covering_root(str(tree / "music")) == str(tree)
+    assert index.covering_root(str(tree.parent)) is None
+
+
+def test_reconcile_drops_removed_entries(tree, tmp_path):
+    index = FilenameIndex(str(tmp_path / "index.sqlite3"))
+    indexer = FilenameIndexer(index, roots=[str(tree)], watch=False)
+    indexer.reconcile()
+    os.remove(tree / "docs" / "notes.txt")
+    (tree / "docs" / "todo.txt").write_text("x")
+
+    indexer.reconcile()
+
+    found, _ = index.search(str(tree), "*.txt")
+    assert [path for path, _ in found] == [str(tree / "docs" / "todo.txt")]
+    assert index.roots()[0]["entries"] == 14
+
+
+@pytest.mark.skipif(not inotify.supported(), reason="inotify is not available")
+def test_watcher_applies_changes(tree, tmp_path):
+    index = FilenameIndex(str(tmp_path / "index.sqlite3"))
+    indexer = FilenameIndexer(index, roots=[str(tree)], reconcile_interval=3600)
+    indexer.start()
+    try:
+        _eventually(lambda: index.covering_root(str(tree)) and indexer.status()["watches"] > 0)
+
+        (tree / "docs" / "report.pdf").write_text("x")
+        incoming = tmp_path / "incoming"
+        (incoming / "Predator (1987)").mkdir(parents=True)
+        (incoming / "Predator (1987)" / "Predator.mkv").write_text("x")
+        os.rename(incoming / "Predator (1987)", tree / "movies" / "Predator (1987)")
+        os.rename(tree / "music", tree / "audio")
+
+        _eventually(lambda: _names(index, tree, "*.pdf") == ["report.pdf"])
+        _eventually(lambda: _names(index, tree, "predator*") == ["Predator (1987)", "Predator.mkv"])
+        _eventually(lambda: _names(index, tree, "*.flac") and index.search(str(tree), "*.flac")[0][0][0].startswith(
+            str(tree / "audio")))
+
+        (tree / "audio" / "alien-ant-farm" / "movies.flac").write_text("x")
+        _eventually(lambda: "movies.flac" in _names(index, tree, "*.flac"))
+    finally:
+        indexer.stop()
+        index.close()
+
+
+@pytest.mark.skipif(not inotify.supported(), reason="inotify is not available")
+def test_watches_end_with_directories_moved_out_or_deleted(tree, tmp_path):
+    index = FilenameIndex(str(tmp_path / "index.sqlite3"))
+    indexer = FilenameIndexer(index, roots=[str(tree)], reconcile_interval=3600)
+    indexer.start()
+    try:
+        _eventually(lambda: index.covering_root(str(tree)) and indexer.status()["watches"] > 0)
+        watches = indexer.status()["watches"]
+
+        os.rename(tree / "music", tmp_path / "elsewhere")
+        (tmp_path / "elsewhere" / "alien-ant-farm" / "ghost.flac").write_text("x")
+        os.rename(tree / "movies" / "Alien (1979)", tree / "docs" / "Alien (1979)")
+        (tree / "docs" / "Alien (1979)" / "alien.nfo").write_text("x")
+        shutil.rmtree(tree / "movies" / ".trash")
+        # Events arrive in order: once this one is applied, so are the others.
+        (tree / "docs" / "marker.txt").write_text("x")
+        _eventually(lambda: "marker.txt" in _names(index, tree, "*.txt"))
+
+        assert _names(index, tree, "*.flac") == []
+        found, _ = index.search(str(tree), "alien.nfo")
+        assert [path for path, _ in found] == [str(tree / "docs" / "Alien (1979)" / "alien.nfo")]
+        assert indexer.status()["watches"] == watches - 3
+    finally:
+        indexer.stop()
+        index.close()
+
+
+def _names(index, tree, pattern):
+    return sorted(os.path.basename(path) for path, _ in index.search(str(tree), pattern)[0])
+
+
+def _eventually(check, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.05)
+
+
+def test_search_task_uses_the_index(tree, index):
+    from hiveden.explorer import tasks
+    from hiveden.explorer.models import ExplorerOperation
+
+    op = ExplorerOperation(id="op", operation_type="search", status="pending")
+    manager = MagicMock()
+    manager.get_operation.return_value = op
+    indexer = MagicMock(index=index)
+    with patch.object(tasks, "ExplorerManager", return_value=manager), \
+            patch.object(tasks, "current_filename_indexer", return_value=indexer), \
+            patch.object(tasks.os, "walk", side_effect=AssertionError("walked the disk")):
+        tasks.perform_search("op", str(tree), "*.mkv", False, False, "all", False)
+
+    assert op.status == "completed"
+    assert op.result["source"] == "index"
+    (page, matches), = [c.args[1:] for c in manager.save_search_page.call_args_list]
+    assert page == 0
+    assert sorted(m["name"] for m in matches) == ["Alien.mkv", "Aliens.MKV"]
+
+    op.status = "pending"
+    manager.save_search_page.reset_mock()
+    with patch.object(tasks, "ExplorerManager", return_value=manager), \
+            patch.object(tasks, "current_filename_indexer", return_value=indexer), \
+            patch.object(index, "search", wraps=index.search) as search:
+        tasks.perform_search("op", str(tree), "*.mkv", False, False, "all", False, max_results=1)
+
+    assert search.call_args.kwargs["limit"] == 2
+    assert (op.result["total_matches"], op.result["truncated"]) == (1, True)
@@ -0,0 +1,138 @@
+import os
+import stat
+from types import SimpleNamespace
+
+import pytest
+
+from hiveden.explorer.listing import Credentials, mime_type, scan_directory, sort_entries
+from hiveden.explorer.models import SortBy, SortOrder
+from hiveden.explorer.operations import ExplorerService
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "b.txt").write_bytes(b"x" * 10)
+    (tmp_path / "A.tar.gz").write_bytes(b"x" * 300)
+    (tmp_path / ".hidden").write_bytes(b"x")
+    (tmp_path / "dir").mkdir()
+    os.symlink("dir", tmp_path / "link")
+    os.symlink("missing", tmp_path / "dangling")
+    return tmp_path
+
+
+def test_listing_matches_single_file_entries(tree):
+    service = ExplorerService()
+
+    entries, count, total_size = service.list_directory(str(tree), show_hidden=True)
+
+    assert count == 6
+    assert total_size == sum(os.lstat(tree / name).st_size for name in os.listdir(tree) if name != "dir")
+    for entry in entries:
+        expected = service.get_file_entry(entry.path)
+        # Reading a symlink updates its access time.
+        assert entry.model_dump(exclude={"accessed"}) == expected.model_dump(exclude={"accessed"}), entry.name
+
+
+def test_hidden_entries_and_sort_orders(tree):
+    service = ExplorerService()
+
+    entries, _, _ = service.list_directory(str(tree))
+    assert [e.name for e in entries] == ["A.tar.gz", "b.txt", "dangling", "dir", "link"]
+
+    scanned, _ = scan_directory(str(tree), show_hidden=True)
+    sort_entries(scanned, SortBy.SIZE, SortOrder.DESC)
+    sizes = [e.stat.st_size for e in scanned]
+    assert sizes == sorted(sizes, reverse=True)
+    sort_entries(scanned, SortBy.TYPE)
+    assert [e.name for e in scanned][:2] == ["dir", ".hidden"]
+
+
+@pytest.mark.parametrize("name", ["a.tar.gz", "b.TGZ", "movie.mkv", "notes.txt", ".bashrc", "noext", "..x.png", "a."])
+def test_mime_type_matches_mimetypes(name):
+    import mimetypes
+
+    assert mime_type(name) == (mimetypes.guess_type(name)[0] or "application/octet-stream")
+
+
+def _st(mode, uid=1000, gid=1000):
+    return SimpleNamespace(st_mode=mode, st_uid=uid, st_gid=gid)
+
+
+def test_access_from_mode_bits():
+    user = Credentials(uid=1000, gid=1000, groups=frozenset({1000, 27}))
+    root = Credentials(uid=0, gid=0, groups=frozenset({0}))
+    regular = stat.S_IFREG
+
+    assert user.access(_st(regular | 0o640)) == (True, True, False)
+    assert user.access(_st(regular | 0o470, uid=0, gid=27)) == (True, True, True)
+    assert user.access(_st(regular | 0o774, uid=0, gid=0)) == (True, False, False)
+    assert user.access(_st(regular | 0o077)) == (False, False, False)
+
+    assert root.access(_st(regular | 0o000)) == (True, True, False)
+    assert root.access(_st(regular | 0o001)) == (True, True, True)
+    assert root.access(_st(stat.S_IFDIR | 0o000)) == (True, True, True)
+
+
+@pytest.mark.parametrize("sort_by", list(SortBy))
+@pytest.mark.parametrize("sort_order", list(SortOrder))
+def test_pages_follow_the_full_sort(tmp_path, sort_by, sort_order):
+    for i in range(23):
+        (tmp_path / f"f{i % 7}-{i}.txt").write_bytes(b"x" * (i % 5))
+        if i % 6 == 0:
+            (tmp_path / f"d{i}").mkdir()
+    service = ExplorerService()
+    expected, count, _ = service.list_directory(str(tmp_path), sort_by=sort_by, sort_order=sort_order)
+
+    names, cursor = [], None
+    while True:
+        page, total, _, cursor = service.list_directory_page(
+            str(tmp_path), sort_by=sort_by, sort_order=sort_order, limit=5, cursor=cursor
+        )
+        assert total == count
+        names += [e.name for e in page]
+        if cursor is None:
+            break
+
+    assert names == [e.name for e in expected]
+
+
+def test_cursor_survives_changes_and_checks_the_sort(tree):
+    service = ExplorerService()
+    page, _, _, cursor = service.list_directory_page(str(tree), limit=2)
+    assert [e.name for e in page] == ["A.tar.gz", "b.txt"]
+
+    (tree / "a.txt").write_bytes(b"")
+    (tree / "c.txt").write_bytes(b"")
+    page, _, _, _ = service.list_directory_page(str(tree), limit=2, cursor=cursor)
+    assert [e.name for e in page] == ["c.txt", "dangling"]
+
+    with pytest.raises(ValueError):
+        service.list_directory_page(str(tree), sort_by=SortBy.SIZE, cursor=cursor)
+    with pytest.raises(ValueError):
+        service.list_directory_page(str(tree), cursor="not-a-cursor")
+
+
+def test_stream_endpoint_sends_entries_then_summary(tree):
+    import json
+    from unittest.mock import patch
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from hiveden.api.routers import explorer
+
+    app = FastAPI()
+    app.include_router(explorer.router)
+    with patch.object(explorer, "get_service", return_value=ExplorerService()):
+        client = TestClient(app)
+        response = client.get("/explorer/list/stream", params={"path": str(tree)})
+        missing = client.get("/explorer/list/stream", params={"path": str(tree / "nope")})
+        paged = client.get("/explorer/list", params={"path": str(tree), "limit": 3, "sort_by": "size"})
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["entry"]["name"] for line in lines[:-1]) == ["A.tar.gz", "b.txt", "dangling", "dir", "link"]
+    assert lines[-1]["summary"]["total_entries"] == 5
+    assert missing.status_code == 404
+    assert len(paged.json()["entries"]) == 3
+    assert paged.json()["next_cursor"]
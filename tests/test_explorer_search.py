@@ -0,0 +1,207 @@
+import os
+import re
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Mock optional runtime dependency required by DB manager import chain.
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.explorer import tasks
+from hiveden.explorer.crawler import Crawler
+from hiveden.explorer.models import ExplorerOperation
+from hiveden.explorer.search import SearchRun, get_search_run
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "media"
+    for i in range(30):
+        (root / f"season{i % 3}" / f"sub{i % 4}").mkdir(parents=True, exist_ok=True)
+        (root / f"season{i % 3}" / f"sub{i % 4}" / f"episode{i:02d}.mkv").write_text("x")
+    (root / ".cache").mkdir()
+    (root / ".cache" / "episode99.mkv").write_text("x")
+    # A loop back to the top.
+    os.symlink(root, root / "season0" / "loop")
+    return root
+
+
+def _names(results):
+    return sorted(os.path.basename(path) for path, _ in results)
+
+
+def test_crawler_matches_filter_before_stat(tree):
+    crawler = Crawler(str(tree), workers=4, show_hidden=False)
+    with patch.object(os, "stat", side_effect=AssertionError("stat called")):
+        found = list(crawler.matches(re.compile(r"episode0\d"), "file"))
+
+    assert _names(found) == [f"episode{i:02d}.mkv" for i in range(10)]
+    assert all(not is_dir for _, is_dir in found)
+    # season dirs, sub dirs, episodes and the symlink.
+    assert crawler.scanned == 3 + 12 + 30 + 1
+
+    found = list(Crawler(str(tree), show_hidden=True).matches(re.compile("episode99")))
+    assert _names(found) == ["episode99.mkv"]
+
+
+def test_following_symlinks_visits_each_directory_once(tree):
+    found = list(Crawler(str(tree), workers=3, follow_symlinks=True).matches(re.compile(r"\.mkv$")))
+    assert len(found) == 31
+    assert len(set(found)) == 31
+
+    loops = list(Crawler(str(tree), follow_symlinks=False).matches(re.compile("loop"), "directory"))
+    assert loops == [(str(tree / "season0" / "loop"), True)]
+
+
+def test_cancel_stops_the_crawl(tree):
+    cancel = threading.Event()
+    crawler = Crawler(str(tree), workers=2, cancel=cancel)
+    matches = crawler.matches(re.compile("."))
+    next(matches)
+    cancel.set()
+    rest = list(matches)
+    assert len(rest) < 60
+
+
+def test_runs_store_pages_and_replay_them():
+    pages = {}
+    run = SearchRun("op", save_page=pages.__setitem__, load_page=pages.get, page_size=2)
+    for i in range(5):
+        run.add({"i": i})
+
+    assert sorted(pages) == [0, 1]
+    assert run.page(1) == [{"i": 2}, {"i": 3}]
+    assert run.page(2) == [{"i": 4}]
+    assert run.read(1) == ([{"i": 1}], False)
+    assert run.read(4, timeout=0) == ([{"i": 4}], False)
+
+    run.finish()
+    assert pages[2] == [{"i": 4}]
+    assert run.read(5) == ([], True)
+    assert run.read(4) == ([{"i": 4}], True)
+
+
+def _search(tree, manager, **kwargs):
+    op = ExplorerOperation(id="op", operation_type="search", status="pending")
+    manager.get_operation.return_value = op
+    args = dict(path=str(tree), pattern="episode*", use_regex=False, case_sensitive=False,
+                type_filter="all", show_hidden=False)
+    args.update(kwargs)
+    with patch.object(tasks, "ExplorerManager", return_value=manager), \
+            patch.object(tasks, "current_filename_indexer", return_value=None):
+        tasks.perform_search("op", **args)
+    return op
+
+
+def test_search_persists_pages_and_stops_at_max_results(tree):
+    pages = {}
+    manager = MagicMock()
+    manager.save_search_page.side_effect = lambda op_id, page, matches: pages.__setitem__(page, matches)
+
+    op = _search(tree, manager)
+    assert op.status == "completed"
+    assert op.result["total_matches"] == 30
+    assert op.result["truncated"] is False
+    assert op.result["source"] == "filesystem"
+    assert "matches" not in op.result
+    assert sum(len(p) for p in pages.values()) == 30
+    assert isinstance(pages[0][0]["modified"], str)
+
+    pages.clear()
+    op = _search(tree, manager, max_results=7)
+    assert (op.result["total_matches"], op.result["truncated"]) == (7, True)
+    assert get_search_run("op") is None
+
+
+def test_search_can_be_cancelled(tree):
+    service = tasks.ExplorerService()
+    real_get_file_entry = service.get_file_entry
+
+    def get_file_entry(path):
+        run = get_search_run("op")
+        if run.total == 3:
+            run.cancel.set()
+        return real_get_file_entry(path)
+
+    service.get_file_entry = get_file_entry
+    with patch.object(tasks, "ExplorerService", return_value=service):
+        op = _search(tree, MagicMock())
+
+    assert op.status == "cancelled"
+    assert op.result["total_matches"] == 4
+
+
+def test_stream_replays_finished_searches_then_follows_live_ones(tree):
+    import json
+
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from hiveden.api.routers import explorer
+    from hiveden.explorer.search import end_search_run, start_search_run
+
+    pages = {0: [{"name": "a"}, {"name": "b"}], 1: [{"name": "c"}]}
+    op = ExplorerOperation(id="op", operation_type="search", status="completed",
+                           result=json.dumps({"total_matches": 3, "pages": 2, "page_size": 2}))
+    manager = MagicMock()
+    manager.get_operation.return_value = op
+    manager.get_search_page.side_effect = lambda op_id, page: pages.get(page)
+
+    app = FastAPI()
+    app.include_router(explorer.router)
+    client = TestClient(app)
+    with patch.object(explorer, "get_manager", return_value=manager):
+        body = client.get("/explorer/search/op/stream").text
+        assert [json.loads(line[6:])["name"] for line in body.splitlines() if line.startswith("data: {\"name")] == [
+            "a", "b", "c"
+        ]
+        assert "event: done" in body and '"status": "completed"' in body
+        assert client.get("/explorer/search/op/results", params={"page": 1}).json()["matches"] == [{"name": "c"}]
+
+        run = start_search_run("op", save_page=MagicMock(), load_page=lambda page: None)
+        run.add({"name": "live"})
+        threading.Timer(0.2, lambda: (run.add({"name": "later"}), end_search_run(run))).start()
+        body = client.get("/explorer/search/op/stream").text
+        assert [json.loads(line[6:])["name"] for line in body.splitlines() if line.startswith("data: {\"name")] == [
+            "live", "later"
+        ]
+
+        assert client.post("/explorer/search/op/cancel").status_code == 409
+
+
+def test_run_ends_even_when_the_last_page_cannot_be_stored(tree):
+    manager = MagicMock()
+    manager.save_search_page.side_effect = RuntimeError("operation is gone")
+
+    op = _search(tree, manager, max_results=3)
+
+    assert op.status == "failed"
+    assert get_search_run("op") is None
+
+
+def test_deleting_a_running_search_waits_for_it_to_stop():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from hiveden.api.routers import explorer
+    from hiveden.explorer.search import end_search_run, start_search_run
+
+    events = []
+    manager = MagicMock()
+    manager.delete_operation.side_effect = lambda op_id: events.append("deleted")
+    run = start_search_run("op", save_page=lambda page, matches: events.append("saved"), load_page=lambda page: None)
+    run.add({"name": "a"})
+
+    def search():
+        run.cancel.wait(2)
+        end_search_run(run)
+
+    threading.Thread(target=search).start()
+    app = FastAPI()
+    app.include_router(explorer.router)
+    with patch.object(explorer, "get_manager", return_value=manager):
+        assert TestClient(app).delete("/explorer/operations/op").status_code == 200
+
+    assert events == ["saved", "deleted"]
@@ -0,0 +1,142 @@
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.services.logs import LogWriter
+
+
+def _entry(n):
+    return {"message": f"entry {n}", "level": "info", "actor": "system", "action": "test"}
+
+
+def _writer(**kwargs):
+    repo = MagicMock()
+    repo.manager.closed = False
+    repo.insert_logs.side_effect = lambda batch: len(batch)
+    kwargs.setdefault("flush_interval", 0.01)
+    return LogWriter(repo, **kwargs), repo
+
+
+def test_entries_are_written_in_batches():
+    writer, repo = _writer(batch_size=3)
+    for n in range(7):
+        writer.submit(_entry(n))
+
+    assert writer.flush(timeout=2)
+    writer.close()
+
+    batches = [call.args[0] for call in repo.insert_logs.call_args_list]
+    assert all(len(batch) <= 3 for batch in batches)
+    assert [e["message"] for batch in batches for e in batch] == [
+        f"entry {n}" for n in range(7)
+    ]
+    assert writer.stats()["written"] == 7
+
+
+def _stall(repo):
+    """Make the repository block until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def insert(batch):
+        started.set()
+        release.wait(2)
+        return len(batch)
+
+    repo.insert_logs.side_effect = insert
+    return started, release
+
+
+def test_drop_oldest_keeps_newest_entries():
+    writer, repo = _writer(batch_size=1, max_queue_size=2, overflow_policy="drop_oldest")
+    started, release = _stall(repo)
+    writer.submit(_entry(0))
+    started.wait(2)
+
+    for n in range(1, 5):
+        writer.submit(_entry(n))
+    release.set()
+    writer.close()
+
+    written = [c.args[0][0]["message"] for c in repo.insert_logs.call_args_list]
+    assert written == ["entry 0", "entry 3", "entry 4"]
+    assert writer.stats()["dropped"] == 2
+
+
+def test_drop_newest_rejects_incoming_entries():
+    writer, repo = _writer(batch_size=1, max_queue_size=1, overflow_policy="drop_newest")
+    started, release = _stall(repo)
+    writer.submit(_entry(0))
+    started.wait(2)
+
+    assert writer.submit(_entry(1))
+    assert not writer.submit(_entry(2))
+    release.set()
+    writer.close()
+
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["written"] == 2
+
+
+def test_stdout_policy_prints_overflow(capsys):
+    writer, repo = _writer(batch_size=1, max_queue_size=1, overflow_policy="stdout")
+    started, release = _stall(repo)
+    writer.submit(_entry(0))
+    started.wait(2)
+
+    writer.submit(_entry(1))
+    writer.submit(_entry(2))
+    release.set()
+    writer.close()
+
+    assert "entry 2" in capsys.readouterr().out
+    assert writer.stats()["fallback"] == 1
+
+
+def test_failed_batch_falls_back_to_stdout(capsys):
+    writer, repo = _writer()
+    repo.insert_logs.side_effect = RuntimeError("db down")
+
+    writer.submit(_entry(0))
+    writer.close()
+
+    out = capsys.readouterr().out
+    assert "FAILED TO WRITE 1 LOG(S) TO DB: db down" in out
+    assert "entry 0" in out
+    assert writer.stats()["fallback"] == 1
+
+
+def test_entries_are_printed_once_the_pool_is_closed(capsys):
+    writer, repo = _writer()
+    repo.manager.closed = True
+
+    writer.submit(_entry(0))
+    writer.close()
+
+    out = capsys.readouterr().out
+    assert "entry 0" in out and "FAILED" not in out
+    repo.insert_logs.assert_not_called()
+    repo.maintain_partitions.assert_not_called()
+
+
+def test_stop_log_writer_drains_before_shutdown(monkeypatch):
+    from hiveden.services import logs
+
+    writer, repo = _writer(flush_interval=10)
+    monkeypatch.setattr(logs, "_log_writer", writer)
+    writer.submit(_entry(0))
+
+    logs.stop_log_writer()
+
+    repo.insert_logs.assert_called_once()
+    assert logs._log_writer is None
+    assert writer.submit(_entry(1)) is False
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        LogWriter(MagicMock(), overflow_policy="discard")
@@ -0,0 +1,63 @@
+import datetime
+import sys
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+sys.modules["yoyo"] = MagicMock()
+
+from hiveden.db.repositories.logs import LogRepository, _build_logs_query
+
+
+def test_keyset_cursor_uses_row_comparison():
+    ts = datetime.datetime(2026, 3, 1, 12, 0)
+    query, params = _build_logs_query(50, 0, "error", None, before_id=42, before_ts=ts)
+
+    assert "(created_at, id) < (%s, %s) AND level = %s" in query
+    assert query.endswith("ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s")
+    assert params == (ts, 42, "error", 50, 0)
+
+
+def test_keyset_cursor_with_only_id_looks_up_timestamp():
+    query, params = _build_logs_query(10, 0, None, None, before_id=42)
+
+    assert "(SELECT created_at, id FROM logs WHERE id = %s LIMIT 1)" in query
+    assert params == (42, 10, 0)
+
+
+def _repository(partitions):
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [{"relname": name} for name in partitions]
+    cursor.fetchone.side_effect = lambda: {"name": cursor.execute.call_args[0][1][0].strftime("logs_p%Y%m")}
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    manager = MagicMock()
+
+    @contextmanager
+    def connection():
+        yield conn
+
+    manager.connection = connection
+    return LogRepository(manager), cursor
+
+
+def test_maintain_partitions_creates_ahead_and_drops_expired():
+    repo, cursor = _repository(["logs_default", "logs_p202511", "logs_p202512", "logs_p202601"])
+
+    result = repo.maintain_partitions(
+        months_ahead=2, retention_months=2, today=datetime.date(2026, 1, 20)
+    )
+
+    assert result["created"] == ["logs_p202601", "logs_p202602", "logs_p202603"]
+    assert result["dropped"] == ["logs_p202511"]
+    executed = [call.args[0] for call in cursor.execute.call_args_list]
+    assert 'DROP TABLE "logs_p202511"' in executed
+    assert not any("logs_default" in sql for sql in executed)
+
+
+def test_maintain_partitions_keeps_everything_without_retention():
+    repo, cursor = _repository(["logs_p200001"])
+
+    result = repo.maintain_partitions(retention_months=0, today=datetime.date(2026, 1, 1))
+
+    assert result["dropped"] == []
+    cursor.fetchall.assert_not_called()